@@ -114,6 +114,9 @@ class Prism_3dsMax_Functions(object):
         # TODO callbacks
         if not origin.core.smCallbacksRegistered:
             if self.appVersion[0] < 23:
+                MaxPlus.NotificationManager.Register(
+                    MaxPlus.NotificationCodes.FilePreSave, origin.core.scenefilePreSave
+                )
                 MaxPlus.NotificationManager.Register(
                     MaxPlus.NotificationCodes.FilePostSave, origin.core.scenefileSaved
                 )
@@ -124,6 +127,7 @@ class Prism_3dsMax_Functions(object):
                     MaxPlus.NotificationCodes.FilePreOpen, origin.core.sceneUnload
                 )
             else:
+                rt.callbacks.addScript(rt.Name("filePreSave"), origin.core.scenefilePreSave, id=rt.Name("filePreSave_scenefilePreSave"))
                 rt.callbacks.addScript(rt.Name("filePostSave"), origin.core.scenefileSaved, id=rt.Name("filePostSave_scenefileSaved"))
                 rt.callbacks.addScript(rt.Name("postSceneReset"), origin.core.sceneUnload, id=rt.Name("postSceneReset_sceneUnload"))
                 rt.callbacks.addScript(rt.Name("filePreOpen"), origin.core.sceneUnload, id=rt.Name("filePreOpen_sceneUnload"))
@@ -1187,7 +1187,7 @@ class Prism_Blender_Functions(object):
 
             origin.l_pathLast.setText(rSettings["outputName"])
             origin.l_pathLast.setToolTip(rSettings["outputName"])
-            origin.stateManager.saveStatesToScene()
+            origin.stateManager.saveStatesToScene(state=origin)
 
     @err_catcher(name=__name__)
     def sm_render_getDeadlineParams(self, origin, dlParams, homeDir):
@@ -215,6 +215,8 @@ class Prism_Houdini_Functions(object):
         elif eventType == hou.hipFileEventType.AfterLoad:
             if self.core.status != "starting":
                 self.core.sceneOpen()
+        elif eventType == hou.hipFileEventType.BeforeSave:
+            self.core.scenefilePreSave()
         elif eventType == hou.hipFileEventType.AfterSave:
             self.core.scenefileSaved()
 
@@ -766,14 +768,6 @@ class Prism_Houdini_Functions(object):
         origin.sceneBrowser.lo_entityDetails.setContentsMargins(9, 18, 9, 9)
         origin.sceneBrowser.setStyleSheet(origin.sceneBrowser.styleSheet() + " QToolButton{ border-width: 0px; background-color: transparent} QToolButton::checked{background-color: rgba(200, 200, 200, 100)}")
 
-        ssheet = hou.qt.styleSheet()
-        ssheet = ssheet.replace("QScrollArea", "Qdisabled")
-        ssheet = ssheet.replace("QAbstractItemView", "QWidget#sceneItems")
-        ssheet = ssheet.replace("QListView", "QWidget#sceneItems")
-
-        origin.sceneBrowser.w_scenefileItems.setObjectName("sceneItems")
-        origin.sceneBrowser.w_scenefileItems.setStyleSheet(ssheet)
-
     @err_catcher(name=__name__)
     def preLoadPresetScene(self, origin, filepath):
         self.curDesktop = hou.ui.curDesktop()
@@ -1714,6 +1708,33 @@ class Prism_Houdini_Functions(object):
 
         return version
 
+    @err_catcher(name=__name__)
+    def sm_render_getLocalFarmCommand(self, origin, jobOutputFile, scenefile):
+        if hasattr(origin, "getRenderNode"):
+            driver = origin.getRenderNode()
+        else:
+            driver = origin.node
+
+        if not driver:
+            return
+
+        binFolder = os.path.join(hou.text.expandString("$HFS"), "bin")
+        hython = os.path.join(binFolder, "hython")
+        if platform.system() == "Windows":
+            hython += ".exe"
+
+        return [
+            hython,
+            os.path.join(binFolder, "hrender.py"),
+            "-e",
+            "-f",
+            "<STARTFRAME>",
+            "<ENDFRAME>",
+            "-d",
+            driver.path(),
+            scenefile,
+        ]
+
     @err_catcher(name=__name__)
     def sm_renderSettings_getCurrentSettings(self, origin, node=None, asString=True):
         settings = []
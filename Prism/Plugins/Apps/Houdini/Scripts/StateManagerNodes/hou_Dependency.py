@@ -125,12 +125,12 @@ class DependencyClass(object):
     @err_catcher(name=__name__)
     def managerChanged(self, text=None):
         self.updateUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def depTypeChanged(self, text=None):
         self.updateUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def getDependencyType(self):
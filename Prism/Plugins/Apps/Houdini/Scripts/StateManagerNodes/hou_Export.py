@@ -469,7 +469,7 @@ class ExportClass(object):
                 self.core.appPlugin.filecache.setRangeOnNode(self.node, "From State Manager")
 
         self.updateUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def nameChanged(self, text):
@@ -542,7 +542,7 @@ class ExportClass(object):
         if result == 1:
             taskName = self.nameWin.e_item.text()
             self.setTaskname(taskName)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def setTaskname(self, taskname):
@@ -558,7 +558,7 @@ class ExportClass(object):
         if self.isPrismFilecacheNode(self.node):
             self.core.appPlugin.setNodeParm(self.node, "task", taskname, clear=True)
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def getTaskname(self, expanded=False):
@@ -614,7 +614,7 @@ class ExportClass(object):
         if self.isPrismFilecacheNode(self.node):
             self.core.appPlugin.filecache.setUpdateMasterVersionOnNode(self.node, master)
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def getUpdateMasterVersion(self):
@@ -629,7 +629,7 @@ class ExportClass(object):
         if self.isPrismFilecacheNode(self.node):
             self.core.appPlugin.filecache.setLocationOnNode(self.node, location)
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def getLocation(self):
@@ -640,7 +640,7 @@ class ExportClass(object):
         idx = self.cb_outPath.findText(location)
         if idx != -1:
             self.cb_outPath.setCurrentIndex(idx)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
             return True
 
         return False
@@ -650,7 +650,7 @@ class ExportClass(object):
         self.curCam = self.camlist[index]
         self.nameChanged(self.e_name.text())
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def refreshShotCameras(self):
@@ -675,7 +675,7 @@ class ExportClass(object):
                 self.curCam = self.camlist[0]
             else:
                 self.curCam = None
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def updateUi(self):
@@ -729,7 +729,7 @@ class ExportClass(object):
             self.cb_sCamShot.setCurrentIndex(idx)
         else:
             self.cb_sCamShot.setCurrentIndex(0)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
         self.nameChanged(self.e_name.text())
 
@@ -939,7 +939,7 @@ class ExportClass(object):
 
         self.rjToggled()
         self.updateUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def goToNode(self):
@@ -1053,7 +1053,7 @@ class ExportClass(object):
         if self.isPrismFilecacheNode(self.node):
             self.core.appPlugin.filecache.nodeInit(self.node, self.state)
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
         return True
 
     @err_catcher(name=__name__)
@@ -1084,7 +1084,7 @@ class ExportClass(object):
         if self.sp_rangeStart.value() > self.sp_rangeEnd.value():
             self.sp_rangeEnd.setValue(self.sp_rangeStart.value())
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def endChanged(self):
@@ -1105,18 +1105,18 @@ class ExportClass(object):
         if self.sp_rangeEnd.value() < self.sp_rangeStart.value():
             self.sp_rangeStart.setValue(self.sp_rangeEnd.value())
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def useTakeChanged(self, state):
         self.cb_take.setEnabled(state)
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def rjToggled(self, checked=None):
         if checked is None:
             checked = self.gb_submit.isChecked()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def managerChanged(self, text=None):
@@ -1124,7 +1124,7 @@ class ExportClass(object):
         if plugin:
             plugin.sm_houExport_activated(self)
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def openSlaves(self):
@@ -1164,7 +1164,7 @@ class ExportClass(object):
                     selSlaves = selSlaves[:-2]
 
             self.e_osSlaves.setText(selSlaves)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def getRenderNode(self):
@@ -1540,7 +1540,7 @@ class ExportClass(object):
 
             self.core.callback("postExport", **kwargs)
 
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
             if os.path.exists(outputName):
                 return [self.state.text(0) + " - success"]
@@ -1693,7 +1693,7 @@ class ExportClass(object):
             self.l_pathLast.setText(outputNames[0])
             self.l_pathLast.setToolTip(outputNames[0])
 
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
             updateMaster = True
 
             for idx, outputName in enumerate(outputNames):
@@ -1832,7 +1832,14 @@ class ExportClass(object):
         if not self.isUsingMasterVersion():
             return
 
-        self.core.products.updateMasterVersion(outputName)
+        self.stateManager.runPublishTask(
+            self.core.products.updateMasterVersion,
+            args=[outputName],
+            name="updateMasterVersion",
+            state=self,
+            inputs=[outputName],
+            outputs=[self.stateManager.getMasterTaskKey(outputName)],
+        )
 
     @err_catcher(name=__name__)
     def getStateProps(self):
@@ -222,7 +222,7 @@ class ImageRenderClass(object):
             idx = self.cb_renderPreset.findText(data["currentrenderpreset"])
             if idx != -1:
                 self.cb_renderPreset.setCurrentIndex(idx)
-                self.stateManager.saveStatesToScene()
+                self.stateManager.saveStatesToScene(state=self)
         if "rangeType" in data:
             idx = self.cb_rangeType.findText(data["rangeType"])
             if idx != -1:
@@ -245,7 +245,7 @@ class ImageRenderClass(object):
                 if self.chb_camOverride.isChecked():
                     self.curCam = self.camlist[idx]
                 self.cb_cams.setCurrentIndex(idx)
-                self.stateManager.saveStatesToScene()
+                self.stateManager.saveStatesToScene(state=self)
         if "resoverride" in data:
             res = eval(data["resoverride"])
             self.chb_resOverride.setChecked(res[0])
@@ -450,7 +450,7 @@ class ImageRenderClass(object):
     def rangeTypeChanged(self, state):
         self.setRangeOnNode()
         self.updateUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def startChanged(self):
@@ -458,7 +458,7 @@ class ImageRenderClass(object):
             self.sp_rangeEnd.setValue(self.sp_rangeStart.value())
 
         self.setRangeOnNode()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def endChanged(self):
@@ -466,7 +466,7 @@ class ImageRenderClass(object):
             self.sp_rangeStart.setValue(self.sp_rangeEnd.value())
 
         self.setRangeOnNode()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def setRangeOnNode(self):
@@ -488,7 +488,9 @@ class ImageRenderClass(object):
         if not hasattr(self, "expressionWinLabel"):
             return
 
-        frames = self.core.resolveFrameExpression(self.le_frameExpression.text())
+        frames = self.core.resolveFrameExpression(
+            self.le_frameExpression.text(), limit=1001
+        )
         if len(frames) > 1000:
             frames = frames[:1000]
             frames.append("...")
@@ -525,7 +527,9 @@ class ImageRenderClass(object):
             winwidth = 10
             winheight = 10
             VBox = QVBoxLayout()
-            frames = self.core.resolveFrameExpression(self.le_frameExpression.text())
+            frames = self.core.resolveFrameExpression(
+                self.le_frameExpression.text(), limit=1001
+            )
             if len(frames) > 1000:
                 frames = frames[:1000]
                 frames.append("...")
@@ -561,12 +565,12 @@ class ImageRenderClass(object):
     @err_catcher(name=__name__)
     def useTakeChanged(self, state):
         self.cb_take.setEnabled(state)
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def setCam(self, index):
         self.curCam = self.camlist[index]
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def rendererChanged(self, renderer, create=True):
@@ -594,7 +598,7 @@ class ImageRenderClass(object):
 
         self.nameChanged(self.e_name.text())
         self.updateUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def deleteNode(self):
@@ -694,7 +698,7 @@ class ImageRenderClass(object):
             self.b_changeTask.setStyleSheet(
                 "QPushButton { background-color: rgb(150,0,0); border: none;}"
             )
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def getTaskname(self):
@@ -728,7 +732,7 @@ class ImageRenderClass(object):
         idx = self.cb_master.findText(master)
         if idx != -1:
             self.cb_master.setCurrentIndex(idx)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
             return True
 
         return False
@@ -742,7 +746,7 @@ class ImageRenderClass(object):
         idx = self.cb_outPath.findText(location)
         if idx != -1:
             self.cb_outPath.setCurrentIndex(idx)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
             return True
 
         return False
@@ -760,7 +764,7 @@ class ImageRenderClass(object):
         idx = self.cb_format.findText(fmt)
         if idx != -1:
             self.cb_format.setCurrentIndex(idx)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
             return True
 
         return False
@@ -770,19 +774,19 @@ class ImageRenderClass(object):
         if self.core.appPlugin.isNodeValid(self, self.node) and hasattr(self.curRenderer, "setFormatOnNode"):
             self.curRenderer.setFormatOnNode(self.getFormat(), self.node)
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def presetOverrideChanged(self, checked):
         self.cb_renderPreset.setEnabled(checked)
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def camOverrideChanged(self, checked):
         self.cb_cams.setEnabled(checked)
         self.updateCams()
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def resOverrideChanged(self, checked):
@@ -790,7 +794,7 @@ class ImageRenderClass(object):
         self.sp_resHeight.setEnabled(checked)
         self.b_resPresets.setEnabled(checked)
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def showResPresets(self):
@@ -818,7 +822,7 @@ class ImageRenderClass(object):
                 pAct.triggered.connect(
                     lambda x=None, v=pheight: self.sp_resHeight.setValue(v)
                 )
-                pAct.triggered.connect(lambda: self.stateManager.saveStatesToScene())
+                pAct.triggered.connect(lambda: self.stateManager.saveStatesToScene(state=self))
 
             pmenu.addAction(pAct)
 
@@ -836,7 +840,7 @@ class ImageRenderClass(object):
         self.sp_resWidth.setValue(self.curCam.parm("resx").eval())
         self.sp_resHeight.setValue(self.curCam.parm("resy").eval())
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def updateUi(self):
@@ -903,7 +907,7 @@ class ImageRenderClass(object):
                     self.curCam = self.camlist[0]
                 else:
                     self.curCam = None
-                self.stateManager.saveStatesToScene()
+                self.stateManager.saveStatesToScene(state=self)
         elif self.node is not None:
             self.curCam = self.curRenderer.getCam(self.node)
 
@@ -1020,7 +1024,7 @@ class ImageRenderClass(object):
 
     @err_catcher(name=__name__)
     def rjToggled(self, checked):
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def managerChanged(self, text=None):
@@ -1038,7 +1042,7 @@ class ImageRenderClass(object):
         self.w_renderRS.setVisible(bool(isRedshift and (rfm == "Deadline")))
         self.w_renderASSs.setVisible(bool(isArnold and (rfm == "Deadline")))
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def openSlaves(self):
@@ -1078,17 +1082,17 @@ class ImageRenderClass(object):
                     selSlaves = selSlaves[:-2]
 
             self.e_osSlaves.setText(selSlaves)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def gpuPtChanged(self):
         self.w_dlGPUdevices.setEnabled(self.sp_dlGPUpt.value() == 0)
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def gpuDevicesChanged(self):
         self.w_dlGPUpt.setEnabled(self.le_dlGPUdevices.text() == "")
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def setPassData(self, item):
@@ -1366,7 +1370,7 @@ class ImageRenderClass(object):
 
         self.l_pathLast.setText(outputName)
         self.l_pathLast.setToolTip(outputName)
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
         if self.chb_resOverride.isChecked():
             result = self.curRenderer.setResolution(self)
@@ -1579,9 +1583,23 @@ class ImageRenderClass(object):
 
         masterAction = self.cb_master.currentText()
         if masterAction == "Set as master":
-            self.core.mediaProducts.updateMasterVersion(outputName)
+            self.stateManager.runPublishTask(
+                self.core.mediaProducts.updateMasterVersion,
+                args=[outputName],
+                name="updateMasterVersion",
+                state=self,
+                inputs=[outputName],
+                outputs=[self.stateManager.getMasterTaskKey(outputName, media=True)],
+            )
         elif masterAction == "Add to master":
-            self.core.mediaProducts.addToMasterVersion(outputName)
+            self.stateManager.runPublishTask(
+                self.core.mediaProducts.addToMasterVersion,
+                args=[outputName],
+                name="addToMasterVersion",
+                state=self,
+                inputs=[outputName],
+                outputs=[self.stateManager.getMasterTaskKey(outputName, media=True)],
+            )
 
     @err_catcher(name=__name__)
     def undoRenderSettings(self, rSettings):
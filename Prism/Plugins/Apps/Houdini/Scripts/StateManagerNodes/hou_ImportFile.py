@@ -283,7 +283,7 @@ class ImportFileClass(object):
                 if curVersion.get("version") and latestVersion.get("version") and curVersion["version"] != latestVersion["version"]:
                     self.importLatest()
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def browse(self):
@@ -335,7 +335,7 @@ class ImportFileClass(object):
         if not self.stateManager.standalone:
             if checked:
                 self.removeNameSpaces()
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def getImportPath(self, expand=True):
@@ -355,7 +355,7 @@ class ImportFileClass(object):
         self.w_currentVersion.setToolTip(path)
         self.stateManager.saveImports()
         self.updateUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def runSanityChecks(self, cachePath):
@@ -457,7 +457,7 @@ class ImportFileClass(object):
             if not self.node:
                 self.core.popup("Import failed.")
                 self.updateUi()
-                self.stateManager.saveStatesToScene()
+                self.stateManager.saveStatesToScene(state=self)
                 return
 
             self.core.appPlugin.setFrameRange(
@@ -770,7 +770,7 @@ class ImportFileClass(object):
 
         self.stateManager.saveImports()
         self.updateUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
         return True
 
@@ -157,7 +157,7 @@ class InstallHDAClass(hou_ImportFile.ImportFileClass):
 
         self.stateManager.saveImports()
         self.updateUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
         return True
 
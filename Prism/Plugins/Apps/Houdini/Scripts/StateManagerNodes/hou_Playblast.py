@@ -149,7 +149,7 @@ class PlayblastClass(object):
             if idx > 0:
                 self.curCam = self.camlist[idx - 1]
                 self.cb_cams.setCurrentIndex(idx)
-                self.stateManager.saveStatesToScene()
+                self.stateManager.saveStatesToScene(state=self)
         if "resoverride" in data:
             res = eval(data["resoverride"])
             self.chb_resOverride.setChecked(res[0])
@@ -242,21 +242,21 @@ class PlayblastClass(object):
     @err_catcher(name=__name__)
     def rangeTypeChanged(self, state):
         self.updateRange()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def startChanged(self):
         if self.sp_rangeStart.value() > self.sp_rangeEnd.value():
             self.sp_rangeEnd.setValue(self.sp_rangeStart.value())
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def endChanged(self):
         if self.sp_rangeEnd.value() < self.sp_rangeStart.value():
             self.sp_rangeStart.setValue(self.sp_rangeEnd.value())
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def setCam(self, index):
@@ -265,7 +265,7 @@ class PlayblastClass(object):
         else:
             self.curCam = self.camlist[index - 1]
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def nameChanged(self, text):
@@ -312,7 +312,7 @@ class PlayblastClass(object):
             self.b_changeTask.setStyleSheet(
                 "QPushButton { background-color: rgb(150,0,0); border: none;}"
             )
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def getTaskname(self):
@@ -348,7 +348,7 @@ class PlayblastClass(object):
         self.sp_resHeight.setEnabled(checked)
         self.b_resPresets.setEnabled(checked)
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def showResPresets(self):
@@ -377,7 +377,7 @@ class PlayblastClass(object):
                 pAct.triggered.connect(
                     lambda x=None, v=pheight: self.sp_resHeight.setValue(v)
                 )
-                pAct.triggered.connect(lambda: self.stateManager.saveStatesToScene())
+                pAct.triggered.connect(lambda: self.stateManager.saveStatesToScene(state=self))
 
             pmenu.addAction(pAct)
 
@@ -404,7 +404,7 @@ class PlayblastClass(object):
         self.sp_resWidth.setValue(pbCam.parm("resx").eval())
         self.sp_resHeight.setValue(pbCam.parm("resy").eval())
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def updateUi(self):
@@ -419,7 +419,7 @@ class PlayblastClass(object):
         else:
             self.cb_cams.setCurrentIndex(0)
             self.curCam = None
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
         if not self.core.mediaProducts.getUseMaster():
             self.w_master.setVisible(False)
@@ -505,7 +505,7 @@ class PlayblastClass(object):
         idx = self.cb_master.findText(master)
         if idx != -1:
             self.cb_master.setCurrentIndex(idx)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
             return True
 
         return False
@@ -519,7 +519,7 @@ class PlayblastClass(object):
         idx = self.cb_location.findText(location)
         if idx != -1:
             self.cb_location.setCurrentIndex(idx)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
             return True
 
         return False
@@ -697,7 +697,7 @@ class PlayblastClass(object):
         self.core.saveVersionInfo(filepath=outputPath, details=details)
 
         self.updateLastPath(outputName)
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
         hou.hipFile.save()
 
@@ -962,9 +962,28 @@ class PlayblastClass(object):
             return
 
         elif masterAction == "Set as master":
-            self.core.mediaProducts.updateMasterVersion(outputName, mediaType="playblasts")
+            self.stateManager.runPublishTask(
+                self.core.mediaProducts.updateMasterVersion,
+                args=[outputName],
+                kwargs={"mediaType": "playblasts"},
+                name="updateMasterVersion",
+                state=self,
+                inputs=[outputName],
+                outputs=[
+                    self.stateManager.getMasterTaskKey(
+                        outputName, media=True, mediaType="playblasts"
+                    )
+                ],
+            )
         elif masterAction == "Add to master":
-            self.core.mediaProducts.addToMasterVersion(outputName)
+            self.stateManager.runPublishTask(
+                self.core.mediaProducts.addToMasterVersion,
+                args=[outputName],
+                name="addToMasterVersion",
+                state=self,
+                inputs=[outputName],
+                outputs=[self.stateManager.getMasterTaskKey(outputName, media=True)],
+            )
 
     @err_catcher(name=__name__)
     def getStateProps(self):
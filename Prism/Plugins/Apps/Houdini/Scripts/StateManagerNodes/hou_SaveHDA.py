@@ -320,7 +320,7 @@ class SaveHDAClass(hou_Export.ExportClass):
             self.node.setUserData("PrismPath", self.nodePath)
             self.nameChanged(self.e_name.text())
             self.updateUi()
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
             return True
 
         return False
@@ -427,7 +427,7 @@ class SaveHDAClass(hou_Export.ExportClass):
         self.l_pathLast.setText(outputName)
         self.l_pathLast.setToolTip(outputName)
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
         hou.hipFile.save()
 
         version = int(hVersion[1:]) if hVersion else None
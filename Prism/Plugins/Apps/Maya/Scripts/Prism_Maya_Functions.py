@@ -3093,6 +3093,10 @@ Show only polygon objects and image planes in viewport.
         if not self.core.smCallbacksRegistered:
             import maya.OpenMaya as api
 
+            preSaveCallback = api.MSceneMessage.addCallback(
+                api.MSceneMessage.kBeforeSave, self.core.scenefilePreSave
+            )
+
             saveCallback = api.MSceneMessage.addCallback(
                 api.MSceneMessage.kAfterSave, self.core.scenefileSaved
             )
@@ -136,7 +136,7 @@ class Prism_PluginEmpty_Functions(object):
                 origin.nodes.append(i)
 
         origin.updateUi()
-        origin.stateManager.saveStatesToScene()
+        origin.stateManager.saveStatesToScene(state=origin)
 
     @err_catcher(name=__name__)
     def getNodeName(self, origin, node):
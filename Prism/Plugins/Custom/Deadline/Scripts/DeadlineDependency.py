@@ -53,6 +53,29 @@ def splitext(path):
         return os.path.splitext(path)
 
 
+def getFramePath(depPath, depExt, frame, offset):
+    return depPath[:-4] + format(frame + int(offset), "04") + depExt
+
+
+class FolderListing(object):
+    # lists every dependency folder only once per scan instead of checking
+    # each frame of each dependency separately
+    def __init__(self):
+        self.folders = {}
+
+    def exists(self, path):
+        folder, name = os.path.split(os.path.normpath(path))
+        if folder not in self.folders:
+            try:
+                entries = os.listdir(folder)
+            except OSError:
+                entries = []
+
+            self.folders[folder] = set(os.path.normcase(entry) for entry in entries)
+
+        return os.path.normcase(name) in self.folders[folder]
+
+
 def __main__(jobId, taskIds=None):
     job = RepositoryUtils.GetJob(jobId, True)
     jobTasks = RepositoryUtils.GetJobTasks(job, True)
@@ -63,6 +86,7 @@ def __main__(jobId, taskIds=None):
     ClientUtils.LogText("\nPrism - starting dependency scan for job %s" % jobId)
     ClientUtils.LogText("\nPrism - Dependency filepath: %s" % depfile)
 
+    listing = FolderListing()
     if not taskIds:
 
         if os.path.exists(depfile):
@@ -76,9 +100,7 @@ def __main__(jobId, taskIds=None):
                 offset = depData[i * 2]
                 depPath, depExt = splitext(depData[1 + (i * 2)])
                 for k in curFrames:
-                    if not os.path.exists(
-                        depPath[:-4] + format(k + int(offset), "04") + depExt
-                    ):
+                    if not listing.exists(getFramePath(depPath, depExt, k, offset)):
                         ClientUtils.LogText("\nPrism - " + str(jobId) + " not released")
                         return False
 
@@ -107,8 +129,8 @@ def __main__(jobId, taskIds=None):
                     offset = depData[i * 2]
                     depPath, depExt = splitext(depData[1 + (i * 2)])
                     for k in curFrames:
-                        filepath = depPath[:-4] + format(k + int(offset), "04") + depExt
-                        exists = os.path.exists(filepath)
+                        filepath = getFramePath(depPath, depExt, k, offset)
+                        exists = listing.exists(filepath)
                         ClientUtils.LogText("checking if file exists: %s - %s" % (filepath, exists))
                         if not exists:
                             release = False
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import logging
+
+from PrismUtils.Decorators import err_catcher as err_catcher
+
+
+logger = logging.getLogger(__name__)
+
+
+class FileDependencyScanner(object):
+    def __init__(self, plugin):
+        self.plugin = plugin
+        self.core = plugin.core
+        self.nodeTypes = []
+        self.resolvedTypes = None
+        self.cache = None
+        self.registerNodeType("file", "file", "input", category="Sop")
+        self.registerNodeType("file", "filename1", "input", category="Cop2")
+        self.registerNodeType("rop_dop", "dopoutput", "output")
+        self.registerNodeType("rop_comp", "copoutput", "output")
+        self.registerNodeType("rop_geometry", "sopoutput", "output")
+        self.registerNodeType("filecache", "file", "output")
+        self.registerNodeType("rop_alembic", "filename", "output")
+
+    @err_catcher(name=__name__)
+    def registerNodeType(self, typeName, parmName, depType, category=None):
+        # depType is "input" or "output". Without a category the node type
+        # gets looked up in all node type categories.
+        entry = {
+            "type": typeName,
+            "parm": parmName,
+            "depType": depType,
+            "category": category,
+        }
+        self.nodeTypes.append(entry)
+        self.resolvedTypes = None
+        self.cache = None
+        return entry
+
+    @err_catcher(name=__name__)
+    def unregisterNodeType(self, typeName, parmName=None):
+        self.nodeTypes = [
+            entry
+            for entry in self.nodeTypes
+            if entry["type"] != typeName or (parmName and entry["parm"] != parmName)
+        ]
+        self.resolvedTypes = None
+        self.cache = None
+
+    @err_catcher(name=__name__)
+    def getNodeTypes(self):
+        # the node types don't change during a session, so they get resolved
+        # once and their instances get queried directly instead of walking
+        # through all nodes of the scene
+        if self.resolvedTypes is not None:
+            return self.resolvedTypes
+
+        hou = self.plugin.hou
+        categories = hou.nodeTypeCategories()
+        self.resolvedTypes = []
+        for entry in self.nodeTypes:
+            if entry["category"]:
+                cats = [categories.get(entry["category"])]
+            else:
+                cats = list(categories.values())
+
+            for cat in cats:
+                nodeType = cat.nodeType(entry["type"]) if cat else None
+                if nodeType:
+                    self.resolvedTypes.append([entry, nodeType])
+
+        return self.resolvedTypes
+
+    @err_catcher(name=__name__)
+    def getDependencies(self, force=False):
+        nodeTypes = self.getNodeTypes()
+        instances = [
+            sorted(nodeType.instances(), key=lambda x: x.path())
+            for entry, nodeType in nodeTypes
+        ]
+        # renamed nodes and animated parms change the dependencies without
+        # changing the node instances
+        nodeStates = []
+        parms = []
+        for (entry, nodeType), nodes in zip(nodeTypes, instances):
+            for node in nodes:
+                parm = node.parm(entry["parm"])
+                keyCount = len(parm.keyframes()) if parm else None
+                nodeStates.append((node.sessionId(), node.path(), keyCount))
+                if parm and keyCount == 0:
+                    parms.append([parm, entry["depType"]])
+
+        signature = (self.plugin.hou.hipFile.path(), tuple(nodeStates))
+        if not force and self.cache and self.cache["signature"] == signature:
+            return self.cache["dependencies"]
+
+        deps = [{"parm": parm.path(), "type": depType} for parm, depType in parms]
+
+        logger.debug("found %s file dependencies" % len(deps))
+        self.cache = {"signature": signature, "dependencies": deps}
+        return deps
+
+    @err_catcher(name=__name__)
+    def clearCache(self):
+        self.cache = None
@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+import json
+import time
+import shutil
+import logging
+
+try:
+    import http.client as httplib
+    from urllib.parse import urlparse
+except ImportError:
+    import httplib
+    from urlparse import urlparse
+
+from PrismUtils.Decorators import err_catcher as err_catcher
+
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineSubmitter(object):
+    def __init__(self, plugin):
+        self.plugin = plugin
+        self.core = plugin.core
+        self.owner = None
+        self.batch = None
+        self.connections = {}
+
+    @err_catcher(name=__name__)
+    def isBatchingEnabled(self):
+        return os.getenv("PRISM_DEADLINE_BATCH_SUBMIT", "1") != "0"
+
+    @err_catcher(name=__name__)
+    def isBatching(self):
+        # only jobs submitted while the publishing StateManager executes a
+        # state get collected. Submissions outside of a publish are sent directly.
+        return bool(self.owner and getattr(self.owner, "curExecutedState", None))
+
+    @err_catcher(name=__name__)
+    def getWebServiceUrl(self):
+        return os.getenv("PRISM_DEADLINE_WEBSERVICE", "")
+
+    @err_catcher(name=__name__)
+    def startBatch(self, owner):
+        if self.batch:
+            self.flushBatch()
+
+        if not self.isBatchingEnabled():
+            return
+
+        self.owner = owner
+
+    @err_catcher(name=__name__)
+    def createBatch(self):
+        homeDir = self.plugin.getDeadlineHomeDir()
+        batchId = "%s_%s" % (int(time.time()), os.getpid())
+        self.batch = {
+            "id": batchId,
+            "folder": os.path.join(homeDir, "temp", "prism_batch_%s" % batchId),
+            "jobs": [],
+            "snapshots": {},
+        }
+
+    @err_catcher(name=__name__)
+    def queueJob(self, jobInfos, pluginInfos, arguments):
+        if not self.batch:
+            self.createBatch()
+
+        idx = len(self.batch["jobs"])
+        placeholder = "PrismBatch_%s_%s" % (self.batch["id"], idx)
+        job = {
+            "id": placeholder,
+            "idx": idx,
+            "jobInfos": dict(jobInfos),
+            "pluginInfos": dict(pluginInfos),
+            "arguments": arguments,
+            "auxFiles": self.snapshotAuxFiles(arguments[2:], idx),
+            "jobId": None,
+            "result": None,
+        }
+        self.batch["jobs"].append(job)
+        logger.debug("queued job for batch submission: %s" % placeholder)
+        return "Result=Success\nJobID=%s" % placeholder
+
+    @err_catcher(name=__name__)
+    def snapshotAuxFiles(self, files, idx):
+        # the submit functions reuse fixed file names in the Deadline temp folder
+        # and scenefiles can be saved again by later states, so every aux file
+        # is copied at queue time. Unchanged files are shared between jobs.
+        auxFiles = []
+        for path in files:
+            if not path or not os.path.isfile(path):
+                auxFiles.append(path)
+                continue
+
+            stat = os.stat(path)
+            key = (os.path.normpath(path), stat.st_mtime, stat.st_size)
+            if key in self.batch["snapshots"]:
+                auxFiles.append(self.batch["snapshots"][key])
+                continue
+
+            folder = os.path.join(self.batch["folder"], "%04d" % idx)
+            if not os.path.exists(folder):
+                os.makedirs(folder)
+
+            target = os.path.join(folder, os.path.basename(path))
+            shutil.copy2(path, target)
+            self.batch["snapshots"][key] = target
+            auxFiles.append(target)
+
+        return auxFiles
+
+    @err_catcher(name=__name__)
+    def getBatchDependencies(self, job):
+        deps = job["jobInfos"].get("JobDependencies") or ""
+        return [dep for dep in str(deps).split(",") if dep.startswith("PrismBatch_")]
+
+    @err_catcher(name=__name__)
+    def resolveDependencies(self, job, idMap):
+        deps = job["jobInfos"].get("JobDependencies")
+        if not deps:
+            return
+
+        deps = [idMap.get(dep, dep) for dep in str(deps).split(",")]
+        job["jobInfos"]["JobDependencies"] = ",".join(deps)
+
+    @err_catcher(name=__name__)
+    def flushBatch(self):
+        batch = self.batch
+        self.batch = None
+        self.owner = None
+        if not batch or not batch["jobs"]:
+            return []
+
+        logger.debug("submitting %s batched jobs" % len(batch["jobs"]))
+        try:
+            if self.getWebServiceUrl():
+                self.submitWebService(batch)
+            else:
+                self.submitDeadlineCommand(batch)
+        finally:
+            if os.path.exists(batch["folder"]):
+                shutil.rmtree(batch["folder"], ignore_errors=True)
+
+        return batch["jobs"]
+
+    @err_catcher(name=__name__)
+    def getReadyJobs(self, pending, idMap):
+        ready = []
+        for job in pending:
+            deps = self.getBatchDependencies(job)
+            failed = [dep for dep in deps if dep in idMap and not idMap[dep]]
+            if failed:
+                job["result"] = "Dependency submission failed: %s" % ", ".join(failed)
+                idMap[job["id"]] = None
+            elif all(dep in idMap for dep in deps):
+                ready.append(job)
+
+        return ready
+
+    @err_catcher(name=__name__)
+    def submitDeadlineCommand(self, batch):
+        # jobs are submitted in waves. Each wave contains all jobs whose batch
+        # dependencies already have a real job id and is sent in one process.
+        idMap = {}
+        pending = list(batch["jobs"])
+        while pending:
+            ready = self.getReadyJobs(pending, idMap)
+            pending = [job for job in pending if job not in ready and job["id"] not in idMap]
+            if not ready:
+                for job in pending:
+                    job["result"] = "Unresolved batch dependencies"
+
+                break
+
+            for job in ready:
+                self.resolveDependencies(job, idMap)
+                self.writeInfoFiles(batch, job)
+
+            if len(ready) > 1:
+                self.submitMultipleJobs(ready)
+
+            for job in ready:
+                if job["result"] is None:
+                    self.submitSingleJob(job)
+
+                job["jobId"] = self.plugin.getJobIdFromSubmitResult(job["result"])
+                idMap[job["id"]] = job["jobId"]
+
+    @err_catcher(name=__name__)
+    def writeInfoFiles(self, batch, job):
+        folder = os.path.join(batch["folder"], "%04d" % job["idx"])
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        job["jobInfoFile"] = os.path.join(folder, "job_info.job")
+        job["pluginInfoFile"] = os.path.join(folder, "plugin_info.job")
+        with open(job["jobInfoFile"], "w") as fileHandle:
+            for i in job["jobInfos"]:
+                fileHandle.write("%s=%s\n" % (i, job["jobInfos"][i]))
+
+        with open(job["pluginInfoFile"], "w") as fileHandle:
+            for i in job["pluginInfos"]:
+                fileHandle.write("%s=%s\n" % (i, job["pluginInfos"][i]))
+
+    @err_catcher(name=__name__)
+    def submitMultipleJobs(self, jobs):
+        arguments = ["-SubmitMultipleJobs"]
+        for job in jobs:
+            arguments += ["-job", job["jobInfoFile"], job["pluginInfoFile"]]
+            arguments += [aux for aux in job["auxFiles"] if aux]
+
+        output = self.plugin.CallDeadlineCommand(arguments)
+        if output is False:
+            for job in jobs:
+                job["result"] = "Execute Canceled: Deadline is not installed"
+
+            return
+
+        # every job prints its own "Result=" line, a job without a JobID in
+        # its section wasn't accepted and gets submitted again individually.
+        results = self.splitMultiJobOutput(output)
+        if len(results) == len(jobs):
+            for job, result in zip(jobs, results):
+                if self.plugin.getJobIdFromSubmitResult(result):
+                    job["result"] = result
+                else:
+                    logger.debug("job wasn't accepted in multi job submission: %s" % result)
+
+            return
+
+        if not self.plugin.getJobIdFromSubmitResult(output):
+            logger.debug("no job was accepted, submitting jobs individually: %s" % output)
+            return
+
+        # some jobs were accepted but can't be matched to the submitted jobs.
+        # Submitting them again would create duplicates on the farm.
+        logger.warning("unexpected multi job output: %s" % output)
+        for job in jobs:
+            job["result"] = "Unexpected output of the Deadline multi job submission. The job was not resubmitted."
+
+    @err_catcher(name=__name__)
+    def splitMultiJobOutput(self, output):
+        results = []
+        lines = []
+        hasResult = False
+        for line in output.replace("\r", "").split("\n"):
+            if line.startswith("Result="):
+                if hasResult:
+                    results.append("\n".join(lines))
+                    lines = []
+
+                hasResult = True
+
+            lines.append(line)
+
+        if hasResult:
+            results.append("\n".join(lines))
+
+        return results
+
+    @err_catcher(name=__name__)
+    def submitSingleJob(self, job):
+        arguments = [job["jobInfoFile"], job["pluginInfoFile"]]
+        arguments += [aux for aux in job["auxFiles"] if aux]
+        result = self.plugin.CallDeadlineCommand(arguments)
+        if result is False:
+            result = "Execute Canceled: Deadline is not installed"
+
+        job["result"] = result
+
+    @err_catcher(name=__name__)
+    def submitWebService(self, batch):
+        idMap = {}
+        for job in batch["jobs"]:
+            deps = self.getBatchDependencies(job)
+            failed = [dep for dep in deps if not idMap.get(dep)]
+            if failed:
+                job["result"] = "Dependency submission failed: %s" % ", ".join(failed)
+                idMap[job["id"]] = None
+                continue
+
+            self.resolveDependencies(job, idMap)
+            data = {
+                "JobInfo": job["jobInfos"],
+                "PluginInfo": job["pluginInfos"],
+                "AuxFiles": [aux for aux in job["auxFiles"] if aux],
+                "IdOnly": True,
+            }
+            try:
+                status, content = self.request("POST", "/api/jobs", data)
+            except Exception as e:
+                status, content = None, str(e)
+
+            if status == 200:
+                try:
+                    jobId = json.loads(content)["_id"]
+                except (ValueError, KeyError, TypeError):
+                    jobId = None
+            else:
+                jobId = None
+
+            if jobId:
+                job["result"] = "Result=Success\nJobID=%s" % jobId
+            else:
+                job["result"] = "Deadline Web Service error (%s): %s" % (status, content)
+
+            job["jobId"] = jobId
+            idMap[job["id"]] = jobId
+
+    @err_catcher(name=__name__)
+    def getConnection(self, url):
+        key = (url.scheme, url.netloc)
+        if key not in self.connections:
+            if url.scheme == "https":
+                self.connections[key] = httplib.HTTPSConnection(url.netloc, timeout=30)
+            else:
+                self.connections[key] = httplib.HTTPConnection(url.netloc, timeout=30)
+
+        return self.connections[key]
+
+    @err_catcher(name=__name__)
+    def request(self, method, path, data=None):
+        url = urlparse(self.getWebServiceUrl())
+        body = json.dumps(data) if data is not None else None
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        for attempt in range(2):
+            connection = self.getConnection(url)
+            try:
+                connection.request(
+                    method, url.path.rstrip("/") + path, body=body, headers=headers
+                )
+                response = connection.getresponse()
+                content = response.read()
+            except (httplib.HTTPException, OSError):
+                # the server closed the kept-alive connection, reconnect once
+                connection.close()
+                self.connections.pop((url.scheme, url.netloc), None)
+                if attempt:
+                    raise
+
+                continue
+
+            if isinstance(content, bytes):
+                content = content.decode("utf-8", "replace")
+
+            return response.status, content
+
+    @err_catcher(name=__name__)
+    def close(self):
+        for connection in self.connections.values():
+            connection.close()
+
+        self.connections = {}
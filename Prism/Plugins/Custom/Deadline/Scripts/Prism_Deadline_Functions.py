@@ -44,6 +44,9 @@ from qtpy.QtGui import *
 from qtpy.QtWidgets import *
 
 from PrismUtils.Decorators import err_catcher as err_catcher
+from PrismUtils.FrameRanges import FrameRange
+from DeadlineSubmission import DeadlineSubmitter
+from DeadlineFileDependencies import FileDependencyScanner
 
 
 logger = logging.getLogger(__name__)
@@ -53,6 +56,10 @@ class Prism_Deadline_Functions(object):
     def __init__(self, core, plugin):
         self.core = core
         self.plugin = plugin
+        self.deadlineCommand = None
+        self.deadlineHomeDir = None
+        self.submitter = DeadlineSubmitter(self)
+        self.fileDependencies = FileDependencyScanner(self)
         if self.core.appPlugin.pluginName == "Houdini":
             self.hou = importlib.import_module("hou")
 
@@ -117,6 +124,14 @@ template = base + "_@product@@identifier@_@version@"]"""
         self.core.plugins.unregisterRenderfarmPlugin(self)
 
     def GetDeadlineCommand(self):
+        if self.deadlineCommand:
+            return self.deadlineCommand
+
+        # allows to point Prism to a different executable, for example a test script
+        if os.getenv("PRISM_DEADLINE_COMMAND"):
+            self.deadlineCommand = os.getenv("PRISM_DEADLINE_COMMAND")
+            return self.deadlineCommand
+
         deadlineBin = ""
         try:
             deadlineBin = os.environ['DEADLINE_PATH']
@@ -130,9 +145,24 @@ template = base + "_@product@@identifier@_@version@"]"""
                 deadlineBin = f.read().strip()
 
         deadlineCommand = os.path.join(deadlineBin, "deadlinecommand")
-
+        self.deadlineCommand = deadlineCommand
         return deadlineCommand
 
+    @err_catcher(name=__name__)
+    def getDeadlineHomeDir(self):
+        if self.deadlineHomeDir:
+            return self.deadlineHomeDir
+
+        homeDir = self.CallDeadlineCommand(["-GetCurrentUserHomeDirectory"])
+        if homeDir is False:
+            return False
+
+        homeDir = homeDir.replace("\r", "").replace("\n", "")
+        if homeDir:
+            self.deadlineHomeDir = homeDir
+
+        return homeDir
+
     def CallDeadlineCommand(self, arguments, hideWindow=True, readStdout=True, silent=False):
         deadlineCommand = self.GetDeadlineCommand()
         startupinfo = None
@@ -325,12 +355,50 @@ template = base + "_@product@@identifier@_@version@"]"""
     def prePublish(self, origin):
         origin.submittedDlJobs = {}
         origin.submittedDlJobData = {}
+        self.submitter.startBatch(origin)
 
     @err_catcher(name=__name__)
     def postPublish(self, origin, pubType, result):
+        self.submitBatchedJobs(origin, result)
         origin.submittedDlJobs = {}
         origin.submittedDlJobData = {}
 
+    @err_catcher(name=__name__)
+    def submitBatchedJobs(self, origin, result=None):
+        jobs = self.submitter.flushBatch()
+        failedJobs = {}
+        for job in jobs:
+            jobResult = job["result"]
+            for line in jobResult.split("\n"):
+                if "Key-value pair not supported" in line:
+                    logger.debug("Deadline Submission Warning: %s" % line)
+
+            self.core.callback(
+                name="postSubmit_Deadline",
+                args=[self, jobResult, job["jobInfos"], job["pluginInfos"], job["arguments"]],
+            )
+            if not job["jobId"]:
+                failedJobs[job["id"]] = jobResult
+
+        if not failedJobs:
+            return
+
+        for stateId in getattr(origin, "submittedDlJobs", {}):
+            errors = [
+                failedJobs[jobId]
+                for jobId in origin.submittedDlJobs[stateId]
+                if jobId in failedJobs
+            ]
+            if not errors:
+                continue
+
+            for stateResult in result or []:
+                state = stateResult["state"]
+                if getattr(state, "uuid", None) != stateId or not stateResult["result"]:
+                    continue
+
+                stateResult["result"][0] = "%s - error - %s" % (state.state.text(0), errors[0])
+
     @err_catcher(name=__name__)
     def sm_updateDlDeps(self, origin, item, column):
         itemData = item.data(0, Qt.UserRole)
@@ -358,7 +426,7 @@ template = base + "_@product@@identifier@_@version@"]"""
                 origin.dependencies["Deadline"].append(itemData)
 
         origin.nameChanged(origin.e_name.text())
-        origin.stateManager.saveStatesToScene()
+        origin.stateManager.saveStatesToScene(state=origin)
 
     @err_catcher(name=__name__)
     def sm_dlGoToNode(self, item, column):
@@ -384,8 +452,11 @@ template = base + "_@product@@identifier@_@version@"]"""
         if curType in items:
             origin.cb_depType.setCurrentText(curType)
 
-        origin.tw_caches.clear()
         curType = origin.cb_depType.currentText()
+        if curType != "File Exists":
+            origin.tw_caches.clear()
+            origin.dlFileDeps = None
+
         if curType == "Job Completed":
             newActive = self.updateUiJobCompleted(origin)
         elif curType == "Frames Completed":
@@ -481,96 +552,26 @@ template = base + "_@product@@identifier@_@version@"]"""
     def updateUiFileExists(self, origin):
         origin.w_offset.setHidden(False)
         origin.tw_caches.setHeaderLabel("Nodes with filepath parms")
-        QTreeWidgetItem(origin.tw_caches, ["Import"])
-        QTreeWidgetItem(origin.tw_caches, ["Export"])
-
-        fileNodeList = []
-        copFileNodeList = []
-        ropDopNodeList = []
-        ropCopNodeList = []
-        ropSopNodeList = []
-        ropAbcNodeList = []
-        filecacheNodeList = []
-
-        for node in self.hou.node("/").allSubChildren():
-            if node.type().name() == "file":
-                if (
-                    node.type().category().name() == "Sop"
-                    and len(node.parm("file").keyframes()) == 0
-                ):
-                    fileNodeList.append(node)
-                elif (
-                    node.type().category().name() == "Cop2"
-                    and len(node.parm("filename1").keyframes()) == 0
-                ):
-                    copFileNodeList.append(node)
-            elif (
-                node.type().name() == "rop_dop"
-                and len(node.parm("dopoutput").keyframes()) == 0
-            ):
-                ropDopNodeList.append(node)
-            elif (
-                node.type().name() == "rop_comp"
-                and len(node.parm("copoutput").keyframes()) == 0
-            ):
-                ropCopNodeList.append(node)
-            elif (
-                node.type().name() == "rop_geometry"
-                and len(node.parm("sopoutput").keyframes()) == 0
-            ):
-                ropSopNodeList.append(node)
-            elif (
-                node.type().name() == "rop_alembic"
-                and len(node.parm("filename").keyframes()) == 0
-            ):
-                ropAbcNodeList.append(node)
-            elif (
-                node.type().name() == "filecache"
-                and len(node.parm("file").keyframes()) == 0
-            ):
-                filecacheNodeList.append(node)
-
-        deps = []
-
-        for node in fileNodeList:
-            data = {"parm": node.parm("file").path(), "type": "input"}
-            deps.append(data)
-
-        for node in copFileNodeList:
-            data = {"parm": node.parm("filename1").path(), "type": "input"}
-            deps.append(data)
-
-        for node in ropDopNodeList:
-            data = {"parm": node.parm("dopoutput").path(), "type": "output"}
-            deps.append(data)
-
-        for node in ropCopNodeList:
-            data = {"parm": node.parm("copoutput").path(), "type": "output"}
-            deps.append(data)
-
-        for node in ropSopNodeList:
-            data = {"parm": node.parm("sopoutput").path(), "type": "output"}
-            deps.append(data)
-
-        for node in filecacheNodeList:
-            data = {"parm": node.parm("file").path(), "type": "output"}
-            deps.append(data)
-
-        for node in ropAbcNodeList:
-            data = {"parm": node.parm("filename").path(), "type": "output"}
-            deps.append(data)
 
-        for dep in deps:
-            nodepath = os.path.dirname(dep["parm"])
-            itemName = os.path.basename(os.path.dirname(nodepath)) + "/" + os.path.basename(nodepath)
-            if dep["type"] == "input":
-                parent = origin.tw_caches.topLevelItem(0)
-            else:
-                parent = origin.tw_caches.topLevelItem(1)
+        # the items only get recreated when the nodes in the scene changed
+        deps = self.fileDependencies.getDependencies()
+        if deps != getattr(origin, "dlFileDeps", None):
+            origin.tw_caches.clear()
+            origin.dlFileDeps = list(deps)
+            QTreeWidgetItem(origin.tw_caches, ["Import"])
+            QTreeWidgetItem(origin.tw_caches, ["Export"])
+
+            for dep in deps:
+                nodepath = os.path.dirname(dep["parm"])
+                itemName = os.path.basename(os.path.dirname(nodepath)) + "/" + os.path.basename(nodepath)
+                if dep["type"] == "input":
+                    parent = origin.tw_caches.topLevelItem(0)
+                else:
+                    parent = origin.tw_caches.topLevelItem(1)
 
-            item = QTreeWidgetItem(parent, [itemName])
-            item.setData(0, Qt.UserRole, dep)
-            item.setToolTip(0, self.hou.parm(dep["parm"]).unexpandedString() + "\n" + dep["parm"])
+                item = QTreeWidgetItem(parent, [itemName])
+                item.setData(0, Qt.UserRole, dep)
+                item.setToolTip(0, self.hou.parm(dep["parm"]).unexpandedString() + "\n" + dep["parm"])
 
         items = []
         for i in range(origin.tw_caches.topLevelItemCount()):
@@ -579,11 +580,11 @@ template = base + "_@product@@identifier@_@version@"]"""
                 items.append(origin.tw_caches.topLevelItem(i).child(k))
 
         newActive = []
+        deppaths = [
+           dep["parm"] for dep in origin.dependencies.get("Deadline", []) if isinstance(dep, dict)
+        ]
         for item in items:
             data = item.data(0, Qt.UserRole)
-            deppaths = [
-               dep["parm"] for dep in origin.dependencies.get("Deadline", []) if isinstance(dep, dict)
-            ]
             if data["parm"] in deppaths:
                 item.setCheckState(0, Qt.Checked)
                 newActive.append(data)
@@ -671,8 +672,8 @@ template = base + "_@product@@identifier@_@version@"]"""
                     state.lo_tileJob.addWidget(state.chb_tileJob)
                     state.lo_tileJob.addWidget(state.cb_tileJob)
                     state.chb_tileJob.toggled.connect(lambda s: state.cb_tileJob.setEnabled(s))
-                    state.chb_tileJob.toggled.connect(lambda s: state.stateManager.saveStatesToScene())
-                    state.cb_tileJob.activated.connect(lambda s: state.stateManager.saveStatesToScene())
+                    state.chb_tileJob.toggled.connect(lambda s: state.stateManager.saveStatesToScene(state=state))
+                    state.cb_tileJob.activated.connect(lambda s: state.stateManager.saveStatesToScene(state=state))
                     lo.addWidget(state.w_tileJob)
 
                 state.w_machineLimit = QWidget()
@@ -823,7 +824,7 @@ template = base + "_@product@@identifier@_@version@"]"""
             if idx != -1:
                 state.cb_dlGroup.setCurrentIndex(idx)
 
-        state.stateManager.saveStatesToScene()
+        state.stateManager.saveStatesToScene(state=state)
 
     @err_catcher(name=__name__)
     def showHighPrioJobPresets(self, state):
@@ -965,6 +966,8 @@ template = base + "_@product@@identifier@_@version@"]"""
             origin.f_osPAssets.setVisible(False)
 
         origin.w_dlConcurrentTasks.setVisible(True)
+        for widget in [origin.w_dlPool, origin.w_sndPool, origin.w_dlGroup, origin.w_dlPreset]:
+            widget.setHidden(False)
 
         presets = self.getDeadlinePoolPresets()
         if presets:
@@ -1054,15 +1057,10 @@ template = base + "_@product@@identifier@_@version@"]"""
         if self.core.appPlugin.pluginName == "Houdini":
             jobOutputFile = self.processHoudiniPath(origin, jobOutputFile)
 
-        homeDir = (
-            self.CallDeadlineCommand(["-GetCurrentUserHomeDirectory"])
-        )
-
+        homeDir = self.getDeadlineHomeDir()
         if homeDir is False:
             return "Execute Canceled: Deadline is not installed"
 
-        homeDir = homeDir.replace("\r", "").replace("\n", "")
-
         if parent:
             dependencies = parent.dependencies
         else:
@@ -1076,14 +1074,14 @@ template = base + "_@product@@identifier@_@version@"]"""
 
         jobName = self.getJobName(details, origin)
         rangeType = origin.cb_rangeType.currentText()
-        frameRange = origin.getFrameRange(rangeType)
         if rangeType != "Expression":
-            startFrame, endFrame = frameRange
+            startFrame, endFrame = origin.getFrameRange(rangeType)
             if rangeType == "Single Frame":
                 endFrame = startFrame
             frameStr = "%s-%s" % (int(startFrame), int(endFrame))
         else:
-            frameStr = ",".join([str(x) for x in frameRange])
+            # the resolved frame list of the state is capped
+            frameStr = FrameRange.fromExpression(origin.le_frameExpression.text()).toString()
 
         if isSecondJob:
             jobPrio = prio
@@ -1098,15 +1096,15 @@ template = base + "_@product@@identifier@_@version@"]"""
                 renderSecondJob = True
                 sndPrio = origin.sp_highPrio.value()
 
-                resolvedFrames = self.core.resolveFrameExpression(frameStr)
-                first = resolvedFrames[0]
-                middle = resolvedFrames[int((len(resolvedFrames) - 1)/2)]
-                last = resolvedFrames[-1]
+                resolvedFrames = FrameRange.fromExpression(frameStr)
                 sndFrames = origin.e_highPrioFrames.text()
-
-                sndFrames = sndFrames.format(first=first, middle=middle, last=last)
-                sndResolved = self.core.resolveFrameExpression(sndFrames)
-                frameStr = ",".join([str(f) for f in resolvedFrames if int(f) not in sndResolved])
+                sndFrames = sndFrames.format(
+                    first=resolvedFrames.first(),
+                    middle=resolvedFrames.middle(),
+                    last=resolvedFrames.last(),
+                )
+                sndResolved = FrameRange.fromExpression(sndFrames)
+                frameStr = resolvedFrames.difference(sndResolved).toString()
                 result = self.sm_render_submitJob(
                     origin,
                     jobOutputFileOrig,
@@ -1165,7 +1163,7 @@ template = base + "_@product@@identifier@_@version@"]"""
         jobInfos["TaskTimeoutMinutes"] = jobTimeOut
         jobInfos["MachineLimit"] = jobMachineLimit
         jobInfos["Frames"] = frameStr
-        jobInfos["ChunkSize"] = jobFramesPerTask
+        jobInfos["ChunkSize"] = self.getBalancedChunkSize(frameStr, jobFramesPerTask)
         jobInfos["OutputFilename0"] = jobOutputFile
         self.addEnvironmentItem(jobInfos, "prism_project", self.core.prismIni.replace("\\", "/"))
         self.addEnvironmentItem(jobInfos, "prism_source_scene", self.core.getCurrentFileName())
@@ -1352,6 +1350,18 @@ template = base + "_@product@@identifier@_@version@"]"""
 
         return result
 
+    @err_catcher(name=__name__)
+    def getBalancedChunkSize(self, frameStr, chunkSize):
+        # keeps the task count of the chunk size, but spreads the frames evenly
+        # so the last task doesn't end up with a few leftover frames
+        length = len(FrameRange.fromExpression(frameStr))
+        chunkSize = max(1, int(chunkSize))
+        if not length:
+            return chunkSize
+
+        taskCount = -(-length // chunkSize)
+        return -(-length // taskCount)
+
     @err_catcher(name=__name__)
     def registerSubmittedJob(self, state, submitResult, data=None):
         jobId = self.getJobIdFromSubmitResult(submitResult)
@@ -1670,15 +1680,10 @@ path = r\"%s\"
         args=None,
         state=None,
     ):
-        homeDir = (
-            self.CallDeadlineCommand(["-GetCurrentUserHomeDirectory"])
-        )
-
+        homeDir = self.getDeadlineHomeDir()
         if homeDir is False:
             return "Execute Canceled: Deadline is not installed"
 
-        homeDir = homeDir.replace("\r", "").replace("\n", "")
-
         if not jobName:
             jobName = os.path.splitext(self.core.getCurrentFileName(path=False))[
                 0
@@ -1821,15 +1826,10 @@ path = r\"%s\"
         resY=1080,
         startFrame=1,
     ):
-        homeDir = (
-            self.CallDeadlineCommand(["-GetCurrentUserHomeDirectory"])
-        )
-
+        homeDir = self.getDeadlineHomeDir()
         if homeDir is False:
             return "Execute Canceled: Deadline is not installed"
 
-        homeDir = homeDir.replace("\r", "").replace("\n", "")
-
         if not jobName:
             jobName = os.path.splitext(self.core.getCurrentFileName(path=False))[
                 0
@@ -1993,15 +1993,10 @@ path = r\"%s\"
         cleanupScript=None,
         state=None,
     ):
-        homeDir = (
-            self.CallDeadlineCommand(["-GetCurrentUserHomeDirectory"])
-        )
-
+        homeDir = self.getDeadlineHomeDir()
         if homeDir is False:
             return "Execute Canceled: Deadline is not installed"
 
-        homeDir = homeDir.replace("\r", "").replace("\n", "")
-
         if not jobName:
             jobName = os.path.splitext(self.core.getCurrentFileName(path=False))[
                 0
@@ -2158,15 +2153,10 @@ path = r\"%s\"
         cleanupScript=None,
         state=None,
     ):
-        homeDir = (
-            self.CallDeadlineCommand(["-GetCurrentUserHomeDirectory"])
-        )
-
+        homeDir = self.getDeadlineHomeDir()
         if homeDir is False:
             return "Execute Canceled: Deadline is not installed"
 
-        homeDir = homeDir.replace("\r", "").replace("\n", "")
-
         if not jobName:
             jobName = os.path.splitext(self.core.getCurrentFileName(path=False))[
                 0
@@ -2322,15 +2312,10 @@ path = r\"%s\"
         cleanupScript=None,
         state=None,
     ):
-        homeDir = (
-            self.CallDeadlineCommand(["-GetCurrentUserHomeDirectory"])
-        )
-
+        homeDir = self.getDeadlineHomeDir()
         if homeDir is False:
             return "Execute Canceled: Deadline is not installed"
 
-        homeDir = homeDir.replace("\r", "").replace("\n", "")
-
         if not jobName:
             jobName = os.path.splitext(self.core.getCurrentFileName(path=False))[
                 0
@@ -2514,6 +2499,9 @@ path = r\"%s\"
             args=[self, jobInfos, pluginInfos, arguments],
         )
 
+        if self.submitter.isBatching():
+            return self.submitter.queueJob(jobInfos, pluginInfos, arguments)
+
         with open(arguments[0], "w") as fileHandle:
             for i in jobInfos:
                 fileHandle.write("%s=%s\n" % (i, jobInfos[i]))
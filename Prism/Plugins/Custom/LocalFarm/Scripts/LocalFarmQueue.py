@@ -0,0 +1,384 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+import time
+import uuid
+import heapq
+import itertools
+import logging
+import threading
+import subprocess
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PrismUtils.Decorators import err_catcher as err_catcher
+from PrismUtils.FrameRanges import FrameRange
+
+
+logger = logging.getLogger(__name__)
+
+
+class LocalFarmQueue(object):
+    def __init__(self, plugin, maxWorkers=None):
+        self.plugin = plugin
+        self.core = plugin.core
+        self.maxWorkers = maxWorkers or self.getDefaultWorkerCount()
+        self.executor = None
+        self.lock = threading.RLock()
+        self.jobs = OrderedDict()
+        self.processes = {}
+        self.readyTasks = []
+        self.taskCounter = itertools.count()
+        self.runningTasks = 0
+
+    @err_catcher(name=__name__)
+    def getDefaultWorkerCount(self):
+        workers = os.getenv("PRISM_LOCAL_FARM_WORKERS")
+        if workers:
+            return max(1, int(workers))
+
+        return os.cpu_count() or 1
+
+    @err_catcher(name=__name__)
+    def getExecutor(self):
+        if not self.executor:
+            self.executor = ThreadPoolExecutor(max_workers=self.maxWorkers)
+
+        return self.executor
+
+    @err_catcher(name=__name__)
+    def getRootFolder(self):
+        return os.getenv("PRISM_LOCAL_FARM_ROOT") or os.path.join(
+            self.core.getUserPrefDir(), "LocalFarm"
+        )
+
+    @err_catcher(name=__name__)
+    def getJobFolder(self, jobId):
+        return os.path.join(self.getRootFolder(), "Jobs", jobId)
+
+    @err_catcher(name=__name__)
+    def submit(self, jobData):
+        if not jobData.get("command") and not jobData.get("code"):
+            logger.warning("the job %s has no command or code" % jobData.get("name"))
+            return
+
+        frames = str(jobData.get("frames") or "1")
+        chunks = FrameRange.fromExpression(frames).getChunks(jobData.get("chunkSize") or 1)
+        if not chunks:
+            logger.warning(
+                "the job %s has no frames to render: %s" % (jobData.get("name"), frames)
+            )
+            return
+
+        jobId = "%s_%s" % (time.strftime("%Y%m%d_%H%M%S"), uuid.uuid4().hex[:8])
+        folder = self.getJobFolder(jobId)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        job = {
+            "id": jobId,
+            "name": jobData.get("name") or jobId,
+            "folder": folder,
+            "command": list(jobData.get("command") or []),
+            "script": None,
+            "args": [str(arg) for arg in jobData.get("args") or []],
+            "frames": frames,
+            "dependencies": list(jobData.get("dependencies") or []),
+            "environment": dict(jobData.get("environment") or {}),
+            "priority": int(jobData.get("priority", 50)),
+            "timeout": jobData.get("timeout"),
+            "output": jobData.get("output"),
+            "submitted": time.time(),
+            "canceled": False,
+            "tasks": [],
+        }
+        if jobData.get("code"):
+            job["script"] = os.path.join(folder, "job.py")
+            with open(job["script"], "w") as f:
+                f.write(jobData["code"])
+
+        for idx, chunk in enumerate(chunks):
+            task = {
+                "index": idx,
+                "frames": chunk.toString(),
+                "status": "queued",
+                "log": os.path.join(folder, "task_%04d.log" % idx),
+                "returncode": None,
+                "started": None,
+                "duration": None,
+            }
+            job["tasks"].append(task)
+
+        self.core.configs.writeJson(
+            {key: val for key, val in job.items() if key != "tasks"},
+            path=os.path.join(folder, "job.json"),
+            quiet=True,
+        )
+        with self.lock:
+            self.jobs[jobId] = job
+
+        logger.debug("submitted local job %s with %s tasks" % (jobId, len(job["tasks"])))
+        self.scheduleTasks()
+        return jobId
+
+    @err_catcher(name=__name__)
+    def getJob(self, jobId):
+        return self.jobs.get(jobId)
+
+    @err_catcher(name=__name__)
+    def getJobStatus(self, jobId):
+        job = self.jobs.get(jobId)
+        if not job:
+            return
+
+        with self.lock:
+            states = [task["status"] for task in job["tasks"]]
+
+        if job["canceled"] or (states and all(status == "canceled" for status in states)):
+            return "canceled"
+        elif "failed" in states:
+            return "failed"
+        elif all(status == "completed" for status in states):
+            return "completed"
+        elif any(status != "queued" for status in states):
+            return "active"
+        else:
+            return "queued"
+
+    @err_catcher(name=__name__)
+    def cancelJob(self, jobId):
+        job = self.jobs.get(jobId)
+        if not job:
+            return False
+
+        with self.lock:
+            job["canceled"] = True
+            for task in job["tasks"]:
+                if task["status"] in ["queued", "pending"]:
+                    task["status"] = "canceled"
+
+                process = self.processes.get((jobId, task["index"]))
+                if process and process.poll() is None:
+                    process.terminate()
+
+        self.scheduleTasks()
+        return True
+
+    @err_catcher(name=__name__)
+    def getDependencyState(self, job):
+        # returns "ready", "waiting" or "failed"
+        for depId in job["dependencies"]:
+            status = self.getJobStatus(depId)
+            if status in ["failed", "canceled"]:
+                return "failed"
+            elif status not in ["completed", None]:
+                return "waiting"
+
+        return "ready"
+
+    @err_catcher(name=__name__)
+    def scheduleTasks(self):
+        # called after every submission and finished task. Ready tasks get
+        # added to a priority queue, tasks of jobs with unfinished
+        # dependencies wait until they get scheduled by a later call.
+        with self.lock:
+            canceledJob = True
+            while canceledJob:
+                # jobs with a failed dependency get canceled, which fails
+                # their own dependents in the next pass
+                canceledJob = False
+                for job in self.jobs.values():
+                    if job["canceled"]:
+                        continue
+
+                    queued = [task for task in job["tasks"] if task["status"] == "queued"]
+                    if not queued:
+                        continue
+
+                    depState = self.getDependencyState(job)
+                    if depState == "waiting":
+                        continue
+                    elif depState == "failed":
+                        logger.debug("canceling local job %s, a dependency failed" % job["name"])
+                        job["canceled"] = True
+                        canceledJob = True
+                        for task in queued:
+                            task["status"] = "canceled"
+
+                        continue
+
+                    for task in queued:
+                        task["status"] = "pending"
+                        key = (-job["priority"], job["submitted"], next(self.taskCounter))
+                        heapq.heappush(self.readyTasks, (key, job, task))
+
+            self.dispatchTasks()
+
+    def dispatchTasks(self):
+        # only as many tasks as there are workers get passed to the executor,
+        # so tasks of higher priority jobs, which get submitted later, still
+        # start before the remaining tasks of lower priority jobs
+        with self.lock:
+            while self.readyTasks and self.runningTasks < self.maxWorkers:
+                key, job, task = heapq.heappop(self.readyTasks)
+                if task["status"] != "pending":
+                    continue
+
+                self.runningTasks += 1
+                self.getExecutor().submit(self.executeTask, job, task)
+
+    def executeTask(self, job, task):
+        # executed in worker threads
+        try:
+            self.runTask(job, task)
+        finally:
+            with self.lock:
+                self.runningTasks -= 1
+
+            self.scheduleTasks()
+
+    def runTask(self, job, task):
+        with self.lock:
+            if job["canceled"]:
+                task["status"] = "canceled"
+                return
+
+            task["status"] = "active"
+            task["started"] = time.time()
+
+        env = os.environ.copy()
+        env.update({str(key): str(val) for key, val in job["environment"].items()})
+        try:
+            with open(task["log"], "w") as log:
+                returncode = 0
+                for start, end in self.getFrameRuns(task["frames"]):
+                    log.write("Prism - rendering frames %s-%s\n" % (start, end))
+                    log.flush()
+                    returncode = self.runProcess(job, task, start, end, env, log)
+                    if returncode != 0:
+                        break
+        except Exception as e:
+            logger.warning("local job task failed: %s" % e)
+            returncode = -1
+
+        with self.lock:
+            self.processes.pop((job["id"], task["index"]), None)
+            task["returncode"] = returncode
+            task["duration"] = time.time() - task["started"]
+            if job["canceled"]:
+                task["status"] = "canceled"
+            elif returncode == 0:
+                task["status"] = "completed"
+            else:
+                task["status"] = "failed"
+
+        logger.debug(
+            "local job %s task %s %s" % (job["name"], task["index"], task["status"])
+        )
+
+    def getFrameRuns(self, frames):
+        # a chunk can contain frame steps, so it gets rendered as consecutive runs
+        runs = []
+        for frame in FrameRange.fromExpression(frames):
+            if runs and frame == runs[-1][1] + 1:
+                runs[-1][1] = frame
+            else:
+                runs.append([frame, frame])
+
+        return runs
+
+    def getTaskCommand(self, job, start, end):
+        if job["script"]:
+            python = os.getenv("PRISM_LOCAL_FARM_PYTHON") or self.core.getPythonPath(
+                executable="python"
+            )
+            return [python, job["script"], str(start), str(end)] + job["args"]
+
+        tokens = {"<STARTFRAME>": str(start), "<ENDFRAME>": str(end)}
+        cmd = []
+        for arg in job["command"]:
+            arg = str(arg)
+            for token, value in tokens.items():
+                arg = arg.replace(token, value)
+
+            cmd.append(arg)
+
+        return cmd
+
+    def runProcess(self, job, task, start, end, env, log):
+        cmd = self.getTaskCommand(job, start, end)
+        log.write("Prism - command: %s\n" % subprocess.list2cmdline(cmd))
+        log.flush()
+        with self.lock:
+            if job["canceled"]:
+                return -1
+
+            process = subprocess.Popen(
+                cmd, stdout=log, stderr=subprocess.STDOUT, env=env, cwd=job["folder"]
+            )
+            self.processes[(job["id"], task["index"])] = process
+
+        timeout = job["timeout"]
+        try:
+            return process.wait(timeout=float(timeout) * 60 if timeout else None)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            log.write("Prism - task timed out after %s minutes\n" % timeout)
+            return -1
+
+    @err_catcher(name=__name__)
+    def getTaskLog(self, jobId, index):
+        job = self.jobs.get(jobId)
+        if not job or index >= len(job["tasks"]):
+            return
+
+        path = job["tasks"][index]["log"]
+        if not os.path.exists(path):
+            return ""
+
+        with open(path, "r") as f:
+            return f.read()
+
+    @err_catcher(name=__name__)
+    def shutdown(self):
+        for jobId in list(self.jobs):
+            if self.getJobStatus(jobId) in ["queued", "active"]:
+                self.cancelJob(jobId)
+
+        if self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import atexit
+import logging
+
+from PrismUtils.Decorators import err_catcher as err_catcher
+from PrismUtils.FrameRanges import FrameRange
+from PrismUtils.Renderfarm import RenderfarmBackend
+from LocalFarmQueue import LocalFarmQueue
+
+
+logger = logging.getLogger(__name__)
+
+
+class Prism_LocalFarm_Functions(RenderfarmBackend):
+    def __init__(self, core, plugin):
+        self.core = core
+        self.plugin = plugin
+        self.queue = LocalFarmQueue(self)
+        self.unsupportedWidgets = [
+            "w_dlPreset",
+            "w_dlPool",
+            "w_sndPool",
+            "w_dlGroup",
+            "w_dlConcurrentTasks",
+            "w_dlGPUpt",
+            "w_dlGPUdevices",
+            "w_redshift",
+            "f_osDependencies",
+            "f_osUpload",
+            "f_osPAssets",
+            "gb_osSlaves",
+        ]
+        if self.isEnabled():
+            self.core.plugins.registerRenderfarmPlugin(self)
+
+        self.core.registerCallback("prePublish", self.prePublish, plugin=self.plugin)
+        atexit.register(self.queue.shutdown)
+
+    # if returns true, the plugin will be loaded by Prism
+    @err_catcher(name=__name__)
+    def isActive(self):
+        return True
+
+    @err_catcher(name=__name__)
+    def isEnabled(self):
+        # the local farm replaces the farm submission in the states, so it
+        # has to be enabled explicitly
+        if os.getenv("PRISM_LOCAL_FARM") is not None:
+            return os.getenv("PRISM_LOCAL_FARM") == "1"
+
+        return bool(self.core.getConfig("localFarm", "enabled", dft=False))
+
+    @err_catcher(name=__name__)
+    def prePublish(self, origin):
+        origin.submittedDlJobs = {}
+        origin.submittedDlJobData = {}
+
+    @err_catcher(name=__name__)
+    def submitJob(self, job):
+        return self.queue.submit(job)
+
+    @err_catcher(name=__name__)
+    def getJobStatus(self, jobId):
+        return self.queue.getJobStatus(jobId)
+
+    @err_catcher(name=__name__)
+    def cancelJob(self, jobId):
+        return self.queue.cancelJob(jobId)
+
+    @err_catcher(name=__name__)
+    def getJobs(self):
+        return list(self.queue.jobs.values())
+
+    @err_catcher(name=__name__)
+    def getTaskLog(self, jobId, taskIndex):
+        return self.queue.getTaskLog(jobId, taskIndex)
+
+    @err_catcher(name=__name__)
+    def getEnvironment(self, environment=None):
+        env = {}
+        if getattr(self.core, "prismIni", None):
+            env["prism_project"] = self.core.prismIni.replace("\\", "/")
+
+        if os.getenv("PRISM_LAUNCH_ENV"):
+            env.update(self.core.configs.readJson(data=os.getenv("PRISM_LAUNCH_ENV")))
+
+        for item in environment or []:
+            if isinstance(environment, dict):
+                env[item] = environment[item]
+            else:
+                env[item[0]] = item[1]
+
+        return env
+
+    @err_catcher(name=__name__)
+    def submitPythonJob(
+        self,
+        code="",
+        jobName=None,
+        jobOutput=None,
+        jobPrio=50,
+        jobTimeOut=None,
+        jobFramesPerTask=1,
+        frames="1",
+        dependencies=None,
+        jobDependencies=None,
+        environment=None,
+        args=None,
+        state=None,
+        **kwargs
+    ):
+        # accepts the arguments of the Deadline plugin, unsupported ones
+        # like pools are ignored
+        if not jobName:
+            jobName = os.path.splitext(self.core.getCurrentFileName(path=False))[
+                0
+            ].strip("_")
+
+        job = {
+            "name": jobName,
+            "code": code,
+            "args": args,
+            "frames": frames,
+            "chunkSize": jobFramesPerTask,
+            "dependencies": self.getJobDependencies(dependencies) + list(jobDependencies or []),
+            "environment": self.getEnvironment(environment),
+            "priority": jobPrio,
+            "timeout": jobTimeOut,
+            "output": jobOutput,
+        }
+        result = self.getSubmitResult(self.submitJob(job))
+        if state:
+            self.registerSubmittedJob(state, result, job)
+
+        return result
+
+    @err_catcher(name=__name__)
+    def submitCommandJob(
+        self,
+        command,
+        jobName=None,
+        jobOutput=None,
+        jobPrio=50,
+        jobTimeOut=None,
+        jobFramesPerTask=1,
+        frames="1",
+        dependencies=None,
+        jobDependencies=None,
+        environment=None,
+        state=None,
+    ):
+        job = {
+            "name": jobName or os.path.basename(command[0]),
+            "command": command,
+            "frames": frames,
+            "chunkSize": jobFramesPerTask,
+            "dependencies": self.getJobDependencies(dependencies) + list(jobDependencies or []),
+            "environment": self.getEnvironment(environment),
+            "priority": jobPrio,
+            "timeout": jobTimeOut,
+            "output": jobOutput,
+        }
+        result = self.getSubmitResult(self.submitJob(job))
+        if state:
+            self.registerSubmittedJob(state, result, job)
+
+        return result
+
+    @err_catcher(name=__name__)
+    def hideUnsupportedWidgets(self, origin):
+        for name in self.unsupportedWidgets:
+            widget = getattr(origin, name, None)
+            if widget:
+                widget.setHidden(True)
+
+    @err_catcher(name=__name__)
+    def sm_render_updateUI(self, origin):
+        self.hideUnsupportedWidgets(origin)
+
+    @err_catcher(name=__name__)
+    def sm_render_managerChanged(self, origin):
+        self.hideUnsupportedWidgets(origin)
+
+    @err_catcher(name=__name__)
+    def sm_houExport_activated(self, origin):
+        self.hideUnsupportedWidgets(origin)
+
+    @err_catcher(name=__name__)
+    def sm_houRender_updateUI(self, origin):
+        self.hideUnsupportedWidgets(origin)
+
+    @err_catcher(name=__name__)
+    def sm_houRender_managerChanged(self, origin):
+        self.hideUnsupportedWidgets(origin)
+
+    @err_catcher(name=__name__)
+    def sm_render_preExecute(self, origin):
+        warnings = []
+        if not hasattr(self.core.appPlugin, "sm_render_getLocalFarmCommand"):
+            warnings.append(
+                [
+                    "LocalFarm rendering is not supported in %s." % self.core.appPlugin.pluginName,
+                    "",
+                    3,
+                ]
+            )
+
+        return warnings
+
+    @err_catcher(name=__name__)
+    def sm_houRender_preExecute(self, origin):
+        return self.sm_render_preExecute(origin)
+
+    @err_catcher(name=__name__)
+    def sm_houExport_preExecute(self, origin):
+        return self.sm_render_preExecute(origin)
+
+    @err_catcher(name=__name__)
+    def sm_render_submitJob(
+        self,
+        origin,
+        jobOutputFile,
+        parent,
+        files=None,
+        isSecondJob=False,
+        prio=None,
+        frames=None,
+        handleMaster=False,
+        details=None,
+        allowCleanup=True,
+        jobnameSuffix=None,
+        useBatch=None,
+        sceneDescription=None,
+        skipSubmission=False,
+    ):
+        getCommand = getattr(self.core.appPlugin, "sm_render_getLocalFarmCommand", None)
+        if not getCommand:
+            return (
+                "Execute Canceled: LocalFarm rendering is not supported in %s"
+                % self.core.appPlugin.pluginName
+            )
+
+        scenefile = self.core.getCurrentFileName()
+        command = getCommand(origin, jobOutputFile, scenefile)
+        if not command:
+            return "Execute Canceled: Couldn't get the render command for the LocalFarm"
+
+        rangeType = origin.cb_rangeType.currentText()
+        frameRange = origin.getFrameRange(rangeType)
+        if rangeType != "Expression":
+            startFrame, endFrame = frameRange
+            if rangeType == "Single Frame":
+                endFrame = startFrame
+            frameStr = "%s-%s" % (int(startFrame), int(endFrame))
+        else:
+            frameStr = FrameRange.fromFrames(frameRange).toString()
+
+        jobName = "%s_%s" % (
+            os.path.splitext(self.core.getCurrentFileName(path=False))[0],
+            origin.state.text(0),
+        )
+        if jobnameSuffix:
+            jobName += jobnameSuffix
+
+        environment = {"prism_source_scene": scenefile}
+        result = self.submitCommandJob(
+            command,
+            jobName=jobName,
+            jobOutput=jobOutputFile,
+            jobPrio=origin.sp_rjPrio.value(),
+            jobTimeOut=origin.sp_rjTimeout.value(),
+            jobFramesPerTask=origin.sp_rjFramesPerTask.value(),
+            frames=frameStr,
+            dependencies=parent.dependencies if parent else None,
+            environment=environment,
+            state=origin,
+        )
+        jobId = self.getJobIdFromSubmitResult(result)
+        if jobId and handleMaster and not isSecondJob:
+            self.handleMaster(origin, handleMaster, jobId, jobOutputFile, jobName)
+
+        return result
+
+    @err_catcher(name=__name__)
+    def handleMaster(self, origin, masterType, jobId, jobOutputFile, jobName):
+        code = """
+import sys
+
+root = \"%s\"
+sys.path.append(root + "/Scripts")
+
+import PrismCore
+pcore = PrismCore.create(prismArgs=["noUI", "loadProject"])
+path = r\"%s\"
+""" % (self.core.prismRoot, jobOutputFile)
+
+        if masterType == "media":
+            masterAction = origin.cb_master.currentText()
+            if masterAction == "Set as master":
+                code += "pcore.mediaProducts.updateMasterVersion(path)"
+            elif masterAction == "Add to master":
+                code += "pcore.mediaProducts.addToMasterVersion(path)"
+        elif masterType == "product":
+            code += "pcore.products.updateMasterVersion(path)"
+
+        return self.submitPythonJob(
+            code=code,
+            jobName=jobName + "_updateMaster",
+            jobPrio=80,
+            frames="1",
+            jobDependencies=[jobId],
+            state=origin,
+        )
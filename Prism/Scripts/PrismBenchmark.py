@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+
+if sys.version[0] == "3":
+    sys.path.append(os.path.dirname(__file__))
+
+import PrismCore
+
+
+class ProjectGenerator(object):
+    def __init__(self, core, options):
+        self.core = core
+        self.options = options
+        self.shots = []
+        self.assets = []
+        self.products = []
+        self.media = []
+        self.versionInfos = []
+
+    def getVersionName(self, version):
+        return self.core.versionFormat % version
+
+    def writeFile(self, path, size=0):
+        folder = os.path.dirname(path)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        with open(path, "wb") as f:
+            f.write(b"\0" * size)
+
+    def writeVersionInfo(self, path, data):
+        infoPath = self.core.getVersioninfoPath(path)
+        data.update({
+            "user": "bench",
+            "username": "Benchmark",
+            "date": time.strftime("%d.%m.%y %X"),
+        })
+        self.core.setConfig(data=data, configPath=infoPath)
+        self.versionInfos.append(infoPath)
+
+    def generate(self):
+        opts = self.options
+        for seqIdx in range(opts.sequences):
+            sequence = "sq%03d" % ((seqIdx + 1) * 10)
+            for shotIdx in range(opts.shots):
+                entity = {"type": "shot", "sequence": sequence, "shot": "sh%03d" % ((shotIdx + 1) * 10)}
+                self.core.entities.createEntity(entity, frameRange=[1001, 1000 + opts.frames], silent=True)
+                self.shots.append(entity)
+
+        for assetIdx in range(opts.assets):
+            entity = {"type": "asset", "asset_path": "Characters/char%03d" % (assetIdx + 1)}
+            self.core.entities.createEntity(entity, silent=True)
+            self.assets.append(entity)
+
+        for entity in self.shots + self.assets:
+            self.generateEntity(entity)
+
+    def generateEntity(self, entity):
+        opts = self.options
+        if entity["type"] == "asset":
+            entity = dict(entity, asset=os.path.basename(entity["asset_path"]))
+
+        for version in range(1, opts.versions + 1):
+            versionName = self.getVersionName(version)
+            scenePath = self.core.generateScenePath(
+                entity, "Anm", task="animation", extension=".ma", version=versionName
+            )
+            self.writeFile(scenePath)
+            self.writeVersionInfo(scenePath, {"department": "Anm", "task": "animation", "version": versionName})
+
+            for productIdx in range(opts.products):
+                product = "product%02d" % (productIdx + 1)
+                productPath = self.core.products.generateProductPath(
+                    entity, product, extension=".abc", version=versionName, framePadding=""
+                )
+                self.writeFile(productPath, size=1024)
+                self.writeVersionInfo(os.path.dirname(productPath), {
+                    "product": product,
+                    "version": versionName,
+                    "sourceScene": scenePath,
+                    "dependencies": [],
+                    "externalFiles": [],
+                })
+                if version == 1:
+                    self.products.append(dict(entity, product=product))
+
+            for aovIdx in range(opts.aovs):
+                aov = "aov%02d" % (aovIdx + 1) if aovIdx else "beauty"
+                for frame in range(1001, 1001 + opts.frames):
+                    mediaPath = self.core.mediaProducts.generateMediaProductPath(
+                        entity,
+                        "main",
+                        ".exr",
+                        framePadding="%04d" % frame,
+                        version=versionName,
+                        aov=aov,
+                        mediaType="3drenders",
+                    )
+                    self.writeFile(mediaPath, size=256)
+
+                if aovIdx == 0:
+                    versionFolder = os.path.dirname(os.path.dirname(mediaPath))
+                    self.writeVersionInfo(versionFolder, {"identifier": "main", "version": versionName})
+
+            if version == 1:
+                self.media.append(dict(entity, identifier="main", mediaType="3drenders"))
+
+
+class SlowFilesystem(object):
+    functionNames = ["stat", "lstat", "listdir", "scandir"]
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.originals = {}
+
+    def wrap(self, func):
+        latency = self.latency
+
+        def wrapper(*args, **kwargs):
+            time.sleep(latency)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    def __enter__(self):
+        if not self.latency:
+            return self
+
+        for name in self.functionNames:
+            if hasattr(os, name):
+                self.originals[name] = getattr(os, name)
+                setattr(os, name, self.wrap(self.originals[name]))
+
+        return self
+
+    def __exit__(self, *args):
+        for name, func in self.originals.items():
+            setattr(os, name, func)
+
+        self.originals = {}
+
+
+class Benchmark(object):
+    def __init__(self, core, generator, options):
+        self.core = core
+        self.generator = generator
+        self.options = options
+
+    def clearCaches(self):
+        self.core.configs.clearCache()
+        self.core.mediaProducts.clearMediaFolderCache()
+
+    def getCases(self):
+        core = self.core
+        gen = self.generator
+        product = gen.products[0]
+        productVersions = core.products.getVersionsFromContext(product)
+        version = productVersions[0] if productVersions else product
+        template = core.projects.getResolvedProjectStructurePath("productVersions", context=dict(product))
+        infoPaths = gen.versionInfos[: self.options.configs]
+        cases = [
+            ("entities.getShots", lambda: core.entities.getShots()),
+            ("entities.getAssetPaths", lambda: core.entities.getAssetPaths()),
+            ("products.getVersionsFromContext", lambda: core.products.getVersionsFromContext(product)),
+            ("products.getPreferredFileFromVersion", lambda: core.products.getPreferredFileFromVersion(version)),
+            ("mediaProducts.getVersionsFromContext", lambda: core.mediaProducts.getVersionsFromContext(gen.media[0])),
+            ("projects.getMatchingPaths", lambda: core.projects.getMatchingPaths(template)),
+            ("configs.getConfig", lambda: [core.getConfig(configPath=path) for path in infoPaths]),
+        ]
+        return cases
+
+    def timeCall(self, func):
+        start = time.time()
+        result = func()
+        return time.time() - start, result
+
+    def run(self):
+        results = []
+        for name, func in self.getCases():
+            with SlowFilesystem(self.options.latency / 1000.0):
+                self.clearCaches()
+                cold, result = self.timeCall(func)
+                warm = [self.timeCall(func)[0] for _ in range(self.options.iterations)]
+
+            warm = sorted(warm)
+            results.append({
+                "name": name,
+                "cold": cold,
+                "warm": {
+                    "min": warm[0],
+                    "median": warm[len(warm) // 2],
+                    "mean": sum(warm) / len(warm),
+                },
+                "iterations": len(warm),
+                "count": len(result) if hasattr(result, "__len__") else None,
+            })
+            print("%-40s cold %8.4fs   warm %8.4fs" % (name, cold, warm[len(warm) // 2]))
+
+        return results
+
+
+def compareResults(results, baselinePath):
+    with open(baselinePath, "r") as f:
+        baseline = {data["name"]: data for data in json.load(f)["results"]}
+
+    print("\n%-40s %10s %10s" % ("comparison to %s" % os.path.basename(baselinePath), "cold", "warm"))
+    for data in results:
+        base = baseline.get(data["name"])
+        if not base:
+            continue
+
+        ratios = []
+        for cur, prev in [(data["cold"], base["cold"]), (data["warm"]["median"], base["warm"]["median"])]:
+            ratios.append("%9.2fx" % (cur / prev) if prev else "%10s" % "-")
+
+        print("%-40s %s %s" % (data["name"], ratios[0], ratios[1]))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic Prism project and time core API calls on it."
+    )
+    parser.add_argument("--path", default=None, help="folder in which the synthetic project gets created (default: temp folder)")
+    parser.add_argument("--keep", action="store_true", help="don't delete the generated project")
+    parser.add_argument("--sequences", type=int, default=3)
+    parser.add_argument("--shots", type=int, default=10, help="shots per sequence")
+    parser.add_argument("--assets", type=int, default=20)
+    parser.add_argument("--products", type=int, default=3, help="products per entity")
+    parser.add_argument("--versions", type=int, default=3, help="versions per scenefile, product and render")
+    parser.add_argument("--aovs", type=int, default=2)
+    parser.add_argument("--frames", type=int, default=10)
+    parser.add_argument("--configs", type=int, default=200, help="number of versioninfo files read by the config benchmark")
+    parser.add_argument("--iterations", type=int, default=5, help="number of warm runs per benchmark")
+    parser.add_argument("--latency", type=float, default=0, help="artificial latency in ms added to each stat/listdir/scandir call")
+    parser.add_argument("--output", default=None, help="write the results as json to this file")
+    parser.add_argument("--compare", default=None, help="compare the results to a previous json result file")
+    options = parser.parse_args(args)
+
+    pc = PrismCore.create(prismArgs=["noUI"])
+    root = options.path or tempfile.mkdtemp(prefix="prism_benchmark_")
+    projectPath = os.path.join(root, "BenchmarkProject")
+    if os.path.exists(projectPath):
+        print("The project folder exists already: %s" % projectPath)
+        return 1
+
+    start = time.time()
+    configPath = pc.projects.createProject("BenchmarkProject", projectPath)
+    if not configPath:
+        print("Couldn't create project: %s" % projectPath)
+        return 1
+
+    pc.changeProject(configPath)
+    generator = ProjectGenerator(pc, options)
+    generator.generate()
+    print("generated project in %.2fs: %s" % (time.time() - start, projectPath))
+
+    results = Benchmark(pc, generator, options).run()
+    data = {
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "prismVersion": pc.version,
+        "python": sys.version.split(" ")[0],
+        "platform": platform.platform(),
+        "options": vars(options),
+        "results": results,
+    }
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(data, f, indent=4)
+
+        print("results: %s" % options.output)
+
+    if options.compare:
+        compareResults(results, options.compare)
+
+    if not options.keep:
+        pc.changeProject(unset=True)
+        shutil.rmtree(projectPath, ignore_errors=True)
+        if not options.path:
+            shutil.rmtree(root, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
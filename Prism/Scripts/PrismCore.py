@@ -46,10 +46,10 @@ import subprocess
 import logging
 import tempfile
 import glob
+import threading
 import importlib
 import atexit
 from datetime import datetime
-from multiprocessing.connection import Listener, Client
 
 startEnv = os.environ.copy()
 
@@ -127,11 +127,13 @@ except:
         pass
 
 from PrismUtils.Decorators import err_catcher
+from PrismUtils.FrameRanges import FrameRange
 from PrismUtils import (
     Callbacks,
     ConfigManager,
+    DependencyIndex,
+    DiskUsage,
     Integration,
-    MediaManager,
     MediaProducts,
     PathManager,
     PluginManager,
@@ -139,7 +141,10 @@ from PrismUtils import (
     Products,
     ProjectEntities,
     Projects,
-    SanityChecks,
+    ProjectWatcher,
+    Retention,
+    StartupProfiler,
+    Tracing,
     Users,
 )
 
@@ -172,8 +177,7 @@ class PrismCore:
             self.requiredLibraries = "v2.0.0"
             self.core = self
             self.preferredExtension = os.getenv("PRISM_CONFIG_EXTENSION", ".json")
-
-            startTime = datetime.now()
+            self.startupProfiler = StartupProfiler.StartupProfiler(self)
 
             self.prismRoot = prismRoot.replace("\\", "/")
             self.prismLibs = prismLibs.replace("\\", "/")
@@ -211,6 +215,23 @@ class PrismCore:
 
             self.startEnv = startEnv
             self.uiAvailable = False if "noUI" in self.prismArgs else True
+            self.lazyManagers = {
+                "media": ("MediaManager", "MediaManager"),
+                "sanities": ("SanityChecks", "SanityChecks"),
+                "trayQueries": ("TrayQueries", "QueryClient"),
+                "journal": ("EventJournal", "EventJournal"),
+                "refreshScheduler": ("RefreshScheduler", "RefreshScheduler"),
+                "publishTimings": ("PublishTimings", "PublishTimings"),
+                "mediaIngest": ("MediaIngest", "MediaIngest"),
+                "searchIndex": ("SearchIndex", "SearchIndex"),
+            }
+            if not self.uiAvailable:
+                self.lazyManagers.update({
+                    "watcher": ("ProjectWatcher", "ProjectWatcher"),
+                    "retention": ("Retention", "Retention"),
+                    "diskUsage": ("DiskUsage", "DiskUsage"),
+                    "dependencyIndex": ("DependencyIndex", "DependencyIndex"),
+                })
 
             self.stateData = []
             self.prjHDAs = []
@@ -250,10 +271,11 @@ class PrismCore:
             self.activeStyleSheet = None
 
             # if no user ini exists, it will be created with default values
-            self.configs = ConfigManager.ConfigManager(self)
-            self.users = Users.Users(self)
-            if not os.path.exists(self.userini):
-                self.configs.createUserPrefs()
+            with self.startupProfiler.phase("configs"):
+                self.configs = ConfigManager.ConfigManager(self)
+                self.users = Users.Users(self)
+                if not os.path.exists(self.userini):
+                    self.configs.createUserPrefs()
 
             logging.basicConfig()
             debug = os.getenv("PRISM_DEBUG")
@@ -262,6 +284,9 @@ class PrismCore:
             else:
                 debug = debug.lower() in ["true", "1"]
             self.setDebugMode(debug)
+            if not Tracing.tracer.enabled and self.getConfig("globals", "tracing"):
+                Tracing.tracer.start()
+
             logger.debug("Initializing Prism %s - args: %s  - python: %s" % (self.version, self.prismArgs, sys.version.split(" (")[0]))
 
             self.useOnTop = self.getConfig("globals", "use_always_on_top")
@@ -271,26 +296,34 @@ class PrismCore:
             if sys.argv and sys.argv[-1] in ["setupStartMenu", "refreshIntegrations"]:
                 self.prismArgs.pop(self.prismArgs.index("loadProject"))
 
-            self.callbacks = Callbacks.Callbacks(self)
-            self.users.refreshEnvironment()
-            self.projects = Projects.Projects(self)
-            self.plugins = PluginManager.PluginManager(self)
-            self.paths = PathManager.PathManager(self)
-            self.integration = Integration.Ingegration(self)
-            self.entities = ProjectEntities.ProjectEntities(self)
-            self.mediaProducts = MediaProducts.MediaProducts(self)
-            self.products = Products.Products(self)
-            self.media = MediaManager.MediaManager(self)
-            self.sanities = SanityChecks.SanityChecks(self)
-
-            dftSheet = os.path.join(self.prismRoot, "Scripts", "UserInterfacesPrism", "stylesheets", "blue_moon")
-            self.registerStyleSheet(dftSheet, default=True)
-
-            oldSheet = os.path.join(self.prismRoot, "Scripts", "UserInterfacesPrism", "stylesheets", "qdarkstyle")
-            self.registerStyleSheet(oldSheet)
-            self.users.ensureUser()
-            self.getUIscale()
-            self.initializePlugins(app)
+            with self.startupProfiler.phase("managers"):
+                self.callbacks = Callbacks.Callbacks(self)
+                self.users.refreshEnvironment()
+                self.projects = Projects.Projects(self)
+                self.plugins = PluginManager.PluginManager(self)
+                self.paths = PathManager.PathManager(self)
+                self.integration = Integration.Ingegration(self)
+                self.entities = ProjectEntities.ProjectEntities(self)
+                self.mediaProducts = MediaProducts.MediaProducts(self)
+                self.products = Products.Products(self)
+                if self.uiAvailable:
+                    self.watcher = ProjectWatcher.ProjectWatcher(self)
+                    self.retention = Retention.Retention(self)
+                    self.diskUsage = DiskUsage.DiskUsage(self)
+                    self.dependencyIndex = DependencyIndex.DependencyIndex(self)
+
+            with self.startupProfiler.phase("ui setup"):
+                dftSheet = os.path.join(self.prismRoot, "Scripts", "UserInterfacesPrism", "stylesheets", "blue_moon")
+                self.registerStyleSheet(dftSheet, default=True)
+
+                oldSheet = os.path.join(self.prismRoot, "Scripts", "UserInterfacesPrism", "stylesheets", "qdarkstyle")
+                self.registerStyleSheet(oldSheet)
+                self.users.ensureUser()
+                self.getUIscale()
+
+            with self.startupProfiler.phase("plugins"):
+                self.initializePlugins(app)
+
             atexit.register(self.onExit)
             QApplication.instance().aboutToQuit.connect(self.onExit)
 
@@ -304,8 +337,7 @@ class PrismCore:
                 self.integration.refreshAllIntegrations()
                 sys.exit()
 
-            endTime = datetime.now()
-            logger.debug("startup duration: %s" % (endTime - startTime))
+            self.startupProfiler.finish()
         except Exception as e:
             exc_type, exc_obj, exc_tb = sys.exc_info()
             erStr = "%s ERROR - PrismCore init %s:\n%s\n\n%s" % (
@@ -316,13 +348,31 @@ class PrismCore:
             )
             self.writeErrorLog(erStr)
 
+    def __getattr__(self, name):
+        lazyManagers = self.__dict__.get("lazyManagers", {})
+        if name not in lazyManagers:
+            raise AttributeError(name)
+
+        moduleName, className = lazyManagers[name]
+        start = time.time()
+        module = importlib.import_module("PrismUtils." + moduleName)
+        manager = getattr(module, className)(self)
+        setattr(self, name, manager)
+        logger.debug("initialized %s in %.3fs" % (moduleName, time.time() - start))
+        return manager
+
     @err_catcher(name=__name__)
-    def getUserPrefDir(self):
+    def isManagerLoaded(self, name):
+        return name in self.__dict__
+
+    @staticmethod
+    def getUserPrefDir():
+        # static, so it can be used without an initialized core
         if os.getenv("PRISM_USER_PREFS"):
             return os.getenv("PRISM_USER_PREFS")
 
         if platform.system() == "Windows":
-            path = self.getWindowsDocumentsPath()
+            path = PrismCore.getWindowsDocumentsPath()
         elif platform.system() == "Linux":
             path = os.path.join(os.environ["HOME"])
         elif platform.system() == "Darwin":
@@ -331,8 +381,8 @@ class PrismCore:
         path = os.path.join(path, "Prism2")
         return path
 
-    @err_catcher(name=__name__)
-    def getWindowsDocumentsPath(self):
+    @staticmethod
+    def getWindowsDocumentsPath():
         import ctypes.wintypes
         CSIDL_PERSONAL = 5       # My Documents
         SHGFP_TYPE_CURRENT = 0   # Get current, not default value
@@ -646,36 +696,34 @@ class PrismCore:
         if not self.users.ensureUser():
             return
 
+        # commands of older Prism versions are still written as files per host
         cmdDir = os.path.join(
             os.path.dirname(self.prismIni), "Commands", socket.gethostname()
         )
-        if not os.path.exists(cmdDir):
-            try:
-                os.makedirs(cmdDir)
-            except:
-                return
+        if os.path.exists(cmdDir):
+            for i in sorted(os.listdir(cmdDir)):
+                if not i.startswith("prismCmd_"):
+                    continue
 
-        for i in sorted(os.listdir(cmdDir)):
-            if not i.startswith("prismCmd_"):
-                continue
+                filePath = os.path.join(cmdDir, i)
+                if os.path.isfile(filePath) and os.path.splitext(filePath)[1] == ".txt":
+                    with open(filePath, "r") as comFile:
+                        cmdText = comFile.read()
 
-            filePath = os.path.join(cmdDir, i)
-            if os.path.isfile(filePath) and os.path.splitext(filePath)[1] == ".txt":
-                with open(filePath, "r") as comFile:
-                    cmdText = comFile.read()
+                command = None
+                try:
+                    command = eval(cmdText)
+                except:
+                    msg = (
+                        "Could evaluate command: %s\n - %s"
+                        % (cmdText, traceback.format_exc()),
+                    )
+                    self.popup(msg)
 
-            command = None
-            try:
-                command = eval(cmdText)
-            except:
-                msg = (
-                    "Could evaluate command: %s\n - %s"
-                    % (cmdText, traceback.format_exc()),
-                )
-                self.popup(msg)
+                self.handleCmd(command)
+                os.remove(filePath)
 
-            self.handleCmd(command)
-            os.remove(filePath)
+        self.journal.handleCommands(self.journal.getPendingCommands())
 
     @err_catcher(name=__name__)
     def handleCmd(self, command):
@@ -721,35 +769,9 @@ class PrismCore:
         if not os.path.exists(self.prismIni):
             return
 
-        cmdDir = os.path.join(os.path.dirname(self.prismIni), "Commands")
-        if not os.path.exists(cmdDir):
-            try:
-                os.makedirs(cmdDir)
-            except:
-                return
-
-        for i in os.listdir(cmdDir):
-            if not includeCurrent and i == socket.gethostname():
-                continue
-
-            if i == socket.gethostname():
-                self.handleCmd(cmd)
-                continue
-
-            dirPath = os.path.join(cmdDir, i)
-            if not os.path.isdir(dirPath):
-                continue
-
-            cmdFile = os.path.join(dirPath, "prismCmd_0001.txt")
-            curNum = 1
-
-            while os.path.exists(cmdFile):
-                curNum += 1
-                cmdFile = cmdFile[:-8] + format(curNum, "04") + ".txt"
-
-            open(cmdFile, "a").close()
-            with open(cmdFile, "w") as cFile:
-                cFile.write(str(cmd))
+        self.journal.addEvent("command", {"command": cmd})
+        if includeCurrent:
+            self.handleCmd(cmd)
 
     @err_catcher(name=__name__)
     def getLocalPath(self):
@@ -1102,6 +1124,7 @@ License: GNU LGPL-3.0-or-later<br>
     def closeSM(self, restart=False):
         if getattr(self, "sm", None):
             self.sm.saveEnabled = False
+            self.sm.saveTimer.stop()
             wasOpen = self.isStateManagerOpen()
             if wasOpen:
                 self.sm.close()
@@ -1368,60 +1391,33 @@ License: GNU LGPL-3.0-or-later<br>
             )
 
     @err_catcher(name=__name__)
-    def resolveFrameExpression(self, expression):
-        eChunks = expression.split(",")
+    def resolveFrameExpression(self, expression, limit=10000):
+        # use FrameRange.fromExpression for large ranges, this returns
+        # single frames and is capped
         rframes = []
-        for chunk in eChunks:
-            cData = chunk.split("x")
-            if len(cData) > 2:
+        found = set()
+        for chunk in expression.split(","):
+            seg = FrameRange.parseChunk(chunk)
+            if not seg:
                 continue
-            elif len(cData) == 2:
-                try:
-                    step = int(cData[1])
-                except:
-                    continue
 
-                if step == 0:
-                    continue
-            else:
-                step = 1
+            frames = range(seg[0], seg[1] + 1, seg[2])
+            if FrameRange.isDescendingChunk(chunk):
+                frames = reversed(frames)
 
-            se = [x for x in cData[0].split("-") if x]
-            if len(se) == 2:
-                try:
-                    start = int(se[0])
-                    end = int(se[1])
-                except:
-                    continue
-
-            elif len(se) == 1:
-                try:
-                    frame = int(se[0])
-                except:
-                    continue
-                if frame not in rframes:
-                    rframes.append(frame)
-                    if len(rframes) > 10000:
-                        return rframes
-
-                continue
-            else:
-                continue
-
-            if end < start:
-                step *= -1
-                end -= 1
-            else:
-                end += 1
-
-            for frame in range(start, end, step):
-                if frame not in rframes:
+            for frame in frames:
+                if frame not in found:
+                    found.add(frame)
                     rframes.append(frame)
-                    if len(rframes) > 10000:
+                    if limit is not None and len(rframes) >= limit:
                         return rframes
 
         return rframes
 
+    @err_catcher(name=__name__)
+    def getFrameRangeFromExpression(self, expression):
+        return FrameRange.fromExpression(expression)
+
     @err_catcher(name=__name__)
     def validateLineEdit(self, widget, allowChars=None, denyChars=None):
         if not hasattr(widget, "text"):
@@ -1849,6 +1845,9 @@ License: GNU LGPL-3.0-or-later<br>
             if isinstance(res, dict) and res.get("cancel", False):
                 return
 
+        if getattr(self, "sm", None):
+            self.sm.flushPendingStateSave()
+
         result = self.appPlugin.saveScene(self, filepath, details)
         if result is False:
             logger.debug("failed to save scene")
@@ -1970,12 +1969,20 @@ License: GNU LGPL-3.0-or-later<br>
 
         infoPath = self.getVersioninfoPath(filepath)
         self.setConfig(configPath=infoPath, data=sData)
+        self.dependencyIndex.updateNode(infoPath)
+        if self.isManagerLoaded("searchIndex"):
+            self.searchIndex.updateVersionInfo(infoPath)
+
+        self.journal.addEvent(
+            "scenefileSaved", {"path": filepath, "versionInfo": infoPath}
+        )
 
         if preview:
             self.core.entities.setScenePreview(filepath, preview)
 
     @err_catcher(name=__name__)
     def saveVersionInfo(self, filepath, details=None):
+        start = time.time()
         details = details or {}
         if "username" not in details:
             details["username"] = self.username
@@ -1994,6 +2001,17 @@ License: GNU LGPL-3.0-or-later<br>
 
         infoFilePath = self.getVersioninfoPath(filepath)
         self.setConfig(data=details, configPath=infoFilePath)
+        self.dependencyIndex.updateNode(infoFilePath)
+        if self.isManagerLoaded("searchIndex"):
+            self.searchIndex.updateVersionInfo(infoFilePath)
+
+        self.journal.addEvent(
+            "publish", {"path": filepath, "versionInfo": infoFilePath}
+        )
+        scheduler = getattr(getattr(self, "sm", None), "publishScheduler", None)
+        if scheduler:
+            scheduler.addVersionInfo(infoFilePath)
+            scheduler.addPhase("versionInfo", time.time() - start)
 
     @err_catcher(name=__name__)
     def saveWithComment(self):
@@ -2712,11 +2730,16 @@ License: GNU LGPL-3.0-or-later<br>
         sortedList = sorted(alist, key=self.naturalKeys)
         return sortedList
 
+    @err_catcher(name=__name__)
+    def scenefilePreSave(self, arg=None):  # callback function
+        if getattr(self, "sm", None):
+            self.sm.saveAllStatesToScene()
+
     @err_catcher(name=__name__)
     def scenefileSaved(self, arg=None):  # callback function
         if getattr(self, "sm", None):
             self.sm.scenename = self.getCurrentFileName()
-            self.sm.saveStatesToScene()
+            self.sm.saveAllStatesToScene()
 
         if self.shouldAutosaveTimerRun():
             self.startAutosaveTimer()
@@ -2757,16 +2780,35 @@ License: GNU LGPL-3.0-or-later<br>
             self.stateManager(openUi=openSm, reload_module=True)
 
         self.openSm = False
-        self.sanities.checkImportVersions()
-        self.sanities.checkFramerange()
-        self.sanities.checkFPS()
-        self.sanities.checkResolution()
+        self.sanities.runChecks("onSceneOpen")
         self.updateEnvironment()
         self.core.callback(name="onSceneOpen", args=[filepath])
 
+    @err_catcher(name=__name__)
+    def exportTrace(self, path=None):
+        tracer = Tracing.tracer
+        if not path and not tracer.outputPath:
+            filename = "trace_%s.json" % time.strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(self.getUserPrefDir(), "Traces", filename)
+
+        logger.info("trace summary:\n%s" % tracer.formatSummary())
+        return tracer.exportChromeTrace(path)
+
     @err_catcher(name=__name__)
     def onExit(self):
         self.unlockScenefile()
+        if Tracing.tracer.enabled:
+            self.exportTrace()
+            Tracing.tracer.stop()
+
+        if self.isManagerLoaded("diskUsage"):
+            self.diskUsage.saveCache()
+
+        if self.isManagerLoaded("dependencyIndex"):
+            self.dependencyIndex.saveCache()
+
+        if self.isManagerLoaded("searchIndex"):
+            self.searchIndex.saveCache()
 
     @err_catcher(name=__name__)
     def unlockScenefile(self):
@@ -3234,6 +3276,22 @@ License: GNU LGPL-3.0-or-later<br>
             else:
                 logger.error(msg)
 
+    def runInMainThread(self, func, *args, **kwargs):
+        # blocks the calling thread until the main thread processed its events
+        qapp = QApplication.instance()
+        if not qapp or qapp.thread() == QThread.currentThread():
+            return func(*args, **kwargs)
+
+        invoker = MainThreadInvoker(func, args, kwargs)
+        invoker.moveToThread(qapp.thread())
+        invoker.invoked.connect(invoker.run, Qt.QueuedConnection)
+        invoker.invoked.emit()
+        invoker.finished.wait()
+        if invoker.error:
+            raise invoker.error
+
+        return invoker.result
+
     @err_catcher(name=__name__)
     def popupQuestion(
         self,
@@ -3884,16 +3942,18 @@ If this plugin is an official Prism plugin, please submit this error to the supp
     @err_catcher(name=__name__)
     def startServer(self, port, key):
         logger.debug("starting server (%s)" % port)
-        address = ("localhost", port)
+        from multiprocessing.connection import Listener
 
+        address = ("localhost", port)
         listener = Listener(address, authkey=key)
         return listener
 
     @err_catcher(name=__name__)
     def startClient(self, port, key):
         logger.debug("starting client (%s)" % port)
-        address = ("localhost", port)
+        from multiprocessing.connection import Client
 
+        address = ("localhost", port)
         conn = Client(address, authkey=key)
         return conn
 
@@ -3990,6 +4050,27 @@ class Worker(QThread):
         self.canceled = True
 
 
+class MainThreadInvoker(QObject):
+    invoked = Signal()
+
+    def __init__(self, func, args, kwargs):
+        super(MainThreadInvoker, self).__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.result = None
+        self.error = None
+        self.finished = threading.Event()
+
+    def run(self):
+        try:
+            self.result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished.set()
+
+
 class ErrorDetailsDialog(QDialog):
     def __init__(self, core, text):
         super(ErrorDetailsDialog, self).__init__()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+import sys
+import argparse
+
+if sys.version[0] == "3":
+    sys.path.append(os.path.dirname(__file__))
+
+import PrismCore
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Remove old product and media versions according to the retention rules of a Prism project."
+    )
+    parser.add_argument("project", help="path of the project folder or project config")
+    parser.add_argument("--apply", action="store_true", help="move the reclaimable versions to the trash")
+    parser.add_argument("--purge-days", type=float, default=None, help="permanently delete trashed versions older than this number of days")
+    parser.add_argument("--restore", default=None, help="restore the versions listed in a trash manifest")
+    parser.add_argument("--no-scenefiles", action="store_true", help="don't protect versions referenced by scenefiles")
+    options = parser.parse_args(args)
+
+    pc = PrismCore.create(prismArgs=["noUI"])
+    pc.changeProject(options.project)
+    if not getattr(pc, "projectPath", None):
+        print("Couldn't load project: %s" % options.project)
+        return 1
+
+    if options.restore:
+        result = pc.retention.restoreTrash(options.restore)
+        print("restored versions" if result else "some versions couldn't be restored")
+        return 0 if result else 1
+
+    report = pc.retention.getReport(includeScenefiles=not options.no_scenefiles)
+    print(pc.retention.formatReport(report))
+    if options.apply and report["candidates"]:
+        manifestPath = pc.retention.trashVersions(report)
+        print("trash manifest: %s" % manifestPath)
+
+    if options.purge_days is not None:
+        pc.retention.purgeExpiredTrash(days=options.purge_days)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -39,6 +39,7 @@ import platform
 import logging
 import traceback
 import time
+import threading
 
 if sys.version[0] == "3":
     sys.path.append(os.path.dirname(__file__))
@@ -77,7 +78,11 @@ class PrismTray:
             )
 
     def startListener(self):
-        self.listenerThread = ListenerThread()
+        from PrismUtils import TrayQueries
+
+        self.queryService = TrayQueries.QueryService(self.core)
+        authkey = TrayQueries.getAuthKey(self.core.getUserPrefDir())
+        self.listenerThread = ListenerThread(queryService=self.queryService, authkey=authkey)
         self.listenerThread.dataReceived.connect(self.onDataReceived)
         self.listenerThread.errored.connect(self.core.writeErrorLog)
         self.listenerThread.start()
@@ -321,8 +326,10 @@ class ListenerThread(QThread):
     dataReceived = Signal(object)
     errored = Signal(object)
 
-    def __init__(self, function=None):
+    def __init__(self, function=None, queryService=None, authkey=None):
         super(ListenerThread, self).__init__()
+        self.queryService = queryService
+        self.authkey = authkey
 
     def run(self):
         try:
@@ -331,7 +338,7 @@ class ListenerThread(QThread):
             port = 7571
             address = ('localhost', port)
             try:
-                self.listener = Listener(address)
+                self.listener = Listener(address, authkey=self.authkey)
             except Exception as e:
                 if e.errno == 10048:
                     logging.warning("Port %s is already in use. Please contact the support." % port)
@@ -340,20 +347,47 @@ class ListenerThread(QThread):
                     raise
 
             while True:
-                self.conn = self.listener.accept()
-                while True:
-                    try:
-                        data = self.conn.recv()
-                    except Exception as e:
-                        break
+                try:
+                    self.conn = self.listener.accept()
+                except Exception as e:
+                    logging.warning("rejected connection: %s" % e)
+                    continue
 
-                    self.dataReceived.emit(data)
+                thread = threading.Thread(target=self.handleConnection, args=(self.conn,))
+                thread.daemon = True
+                thread.start()
 
             self.listener.close()
             self.quit()
         except Exception as e:
             self.errored.emit(traceback.format_exc())
 
+    def handleConnection(self, conn):
+        while True:
+            try:
+                data = conn.recv()
+            except EOFError:
+                break
+            except Exception as e:
+                logging.debug("failed to receive data: %s" % e)
+                break
+
+            if isinstance(data, dict) and "query" in data:
+                if self.queryService:
+                    response = self.queryService.handle(data)
+                else:
+                    response = {"error": "queries are not supported"}
+
+                try:
+                    conn.send(response)
+                except Exception as e:
+                    logging.debug("failed to send response: %s" % e)
+                    break
+            else:
+                self.dataReceived.emit(data)
+
+        conn.close()
+
     def shutDown(self):
         if hasattr(self, "listener"):
             self.listener.close()
@@ -362,15 +396,16 @@ class ListenerThread(QThread):
 
 
 class SenderThread(QThread):
-    def __init__(self, function=None):
+    def __init__(self, function=None, authkey=None):
         super(SenderThread, self).__init__()
         self.canceled = False
+        self.authkey = authkey
 
     def run(self):
         from multiprocessing.connection import Client
         port = 7571
         address = ('localhost', port)
-        self.conn = Client(address)
+        self.conn = Client(address, authkey=self.authkey)
 
     def shutDown(self):
         self.conn.close()
@@ -410,7 +445,10 @@ if __name__ == "__main__":
         sys.exit(1)
 
     if isAlreadyRunning():
-        senderThread = SenderThread()
+        from PrismUtils import TrayQueries
+
+        prefDir = PrismCore.PrismCore.getUserPrefDir()
+        senderThread = SenderThread(authkey=TrayQueries.getAuthKey(prefDir))
         senderThread.start()
         idx = 0
         while True:
@@ -34,6 +34,8 @@
 
 import os
 import sys
+import time
+import bisect
 import logging
 import traceback
 import glob
@@ -53,7 +55,12 @@ class Callbacks(object):
         self.core = core
         self.currentCallback = {"plugin": "", "function": ""}
         self.registeredCallbacks = {}
+        self.callbackPriorities = {}
+        self.callbacksById = {}
         self.registeredHooks = {}
+        self.hookModules = {}
+        self.callbackStats = {}
+        self.slowCallbackThreshold = float(os.getenv("PRISM_SLOW_CALLBACK_THRESHOLD", "1"))
         self.callbackNum = 0
         self.hookNum = 0
 
@@ -61,6 +68,7 @@ class Callbacks(object):
     def registerCallback(self, callbackName, function, priority=50, plugin=None):
         if callbackName not in self.registeredCallbacks:
             self.registeredCallbacks[callbackName] = []
+            self.callbackPriorities[callbackName] = []
 
         self.callbackNum += 1
         cbDict = {
@@ -70,41 +78,43 @@ class Callbacks(object):
             "id": self.callbackNum,
             "plugin": plugin,
         }
-        self.registeredCallbacks[callbackName].append(cbDict)
-        self.registeredCallbacks[callbackName] = sorted(
-            self.registeredCallbacks[callbackName],
-            key=lambda x: int(x["priority"]),
-            reverse=True,
-        )
+        # keep the list sorted by descending priority and registration order
+        priorities = self.callbackPriorities[callbackName]
+        idx = bisect.bisect_right(priorities, -int(priority))
+        priorities.insert(idx, -int(priority))
+        self.registeredCallbacks[callbackName].insert(idx, cbDict)
+        self.callbacksById[cbDict["id"]] = cbDict
         # logger.debug("registered callback: %s" % str(cbDict))
         return cbDict
 
     @err_catcher(name=__name__)
     def unregisterPluginCallbacks(self, plugin):
-        cbIds = []
-        for callback in self.registeredCallbacks:
-            for callbackItem in self.registeredCallbacks[callback]:
-                if callbackItem["plugin"] == plugin:
-                    cbIds.append(callbackItem["id"])
-
+        cbIds = [
+            cbId for cbId, cb in self.callbacksById.items() if cb["plugin"] == plugin
+        ]
         for cbId in cbIds:
             self.unregisterCallback(cbId)
 
     @err_catcher(name=__name__)
     def unregisterCallback(self, callbackId):
-        for cbName in self.registeredCallbacks:
-            for cb in self.registeredCallbacks[cbName]:
-                if cb["id"] == callbackId:
-                    self.registeredCallbacks[cbName].remove(cb)
-                    try:
-                        logger.debug("unregistered callback: %s" % str(cb))
-                    except:
-                        pass
+        cb = self.callbacksById.pop(callbackId, None)
+        if not cb:
+            logger.debug("couldn't unregister callback with id %s" % callbackId)
+            return False
 
-                    return True
+        callbacks = self.registeredCallbacks[cb["callbackName"]]
+        for idx, item in enumerate(callbacks):
+            if item is cb:
+                del callbacks[idx]
+                del self.callbackPriorities[cb["callbackName"]][idx]
+                break
 
-        logger.debug("couldn't unregister callback with id %s" % callbackId)
-        return False
+        try:
+            logger.debug("unregistered callback: %s" % str(cb))
+        except:
+            pass
+
+        return True
 
     @err_catcher(name=__name__)
     def registerHook(self, hookName, filepath):
@@ -124,6 +134,7 @@ class Callbacks(object):
     @err_catcher(name=__name__)
     def registerProjectHooks(self):
         self.registeredHooks = {}
+        self.hookModules = {}
         hooks = self.getProjectHooks()
         for hook in hooks:
             self.registerHook(hook["name"], hook["path"])
@@ -154,11 +165,15 @@ class Callbacks(object):
         result = []
         self.core.catchTypeErrors = True
         self.currentCallback["function"] = name
+        callbackStart = time.time()
 
         if name in self.registeredCallbacks:
             for cb in list(self.registeredCallbacks[name]):
-                self.currentCallback["plugin"] = getattr(cb["plugin"], "pluginName", "")
+                pluginName = getattr(cb["plugin"], "pluginName", "")
+                self.currentCallback["plugin"] = pluginName
+                start = time.time()
                 res = cb["function"](*args, **kwargs)
+                self.addCallbackTiming(name, pluginName, time.time() - start)
                 result.append(res)
 
         if name in self.registeredHooks:
@@ -166,36 +181,59 @@ class Callbacks(object):
                 result.append(self.callHook(name, *args, **kwargs))
 
         self.core.catchTypeErrors = False
+        if result:
+            scheduler = getattr(getattr(self.core, "sm", None), "publishScheduler", None)
+            if scheduler:
+                scheduler.addPhase(name, time.time() - callbackStart)
 
         return result
 
     @err_catcher(name=__name__)
-    def callHook(self, hookName, *args, **kwargs):
-        if not getattr(self.core, "projectPath", None):
+    def addCallbackTiming(self, callbackName, source, duration):
+        key = "%s (%s)" % (callbackName, source or "core")
+        stats = self.callbackStats.get(key)
+        if not stats:
+            stats = {"name": callbackName, "source": source, "count": 0, "duration": 0, "max": 0}
+            self.callbackStats[key] = stats
+
+        stats["count"] += 1
+        stats["duration"] += duration
+        stats["max"] = max(stats["max"], duration)
+        if duration > self.slowCallbackThreshold:
+            logger.warning("slow callback: %s took %.2fs" % (key, duration))
+
+    @err_catcher(name=__name__)
+    def getCallbackStats(self):
+        return sorted(
+            self.callbackStats.values(), key=lambda x: x["duration"], reverse=True
+        )
+
+    @err_catcher(name=__name__)
+    def resetCallbackStats(self):
+        self.callbackStats = {}
+
+    @err_catcher(name=__name__)
+    def getHookModule(self, hookName, hookPath):
+        try:
+            modtime = os.stat(hookPath).st_mtime
+        except OSError:
+            self.hookModules.pop(hookName, None)
             return
 
-        result = None
-        hookPath = os.path.join(self.core.projects.getHookFolder(), hookName + ".py")
-        if os.path.exists(os.path.dirname(hookPath)) and os.path.basename(
-            hookPath
-        ) in os.listdir(os.path.dirname(hookPath)):
-            hookDir = os.path.dirname(hookPath)
-            if hookDir not in sys.path:
-                sys.path.append(os.path.dirname(hookPath))
-
-            if kwargs:
-                kwargs["core"] = self.core
-
-            try:
-                hook = __import__(hookName)
-                result = getattr(hook, "main", lambda *args, **kwargs: None)(*args, **kwargs)
-            except:
-                msg = "An Error occuredwhile calling the %s hook:\n\n%s" % (
-                    hookName,
-                    traceback.format_exc(),
-                )
-                self.core.popup(msg)
+        cacheData = self.hookModules.get(hookName)
+        if cacheData and cacheData["path"] == hookPath and cacheData["modtime"] == modtime:
+            return cacheData["module"]
+
+        hookDir = os.path.dirname(hookPath)
+        if hookDir not in sys.path:
+            sys.path.append(hookDir)
 
+        if hookName in sys.modules:
+            del sys.modules[hookName]
+
+        try:
+            hook = __import__(hookName)
+        finally:
             if hookName in sys.modules:
                 del sys.modules[hookName]
 
@@ -205,4 +243,30 @@ class Callbacks(object):
                 except:
                     pass
 
+        self.hookModules[hookName] = {"path": hookPath, "modtime": modtime, "module": hook}
+        return hook
+
+    @err_catcher(name=__name__)
+    def callHook(self, hookName, *args, **kwargs):
+        if not getattr(self.core, "projectPath", None):
+            return
+
+        result = None
+        hookPath = os.path.join(self.core.projects.getHookFolder(), hookName + ".py")
+        if kwargs:
+            kwargs["core"] = self.core
+
+        start = time.time()
+        try:
+            hook = self.getHookModule(hookName, hookPath)
+            if hook:
+                result = getattr(hook, "main", lambda *args, **kwargs: None)(*args, **kwargs)
+        except:
+            msg = "An Error occuredwhile calling the %s hook:\n\n%s" % (
+                hookName,
+                traceback.format_exc(),
+            )
+            self.core.popup(msg)
+
+        self.addCallbackTiming(hookName, "hook", time.time() - start)
         return result
@@ -357,12 +357,17 @@ class ConfigManager(object):
 
     @err_catcher(name=__name__)
     def readConfig(self, configPath):
+        start = time.time()
         ext = os.path.splitext(configPath)[1]
         if ext == ".yml":
             configData = self.readYaml(configPath)
         else:
             configData = self.readJson(configPath)
 
+        profiler = getattr(self.core, "startupProfiler", None)
+        if profiler:
+            profiler.addConfigRead(configPath, time.time() - start)
+
         return configData
 
     @err_catcher(name=__name__)
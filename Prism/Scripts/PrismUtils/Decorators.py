@@ -43,14 +43,21 @@ from qtpy.QtCore import *
 from qtpy.QtGui import *
 from qtpy.QtWidgets import *
 
+from PrismUtils.Tracing import tracer
+
 
 logger = logging.getLogger(__name__)
 
 
 def err_handler(func, name="", plugin=False):
+    traceName = "%s.%s" % (func.__module__, getattr(func, "__qualname__", func.__name__))
+
     @wraps(func)
     def func_wrapper(*args, **kwargs):
         try:
+            if tracer.enabled:
+                return tracer.trace(traceName, func, args, kwargs)
+
             return func(*args, **kwargs)
         except Exception as e:
             exc_type, exc_obj, exc_tb = sys.exc_info()
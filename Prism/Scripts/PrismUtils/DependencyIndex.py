@@ -0,0 +1,486 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import json
+import logging
+import threading
+
+from qtpy.QtCore import *
+from qtpy.QtGui import *
+from qtpy.QtWidgets import *
+
+from PrismUtils.Decorators import err_catcher
+
+
+logger = logging.getLogger(__name__)
+
+
+class DependencyIndex(QObject):
+    scanFinished = Signal()
+    scanCollected = Signal(object)
+
+    def __init__(self, core):
+        super(DependencyIndex, self).__init__()
+        self.core = core
+        self.nodes = {}
+        self.dependents = {}
+        self.resolveCache = {}
+        self.cacheLoaded = None
+        self.scanned = False
+        self.scanning = False
+        self.dirty = False
+        self.scanCollected.connect(self.applyScan)
+
+    @err_catcher(name=__name__)
+    def getCachePath(self):
+        if not getattr(self.core, "projectName", None):
+            return
+
+        return os.path.join(
+            self.core.getUserPrefDir(),
+            "Cache",
+            "dependencyIndex_%s.json" % self.core.projectName,
+        )
+
+    @err_catcher(name=__name__)
+    def loadCache(self):
+        cachePath = self.getCachePath()
+        if self.cacheLoaded == cachePath:
+            return
+
+        self.cacheLoaded = cachePath
+        self.nodes = {}
+        self.dependents = {}
+        self.resolveCache = {}
+        self.scanned = False
+        self.scanning = False
+        if not cachePath or not os.path.exists(cachePath):
+            return
+
+        data = self.core.configs.readJson(path=cachePath, ignoreErrors=True) or {}
+        self.nodes = data.get("nodes", {})
+        for infoPath in self.nodes:
+            self.addReverseEntries(infoPath)
+
+    @err_catcher(name=__name__)
+    def saveCache(self):
+        cachePath = self.cacheLoaded
+        if not cachePath or not self.dirty:
+            return
+
+        self.core.configs.writeJson(
+            {"nodes": self.nodes}, path=cachePath, indent=None, quiet=True
+        )
+        self.dirty = False
+
+    @err_catcher(name=__name__)
+    def clearCache(self):
+        self.saveCache()
+        self.cacheLoaded = None
+        self.nodes = {}
+        self.dependents = {}
+        self.resolveCache = {}
+        self.scanned = False
+        self.scanning = False
+
+    @err_catcher(name=__name__)
+    def isVersionInfo(self, path):
+        name = os.path.basename(path)
+        base, ext = os.path.splitext(name)
+        return base.endswith("versioninfo") and ext in [".json", ".yml", ".ini"]
+
+    @err_catcher(name=__name__)
+    def resolveVersionInfo(self, path):
+        path = os.path.normpath(path)
+        if self.isVersionInfo(path):
+            return path if os.path.exists(path) else None
+
+        if path in self.resolveCache:
+            return self.resolveCache[path]
+
+        ext = self.core.configs.getProjectExtension()
+        candidates = [
+            self.core.getVersioninfoPath(path),
+            os.path.join(os.path.dirname(path), "versioninfo" + ext),
+            os.path.join(os.path.dirname(os.path.dirname(path)), "versioninfo" + ext),
+        ]
+        infoPath = None
+        for candidate in candidates:
+            self.core.configs.findDeprecatedConfig(candidate)
+            if os.path.exists(candidate):
+                infoPath = os.path.normpath(candidate)
+                break
+
+        self.resolveCache[path] = infoPath
+        return infoPath
+
+    @err_catcher(name=__name__)
+    def getNode(self, infoPath):
+        self.loadCache()
+        infoPath = os.path.normpath(infoPath)
+        try:
+            modtime = os.stat(infoPath).st_mtime
+        except OSError:
+            if infoPath in self.nodes:
+                self.removeNode(infoPath)
+                self.invalidateResolved([infoPath])
+
+            return
+
+        node = self.nodes.get(infoPath)
+        if node and node["modtime"] == modtime:
+            return node
+
+        return self.updateNode(infoPath, modtime=modtime)
+
+    @err_catcher(name=__name__)
+    def updateNode(self, infoPath, modtime=None):
+        self.loadCache()
+        infoPath = os.path.normpath(infoPath)
+        if modtime is None:
+            try:
+                modtime = os.stat(infoPath).st_mtime
+            except OSError:
+                self.removeNode(infoPath)
+                return
+
+        isNew = infoPath not in self.nodes
+        data = self.core.getConfig(configPath=infoPath) or {}
+        node = self.setNode(infoPath, self.createNode(modtime, data))
+        if isNew:
+            self.invalidateResolved([infoPath])
+
+        return node
+
+    @err_catcher(name=__name__)
+    def createNode(self, modtime, data):
+        source = data.get("sourceScene") or data.get("source scene")
+        deps = [dep for dep in (data.get("dependencies") or []) if dep]
+        extFiles = [
+            path for path in (data.get("externalFiles") or []) if path and path not in deps
+        ]
+        if source and source in deps:
+            deps.remove(source)
+
+        return {
+            "modtime": modtime,
+            "date": data.get("date", ""),
+            "source": source or "",
+            "dependencies": deps,
+            "externalFiles": extFiles,
+        }
+
+    @err_catcher(name=__name__)
+    def setNode(self, infoPath, node):
+        if infoPath in self.nodes:
+            self.removeReverseEntries(infoPath)
+
+        self.nodes[infoPath] = node
+        self.addReverseEntries(infoPath)
+        self.dirty = True
+        return self.nodes[infoPath]
+
+    @err_catcher(name=__name__)
+    def removeNode(self, infoPath):
+        if infoPath not in self.nodes:
+            return
+
+        self.removeReverseEntries(infoPath)
+        del self.nodes[infoPath]
+        self.dirty = True
+
+    @err_catcher(name=__name__)
+    def getNodeDependencyPaths(self, node):
+        paths = list(node["dependencies"])
+        if node["source"]:
+            paths.append(node["source"])
+
+        return paths
+
+    @err_catcher(name=__name__)
+    def getResolvedDependencies(self, infoPath):
+        # the versioninfos of the dependencies get resolved once when the node
+        # is added and are stored with it, so the reverse lookup is a dict access
+        node = self.nodes[infoPath]
+        if node.get("resolved") is None:
+            node["resolved"] = self.resolveDependencies(node)
+            self.dirty = True
+
+        return node["resolved"]
+
+    @err_catcher(name=__name__)
+    def resolveDependencies(self, node):
+        resolved = []
+        for path in self.getNodeDependencyPaths(node):
+            depInfo = self.resolveVersionInfo(path)
+            if depInfo and depInfo not in resolved:
+                resolved.append(depInfo)
+
+        return resolved
+
+    @err_catcher(name=__name__)
+    def addReverseEntries(self, infoPath):
+        for key in self.getResolvedDependencies(infoPath):
+            self.dependents.setdefault(key, set()).add(infoPath)
+
+    @err_catcher(name=__name__)
+    def removeReverseEntries(self, infoPath):
+        for key in self.nodes[infoPath].get("resolved") or []:
+            if key in self.dependents:
+                self.dependents[key].discard(infoPath)
+                if not self.dependents[key]:
+                    del self.dependents[key]
+
+    @err_catcher(name=__name__)
+    def getDependencies(self, infoPath):
+        node = self.getNode(infoPath)
+        if not node:
+            return []
+
+        entries = []
+        for path in node["dependencies"]:
+            entries.append(
+                {"path": path, "type": "Export", "versionInfo": self.resolveVersionInfo(path)}
+            )
+
+        if node["source"]:
+            entries.append(
+                {
+                    "path": node["source"],
+                    "type": "Source Scene",
+                    "versionInfo": self.resolveVersionInfo(node["source"]),
+                }
+            )
+
+        for path in node["externalFiles"]:
+            entries.append({"path": path, "type": "File", "versionInfo": None})
+
+        return entries
+
+    @err_catcher(name=__name__)
+    def getDependents(self, infoPath):
+        # answers from the current index, the first call starts a project scan
+        # in the background which emits scanFinished when it's done
+        self.requestScan()
+        infoPath = os.path.normpath(infoPath)
+        entries = []
+        for dependent in sorted(self.dependents.get(infoPath, [])):
+            if not self.getNode(dependent):
+                continue
+
+            entries.append(
+                {
+                    "path": self.getSubjectPath(dependent),
+                    "type": "Dependent",
+                    "versionInfo": dependent,
+                }
+            )
+
+        return entries
+
+    @err_catcher(name=__name__)
+    def getSubjectPath(self, infoPath):
+        base = os.path.splitext(infoPath)[0][: -len("versioninfo")]
+        if not base or base.endswith(os.sep):
+            return os.path.dirname(infoPath)
+
+        prefix = os.path.basename(base)
+        try:
+            entries = os.listdir(os.path.dirname(infoPath))
+        except OSError:
+            return base
+
+        for name in sorted(entries):
+            if name.startswith(prefix) and name[len(prefix):].startswith("."):
+                return os.path.join(os.path.dirname(infoPath), name)
+
+        return base
+
+    @err_catcher(name=__name__)
+    def walk(self, infoPath, reverse=False):
+        infoPath = os.path.normpath(infoPath)
+        visited = set([infoPath])
+        stack = [(infoPath, 0)]
+        while stack:
+            curPath, depth = stack.pop()
+            if reverse:
+                entries = self.getDependents(curPath)
+            else:
+                entries = self.getDependencies(curPath)
+
+            for entry in reversed(entries):
+                yield curPath, entry, depth + 1
+                child = entry["versionInfo"]
+                if child and child not in visited:
+                    visited.add(child)
+                    stack.append((child, depth + 1))
+
+    @err_catcher(name=__name__)
+    def requestScan(self, force=False):
+        self.loadCache()
+        if (self.scanned and not force) or self.scanning:
+            return
+
+        if not self.core.uiAvailable:
+            self.scanProject(force=force)
+            return
+
+        projectPath = getattr(self.core, "projectPath", None)
+        if not projectPath or not os.path.exists(projectPath):
+            return
+
+        self.scanning = True
+        thread = threading.Thread(
+            target=self.collectVersionInfos,
+            args=self.getScanArgs(projectPath),
+        )
+        thread.daemon = True
+        thread.start()
+
+    @err_catcher(name=__name__)
+    def scanProject(self, force=False):
+        self.loadCache()
+        if self.scanned and not force:
+            return
+
+        projectPath = getattr(self.core, "projectPath", None)
+        if not projectPath or not os.path.exists(projectPath):
+            return
+
+        self.applyScan(self.collectVersionInfos(*self.getScanArgs(projectPath), emit=False))
+
+    @err_catcher(name=__name__)
+    def getScanArgs(self, projectPath):
+        pipelineFolder = os.path.normpath(self.core.projects.getPipelineFolder() or "")
+        modtimes = {path: node["modtime"] for path, node in self.nodes.items()}
+        return self.cacheLoaded, projectPath, pipelineFolder, modtimes
+
+    def collectVersionInfos(self, cachePath, projectPath, pipelineFolder, modtimes, emit=True):
+        # runs in a worker thread when called from requestScan. Only reads
+        # files, everything which uses the core happens in applyScan
+        result = {"cachePath": cachePath, "found": set(), "changed": {}}
+        try:
+            for root, dirs, files in os.walk(projectPath):
+                if os.path.normpath(root) == pipelineFolder:
+                    dirs[:] = []
+                    continue
+
+                dirs[:] = [folder for folder in dirs if folder != ".trash"]
+                for name in files:
+                    if not self.isVersionInfo(name):
+                        continue
+
+                    infoPath = os.path.normpath(os.path.join(root, name))
+                    try:
+                        modtime = os.stat(infoPath).st_mtime
+                    except OSError:
+                        continue
+
+                    result["found"].add(infoPath)
+                    if modtimes.get(infoPath) == modtime:
+                        continue
+
+                    # yml and ini files are read on the main thread
+                    data = None
+                    if infoPath.endswith(".json"):
+                        data = self.readVersionInfo(infoPath)
+
+                    result["changed"][infoPath] = {"modtime": modtime, "data": data}
+        except Exception as e:
+            logger.warning("failed to scan the project for dependencies: %s" % e)
+            result["failed"] = True
+
+        if emit:
+            self.scanCollected.emit(result)
+
+        return result
+
+    def readVersionInfo(self, infoPath):
+        try:
+            with open(infoPath, "r") as f:
+                return json.load(f)
+        except Exception:
+            return
+
+    @err_catcher(name=__name__)
+    def applyScan(self, result):
+        self.scanning = False
+        if result["cachePath"] != self.cacheLoaded or result.get("failed"):
+            return
+
+        updated = []
+        for infoPath, entry in result["changed"].items():
+            data = entry["data"]
+            if data is None:
+                data = self.core.getConfig(configPath=infoPath)
+
+            self.setNode(infoPath, self.createNode(entry["modtime"], data or {}))
+            updated.append(infoPath)
+
+        for infoPath in list(self.nodes):
+            if infoPath not in result["found"]:
+                self.removeNode(infoPath)
+                updated.append(infoPath)
+
+        self.invalidateResolved(updated)
+        self.scanned = True
+        self.saveCache()
+        self.scanFinished.emit()
+
+    @err_catcher(name=__name__)
+    def invalidateResolved(self, infoPaths):
+        # dependencies resolve to a versioninfo in their own folder or the
+        # parent folder. Resolved paths next to added, changed or removed
+        # versioninfos can be outdated.
+        folders = set(os.path.dirname(infoPath) for infoPath in infoPaths)
+        if not folders:
+            return
+
+        def isAffected(path):
+            folder = os.path.dirname(path)
+            return folder in folders or os.path.dirname(folder) in folders
+
+        for path in [path for path in self.resolveCache if isAffected(path)]:
+            del self.resolveCache[path]
+
+        for infoPath, node in self.nodes.items():
+            if node.get("resolved") is None:
+                continue
+
+            paths = [os.path.normpath(path) for path in self.getNodeDependencyPaths(node)]
+            if any(isAffected(path) for path in paths):
+                self.removeReverseEntries(infoPath)
+                node["resolved"] = None
+                self.addReverseEntries(infoPath)
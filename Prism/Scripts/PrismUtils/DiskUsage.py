@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from qtpy.QtCore import *
+from qtpy.QtGui import *
+from qtpy.QtWidgets import *
+
+from PrismUtils.Decorators import err_catcher
+
+
+logger = logging.getLogger(__name__)
+
+
+class DiskUsage(QObject):
+    sizeUpdated = Signal(object)
+    sizesFinished = Signal()
+
+    def __init__(self, core):
+        super(DiskUsage, self).__init__()
+        self.core = core
+        self.maxWorkers = 4
+        self.executor = None
+        self.folderCache = {}
+        self.sizes = {}
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.cacheLoaded = None
+        self.dirty = False
+        self.sizesFinished.connect(self.saveCache)
+
+    @err_catcher(name=__name__)
+    def getCachePath(self):
+        if not getattr(self.core, "projectName", None):
+            return
+
+        return os.path.join(
+            self.core.getUserPrefDir(), "Cache", "diskUsage_%s.json" % self.core.projectName
+        )
+
+    @err_catcher(name=__name__)
+    def loadCache(self):
+        cachePath = self.getCachePath()
+        if self.cacheLoaded == cachePath:
+            return
+
+        self.cacheLoaded = cachePath
+        data = {}
+        if cachePath and os.path.exists(cachePath):
+            data = self.core.configs.readJson(path=cachePath, ignoreErrors=True) or {}
+
+        with self.lock:
+            self.folderCache = data.get("folders", {})
+            self.sizes = data.get("sizes", {})
+
+    @err_catcher(name=__name__)
+    def saveCache(self):
+        cachePath = self.cacheLoaded
+        if not cachePath or not self.dirty:
+            return
+
+        with self.lock:
+            data = {"folders": dict(self.folderCache), "sizes": dict(self.sizes)}
+            self.dirty = False
+
+        self.core.configs.writeJson(data, path=cachePath, indent=None, quiet=True)
+
+    @err_catcher(name=__name__)
+    def clearCache(self):
+        self.saveCache()
+        self.cacheLoaded = None
+        with self.lock:
+            self.folderCache = {}
+            self.sizes = {}
+
+    @err_catcher(name=__name__)
+    def getFolderSize(self, path, modtime=None):
+        self.loadCache()
+        return self.computeSize(os.path.normpath(path), modtime=modtime)
+
+    def computeSize(self, path, modtime=None):
+        # called from the worker threads, the caches are only accessed
+        # while holding the lock
+        if modtime is None:
+            try:
+                modtime = os.stat(path).st_mtime
+            except OSError:
+                return 0
+
+        with self.lock:
+            cacheData = self.folderCache.get(path)
+
+        if cacheData and cacheData["modtime"] == modtime:
+            size = cacheData["files"]
+            for name in cacheData["dirs"]:
+                subPath = os.path.join(path, name)
+                try:
+                    submtime = os.stat(subPath).st_mtime
+                except OSError:
+                    continue
+
+                size += self.computeSize(subPath, modtime=submtime)
+        else:
+            fileSize = 0
+            dirs = []
+            size = 0
+            try:
+                entries = list(os.scandir(path))
+            except OSError:
+                entries = []
+
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.name)
+                        size += self.computeSize(entry.path, modtime=entry.stat().st_mtime)
+                    else:
+                        fileSize += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+
+            size += fileSize
+            with self.lock:
+                self.folderCache[path] = {"modtime": modtime, "files": fileSize, "dirs": dirs}
+                self.dirty = True
+
+        with self.lock:
+            if self.sizes.get(path) != size:
+                self.sizes[path] = size
+                self.dirty = True
+
+        return size
+
+    @err_catcher(name=__name__)
+    def getCachedSize(self, path):
+        self.loadCache()
+        with self.lock:
+            return self.sizes.get(os.path.normpath(path))
+
+    @err_catcher(name=__name__)
+    def getExecutor(self):
+        if not self.executor:
+            self.executor = ThreadPoolExecutor(max_workers=self.maxWorkers)
+
+        return self.executor
+
+    @err_catcher(name=__name__)
+    def requestFolderSize(self, path):
+        path = os.path.normpath(path)
+        with self.lock:
+            if path in self.pending:
+                return
+
+            self.pending.add(path)
+
+        self.loadCache()
+        self.getExecutor().submit(self.computeFolderSize, path)
+
+    def computeFolderSize(self, path):
+        try:
+            size = self.computeSize(path)
+        except Exception as e:
+            logger.warning("failed to get size of folder %s: %s" % (path, e))
+            size = None
+        finally:
+            with self.lock:
+                self.pending.discard(path)
+                finished = not self.pending
+
+        if size is not None:
+            self.sizeUpdated.emit({"path": path, "size": size})
+
+        if finished:
+            self.sizesFinished.emit()
+
+    @err_catcher(name=__name__)
+    def getEntityPaths(self, entity):
+        paths = []
+        for path in entity.get("paths", []):
+            if isinstance(path, dict):
+                path = path.get("path")
+
+            if path:
+                paths.append(os.path.normpath(path))
+
+        if not paths and entity.get("type") in ["asset", "shot"]:
+            path = self.core.getEntityPath(entity=entity)
+            if path:
+                paths.append(os.path.normpath(path))
+
+        return paths
+
+    @err_catcher(name=__name__)
+    def getCachedEntitySize(self, entity):
+        sizes = [self.getCachedSize(path) for path in self.getEntityPaths(entity)]
+        if not sizes or None in sizes:
+            return
+
+        return sum(sizes)
+
+    @err_catcher(name=__name__)
+    def requestEntitySize(self, entity):
+        for path in self.getEntityPaths(entity):
+            self.requestFolderSize(path)
+
+    @err_catcher(name=__name__)
+    def formatSize(self, size):
+        for unit in ["B", "KB", "MB", "GB"]:
+            if size < 1024.0:
+                return "%.1f %s" % (size, unit)
+
+            size /= 1024.0
+
+        return "%.1f TB" % size
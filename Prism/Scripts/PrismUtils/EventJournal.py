@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+import json
+import time
+import uuid
+import errno
+import socket
+import logging
+
+from qtpy.QtCore import *
+from qtpy.QtGui import *
+from qtpy.QtWidgets import *
+
+from PrismUtils.Decorators import err_catcher
+
+
+logger = logging.getLogger(__name__)
+
+
+class EventJournal(QObject):
+    eventsReceived = Signal(object)
+
+    def __init__(self, core):
+        super(EventJournal, self).__init__()
+        self.core = core
+        self.segmentSize = 5000
+        self.pollInterval = 10000
+        self.lockTimeout = 5
+        self.staleLockAge = 30
+        self.sessionId = uuid.uuid4().hex
+        self.hostname = socket.gethostname()
+        self.position = None
+        self.pollTimer = None
+
+    @err_catcher(name=__name__)
+    def getJournalFolder(self):
+        if not getattr(self.core, "projectPath", None):
+            return
+
+        return os.path.join(self.core.projects.getPipelineFolder(), "Journal")
+
+    @err_catcher(name=__name__)
+    def getSegmentPath(self, start):
+        return os.path.join(self.getJournalFolder(), "journal_%012d.jsonl" % start)
+
+    @err_catcher(name=__name__)
+    def getSegments(self):
+        folder = self.getJournalFolder()
+        segments = []
+        try:
+            names = os.listdir(folder)
+        except OSError:
+            return segments
+
+        for name in names:
+            base, ext = os.path.splitext(name)
+            if ext != ".jsonl" or not base.startswith("journal_"):
+                continue
+
+            try:
+                start = int(base[len("journal_"):])
+            except ValueError:
+                continue
+
+            segments.append((start, os.path.join(folder, name)))
+
+        return sorted(segments)
+
+    @err_catcher(name=__name__)
+    def getLastOffset(self):
+        segments = self.getSegments()
+        if not segments:
+            return 0
+
+        start, path = segments[-1]
+        return self.getLastOffsetOfSegment(path, start)
+
+    @err_catcher(name=__name__)
+    def getLastOffsetOfSegment(self, path, start):
+        try:
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                f.seek(max(0, size - 65536))
+                lines = f.read().splitlines()
+        except OSError:
+            return start - 1
+
+        for line in reversed(lines):
+            try:
+                return json.loads(line.decode("utf-8"))["offset"]
+            except Exception:
+                continue
+
+        return start - 1
+
+    @err_catcher(name=__name__)
+    def acquireLock(self, lockPath):
+        startTime = time.time()
+        while True:
+            try:
+                fd = os.open(lockPath, os.O_CREAT | os.O_EXCL | os.O_RDWR)
+                os.close(fd)
+                return True
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+
+            try:
+                if (time.time() - os.path.getmtime(lockPath)) > self.staleLockAge:
+                    os.remove(lockPath)
+                    continue
+            except OSError:
+                continue
+
+            if (time.time() - startTime) > self.lockTimeout:
+                return False
+
+            time.sleep(0.02)
+
+    @err_catcher(name=__name__)
+    def addEvent(self, eventType, data=None):
+        folder = self.getJournalFolder()
+        if not folder:
+            return
+
+        if not os.path.exists(folder):
+            try:
+                os.makedirs(folder)
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    logger.warning("couldn't create journal folder: %s" % e)
+                    return
+
+        event = {
+            "type": eventType,
+            "data": data or {},
+            "time": time.time(),
+            "host": self.hostname,
+            "user": getattr(self.core, "username", ""),
+            "session": self.sessionId,
+        }
+        lockPath = os.path.join(folder, "journal.lock")
+        if not self.acquireLock(lockPath):
+            logger.warning("couldn't lock the project journal. Event not written: %s" % event)
+            return
+
+        try:
+            segments = self.getSegments()
+            if segments:
+                start, path = segments[-1]
+                offset = self.getLastOffsetOfSegment(path, start) + 1
+            else:
+                start = offset = 1
+                path = self.getSegmentPath(start)
+
+            if (offset - start) >= self.segmentSize:
+                path = self.getSegmentPath(offset)
+
+            event["offset"] = offset
+            with open(path, "a") as f:
+                f.write(json.dumps(event, default=str) + "\n")
+        finally:
+            try:
+                os.remove(lockPath)
+            except OSError:
+                pass
+
+        logger.debug("added journal event: %s" % event)
+        return event
+
+    @err_catcher(name=__name__)
+    def getEvents(self, afterOffset=0):
+        segments = self.getSegments()
+        events = []
+        for idx, segment in enumerate(segments):
+            if idx + 1 < len(segments) and segments[idx + 1][0] <= afterOffset + 1:
+                continue
+
+            for event in self.readSegment(segment[1])[0]:
+                if event["offset"] > afterOffset:
+                    events.append(event)
+
+        return events
+
+    @err_catcher(name=__name__)
+    def readSegment(self, path, position=0):
+        events = []
+        try:
+            with open(path, "rb") as f:
+                f.seek(position)
+                data = f.read()
+        except (IOError, OSError):
+            return events, position
+
+        # ignore a partially written last line, it will be read in the next poll
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                events.append(json.loads(line.decode("utf-8")))
+            except Exception:
+                logger.debug("invalid journal line: %s" % line)
+
+        return events, position + end
+
+    @err_catcher(name=__name__)
+    def start(self):
+        self.reset()
+        if not self.getJournalFolder():
+            return
+
+        segments = self.getSegments()
+        if segments:
+            start, path = segments[-1]
+            self.position = {"segment": start, "bytes": os.path.getsize(path)}
+        else:
+            self.position = {"segment": 1, "bytes": 0}
+
+        if self.core.uiAvailable:
+            self.pollTimer = QTimer()
+            self.pollTimer.timeout.connect(self.poll)
+            self.pollTimer.start(self.pollInterval)
+
+    @err_catcher(name=__name__)
+    def reset(self):
+        if self.pollTimer:
+            self.pollTimer.stop()
+            self.pollTimer = None
+
+        self.position = None
+
+    @err_catcher(name=__name__)
+    def poll(self):
+        if not self.position:
+            return []
+
+        events = []
+        for start, path in self.getSegments():
+            if start < self.position["segment"]:
+                continue
+
+            if start > self.position["segment"]:
+                self.position = {"segment": start, "bytes": 0}
+
+            segmentEvents, self.position["bytes"] = self.readSegment(
+                path, position=self.position["bytes"]
+            )
+            events += segmentEvents
+
+        if events:
+            self.handleEvents(events)
+
+        return events
+
+    @err_catcher(name=__name__)
+    def handleEvents(self, events):
+        foreignEvents = [event for event in events if event.get("session") != self.sessionId]
+        for event in foreignEvents:
+            self.invalidateCaches(event)
+            self.core.callback(name="onJournalEvent", args=[event])
+
+        self.handleCommands([event for event in events if event["type"] == "command"])
+        if foreignEvents:
+            self.eventsReceived.emit(foreignEvents)
+
+    @err_catcher(name=__name__)
+    def invalidateCaches(self, event):
+        data = event.get("data") or {}
+        for key in ["versionInfo", "configPath"]:
+            if data.get(key):
+                self.core.configs.clearCache(path=data[key])
+
+        if not data.get("path") or not self.core.isManagerLoaded("watcher"):
+            return
+
+        path = os.path.normpath(data["path"])
+        for folder in [os.path.dirname(path), os.path.dirname(os.path.dirname(path))]:
+            if folder in self.core.watcher.watchedFolders:
+                self.core.watcher.onDirectoryChanged(folder)
+
+    @err_catcher(name=__name__)
+    def getStatePath(self):
+        return os.path.join(
+            self.core.getUserPrefDir(), "Cache", "journal_%s.json" % self.core.projectName
+        )
+
+    @err_catcher(name=__name__)
+    def getCommandOffset(self):
+        statePath = self.getStatePath()
+        if os.path.exists(statePath):
+            data = self.core.configs.readJson(path=statePath, ignoreErrors=True) or {}
+            if "commandOffset" in data:
+                return data["commandOffset"]
+
+        offset = self.getLastOffset()
+        self.setCommandOffset(offset)
+        return offset
+
+    @err_catcher(name=__name__)
+    def setCommandOffset(self, offset):
+        self.core.configs.writeJson({"commandOffset": offset}, path=self.getStatePath(), quiet=True)
+
+    @err_catcher(name=__name__)
+    def getPendingCommands(self):
+        return [
+            event for event in self.getEvents(afterOffset=self.getCommandOffset())
+            if event["type"] == "command"
+        ]
+
+    @err_catcher(name=__name__)
+    def handleCommands(self, events):
+        # commands are handled once per host, like the per-host command files before
+        if not events:
+            return
+
+        commandOffset = self.getCommandOffset()
+        events = [event for event in events if event["offset"] > commandOffset]
+        if not events:
+            return
+
+        self.setCommandOffset(max(event["offset"] for event in events))
+        for event in events:
+            if event.get("host") == self.hostname:
+                continue
+
+            self.core.handleCmd(event["data"].get("command"))
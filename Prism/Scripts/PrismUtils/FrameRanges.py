@@ -0,0 +1,422 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import heapq
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+def gcd(a, b):
+    while b:
+        a, b = b, a % b
+
+    return a
+
+
+def modInverse(value, modulo):
+    oldR, r = value % modulo, modulo
+    oldS, s = 1, 0
+    while r:
+        quotient = oldR // r
+        oldR, r = r, oldR - quotient * r
+        oldS, s = s, oldS - quotient * s
+
+    return oldS % modulo
+
+
+class FrameRange(object):
+    """Set of frames, stored as arithmetic progressions (start, end, step).
+
+    The progressions never share a frame, so length, membership and the set
+    operations work on the progressions without expanding them into frame
+    lists. Frames are ordered ascending.
+    """
+
+    def __init__(self, segments=None):
+        self.segments = self.normalize(segments or [])
+
+    def __len__(self):
+        return sum(self.getSegmentLength(seg) for seg in self.segments)
+
+    def __bool__(self):
+        return bool(self.segments)
+
+    __nonzero__ = __bool__
+
+    def __iter__(self):
+        ranges = [range(seg[0], seg[1] + 1, seg[2]) for seg in self.segments]
+        return heapq.merge(*ranges)
+
+    def __contains__(self, frame):
+        for start, end, step in self.segments:
+            if start <= frame <= end and (frame - start) % step == 0:
+                return True
+
+        return False
+
+    def __eq__(self, other):
+        if not isinstance(other, FrameRange):
+            return False
+
+        if self.segments == other.segments:
+            return True
+
+        # the same frames can be stored as different progressions (53,57 vs 53-57x4)
+        return len(self) == len(other) and not self.difference(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def __sub__(self, other):
+        return self.difference(other)
+
+    def __and__(self, other):
+        return self.intersection(other)
+
+    def __repr__(self):
+        return "FrameRange(%s)" % self.toString()
+
+    @classmethod
+    def fromExpression(cls, expression):
+        segments = []
+        for chunk in str(expression).split(","):
+            seg = cls.parseChunk(chunk.strip())
+            if seg:
+                segments.append(seg)
+
+        # sorted segments, which don't overlap, can be used as they are. Only
+        # overlapping segments need a union.
+        segments.sort()
+        disjoint = []
+        overlapping = []
+        for seg in segments:
+            if disjoint and seg[0] <= disjoint[-1][1]:
+                overlapping.append(seg)
+            else:
+                disjoint.append(seg)
+
+        result = cls(disjoint)
+        for seg in overlapping:
+            result = result.union(cls([seg]))
+
+        return result
+
+    @classmethod
+    def fromFrames(cls, frames):
+        return cls([(frame, frame, 1) for frame in set(int(frame) for frame in frames)])
+
+    @classmethod
+    def fromRange(cls, start, end, step=1):
+        return cls([cls.alignSegment(int(start), int(end), int(step))])
+
+    @staticmethod
+    def splitChunk(chunk):
+        cData = chunk.split("x")
+        if len(cData) > 2:
+            return
+        elif len(cData) == 2:
+            try:
+                step = int(cData[1])
+            except ValueError:
+                return
+
+            if step <= 0:
+                return
+        else:
+            step = 1
+
+        try:
+            values = [int(x) for x in cData[0].split("-") if x.strip()]
+        except ValueError:
+            return
+
+        if len(values) not in [1, 2]:
+            return
+
+        return values, step
+
+    @staticmethod
+    def parseChunk(chunk):
+        data = FrameRange.splitChunk(chunk)
+        if not data:
+            return
+
+        values, step = data
+        if len(values) == 1:
+            return (values[0], values[0], 1)
+
+        return FrameRange.alignSegment(values[0], values[1], step)
+
+    @staticmethod
+    def isDescendingChunk(chunk):
+        data = FrameRange.splitChunk(chunk)
+        return bool(data) and len(data[0]) == 2 and data[0][0] > data[0][1]
+
+    @staticmethod
+    def alignSegment(start, end, step):
+        if end < start:
+            # descending ranges start at the first frame of the expression
+            start, end = end, start
+            start = end - ((end - start) // step) * step
+        else:
+            end = start + ((end - start) // step) * step
+
+        if start == end:
+            step = 1
+
+        return (start, end, step)
+
+    @staticmethod
+    def getSegmentLength(seg):
+        return (seg[1] - seg[0]) // seg[2] + 1
+
+    @staticmethod
+    def normalize(segments):
+        segments = sorted(segments)
+        result = []
+        for start, end, step in segments:
+            if result:
+                pStart, pEnd, pStep = result[-1]
+                single = start == end
+                pSingle = pStart == pEnd
+                if pSingle and single:
+                    # two single frames start a run with a constant step
+                    result[-1] = (pStart, end, start - pEnd)
+                    continue
+                elif pSingle and start - pEnd == step:
+                    result[-1] = (pStart, end, step)
+                    continue
+                elif not pSingle and start - pEnd == pStep and (single or step == pStep):
+                    result[-1] = (pStart, end, pStep)
+                    continue
+
+            result.append((start, end, step))
+
+        return result
+
+    @staticmethod
+    def intersectSegments(a, b):
+        lo = max(a[0], b[0])
+        hi = min(a[1], b[1])
+        if lo > hi:
+            return
+
+        divisor = gcd(a[2], b[2])
+        diff = b[0] - a[0]
+        if diff % divisor:
+            return
+
+        step = a[2] // divisor * b[2]
+        modulo = b[2] // divisor
+        if modulo > 1:
+            factor = (diff // divisor) * modInverse(a[2] // divisor, modulo) % modulo
+        else:
+            factor = 0
+
+        frame = a[0] + a[2] * factor
+        if frame < lo:
+            frame += -(-(lo - frame) // step) * step
+        else:
+            frame -= ((frame - lo) // step) * step
+
+        if frame > hi:
+            return
+
+        end = frame + ((hi - frame) // step) * step
+        if frame == end:
+            step = 1
+
+        return (frame, end, step)
+
+    @staticmethod
+    def subtractSegment(a, b):
+        common = FrameRange.intersectSegments(a, b)
+        if not common:
+            return [a]
+
+        start, end, step = a
+        result = []
+        if common[0] > start:
+            result.append(FrameRange.alignSegment(start, common[0] - step, step))
+
+        if common[1] < end:
+            result.append(FrameRange.alignSegment(common[1] + step, end, step))
+
+        if common[0] == common[1]:
+            return result
+
+        removed = FrameRange.getSegmentLength(common)
+        period = common[2] // step
+        if removed <= period:
+            # few removed frames: split the span at each of them
+            prev = common[0]
+            for frame in range(common[0] + common[2], common[1] + 1, common[2]):
+                result.append(FrameRange.alignSegment(prev + step, frame - step, step))
+                prev = frame
+        else:
+            # many removed frames: keep the remaining residues of the span
+            for offset in range(1, period):
+                rStart = common[0] + offset * step
+                result.append(FrameRange.alignSegment(rStart, common[1], common[2]))
+
+        return result
+
+    def union(self, other):
+        return FrameRange(self.segments + other.difference(self).segments)
+
+    def difference(self, other):
+        segments = list(self.segments)
+        for seg in other.segments:
+            remaining = []
+            for own in segments:
+                remaining += self.subtractSegment(own, seg)
+
+            segments = remaining
+
+        return FrameRange(segments)
+
+    def intersection(self, other):
+        segments = []
+        for own in self.segments:
+            for seg in other.segments:
+                common = self.intersectSegments(own, seg)
+                if common:
+                    segments.append(common)
+
+        return FrameRange(segments)
+
+    def first(self):
+        if self.segments:
+            return min(seg[0] for seg in self.segments)
+
+    def last(self):
+        if self.segments:
+            return max(seg[1] for seg in self.segments)
+
+    def middle(self):
+        if self.segments:
+            return self.frameAt((len(self) - 1) // 2)
+
+    def countUpTo(self, frame):
+        count = 0
+        for start, end, step in self.segments:
+            if frame >= start:
+                count += (min(end, frame) - start) // step + 1
+
+        return count
+
+    def frameAt(self, index):
+        length = len(self)
+        if index < 0:
+            index += length
+
+        if index < 0 or index >= length:
+            raise IndexError("frame index out of range: %s" % index)
+
+        lo = self.first()
+        hi = self.last()
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.countUpTo(mid) > index:
+                hi = mid
+            else:
+                lo = mid + 1
+
+        return lo
+
+    def clip(self, start, end):
+        segments = []
+        for sStart, sEnd, step in self.segments:
+            if start > sStart:
+                sStart += -(-(start - sStart) // step) * step
+
+            if sStart > min(sEnd, end):
+                continue
+
+            segments.append(self.alignSegment(sStart, min(sEnd, end), step))
+
+        return FrameRange(segments)
+
+    def getChunks(self, chunkSize=None, taskCount=None):
+        """Splits the frames into tasks, whose lengths differ by one frame at most."""
+        length = len(self)
+        if not length:
+            return []
+
+        if not taskCount:
+            chunkSize = max(1, int(chunkSize or length))
+            taskCount = -(-length // chunkSize)
+
+        taskCount = max(1, min(int(taskCount), length))
+        size, extra = divmod(length, taskCount)
+        chunks = []
+        index = 0
+        for idx in range(taskCount):
+            chunkLength = size + (1 if idx < extra else 0)
+            start = self.frameAt(index)
+            end = self.frameAt(index + chunkLength - 1)
+            chunks.append(self.clip(start, end))
+            index += chunkLength
+
+        return chunks
+
+    def toString(self):
+        chunks = []
+        for start, end, step in self.segments:
+            if start == end:
+                chunks.append(str(start))
+            elif step == 1:
+                chunks.append("%s-%s" % (start, end))
+            elif end - start == step:
+                chunks.append("%s,%s" % (start, end))
+            else:
+                chunks.append("%s-%sx%s" % (start, end, step))
+
+        return ",".join(chunks)
+
+    def toList(self, limit=None):
+        frames = []
+        for frame in self:
+            if limit is not None and len(frames) >= limit:
+                break
+
+            frames.append(frame)
+
+        return frames
@@ -0,0 +1,632 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from PrismUtils.Decorators import err_catcher
+from PrismUtils.FrameRanges import FrameRange
+
+
+logger = logging.getLogger(__name__)
+
+
+class MediaIngest(object):
+    """Headless ingest of image sequences, AOVs and videos into media versions.
+
+    A manifest is a dict with an "items" list (or the list itself). Every item
+    creates or fills one media version:
+
+        {
+            "entity": {"type": "shot", "sequence": "sq010", "shot": "sh010"},
+            "identifier": "plate",
+            "mediaType": "2drenders",
+            "version": None,
+            "comment": "",
+            "mode": "hardlink",
+            "sources": [
+                {"path": "/plates/A001_####.exr", "aov": "rgb", "frames": "1001-1100"},
+                {"path": "/plates/A001_ref.mov"},
+            ],
+        }
+
+    "version" defaults to the next free version. A source "path" can be a
+    single file or a sequence using "#" as frame placeholders, "files" can be
+    used instead to list files explicitly. "mode" is one of "copy",
+    "hardlink" or "reference" and can also be set on the manifest.
+    """
+
+    modes = ["copy", "hardlink", "reference"]
+
+    def __init__(self, core):
+        self.core = core
+        self.maxWorkers = int(os.getenv("PRISM_INGEST_WORKERS", "8"))
+        self.executor = None
+        self.lock = threading.Lock()
+        self.canceled = False
+
+    @err_catcher(name=__name__)
+    def getExecutor(self):
+        if not self.executor:
+            self.executor = ThreadPoolExecutor(max_workers=self.maxWorkers)
+
+        return self.executor
+
+    @err_catcher(name=__name__)
+    def loadManifest(self, manifest):
+        if not isinstance(manifest, (dict, list)):
+            manifest = self.core.configs.readJson(path=manifest)
+
+        if isinstance(manifest, list):
+            manifest = {"items": manifest}
+
+        items = []
+        for item in manifest.get("items") or []:
+            item = dict(item)
+            item["entity"] = dict(item.get("entity") or {})
+            item.setdefault("mediaType", "3drenders")
+            item.setdefault("mode", manifest.get("mode", "copy"))
+            item.setdefault("comment", manifest.get("comment", ""))
+            item["sources"] = [dict(source) for source in item.get("sources") or []]
+            items.append(item)
+
+        return items
+
+    @err_catcher(name=__name__)
+    def getIngestId(self, items):
+        data = json.dumps(items, sort_keys=True, default=str)
+        return hashlib.md5(data.encode("utf-8")).hexdigest()[:16]
+
+    @err_catcher(name=__name__)
+    def getStatePath(self, ingestId):
+        return os.path.join(
+            self.core.getUserPrefDir(), "Cache", "Ingest", "ingest_%s.json" % ingestId
+        )
+
+    @err_catcher(name=__name__)
+    def loadState(self, ingestId):
+        path = self.getStatePath(ingestId)
+        if not os.path.exists(path):
+            return {}
+
+        return self.core.configs.readJson(path=path, ignoreErrors=True) or {}
+
+    @err_catcher(name=__name__)
+    def saveState(self, ingestId, state):
+        with self.lock:
+            data = dict(state)
+            data["completed"] = sorted(state["completed"])
+
+        self.core.configs.writeJson(
+            data, path=self.getStatePath(ingestId), indent=None, quiet=True
+        )
+
+    @err_catcher(name=__name__)
+    def getSourceFiles(self, source):
+        if source.get("files"):
+            return sorted(source["files"])
+
+        path = source.get("path", "")
+        if "#" in path:
+            return self.core.media.getFilesFromSequence(path)
+        elif os.path.isfile(path):
+            return [path]
+        else:
+            return []
+
+    @err_catcher(name=__name__)
+    def getSourceFrames(self, files):
+        # returns {frame: file} or None if the files are no sequence
+        if len(files) == 1 and (
+            os.path.splitext(files[0])[1].lower() in self.core.media.videoFormats
+        ):
+            return
+
+        frames = {}
+        for file in files:
+            frameStr = self.core.media.getFrameNumberFromFilename(os.path.basename(file))
+            if frameStr is None:
+                return
+
+            frames[int(frameStr)] = file
+
+        if len(frames) != len(files):
+            return
+
+        return frames
+
+    @err_catcher(name=__name__)
+    def validate(self, items):
+        # checks all sources before anything gets created and returns a list
+        # of errors and warnings
+        errors = []
+        warnings = []
+        versions = {}
+        for idx, item in enumerate(items):
+            label = "%s (item %s)" % (item.get("identifier"), idx + 1)
+            if item.get("entity", {}).get("type") not in ["asset", "shot"]:
+                errors.append("%s: invalid entity" % label)
+            elif item.get("version"):
+                key = self.getVersionStackKey(item) + (item["version"],)
+                if key in versions:
+                    errors.append(
+                        "%s: version %s is also used by item %s"
+                        % (label, item["version"], versions[key] + 1)
+                    )
+                else:
+                    versions[key] = idx
+
+            if not item.get("identifier"):
+                errors.append("%s: no identifier specified" % label)
+
+            if item["mode"] not in self.modes:
+                errors.append("%s: invalid mode \"%s\"" % (label, item["mode"]))
+
+            if not item["sources"]:
+                errors.append("%s: no sources specified" % label)
+
+            aovFrames = {}
+            for source in item["sources"]:
+                name = source.get("path") or label
+                files = self.getSourceFiles(source)
+                source["resolvedFiles"] = files
+                if not files:
+                    errors.append("%s: no files found" % name)
+                    continue
+
+                frames = self.getSourceFrames(files)
+                source["resolvedFrames"] = frames
+                if frames is None:
+                    if len(files) > 1:
+                        errors.append("%s: couldn't get the frame numbers of the files" % name)
+
+                    continue
+
+                frameRange = FrameRange.fromFrames(sorted(frames))
+                if source.get("frames"):
+                    expected = FrameRange.fromExpression(str(source["frames"]))
+                    missing = expected.difference(frameRange)
+                    if len(missing):
+                        errors.append("%s: missing frames %s" % (name, missing.toString()))
+                else:
+                    complete = FrameRange.fromExpression(
+                        "%s-%s" % (frameRange.first(), frameRange.last())
+                    )
+                    missing = complete.difference(frameRange)
+                    if len(missing) and not source.get("allowGaps"):
+                        errors.append("%s: missing frames %s" % (name, missing.toString()))
+
+                aov = source.get("aov", "")
+                if aov in aovFrames and item["mediaType"] != "externalMedia":
+                    errors.append("%s: AOV \"%s\" is used by multiple sources" % (name, aov))
+
+                aovFrames[aov] = frameRange.toString()
+
+            if len(set(aovFrames.values())) > 1:
+                warnings.append("%s: the AOVs have different frame ranges" % label)
+
+        return {"errors": errors, "warnings": warnings}
+
+    @err_catcher(name=__name__)
+    def getTargetPath(self, item, source, version, frame=None):
+        kwargs = {
+            "entity": item["entity"],
+            "task": item["identifier"],
+            "extension": os.path.splitext(source["resolvedFiles"][0])[1],
+            "version": version,
+            "comment": item["comment"],
+            "user": item.get("user") or self.core.user,
+        }
+        if frame is not None:
+            kwargs["framePadding"] = ("%%0%sd" % self.core.framePadding) % frame
+
+        if item["mediaType"] == "playblasts":
+            return self.core.mediaProducts.generatePlayblastPath(**kwargs)
+
+        kwargs["aov"] = source.get("aov") or "rgb"
+        kwargs["mediaType"] = item["mediaType"]
+        return self.core.mediaProducts.generateMediaProductPath(**kwargs)
+
+    @err_catcher(name=__name__)
+    def getExternalFolder(self, item, version):
+        context = item["entity"].copy()
+        context["mediaType"] = "externalMedia"
+        context["identifier"] = item["identifier"]
+        context["version"] = version
+        context["aov"] = "rgb"
+        context["comment"] = item["comment"]
+        key = "renderFilesAssets" if context["type"] == "asset" else "renderFilesShots"
+        path = self.core.projects.getResolvedProjectStructurePath(key, context=context)
+        return os.path.dirname(path)
+
+    @err_catcher(name=__name__)
+    def getVersionStackKey(self, item):
+        entityName = self.core.entities.getEntityName(item["entity"])
+        return (item["entity"].get("type"), entityName, item["identifier"], item["mediaType"])
+
+    @err_catcher(name=__name__)
+    def plan(self, items, versions=None):
+        # resolves the versions and target paths of all files. versions of a
+        # resumed ingest are reused, so interrupted versions get completed
+        versions = versions or {}
+        reserved = {}
+        for idx, item in enumerate(items):
+            version = versions.get(str(idx)) or item.get("version")
+            if version:
+                reserved.setdefault(self.getVersionStackKey(item), set()).add(version)
+
+        plans = []
+        for idx, item in enumerate(items):
+            version = versions.get(str(idx)) or item.get("version")
+            if not version:
+                # items of the same identifier get consecutive versions
+                context = item["entity"].copy()
+                context["identifier"] = item["identifier"]
+                context["mediaType"] = item["mediaType"]
+                version = self.core.mediaProducts.getHighestMediaVersion(context)
+                stackVersions = reserved.setdefault(self.getVersionStackKey(item), set())
+                num = self.core.products.getIntVersionFromVersionName(version)
+                while version in stackVersions and num is not None:
+                    num += 1
+                    version = self.core.versionFormat % num
+
+                stackVersions.add(version)
+
+            versions[str(idx)] = version
+            transfers = []
+            targetFolders = set()
+            if item["mediaType"] == "externalMedia":
+                folder = self.getExternalFolder(item, version)
+                targetFolders.add(folder)
+                for source in item["sources"]:
+                    for file in source["resolvedFiles"]:
+                        target = os.path.join(folder, os.path.basename(file))
+                        transfers.append([file, target])
+            else:
+                for source in item["sources"]:
+                    frames = source["resolvedFrames"]
+                    if frames:
+                        for frame in sorted(frames):
+                            target = self.getTargetPath(item, source, version, frame)
+                            transfers.append([frames[frame], target])
+                    else:
+                        for file in source["resolvedFiles"]:
+                            target = self.getTargetPath(item, source, version)
+                            transfers.append([file, target])
+
+                for transfer in transfers:
+                    targetFolders.add(os.path.dirname(transfer[1]))
+
+            plans.append(
+                {
+                    "index": idx,
+                    "item": item,
+                    "version": version,
+                    "transfers": transfers,
+                    "folders": sorted(targetFolders),
+                }
+            )
+
+        return plans
+
+    @err_catcher(name=__name__)
+    def createFolders(self, plan):
+        item = plan["item"]
+        if item["mediaType"] != "externalMedia":
+            self.core.mediaProducts.createVersion(
+                entity=item["entity"],
+                identifier=item["identifier"],
+                version=plan["version"],
+                identifierType=item["mediaType"],
+            )
+            if item["mediaType"] == "3drenders":
+                aovs = set(source.get("aov") or "rgb" for source in item["sources"])
+                for aov in sorted(aovs):
+                    self.core.mediaProducts.createAov(
+                        entity=item["entity"],
+                        identifier=item["identifier"],
+                        version=plan["version"],
+                        aov=aov,
+                    )
+
+        for folder in plan["folders"]:
+            if not os.path.exists(folder):
+                os.makedirs(folder)
+
+    def isTransferred(self, source, target, mode):
+        # used to skip files of a resumed ingest. Copies are written to a
+        # temporary file first, so an existing target is always complete
+        if not os.path.lexists(target):
+            return False
+
+        try:
+            if mode == "reference" and os.path.islink(target):
+                return os.readlink(target) == source
+
+            if os.path.samefile(source, target):
+                return True
+
+            srcStat = os.stat(source)
+            dstStat = os.stat(target)
+        except OSError:
+            return False
+
+        return srcStat.st_size == dstStat.st_size and int(srcStat.st_mtime) == int(
+            dstStat.st_mtime
+        )
+
+    def copyFile(self, source, target):
+        tmpPath = target + ".ingest"
+        shutil.copy2(source, tmpPath)
+        os.replace(tmpPath, target)
+
+    def linkFile(self, source, target):
+        try:
+            os.link(source, target)
+        except OSError as e:
+            # hardlinks don't work across devices or on some network shares
+            logger.debug("couldn't create hardlink, copying instead: %s (%s)" % (target, e))
+            self.copyFile(source, target)
+            return "copy"
+
+        return "hardlink"
+
+    def referenceFile(self, source, target):
+        try:
+            os.symlink(source, target)
+        except (OSError, NotImplementedError, AttributeError) as e:
+            logger.debug("couldn't create symlink, linking instead: %s (%s)" % (target, e))
+            return self.linkFile(source, target)
+
+        return "reference"
+
+    def transferFile(self, source, target, mode="copy"):
+        # executed in worker threads, returns the transfer method used
+        if self.canceled:
+            return
+
+        if os.path.lexists(target):
+            if self.isTransferred(source, target, mode):
+                return "skipped"
+
+            os.remove(target)
+
+        if mode == "hardlink":
+            return self.linkFile(source, target)
+        elif mode == "reference":
+            return self.referenceFile(source, target)
+        else:
+            self.copyFile(source, target)
+            return "copy"
+
+    @err_catcher(name=__name__)
+    def transferFiles(
+        self, transfers, mode="copy", fileCallback=None, progressCallback=None
+    ):
+        """Transfers [source, target] pairs on the worker pool.
+
+        Blocks until all files are done while calling the callbacks on the
+        calling thread. Returns a dict with the transferred targets and errors.
+        """
+        executor = self.getExecutor()
+        futures = {}
+        for source, target in transfers:
+            future = executor.submit(self.transferFile, source, target, mode)
+            futures[future] = [source, target]
+
+        result = {"transferred": [], "skipped": [], "fallbacks": [], "errors": []}
+        pending = set(futures)
+        total = len(futures)
+        while pending:
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                source, target = futures[future]
+                try:
+                    method = future.result()
+                except Exception as e:
+                    result["errors"].append("%s: %s" % (source, e))
+                    continue
+
+                if method is None:
+                    continue
+                elif method == "skipped":
+                    result["skipped"].append(target)
+                else:
+                    result["transferred"].append(target)
+                    if method != mode:
+                        result["fallbacks"].append(target)
+
+                if fileCallback:
+                    fileCallback(source, target)
+
+            if progressCallback:
+                numDone = total - len(pending)
+                progressCallback(numDone, total)
+
+            if self.canceled:
+                for future in pending:
+                    future.cancel()
+
+        return result
+
+    @err_catcher(name=__name__)
+    def cancel(self):
+        self.canceled = True
+
+    @err_catcher(name=__name__)
+    def writeVersionInfo(self, plan):
+        item = plan["item"]
+        if not plan["transfers"]:
+            return
+
+        details = item["entity"].copy()
+        details["identifier"] = item["identifier"]
+        details["version"] = plan["version"]
+        details["comment"] = item["comment"]
+        details["user"] = item.get("user") or self.core.user
+        details["extension"] = os.path.splitext(plan["transfers"][0][1])[1]
+        details["ingest"] = {
+            "mode": item["mode"],
+            "sources": [source.get("path") or source.get("files") for source in item["sources"]],
+        }
+
+        if item["mediaType"] == "externalMedia":
+            infoFolder = plan["folders"][0]
+        else:
+            infoPath = self.core.mediaProducts.getMediaVersionInfoPathFromFilepath(
+                plan["transfers"][0][1], mediaType=item["mediaType"]
+            )
+            infoFolder = os.path.dirname(infoPath)
+
+        self.core.saveVersionInfo(filepath=infoFolder, details=details)
+
+    @err_catcher(name=__name__)
+    def ingest(self, manifest, resume=True, progressCallback=None):
+        """Ingests all items of a manifest and returns a result dict.
+
+        Nothing gets created if the validation fails. The progress of the
+        ingest is saved in the user cache, so running the same manifest again
+        after an interruption only transfers the missing files.
+        """
+        self.canceled = False
+        items = self.loadManifest(manifest)
+        ingestId = self.getIngestId(items)
+        validation = self.validate(items)
+        for warning in validation["warnings"]:
+            logger.warning(warning)
+
+        if validation["errors"]:
+            return {"result": "invalid", "errors": validation["errors"]}
+
+        state = self.loadState(ingestId) if resume else {}
+        if state.get("finished"):
+            state = {}
+
+        plans = self.plan(items, versions=state.get("versions"))
+        state = {
+            "versions": {str(plan["index"]): plan["version"] for plan in plans},
+            "completed": set(state.get("completed") or []),
+            "versionInfos": list(state.get("versionInfos") or []),
+            "finished": False,
+        }
+        self.saveState(ingestId, state)
+
+        total = sum(len(plan["transfers"]) for plan in plans)
+        numDone = [0]
+        lastSave = [time.time()]
+
+        def onFileTransferred(source, target):
+            with self.lock:
+                state["completed"].add(target)
+
+            numDone[0] += 1
+            if progressCallback:
+                progressCallback(numDone[0], total)
+
+            if time.time() - lastSave[0] > 2:
+                self.saveState(ingestId, state)
+                lastSave[0] = time.time()
+
+        result = {"result": "success", "versions": [], "errors": [], "fallbacks": 0, "skipped": 0}
+        for plan in plans:
+            item = plan["item"]
+            self.createFolders(plan)
+            if item["mediaType"] == "externalMedia" and item["mode"] == "reference":
+                self.writeRedirect(plan)
+                transfers = []
+            else:
+                transfers = [
+                    transfer for transfer in plan["transfers"]
+                    if transfer[1] not in state["completed"] or not os.path.lexists(transfer[1])
+                ]
+                numDone[0] += len(plan["transfers"]) - len(transfers)
+
+            transferResult = self.transferFiles(
+                transfers, mode=item["mode"], fileCallback=onFileTransferred
+            )
+            result["errors"] += transferResult["errors"]
+            result["fallbacks"] += len(transferResult["fallbacks"])
+            result["skipped"] += len(transferResult["skipped"])
+            if self.canceled:
+                result["result"] = "canceled"
+                break
+
+            if transferResult["errors"]:
+                continue
+
+            versionKey = str(plan["index"])
+            if versionKey not in state["versionInfos"]:
+                self.writeVersionInfo(plan)
+                state["versionInfos"].append(versionKey)
+
+            result["versions"].append(
+                {
+                    "identifier": item["identifier"],
+                    "version": plan["version"],
+                    "mediaType": item["mediaType"],
+                    "files": [transfer[1] for transfer in plan["transfers"]],
+                }
+            )
+
+        if result["errors"] and result["result"] == "success":
+            result["result"] = "failed"
+
+        state["finished"] = result["result"] == "success"
+        self.saveState(ingestId, state)
+        self.core.mediaProducts.clearMediaFolderCache()
+        logger.debug(
+            "ingested %s versions (%s files, %s skipped, %s errors)"
+            % (len(result["versions"]), total, result["skipped"], len(result["errors"]))
+        )
+        return result
+
+    @err_catcher(name=__name__)
+    def writeRedirect(self, plan):
+        sources = []
+        for source in plan["item"]["sources"]:
+            if source.get("path"):
+                sources.append(source["path"])
+            else:
+                sources += source["resolvedFiles"]
+
+        redirectFile = os.path.join(plan["folders"][0], "REDIRECT.txt")
+        with open(redirectFile, "w") as rfile:
+            rfile.write(os.pathsep.join(sources))
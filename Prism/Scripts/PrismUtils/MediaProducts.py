@@ -39,7 +39,6 @@ import platform
 import shutil
 import glob
 import errno
-import time
 
 from qtpy.QtCore import *
 from qtpy.QtGui import *
@@ -54,6 +53,7 @@ logger = logging.getLogger(__name__)
 class MediaProducts(object):
     def __init__(self, core):
         self.core = core
+        self.mediaFolderCache = {}
 
     @err_catcher(name=__name__)
     def createExternalMedia(self, filepath, entity, identifier, version, action="copy"):
@@ -80,14 +80,20 @@ class MediaProducts(object):
             os.makedirs(folderpath)
 
         files = filepath.split(os.pathsep)
+        transfers = []
         for file in files:
             try:
-                if action == "copy":
+                if action in ["copy", "hardlink"]:
                     if os.path.isdir(file):
                         os.rmdir(folderpath)
-                        shutil.copytree(file, folderpath)
+                        if action == "hardlink":
+                            copyFunction = lambda src, dst: self.core.mediaIngest.linkFile(src, dst)
+                        else:
+                            copyFunction = shutil.copy2
+
+                        shutil.copytree(file, folderpath, copy_function=copyFunction)
                     else:
-                        shutil.copy2(file, folderpath)
+                        transfers.append([file, os.path.join(folderpath, os.path.basename(file))])
                 elif action == "move":
                     shutil.move(file, folderpath)
                 elif action == "link":
@@ -100,6 +106,13 @@ class MediaProducts(object):
                 self.core.popup(msg)
                 continue
 
+        if transfers:
+            self.core.mediaIngest.canceled = False
+            result = self.core.mediaIngest.transferFiles(transfers, mode=action)
+            if result["errors"]:
+                msg = "Failed to add external media:\n\n%s" % "\n".join(result["errors"])
+                self.core.popup(msg)
+
         return folderpath
 
     @err_catcher(name=__name__)
@@ -194,7 +207,7 @@ class MediaProducts(object):
         return path
 
     @err_catcher(name=__name__)
-    def getVersionsFromIdentifier(self, identifier, locations=None):
+    def getVersionsFromIdentifier(self, identifier, locations=None, cached=False):
         locationData = self.core.paths.getRenderProductBasePaths()
         searchLocations = []
         for locData in locationData:
@@ -211,7 +224,7 @@ class MediaProducts(object):
                 del context["paths"]
 
             context["project_path"] = locationData[loc]
-            locVersions = self.getVersionsFromContext(context)
+            locVersions = self.getVersionsFromContext(context, cached=cached)
             for locVersion in locVersions:
                 locVersion["paths"] = [locVersion.get("path")]
                 for version in versions:
@@ -255,7 +268,12 @@ class MediaProducts(object):
         return versionData
 
     @err_catcher(name=__name__)
-    def getVersionsFromContext(self, context, keys=None):
+    def getVersionsFromContext(self, context, keys=None, cached=False):
+        if cached:
+            result = self.core.trayQueries.query("getMediaVersions", context=context, keys=keys)
+            if result is not None:
+                return result
+
         if context.get("mediaType") == "playblasts":
             key = "playblastVersions"
         else:
@@ -434,6 +452,10 @@ class MediaProducts(object):
 
         mediaInfo["comment"] = comment
         self.core.setConfig(data=mediaInfo, configPath=infoPath)
+        self.core.journal.addEvent(
+            "metadataChanged",
+            {"path": infoPath, "versionInfo": infoPath, "key": "comment"},
+        )
 
     @err_catcher(name=__name__)
     def getLatestVersionFromVersions(self, versions, includeMaster=True):
@@ -627,39 +649,14 @@ class MediaProducts(object):
             )
 
             productData = self.core.projects.getMatchingPaths(template)
-            for data in productData:
-                if ignoreEmpty:
-                    if ignoreFolder:
-                        files = None
-                        for root, folders, files in os.walk(data["path"]):
-                            break
-                        
-                        if not files:
-                            continue
-
-                    else:
-                        if not os.path.isdir(data["path"]):
-                            continue
+            if ignoreEmpty:
+                productData = self.getNonEmptyMediaVersions(
+                    productData,
+                    mediaType=ctx.get("mediaType"),
+                    ignoreFolder=ignoreFolder,
+                )
 
-                    if ctx.get("mediaType") == "2drenders":
-                        exFiles = os.listdir(data["path"])
-                        if len(exFiles) > 1 or (
-                            len(exFiles) == 1 and not exFiles[0].startswith("versioninfo")
-                        ):
-                            validData.append(data)
-                    else:
-                        for folder in os.listdir(data["path"]):
-                            path = os.path.join(data["path"], folder)
-                            if not os.path.isdir(path):
-                                continue
-
-                            exFiles = os.listdir(path)
-                            if len(exFiles) > 1 or (
-                                len(exFiles) == 1 and not exFiles[0].startswith("versioninfo")
-                            ):
-                                validData.append(data)
-                else:
-                    validData.append(data)
+            validData += productData
 
         highversion = None
         for data in validData:
@@ -679,6 +676,80 @@ class MediaProducts(object):
             else:
                 return self.core.versionFormat % (highversion + 1)
 
+    @err_catcher(name=__name__)
+    def getNonEmptyMediaVersions(self, versions, mediaType=None, ignoreFolder=False):
+        validVersions = []
+        for version in versions:
+            if self.isMediaVersionNonEmpty(
+                version["path"], mediaType=mediaType, ignoreFolder=ignoreFolder
+            ):
+                validVersions.append(version)
+
+        return validVersions
+
+    @err_catcher(name=__name__)
+    def isMediaVersionNonEmpty(self, path, mediaType=None, ignoreFolder=False):
+        if ignoreFolder:
+            if not self.folderContainsFiles(path, ignoreVersioninfo=False):
+                return False
+
+        elif not os.path.isdir(path):
+            return False
+
+        if mediaType == "2drenders":
+            return self.folderContainsFiles(path)
+
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            return False
+
+        for entry in entries:
+            try:
+                if not entry.is_dir():
+                    continue
+
+                mtime = entry.stat().st_mtime
+            except OSError:
+                continue
+
+            if self.folderContainsFiles(entry.path, mtime=mtime):
+                return True
+
+        return False
+
+    @err_catcher(name=__name__)
+    def folderContainsFiles(self, path, mtime=None, ignoreVersioninfo=True):
+        if mtime is None:
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                return False
+
+        cacheKey = (os.path.normpath(path), ignoreVersioninfo)
+        cacheData = self.mediaFolderCache.get(cacheKey)
+        if cacheData and cacheData["modtime"] == mtime:
+            return cacheData["result"]
+
+        result = False
+        try:
+            for entry in os.scandir(path):
+                if ignoreVersioninfo and entry.name.startswith("versioninfo"):
+                    continue
+
+                if ignoreVersioninfo or not entry.is_dir():
+                    result = True
+                    break
+        except OSError:
+            return False
+
+        self.mediaFolderCache[cacheKey] = {"modtime": mtime, "result": result}
+        return result
+
+    @err_catcher(name=__name__)
+    def clearMediaFolderCache(self):
+        self.mediaFolderCache = {}
+
     @err_catcher(name=__name__)
     def getVersionFromFilepath(self, path):
         data = self.getDataFromFilepath(path)
@@ -936,6 +1007,10 @@ class MediaProducts(object):
             "versionpaths", val=masterVersions, configPath=masterInfoPath
         )
         self.core.media.invalidateOiioCache()
+        self.core.journal.addEvent(
+            "masterUpdated",
+            {"path": masterInfoPath, "source": path, "versionInfo": masterInfoPath},
+        )
         return masterPath
 
     @err_catcher(name=__name__)
@@ -1059,7 +1134,7 @@ class MediaProducts(object):
                 shutil.rmtree(vpath)
             except Exception as e:
                 if self.core.pb and allowClear:
-                    self.core.pb.mediaBrowser.lw_version.clearSelection()
+                    self.core.runInMainThread(self.core.pb.mediaBrowser.lw_version.clearSelection)
                     return self.deleteMasterVersion(path, isFilepath=isFilepath, mediaType=mediaType, allowClear=False, allowRename=allowRename)
 
                 if allowRename:
@@ -1069,7 +1144,8 @@ class MediaProducts(object):
 
                 logger.warning(e)
                 msg = "Couldn't remove the existing master version:\n\n%s" % (str(e))
-                result = self.core.popupQuestion(
+                result = self.core.runInMainThread(
+                    self.core.popupQuestion,
                     msg,
                     buttons=["Retry", "Don't delete master version"],
                     icon=QMessageBox.Warning,
@@ -1083,7 +1159,7 @@ class MediaProducts(object):
 
     @err_catcher(name=__name__)
     def addToMasterVersion(self, path=None, context=None, isFilepath=True, mediaType=None):
-        self.updateMasterVersion(
+        return self.updateMasterVersion(
             path=path, context=context, isFilepath=isFilepath, add=True, mediaType=mediaType
         )
 
@@ -1218,7 +1294,7 @@ class MediaProducts(object):
 
         self.ingestedFiles = []
         self.ingestCanceled = False
-        self.ingestThreads = []
+        transfers = []
         with self.copyMsg as copyMsg:
             for idx, file in enumerate(files):
                 if self.ingestCanceled:
@@ -1277,10 +1353,17 @@ class MediaProducts(object):
                     QApplication.processEvents()
 
                 targetPath = targetPath.replace("\\", "/")
-                copyThread = self.core.copyWithProgress(file, targetPath, popup=False, start=False)
-                self.ingestThreads.append(copyThread)
-                copyThread.finished.connect(lambda t=copyThread, tp=targetPath: self.onMediaFileIngested(t, tp, len(files)))
-                copyThread.start()
+                transfers.append([file, targetPath])
+
+            self.core.mediaIngest.canceled = False
+            result = self.core.mediaIngest.transferFiles(
+                transfers,
+                fileCallback=lambda src, tp: self.onMediaFileIngested(tp, len(files)),
+                progressCallback=lambda done, total: QApplication.processEvents(),
+            )
+            if result["errors"]:
+                msg = "Failed to ingest media:\n\n%s" % "\n".join(result["errors"])
+                self.core.popup(msg)
 
             details = entity.copy()
             details["identifier"] = identifier
@@ -1291,14 +1374,11 @@ class MediaProducts(object):
 
             infoPath = self.getMediaVersionInfoPathFromFilepath(targetPath, mediaType=mediaType)
             self.core.saveVersionInfo(filepath=os.path.dirname(infoPath), details=details)
-            while (len(self.ingestedFiles) != len(files)) and not self.ingestCanceled:
-                time.sleep(0.1)
-                QApplication.processEvents()
 
         return {"result": self.ingestedFiles, "versionAdded": False}
 
     @err_catcher(name=__name__)
-    def onMediaFileIngested(self, thread, targetPath, numFiles):
+    def onMediaFileIngested(self, targetPath, numFiles):
         self.ingestedFiles.append(targetPath)
         logger.debug("ingested media: %s" % targetPath)
         baseTxt = "Copying file - please wait..\n\n"
@@ -1314,9 +1394,7 @@ class MediaProducts(object):
     @err_catcher(name=__name__)
     def onIngestCanceled(self):
         self.ingestCanceled = True
-        for thread in self.ingestThreads:
-            if thread.isRunning():
-                thread.cancel()
+        self.core.mediaIngest.cancel()
 
     @err_catcher(name=__name__)
     def checkMasterVersions(self, entities, parent=None):
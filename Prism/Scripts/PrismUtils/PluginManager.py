@@ -34,6 +34,8 @@
 
 import os
 import sys
+import ast
+import time
 import shutil
 import platform
 import logging
@@ -54,6 +56,8 @@ class PluginManager(object):
         self.core = core
         self.monkeyPatchedFunctions = {}
         self.ignoreAutoLoadPlugins = [name.strip() for name in os.getenv("PRISM_IGNORE_AUTOLOAD_PLUGINS", "").split(",")]
+        self.manifestCache = None
+        self.manifestCacheDirty = False
 
     @err_catcher(name=__name__)
     def initializePlugins(self, appPlugin):
@@ -88,6 +92,7 @@ class PluginManager(object):
             force=False,
             ignore=[appPlugs[0]["name"]],
         )
+        self.saveManifestCache()
         self.core.callback("onPluginsLoaded")
         if self.core.splashScreen:
             self.core.splashScreen.setStatus("plugins loaded...")
@@ -238,9 +243,12 @@ class PluginManager(object):
         sys.path.append(pluginPath)
         self.core.appPlugin = None
         try:
-            appPlug = getattr(
-                __import__("Prism_%s_init" % pluginName), "Prism_Plugin_%s" % pluginName
-            )(self.core)
+            start = time.time()
+            module = __import__("Prism_%s_init" % pluginName)
+            importTime = time.time()
+            appPlug = getattr(module, "Prism_Plugin_%s" % pluginName)(self.core)
+            self.core.startupProfiler.addPluginTiming(pluginName, "import", importTime - start)
+            self.core.startupProfiler.addPluginTiming(pluginName, "init", time.time() - importTime)
         except Exception as e:
             logger.warning(traceback.format_exc())
             msg = "Failed to load app plugin.\nPlease contact the support.\n\n%s" % e
@@ -345,6 +353,7 @@ class PluginManager(object):
                             foundPluginPaths.append(path)
                         break
 
+        notAutoLoadedPlugins = self.getNotAutoLoadPlugins()
         for pluginPath in foundPluginPaths:
             if pluginPath.endswith(".py"):
                 if loadPlugins:
@@ -362,7 +371,14 @@ class PluginManager(object):
                 if self.isPluginLoaded(pluginName):
                     continue
 
-            result.append(self.loadPlugin(pluginPath, force=force))
+            result.append(
+                self.loadPlugin(
+                    pluginPath,
+                    force=force,
+                    lazy=not force and self.useLazyPlugins(),
+                    notAutoLoadedPlugins=notAutoLoadedPlugins,
+                )
+            )
 
         return result
 
@@ -397,30 +413,58 @@ class PluginManager(object):
             if not os.path.exists(dr):
                 continue
 
-            for root, dirs, files in os.walk(dr):
-                if "Scripts" in dirs:
-                    dirs[:] = ["Scripts"]
+            for pData in self.getPluginsInDirectory(dr, recursive=recursive):
+                if pluginNames and pData["name"] not in pluginNames:
                     continue
 
-                dirs[:] = [d for d in dirs if d[0] not in [".", "_"]]
-                for f in files:
-                    if not f.endswith("_init.py"):
-                        continue
+                result.append(dict(pData))
 
-                    dirs[:] = []
-                    path = os.path.dirname(root)
-                    pluginName = os.path.basename(path)
-                    if pluginNames and pluginName not in pluginNames:
-                        continue
+        return result
 
-                    pData = {"name": pluginName, "path": path}
-                    result.append(pData)
+    @err_catcher(name=__name__)
+    def getPluginsInDirectory(self, directory, recursive=True):
+        cache = self.getManifestCache()
+        key = "%s|%s" % (os.path.normpath(directory), int(bool(recursive)))
+        cacheData = cache["searches"].get(key)
+        if cacheData:
+            for path, modtime in cacheData["folders"].items():
+                try:
+                    if os.stat(path).st_mtime != modtime:
+                        break
+                except OSError:
                     break
+            else:
+                return cacheData["plugins"]
 
-                if not recursive:
-                    break
+        plugins = []
+        folders = {}
+        for root, dirs, files in os.walk(directory):
+            if "Scripts" in dirs:
+                dirs[:] = ["Scripts"]
+                continue
 
-        return result
+            if os.path.basename(root) != "Scripts":
+                try:
+                    folders[root] = os.stat(root).st_mtime
+                except OSError:
+                    pass
+
+            dirs[:] = [d for d in dirs if d[0] not in [".", "_"]]
+            for f in files:
+                if not f.endswith("_init.py"):
+                    continue
+
+                dirs[:] = []
+                path = os.path.dirname(root)
+                plugins.append({"name": os.path.basename(path), "path": path})
+                break
+
+            if not recursive:
+                break
+
+        cache["searches"][key] = {"folders": folders, "plugins": plugins}
+        self.manifestCacheDirty = True
+        return plugins
 
     @err_catcher(name=__name__)
     def activatePlugin(self, path):
@@ -435,7 +479,15 @@ class PluginManager(object):
         return self.loadPlugin(path)
 
     @err_catcher(name=__name__)
-    def loadPlugin(self, path=None, name=None, force=True, activate=None):
+    def loadPlugin(
+        self,
+        path=None,
+        name=None,
+        force=True,
+        activate=None,
+        lazy=False,
+        notAutoLoadedPlugins=None,
+    ):
         if not path:
             if name:
                 path = self.searchPluginPath(name)
@@ -454,7 +506,8 @@ class PluginManager(object):
         else:
             location = "custom"
 
-        notAutoLoadedPlugins = self.getNotAutoLoadPlugins()
+        if notAutoLoadedPlugins is None:
+            notAutoLoadedPlugins = self.getNotAutoLoadPlugins()
 
         if path.endswith(".py"):
             dirpath = os.path.dirname(path)
@@ -531,9 +584,15 @@ class PluginManager(object):
                 )
                 return
 
+            if lazy:
+                manifest = self.getPluginManifest(path)
+                if manifest and manifest["lazy"]:
+                    return self.registerLazyPlugin(manifest, path, location)
+
         if os.path.dirname(initPath) not in sys.path:
             sys.path.append(os.path.dirname(initPath))
 
+        start = time.time()
         try:
             if path.endswith(".py"):
                 plugModule = __import__(pluginName)
@@ -560,17 +619,17 @@ class PluginManager(object):
                 else:
                     classname = "Prism_%s" % pluginName
 
+                importTime = time.time()
                 pPlug = getattr(plugModule, classname)(self.core)
                 pPlug.pluginName = pluginName
             elif os.path.exists(initPath.replace("_init", "_init_unloaded")):
-                pPlug = getattr(
-                    __import__("Prism_%s_init_unloaded" % (pluginName)),
-                    "Prism_%s_unloaded" % pluginName,
-                )(self.core)
+                plugModule = __import__("Prism_%s_init_unloaded" % (pluginName))
+                importTime = time.time()
+                pPlug = getattr(plugModule, "Prism_%s_unloaded" % pluginName)(self.core)
             else:
-                pPlug = getattr(
-                    __import__("Prism_%s_init" % (pluginName)), "Prism_%s" % pluginName
-                )(self.core)
+                plugModule = __import__("Prism_%s_init" % (pluginName))
+                importTime = time.time()
+                pPlug = getattr(plugModule, "Prism_%s" % pluginName)(self.core)
         except:
             msg = "Failed to load plugin: %s" % pluginName
             detailMsg = msg + "\n\n" + traceback.format_exc()
@@ -593,6 +652,9 @@ class PluginManager(object):
             self.core.unloadedPlugins[pluginName] = UnloadedPlugin(self.core, pluginName, path=pluginPath, location=location)
             return
 
+        self.core.startupProfiler.addPluginTiming(pluginName, "import", importTime - start)
+        self.core.startupProfiler.addPluginTiming(pluginName, "init", time.time() - importTime)
+
         if hasattr(pPlug, "platforms") and platform.system() not in pPlug.platforms:
             logger.debug(
                 "skipped loading plugin %s - plugin doesn't support this OS"
@@ -680,6 +742,224 @@ class PluginManager(object):
         logger.debug("loaded plugin metadata %s" % pPlug.pluginName)
         return pPlug
 
+    @err_catcher(name=__name__)
+    def useLazyPlugins(self):
+        if os.getenv("PRISM_LAZY_PLUGINS", "1") == "0":
+            return False
+
+        return self.core.getConfig("plugins", "lazyLoading", dft=True)
+
+    @err_catcher(name=__name__)
+    def getManifestCachePath(self):
+        return os.path.join(self.core.getUserPrefDir(), "Cache", "pluginManifests.json")
+
+    @err_catcher(name=__name__)
+    def getManifestCache(self):
+        if self.manifestCache is None:
+            cachePath = self.getManifestCachePath()
+            data = {}
+            if os.path.exists(cachePath):
+                data = self.core.configs.readJson(path=cachePath, ignoreErrors=True) or {}
+
+            self.manifestCache = {
+                "plugins": data.get("plugins", {}),
+                "searches": data.get("searches", {}),
+            }
+
+        return self.manifestCache
+
+    @err_catcher(name=__name__)
+    def saveManifestCache(self):
+        if not self.manifestCacheDirty:
+            return
+
+        self.core.configs.writeJson(
+            self.manifestCache, path=self.getManifestCachePath(), indent=None, quiet=True
+        )
+        self.manifestCacheDirty = False
+
+    @err_catcher(name=__name__)
+    def getPluginSignature(self, path):
+        pluginName = os.path.basename(path)
+        scriptPath = os.path.join(path, "Scripts")
+        signature = []
+        try:
+            entries = list(os.scandir(scriptPath))
+        except OSError:
+            return
+
+        for entry in entries:
+            if entry.name.startswith("Prism_%s_" % pluginName) and entry.name.endswith(".py"):
+                signature.append([entry.name, entry.stat().st_mtime])
+
+        return sorted(signature)
+
+    @err_catcher(name=__name__)
+    def getPluginManifest(self, path):
+        path = os.path.normpath(path)
+        signature = self.getPluginSignature(path)
+        if not signature:
+            return
+
+        cache = self.getManifestCache()
+        manifest = cache["plugins"].get(path)
+        if manifest and manifest["signature"] == signature:
+            return manifest
+
+        manifest = self.createPluginManifest(path)
+        manifest["signature"] = signature
+        cache["plugins"][path] = manifest
+        self.manifestCacheDirty = True
+        return manifest
+
+    @err_catcher(name=__name__)
+    def createPluginManifest(self, path):
+        pluginName = os.path.basename(path)
+        scriptPath = os.path.join(path, "Scripts")
+        initModule = "Prism_%s_init_unloaded" % pluginName
+        if not os.path.exists(os.path.join(scriptPath, initModule + ".py")):
+            initModule = "Prism_%s_init" % pluginName
+
+        manifest = {
+            "name": pluginName,
+            "entryPoint": initModule,
+            "attributes": {},
+            "callbacks": [],
+            "lazy": False,
+        }
+        initTree = self.parsePluginModule(os.path.join(scriptPath, initModule + ".py"))
+        if not initTree:
+            return manifest
+
+        modules = []
+        for node in initTree.body:
+            if not isinstance(node, ast.ImportFrom) or not node.module:
+                continue
+
+            if node.module.startswith("Prism_%s_" % pluginName):
+                modules.append(node.module)
+
+        lazy = True
+        for module in modules:
+            tree = self.parsePluginModule(os.path.join(scriptPath, module + ".py"))
+            if not tree:
+                lazy = False
+                continue
+
+            for node in ast.walk(tree):
+                if not isinstance(node, ast.FunctionDef) or node.name != "__init__":
+                    continue
+
+                lazy = self.parsePluginInit(node.body, manifest) and lazy
+
+        attributes = manifest["attributes"]
+        lazy = lazy and attributes.get("pluginType") == "App"
+        for key in ["pluginName", "sceneFormats", "appShortName"]:
+            if key not in attributes:
+                lazy = False
+
+        manifest["lazy"] = lazy
+        return manifest
+
+    @err_catcher(name=__name__)
+    def parsePluginModule(self, path):
+        try:
+            with open(path, "r") as f:
+                return ast.parse(f.read(), filename=path)
+        except Exception as e:
+            logger.debug("failed to parse plugin module %s: %s" % (path, e))
+
+    @err_catcher(name=__name__)
+    def parsePluginInit(self, statements, manifest):
+        # returns False if the init does anything besides setting attributes
+        # and registering callbacks, in which case the plugin can't be deferred
+        lazy = True
+        for node in statements:
+            if isinstance(node, ast.If):
+                lazy = self.parsePluginInit(node.body, manifest) and lazy
+                lazy = self.parsePluginInit(node.orelse, manifest) and lazy
+            elif isinstance(node, ast.Assign):
+                if len(node.targets) != 1 or not self.isSelfAttribute(node.targets[0]):
+                    continue
+
+                name = node.targets[0].attr
+                if self.isSelfAttribute(node.value):
+                    if node.value.attr in manifest["attributes"]:
+                        manifest["attributes"][name] = manifest["attributes"][node.value.attr]
+
+                    continue
+
+                try:
+                    manifest["attributes"][name] = ast.literal_eval(node.value)
+                except (ValueError, SyntaxError, TypeError):
+                    continue
+            elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Call):
+                callback = self.parseCallbackRegistration(node.value)
+                if callback:
+                    manifest["callbacks"].append(callback)
+                else:
+                    lazy = False
+            elif not isinstance(node, (ast.Pass, ast.AugAssign)):
+                lazy = False
+
+        return lazy
+
+    @err_catcher(name=__name__)
+    def isSelfAttribute(self, node):
+        return (
+            isinstance(node, ast.Attribute)
+            and isinstance(node.value, ast.Name)
+            and node.value.id == "self"
+        )
+
+    @err_catcher(name=__name__)
+    def parseCallbackRegistration(self, node):
+        func = node.func
+        if not isinstance(func, ast.Attribute) or func.attr != "registerCallback":
+            return
+
+        if len(node.args) < 2 or not self.isSelfAttribute(node.args[1]):
+            return
+
+        try:
+            name = ast.literal_eval(node.args[0])
+            priority = 50
+            if len(node.args) > 2:
+                priority = ast.literal_eval(node.args[2])
+
+            for keyword in node.keywords:
+                if keyword.arg == "priority":
+                    priority = ast.literal_eval(keyword.value)
+        except (ValueError, SyntaxError, TypeError):
+            return
+
+        return {"name": name, "function": node.args[1].attr, "priority": priority}
+
+    @err_catcher(name=__name__)
+    def registerLazyPlugin(self, manifest, path, location):
+        platforms = manifest["attributes"].get("platforms")
+        if platforms and platform.system() not in platforms:
+            logger.debug(
+                "skipped loading plugin %s - plugin doesn't support this OS"
+                % manifest["name"]
+            )
+            return
+
+        start = time.time()
+        pPlug = LazyPlugin(self.core, manifest, path, location)
+        if pPlug.pluginName in self.core.unloadedPlugins:
+            self.core.unloadedPlugins.pop(pPlug.pluginName)
+
+        self.core.unloadedAppPlugins[pPlug.pluginName] = pPlug
+        pPlug.registerCallbacks()
+        self.core.startupProfiler.addPluginTiming(pPlug.pluginName, "deferred", time.time() - start)
+
+        if self.core.pb:
+            self.core.pb.sceneBrowser.refreshAppFilters()
+
+        logger.debug("registered lazy plugin %s" % pPlug.pluginName)
+        return pPlug
+
     @err_catcher(name=__name__)
     def reloadPlugins(self, plugins=None):
         appPlug = self.core.appPlugin.pluginName
@@ -1550,3 +1830,62 @@ class UnloadedPlugin(object):
         self.pluginType = ""
         self.appShortName = ""
         self.location = location
+
+
+class LazyPlugin(object):
+    def __init__(self, core, manifest, path, location=""):
+        self.core = core
+        self.loadedPlugin = None
+        self.loadFailed = False
+        self.version = ""
+        self.manifest = manifest
+        for key, value in manifest["attributes"].items():
+            setattr(self, key, value)
+
+        self.pluginName = manifest["name"]
+        self.pluginRoot = path
+        self.pluginPath = os.path.join(path, "Scripts")
+        self.location = location
+
+    def __getattr__(self, name):
+        if name.startswith("__") or self.__dict__.get("loadFailed", True):
+            raise AttributeError(name)
+
+        plugin = self.loadPlugin()
+        if not plugin:
+            raise AttributeError(name)
+
+        return getattr(plugin, name)
+
+    def registerCallbacks(self):
+        for callback in self.manifest["callbacks"]:
+            self.core.registerCallback(
+                callback["name"],
+                self.getCallbackProxy(callback["function"]),
+                priority=callback["priority"],
+                plugin=self,
+            )
+
+    def getCallbackProxy(self, functionName):
+        def proxy(*args, **kwargs):
+            plugin = self.loadPlugin()
+            if not plugin:
+                return
+
+            return getattr(plugin, functionName)(*args, **kwargs)
+
+        return proxy
+
+    def loadPlugin(self):
+        if self.loadedPlugin or self.loadFailed:
+            return self.loadedPlugin
+
+        logger.debug("loading deferred plugin %s" % self.pluginName)
+        self.loadFailed = True
+        self.core.callbacks.unregisterPluginCallbacks(self)
+        if self.core.unloadedAppPlugins.get(self.pluginName) is self:
+            self.core.unloadedAppPlugins.pop(self.pluginName)
+
+        self.loadedPlugin = self.core.plugins.loadPlugin(self.pluginRoot)
+        self.loadFailed = not self.loadedPlugin
+        return self.loadedPlugin
@@ -148,7 +148,7 @@ class Products(object):
         return versionData
 
     @err_catcher(name=__name__)
-    def getVersionsFromProduct(self, entity, product, locations="all"):
+    def getVersionsFromProduct(self, entity, product, locations="all", cached=False):
         if locations == "all":
             locations = self.core.paths.getExportProductBasePaths()
 
@@ -166,7 +166,9 @@ class Products(object):
 
             context["product"] = product
             context["project_path"] = locations[loc]
-            locVersions = self.getVersionsFromContext(context, locations={loc: locations[loc]})
+            locVersions = self.getVersionsFromContext(
+                context, locations={loc: locations[loc]}, cached=cached
+            )
             for locVersion in locVersions:
                 locVersion["paths"] = [locVersion.get("path")]
                 for version in versions:
@@ -203,7 +205,16 @@ class Products(object):
         return self.getVersionsFromContext(context)
 
     @err_catcher(name=__name__)
-    def getVersionsFromContext(self, context, locations=None):
+    def getVersionsFromContext(self, context, locations=None, cached=False):
+        # cached results are answered by the PrismTray and can be a few
+        # seconds old. Only used for browsing, not to find new version names
+        if cached:
+            result = self.core.trayQueries.query(
+                "getProductVersions", context=context, locations=locations
+            )
+            if result is not None:
+                return result
+
         locationData = self.core.paths.getExportProductBasePaths()
         searchLocations = []
         for locData in locationData:
@@ -657,6 +668,10 @@ class Products(object):
 
         versionInfo["comment"] = comment
         self.core.setConfig(data=versionInfo, configPath=infoPath)
+        self.core.journal.addEvent(
+            "metadataChanged",
+            {"path": versionPath, "versionInfo": infoPath, "key": "comment"},
+        )
 
     @err_catcher(name=__name__)
     def updateMasterVersion(self, path):
@@ -778,7 +793,13 @@ class Products(object):
                 self.core.copyfile(filepath, fileTargetPath)
 
         self.core.configs.clearCache(path=masterInfoPath)
-        self.core.callback(name="masterVersionUpdated", args=[masterPath])
+        self.core.runInMainThread(
+            self.core.callback, name="masterVersionUpdated", args=[masterPath]
+        )
+        self.core.journal.addEvent(
+            "masterUpdated",
+            {"path": masterPath, "source": path, "versionInfo": masterInfoPath},
+        )
         return masterPath
 
     @err_catcher(name=__name__)
@@ -831,7 +852,9 @@ class Products(object):
                 shutil.rmtree(masterFolder)
             except Exception as e:
                 if self.core.pb and allowClear:
-                    self.core.pb.productBrowser.tw_versions.selectionModel().clearSelection()
+                    self.core.runInMainThread(
+                        lambda: self.core.pb.productBrowser.tw_versions.selectionModel().clearSelection()
+                    )
                     return self.deleteMasterVersion(path, errorMsg=errorMsg, allowClear=False, allowRename=allowRename)
 
                 if allowRename:
@@ -841,7 +864,8 @@ class Products(object):
 
                 logger.warning(e)
                 msg = (errorMsg or "Couldn't remove the existing master version:\n\n%s") % (str(e))
-                result = self.core.popupQuestion(
+                result = self.core.runInMainThread(
+                    self.core.popupQuestion,
                     msg,
                     buttons=["Retry", "Don't delete master version"],
                     icon=QMessageBox.Warning,
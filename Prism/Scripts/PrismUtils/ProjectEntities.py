@@ -56,6 +56,15 @@ class ProjectEntities(object):
         self.entityFolders = {"asset": [], "shot": []}
         self.entityActions = {}
         self.entityDlg = EntityDlg
+        self.ignoredScenefileExtensions = [
+            ".jpg",
+            ".json",
+            ".yml",
+            ".ini",
+            ".lock",
+            ".old",
+            ".db"
+        ]
         self.refreshOmittedEntities()
 
     @err_catcher(name=__name__)
@@ -129,6 +138,12 @@ class ProjectEntities(object):
 
     @err_catcher(name=__name__)
     def getShots(self, searchFilter="", locations=None, getSequences=True):
+        result = self.core.trayQueries.query(
+            "getShots", searchFilter=searchFilter, locations=locations, getSequences=getSequences
+        )
+        if result is not None:
+            return result
+
         location_paths = self.core.paths.getExportProductBasePaths()
         location_paths.update(self.core.paths.getRenderProductBasePaths())
         seqDirs = []
@@ -271,9 +286,7 @@ class ProjectEntities(object):
         return cats
 
     @err_catcher(name=__name__)
-    def getScenefiles(self, entity=None, step=None, category=None, extensions=None, path=None):
-        scenefiles = []
-
+    def getScenefileDirs(self, entity=None, step=None, category=None, path=None):
         if not path:
             if entity["type"] == "asset":
                 if (
@@ -299,6 +312,11 @@ class ProjectEntities(object):
             lpath = self.core.convertPath(path, target="local")
             sceneDirs = [path, lpath]
 
+        return sceneDirs
+
+    @err_catcher(name=__name__)
+    def getScenefiles(self, entity=None, step=None, category=None, extensions=None, path=None):
+        sceneDirs = self.getScenefileDirs(entity=entity, step=step, category=category, path=path)
         sfiles = {}
         for sDir in sceneDirs:
             for root, dirs, files in os.walk(sDir):
@@ -315,19 +333,77 @@ class ProjectEntities(object):
         return scenefiles
 
     @err_catcher(name=__name__)
-    def isValidScenefilename(self, filename, extensions=None):
-        if os.path.splitext(filename)[1] in [
-            ".jpg",
-            ".json",
-            ".yml",
-            ".ini",
-            ".lock",
-            ".old",
-            ".db"
-        ]:
+    def getScenefileRecords(self, entity=None, step=None, category=None, extensions=None, path=None):
+        # returns the same data as getScenefileData(preview=True) for all scenefiles
+        # of a task. every folder gets listed once and the versioninfos are read
+        # concurrently instead of checking the sidecar files of each scenefile
+        sceneDirs = self.getScenefileDirs(entity=entity, step=step, category=category, path=path)
+        infoSuffix = "versioninfo" + self.core.configs.getProjectExtension()
+        records = []
+        scenes = {}
+        for sDir in sceneDirs:
+            try:
+                entries = {entry.name: entry for entry in os.scandir(sDir)}
+            except OSError:
+                continue
+
+            for name, entry in entries.items():
+                if name in scenes or not entry.is_file():
+                    continue
+
+                if os.path.splitext(name)[1] in self.ignoredScenefileExtensions:
+                    continue
+
+                base = os.path.splitext(entry.path)[0]
+                infoEntry = entries.get(os.path.basename(base) + infoSuffix)
+                infoPath = infoEntry.path if infoEntry else None
+                if not infoPath and os.path.basename(base) + "versioninfo.ini" in entries:
+                    infoPath = self.core.configs.findDeprecatedConfig(base + infoSuffix)
+
+                previewEntry = entries.get(os.path.basename(base) + "preview.jpg")
+                scenes[name] = {
+                    "entry": entry,
+                    "infoPath": infoPath,
+                    "previewEntry": previewEntry,
+                }
+
+        def readInfo(infoPath):
+            return self.core.getConfig(configPath=infoPath) or {}
+
+        infoPaths = [scene["infoPath"] for scene in scenes.values() if scene["infoPath"]]
+        infos = {}
+        if len(infoPaths) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=min(8, len(infoPaths))) as executor:
+                for infoPath, info in zip(infoPaths, executor.map(readInfo, infoPaths)):
+                    infos[infoPath] = info
+        else:
+            for infoPath in infoPaths:
+                infos[infoPath] = readInfo(infoPath)
+
+        for name in sorted(scenes):
+            scene = scenes[name]
+            entry = scene["entry"]
+            data = self.getScenefileDataFromInfo(entry.path, infos.get(scene["infoPath"], {}))
+            if not self.isValidScenefilename(entry.path, extensions=extensions, data=data):
+                continue
+
+            if scene["previewEntry"]:
+                data["preview"] = scene["previewEntry"].path
+                data["previewModtime"] = scene["previewEntry"].stat().st_mtime
+
+            data["modtime"] = entry.stat().st_mtime
+            records.append(data)
+
+        return records
+
+    @err_catcher(name=__name__)
+    def isValidScenefilename(self, filename, extensions=None, data=None):
+        if os.path.splitext(filename)[1] in self.ignoredScenefileExtensions:
             return False
 
-        sData = self.core.getScenefileData(filename)
+        sData = data if data is not None else self.core.getScenefileData(filename)
 
         try:
             int(sData["extension"][-5:])  # ignore maya temp files
@@ -483,6 +559,14 @@ class ProjectEntities(object):
 
         if result.get("error"):
             self.core.popup(result["error"])
+        elif not result.get("existed"):
+            self.core.journal.addEvent(
+                "entityCreated",
+                {
+                    "entity": entity,
+                    "path": result.get("entityPath") or self.core.getEntityPath(entity=entity),
+                },
+            )
 
         return result
 
@@ -872,11 +956,29 @@ class ProjectEntities(object):
 
             self.setScenefileInfo(newPath, "comment", comment)
 
+        if newPath:
+            self.core.journal.addEvent(
+                "metadataChanged",
+                {
+                    "path": newPath,
+                    "versionInfo": self.core.getVersioninfoPath(newPath),
+                    "key": "comment",
+                },
+            )
+
         return newPath
 
     @err_catcher(name=__name__)
     def setDescription(self, filepath, description):
         self.setScenefileInfo(filepath, "description", description)
+        self.core.journal.addEvent(
+            "metadataChanged",
+            {
+                "path": filepath,
+                "versionInfo": self.core.getVersioninfoPath(filepath),
+                "key": "description",
+            },
+        )
 
     @err_catcher(name=__name__)
     def getAssetDescription(self, assetName):
@@ -978,6 +1080,19 @@ class ProjectEntities(object):
             data["shots"][entity["sequence"]][entity["shot"]]["metadata"] = metaData
             self.core.setConfig(data=data, config="shotinfo", updateNestedData=False)
 
+        else:
+            return
+
+        config = "assetinfo" if entity["type"] == "asset" else "shotinfo"
+        self.core.journal.addEvent(
+            "metadataChanged",
+            {
+                "entity": entity,
+                "configPath": self.core.configs.getConfigPath(config),
+                "key": "metadata",
+            },
+        )
+
     @err_catcher(name=__name__)
     def deleteShot(self, shotName):
         shotPath = self.core.getEntityPath(shot=shotName)
@@ -1230,6 +1345,11 @@ class ProjectEntities(object):
 
     @err_catcher(name=__name__)
     def getAssetPaths(self, path=None, returnFolders=False, depth=0):
+        if not path and not returnFolders and not depth:
+            result = self.core.trayQueries.query("getAssetPaths")
+            if result is not None:
+                return result
+
         aBasePath = path or self.core.assetPath
         assets = []
         assetFolders = []
@@ -1352,7 +1472,17 @@ class ProjectEntities(object):
     @err_catcher(name=__name__)
     def getScenefileData(self, fileName, preview=False):
         data = self.core.getConfig(configPath=self.getScenefileInfoPath(fileName)) or {}
-        data = dict(data)
+        data = self.getScenefileDataFromInfo(fileName, data)
+        if preview:
+            prvPath = os.path.splitext(fileName)[0] + "preview.jpg"
+            if os.path.exists(prvPath):
+                data["preview"] = prvPath
+
+        return data
+
+    @err_catcher(name=__name__)
+    def getScenefileDataFromInfo(self, fileName, info):
+        data = dict(info)
         if not data and fileName:
             entityType = self.core.paths.getEntityTypeFromPath(fileName)
             key = None
@@ -1378,11 +1508,6 @@ class ProjectEntities(object):
             if etype:
                 data["type"] = etype
 
-        if preview:
-            prvPath = os.path.splitext(fileName)[0] + "preview.jpg"
-            if os.path.exists(prvPath):
-                data["preview"] = prvPath
-
         return data
 
     @err_catcher(name=__name__)
@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+import platform
+import logging
+
+from qtpy.QtCore import *
+from qtpy.QtGui import *
+from qtpy.QtWidgets import *
+
+from PrismUtils.Decorators import err_catcher
+
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectWatcher(QObject):
+    versionAdded = Signal(object)
+    versionRemoved = Signal(object)
+    fileChanged = Signal(object)
+    entityCreated = Signal(object)
+    folderChanged = Signal(object)
+
+    networkFilesystems = ["nfs", "nfs4", "cifs", "smbfs", "smb3", "fuse.sshfs", "afpfs", "9p"]
+
+    def __init__(self, core):
+        super(ProjectWatcher, self).__init__()
+        self.core = core
+        self.fsWatcher = None
+        self.debounceTimer = None
+        self.pollTimer = None
+        self.debounceInterval = 300
+        self.pollInterval = 3000
+        self.watchedFolders = {}
+        self.ownerFolders = {}
+        self.pendingFolders = []
+        self.networkMounts = None
+
+    @err_catcher(name=__name__)
+    def getWatchMode(self):
+        mode = os.getenv("PRISM_FILE_WATCHER")
+        if mode is None:
+            mode = self.core.getConfig("globals", "file_watcher", config="user")
+
+        if mode in [None, True, ""]:
+            mode = "auto"
+        elif mode in [False, "0", "false", "False"]:
+            mode = "off"
+
+        return mode
+
+    @err_catcher(name=__name__)
+    def isEnabled(self):
+        return self.getWatchMode() != "off" and self.core.uiAvailable
+
+    @err_catcher(name=__name__)
+    def getNetworkMounts(self):
+        if self.networkMounts is not None:
+            return self.networkMounts
+
+        self.networkMounts = []
+        if platform.system() != "Linux" or not os.path.exists("/proc/mounts"):
+            return self.networkMounts
+
+        try:
+            with open("/proc/mounts", "r") as mountFile:
+                lines = mountFile.readlines()
+        except Exception as e:
+            logger.debug("failed to read mounts: %s" % e)
+            return self.networkMounts
+
+        for line in lines:
+            data = line.split()
+            if len(data) < 3:
+                continue
+
+            if data[2] in self.networkFilesystems:
+                self.networkMounts.append(data[1].replace("\\040", " "))
+
+        return self.networkMounts
+
+    @err_catcher(name=__name__)
+    def isNetworkPath(self, path):
+        path = path.replace("\\", "/")
+        if path.startswith("//"):
+            return True
+
+        for mount in self.getNetworkMounts():
+            if path == mount or path.startswith(mount.rstrip("/") + "/"):
+                return True
+
+        return False
+
+    @err_catcher(name=__name__)
+    def getModeForPath(self, path):
+        mode = self.getWatchMode()
+        if mode == "auto":
+            mode = "polling" if self.isNetworkPath(path) else "native"
+
+        return mode
+
+    @err_catcher(name=__name__)
+    def getFileSystemWatcher(self):
+        if not self.fsWatcher:
+            self.fsWatcher = QFileSystemWatcher()
+            self.fsWatcher.directoryChanged.connect(self.onDirectoryChanged)
+
+        return self.fsWatcher
+
+    @err_catcher(name=__name__)
+    def setWatchedFolders(self, owner, folders):
+        if not self.isEnabled():
+            return
+
+        newPaths = []
+        for folder in folders:
+            if not folder.get("path"):
+                continue
+
+            path = os.path.normpath(folder["path"])
+            newPaths.append(path)
+            if path in self.watchedFolders:
+                self.watchedFolders[path]["owners"].add(owner)
+                self.watchedFolders[path]["type"] = folder.get("type")
+                self.watchedFolders[path]["context"] = folder.get("context")
+                continue
+
+            self.watchFolder(path, folder.get("type"), context=folder.get("context"), owner=owner)
+
+        for path in self.ownerFolders.get(owner, []):
+            if path not in newPaths:
+                self.releaseFolder(path, owner)
+
+        self.ownerFolders[owner] = newPaths
+
+    @err_catcher(name=__name__)
+    def isWatchedBy(self, owner, path):
+        return os.path.normpath(path) in self.ownerFolders.get(owner, [])
+
+    @err_catcher(name=__name__)
+    def unwatchFolders(self, owner):
+        for path in self.ownerFolders.pop(owner, []):
+            self.releaseFolder(path, owner)
+
+    @err_catcher(name=__name__)
+    def watchFolder(self, path, folderType, context=None, owner=None):
+        if not os.path.isdir(path):
+            return False
+
+        mode = self.getModeForPath(path)
+        if mode == "native":
+            if not self.getFileSystemWatcher().addPath(path):
+                logger.debug("native watching failed, falling back to polling: %s" % path)
+                mode = "polling"
+
+        self.watchedFolders[path] = {
+            "type": folderType,
+            "context": context,
+            "mode": mode,
+            "owners": set([owner]),
+            "snapshot": self.getFolderSnapshot(path),
+            "modtime": self.getFolderModTime(path),
+        }
+        if mode == "polling":
+            self.startPolling()
+
+        return True
+
+    @err_catcher(name=__name__)
+    def releaseFolder(self, path, owner):
+        data = self.watchedFolders.get(path)
+        if not data:
+            return
+
+        data["owners"].discard(owner)
+        if data["owners"]:
+            return
+
+        if data["mode"] == "native" and self.fsWatcher:
+            self.fsWatcher.removePath(path)
+
+        del self.watchedFolders[path]
+        if self.pollTimer and not [f for f in self.watchedFolders.values() if f["mode"] == "polling"]:
+            self.pollTimer.stop()
+
+    @err_catcher(name=__name__)
+    def clear(self):
+        if self.fsWatcher:
+            paths = self.fsWatcher.directories()
+            if paths:
+                self.fsWatcher.removePaths(paths)
+
+        if self.pollTimer:
+            self.pollTimer.stop()
+
+        self.watchedFolders = {}
+        self.ownerFolders = {}
+        self.pendingFolders = []
+
+    @err_catcher(name=__name__)
+    def startPolling(self):
+        if not self.pollTimer:
+            self.pollTimer = QTimer()
+            self.pollTimer.timeout.connect(self.poll)
+
+        if not self.pollTimer.isActive():
+            self.pollTimer.start(self.pollInterval)
+
+    @err_catcher(name=__name__)
+    def poll(self):
+        for path, data in list(self.watchedFolders.items()):
+            if data["mode"] != "polling":
+                continue
+
+            modtime = self.getFolderModTime(path)
+            if modtime != data["modtime"]:
+                self.onDirectoryChanged(path)
+
+    @err_catcher(name=__name__)
+    def onDirectoryChanged(self, path):
+        path = os.path.normpath(path)
+        if path not in self.pendingFolders:
+            self.pendingFolders.append(path)
+
+        if not self.debounceTimer:
+            self.debounceTimer = QTimer()
+            self.debounceTimer.setSingleShot(True)
+            self.debounceTimer.timeout.connect(self.flush)
+
+        self.debounceTimer.start(self.debounceInterval)
+
+    @err_catcher(name=__name__)
+    def getFolderModTime(self, path):
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    @err_catcher(name=__name__)
+    def getFolderSnapshot(self, path):
+        snapshot = {}
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            return snapshot
+
+        for entry in entries:
+            try:
+                isDir = entry.is_dir()
+                stat = entry.stat()
+            except OSError:
+                continue
+
+            snapshot[entry.name] = (isDir, stat.st_mtime, 0 if isDir else stat.st_size)
+
+        return snapshot
+
+    @err_catcher(name=__name__)
+    def flush(self):
+        pending = self.pendingFolders
+        self.pendingFolders = []
+        for path in pending:
+            data = self.watchedFolders.get(path)
+            if not data:
+                continue
+
+            if data["mode"] == "native" and self.fsWatcher and path not in self.fsWatcher.directories():
+                # deleted and recreated folders drop out of the native watcher
+                if os.path.isdir(path):
+                    self.fsWatcher.addPath(path)
+
+            snapshot = self.getFolderSnapshot(path)
+            changes = self.getSnapshotChanges(data["snapshot"], snapshot)
+            data["snapshot"] = snapshot
+            data["modtime"] = self.getFolderModTime(path)
+            if not any(changes.values()):
+                continue
+
+            self.emitChanges(path, data, snapshot, changes)
+
+    @err_catcher(name=__name__)
+    def getSnapshotChanges(self, prevSnapshot, snapshot):
+        added = [name for name in snapshot if name not in prevSnapshot]
+        removed = [name for name in prevSnapshot if name not in snapshot]
+        modified = [
+            name for name in snapshot
+            if name in prevSnapshot and snapshot[name] != prevSnapshot[name]
+        ]
+        return {"added": added, "removed": removed, "modified": modified}
+
+    @err_catcher(name=__name__)
+    def emitChanges(self, path, data, snapshot, changes):
+        event = {
+            "path": path,
+            "type": data["type"],
+            "context": data["context"],
+            "added": changes["added"],
+            "removed": changes["removed"],
+            "modified": changes["modified"],
+        }
+        logger.debug("folder changed: %s" % event)
+        for name in changes["added"]:
+            itemData = {"path": os.path.join(path, name), "context": data["context"], "type": data["type"]}
+            isDir = snapshot[name][0]
+            if data["type"] == "identifier" and isDir:
+                self.versionAdded.emit(itemData)
+            elif data["type"] == "entity" and isDir:
+                self.entityCreated.emit(itemData)
+            elif not isDir:
+                itemData["change"] = "added"
+                self.fileChanged.emit(itemData)
+
+        for name in changes["removed"]:
+            itemData = {"path": os.path.join(path, name), "context": data["context"], "type": data["type"]}
+            if data["type"] == "identifier":
+                self.versionRemoved.emit(itemData)
+            else:
+                itemData["change"] = "removed"
+                self.fileChanged.emit(itemData)
+
+        for name in changes["modified"]:
+            if snapshot[name][0]:
+                continue
+
+            itemData = {
+                "path": os.path.join(path, name),
+                "context": data["context"],
+                "type": data["type"],
+                "change": "modified",
+            }
+            self.fileChanged.emit(itemData)
+
+        self.folderChanged.emit(event)
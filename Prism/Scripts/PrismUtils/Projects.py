@@ -351,6 +351,19 @@ class Projects(object):
         self.core.projectVersion = projectVersion
 
         self.core.configs.clearCache()
+        self.core.mediaProducts.clearMediaFolderCache()
+        if self.core.isManagerLoaded("watcher"):
+            self.core.watcher.clear()
+
+        if self.core.isManagerLoaded("diskUsage"):
+            self.core.diskUsage.clearCache()
+
+        if self.core.isManagerLoaded("dependencyIndex"):
+            self.core.dependencyIndex.clearCache()
+
+        if self.core.isManagerLoaded("refreshScheduler"):
+            self.core.refreshScheduler.clearCache()
+
         result = self.refreshLocalFiles()
         if not result:
             QApplication.setQuitOnLastWindowClosed(quitOnLastWindowClosed)
@@ -425,6 +438,7 @@ class Projects(object):
             self.core.plugins.loadPlugins(directories=[pluginPath], recursive=True)
 
         self.setRecentPrj(configPath)
+        self.core.journal.start()
         self.core.checkCommands()
         self.core.updateProjectEnvironment()
         self.core.callback(
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+import time
+import logging
+import threading
+import traceback
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from qtpy.QtCore import *
+from qtpy.QtGui import *
+from qtpy.QtWidgets import *
+
+from PrismUtils.Decorators import err_catcher
+
+
+logger = logging.getLogger(__name__)
+
+
+class PublishScheduler(object):
+    def __init__(self, core, maxWorkers=4):
+        super(PublishScheduler, self).__init__()
+        self.core = core
+        self.maxWorkers = maxWorkers
+        self.executor = None
+        self.lock = threading.Lock()
+        self.tasks = []
+        self.writers = {}
+        self.timings = OrderedDict()
+        self.currentState = None
+        self.childDurations = []
+        self.phases = []
+        self.startTime = time.time()
+
+    @err_catcher(name=__name__)
+    def isParallel(self):
+        return os.getenv("PRISM_PARALLEL_PUBLISH", "1") != "0"
+
+    @err_catcher(name=__name__)
+    def getExecutor(self):
+        if not self.executor:
+            self.executor = ThreadPoolExecutor(max_workers=self.maxWorkers)
+
+        return self.executor
+
+    @err_catcher(name=__name__)
+    def getStateTiming(self, state):
+        key = id(state)
+        if key not in self.timings:
+            self.timings[key] = {
+                "state": state,
+                "name": state.state.text(0),
+                "class": getattr(state, "className", ""),
+                "main": 0.0,
+                "phases": [],
+                "versionInfos": [],
+                "tasks": [],
+            }
+
+        return self.timings[key]
+
+    @err_catcher(name=__name__)
+    def executeState(self, state, func, *args, **kwargs):
+        # the state itself runs on the main thread. Tasks it submits get
+        # attributed to it through currentState.
+        if getattr(state, "publishBarrier", False):
+            self.waitForTasks()
+
+        prevState = self.currentState
+        self.currentState = state
+        self.childDurations.append(0.0)
+        startTime = time.time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            # folders execute their child states, which get timed separately
+            duration = time.time() - startTime
+            childDuration = self.childDurations.pop()
+            self.getStateTiming(state)["main"] += duration - childDuration
+            if self.childDurations:
+                self.childDurations[-1] += duration
+
+            self.currentState = prevState
+
+    @err_catcher(name=__name__)
+    def addPhase(self, name, duration, state=None):
+        # phases without a state belong to the publish itself, e.g. sanity
+        # checks or the prePublish callback. Phases of background tasks are
+        # already part of the task duration.
+        if threading.current_thread() is not threading.main_thread():
+            return
+
+        state = state or self.currentState
+        entry = {"name": name, "duration": duration}
+        with self.lock:
+            if state:
+                self.getStateTiming(state)["phases"].append(entry)
+            else:
+                self.phases.append(entry)
+
+        return entry
+
+    @contextmanager
+    def phase(self, name, state=None):
+        state = state or self.currentState
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.addPhase(name, time.time() - start, state=state)
+
+    @err_catcher(name=__name__)
+    def addVersionInfo(self, path, state=None):
+        if threading.current_thread() is not threading.main_thread():
+            return
+
+        state = state or self.currentState
+        if not state:
+            return
+
+        infos = self.getStateTiming(state)["versionInfos"]
+        path = os.path.normpath(path)
+        if path not in infos:
+            infos.append(path)
+
+    @err_catcher(name=__name__)
+    def submit(self, func, args=None, kwargs=None, name=None, state=None, inputs=None, outputs=None):
+        state = state or self.currentState
+        task = {
+            "name": name or getattr(func, "__name__", "task"),
+            "state": state,
+            "inputs": [os.path.normpath(key) for key in (inputs or [])],
+            "outputs": [os.path.normpath(key) for key in (outputs or [])],
+            "queued": time.time(),
+            "started": None,
+            "duration": None,
+            "error": None,
+            "result": None,
+            "future": None,
+        }
+        depends = self.getTaskDependencies(task)
+        for key in task["outputs"]:
+            self.writers[key] = task
+
+        if state:
+            self.getStateTiming(state)["tasks"].append(task)
+
+        self.tasks.append(task)
+        if not self.isParallel():
+            self.runTask(task, func, args or [], kwargs or {}, [])
+            return task
+
+        task["future"] = self.getExecutor().submit(
+            self.runTask, task, func, args or [], kwargs or {}, depends
+        )
+        return task
+
+    @err_catcher(name=__name__)
+    def getTaskDependencies(self, task):
+        # tasks of the same state keep their order, other tasks only wait for
+        # the last task which wrote one of their inputs or outputs
+        depends = []
+        for prevTask in reversed(self.tasks):
+            if prevTask["state"] is task["state"] and task["state"] is not None:
+                depends.append(prevTask)
+                break
+
+        for key in task["inputs"] + task["outputs"]:
+            writer = self.writers.get(key)
+            if writer and writer not in depends:
+                depends.append(writer)
+
+        return [dep["future"] for dep in depends if dep["future"]]
+
+    def runTask(self, task, func, args, kwargs, depends):
+        # executed in worker threads. Submission order guarantees that the
+        # dependencies were picked up by the pool before this task.
+        if depends:
+            wait(depends)
+            for future in depends:
+                if future.result() is not None:
+                    task["error"] = "Skipped, because a task it depends on failed."
+                    return task["error"]
+
+        task["started"] = time.time()
+        try:
+            task["result"] = func(*args, **kwargs)
+            if not task["result"]:
+                # publish tasks return what they wrote, e.g. the master path.
+                # Failures, which were only reported in a popup, return nothing.
+                task["error"] = "The task returned no result. Check the log for details."
+        except Exception as e:
+            task["error"] = str(e) or traceback.format_exc()
+            logger.warning(
+                "publish task %s failed: %s" % (task["name"], traceback.format_exc())
+            )
+        finally:
+            task["duration"] = time.time() - task["started"]
+
+        return task["error"]
+
+    @err_catcher(name=__name__)
+    def hasPendingTasks(self):
+        return any(task["future"] and not task["future"].done() for task in self.tasks)
+
+    @err_catcher(name=__name__)
+    def waitForTasks(self):
+        futures = [task["future"] for task in self.tasks if task["future"]]
+        if not futures:
+            return
+
+        qapp = QApplication.instance()
+        isGuiThread = qapp and qapp.thread() == QThread.currentThread()
+        while True:
+            done, notDone = wait(futures, timeout=0.05)
+            if not notDone:
+                break
+
+            if isGuiThread:
+                qapp.processEvents()
+
+    @err_catcher(name=__name__)
+    def finish(self):
+        self.waitForTasks()
+        if self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+        return [task for task in self.tasks if task["error"]]
+
+    @err_catcher(name=__name__)
+    def getReport(self):
+        states = []
+        for timing in self.timings.values():
+            tasks = []
+            for task in timing["tasks"]:
+                tasks.append(
+                    {
+                        "name": task["name"],
+                        "duration": task["duration"] or 0.0,
+                        "waited": (task["started"] or task["queued"]) - task["queued"],
+                        "error": task["error"],
+                    }
+                )
+
+            # whatever isn't a phase or a task which ran in the main thread is
+            # the export/render itself
+            phases = list(timing["phases"])
+            mainTaskDuration = sum(
+                task["duration"] or 0.0 for task in timing["tasks"] if not task["future"]
+            )
+            execute = timing["main"] - sum(phase["duration"] for phase in phases)
+            states.append(
+                {
+                    "name": timing["name"],
+                    "class": timing["class"],
+                    "main": timing["main"],
+                    "execute": max(0.0, execute - mainTaskDuration),
+                    "background": sum(task["duration"] for task in tasks),
+                    "phases": phases,
+                    "tasks": tasks,
+                    "versionInfos": list(timing["versionInfos"]),
+                }
+            )
+
+        report = {
+            "duration": time.time() - self.startTime,
+            "phases": list(self.phases),
+            "states": states,
+        }
+        return report
+
+    @err_catcher(name=__name__)
+    def formatReport(self, report=None):
+        report = report or self.getReport()
+        lines = ["publish took %.2fs" % report["duration"]]
+        for phase in report["phases"]:
+            lines.append("  %s: %.2fs" % (phase["name"], phase["duration"]))
+
+        for state in report["states"]:
+            lines.append(
+                "  %s (%s): main thread %.2fs, background %.2fs"
+                % (state["name"], state["class"], state["main"], state["background"])
+            )
+            for phase in state["phases"]:
+                lines.append("    %s: %.2fs" % (phase["name"], phase["duration"]))
+
+            for task in state["tasks"]:
+                line = "    %s: %.2fs (waited %.2fs)" % (
+                    task["name"],
+                    task["duration"],
+                    task["waited"],
+                )
+                if task["error"]:
+                    line += " - error: %s" % task["error"]
+
+                lines.append(line)
+
+        return "\n".join(lines)
@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+import json
+import time
+import socket
+import logging
+from collections import OrderedDict
+
+from qtpy.QtCore import *
+from qtpy.QtGui import *
+from qtpy.QtWidgets import *
+
+from PrismUtils.Decorators import err_catcher
+
+
+logger = logging.getLogger(__name__)
+
+
+class PublishTimings(object):
+    def __init__(self, core):
+        super(PublishTimings, self).__init__()
+        self.core = core
+        self.maxRecords = 500
+        self.regressionFactor = 1.5
+        self.regressionMinimum = 1.0
+
+    @err_catcher(name=__name__)
+    def isEnabled(self):
+        return os.getenv("PRISM_PUBLISH_TIMINGS", "1") != "0"
+
+    @err_catcher(name=__name__)
+    def getLogPath(self):
+        name = getattr(self.core, "projectName", None) or "global"
+        return os.path.join(
+            self.core.getUserPrefDir(), "Logs", "publishTimings_%s.jsonl" % name
+        )
+
+    @err_catcher(name=__name__)
+    def createRecord(self, report, pubType="publish", scenefile=None, success=True):
+        record = OrderedDict()
+        record["date"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        record["user"] = getattr(self.core, "user", "")
+        record["host"] = socket.gethostname()
+        record["project"] = getattr(self.core, "projectName", "")
+        record["scenefile"] = scenefile or ""
+        record["type"] = pubType
+        record["success"] = success
+        record["duration"] = report["duration"]
+        record["phases"] = report["phases"]
+        record["states"] = report["states"]
+        return record
+
+    @err_catcher(name=__name__)
+    def addRecord(self, report, pubType="publish", scenefile=None, success=True):
+        if not self.isEnabled():
+            return
+
+        record = self.createRecord(
+            report, pubType=pubType, scenefile=scenefile, success=success
+        )
+        self.writeLog(record)
+        self.writeVersionInfos(record)
+        return record
+
+    @err_catcher(name=__name__)
+    def writeLog(self, record):
+        logPath = self.getLogPath()
+        try:
+            if not os.path.exists(os.path.dirname(logPath)):
+                os.makedirs(os.path.dirname(logPath))
+
+            with open(logPath, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        except (IOError, OSError) as e:
+            logger.warning("failed to write publish timings to %s: %s" % (logPath, e))
+
+    @err_catcher(name=__name__)
+    def writeVersionInfos(self, record):
+        # the scenefile gets the complete record, each product or media
+        # version only the timing of the state which published it
+        if record["scenefile"]:
+            infoPath = self.core.getVersioninfoPath(record["scenefile"])
+            if os.path.exists(infoPath):
+                self.core.setConfig(
+                    param="publishTiming", val=record, configPath=infoPath
+                )
+
+        for state in record["states"]:
+            timing = OrderedDict()
+            timing["date"] = record["date"]
+            timing["state"] = state["name"]
+            timing["duration"] = state["main"] + state["background"]
+            timing["execute"] = state["execute"]
+            timing["phases"] = state["phases"]
+            timing["tasks"] = state["tasks"]
+            for infoPath in state["versionInfos"]:
+                if os.path.exists(infoPath):
+                    self.core.setConfig(
+                        param="publishTiming", val=timing, configPath=infoPath
+                    )
+
+    @err_catcher(name=__name__)
+    def getRecords(self, limit=None):
+        limit = limit or self.maxRecords
+        logPath = self.getLogPath()
+        if not os.path.exists(logPath):
+            return []
+
+        records = []
+        with open(logPath, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    logger.debug("skipping invalid publish timing record")
+
+        return records[-limit:]
+
+    @err_catcher(name=__name__)
+    def getRecordTimings(self, record):
+        timings = OrderedDict()
+
+        def add(group, name, duration):
+            key = (group, name)
+            timings[key] = timings.get(key, 0.0) + duration
+
+        add("Publish", "total", record["duration"])
+        for phase in record["phases"]:
+            add("Publish", phase["name"], phase["duration"])
+
+        for state in record["states"]:
+            group = "%s (%s)" % (state["name"], state["class"])
+            add(group, "total", state["main"] + state["background"])
+            add(group, "execute", state["execute"])
+            for phase in state["phases"]:
+                add(group, phase["name"], phase["duration"])
+
+            for task in state["tasks"]:
+                add(group, "task: %s" % task["name"], task["duration"])
+
+        return timings
+
+    @err_catcher(name=__name__)
+    def aggregate(self, records=None):
+        # compares the last publish of every entry to the average of all
+        # publishes before it to make regressions visible
+        if records is None:
+            records = self.getRecords()
+
+        values = OrderedDict()
+        for record in records:
+            for key, duration in self.getRecordTimings(record).items():
+                values.setdefault(key, []).append(duration)
+
+        rows = []
+        for (group, name), durations in values.items():
+            previous = durations[:-1]
+            prevMean = sum(previous) / len(previous) if previous else None
+            last = durations[-1]
+            regression = bool(
+                prevMean is not None
+                and last > prevMean * self.regressionFactor
+                and last - prevMean > self.regressionMinimum
+            )
+            rows.append(
+                {
+                    "group": group,
+                    "name": name,
+                    "count": len(durations),
+                    "mean": sum(durations) / len(durations),
+                    "max": max(durations),
+                    "last": last,
+                    "previousMean": prevMean,
+                    "regression": regression,
+                }
+            )
+
+        return rows
+
+    @err_catcher(name=__name__)
+    def showDialog(self, parent=None):
+        self.dlg_timings = PublishTimingsDlg(self, parent=parent)
+        self.dlg_timings.show()
+        return self.dlg_timings
+
+
+class PublishTimingsDlg(QDialog):
+    def __init__(self, timings, parent=None):
+        QDialog.__init__(self)
+        self.timings = timings
+        self.core = timings.core
+        self.core.parentWindow(self, parent)
+        self.setupUi()
+        self.refresh()
+
+    @err_catcher(name=__name__)
+    def setupUi(self):
+        self.setWindowTitle("Publish Timings")
+        self.lo_main = QVBoxLayout()
+        self.setLayout(self.lo_main)
+
+        self.l_info = QLabel()
+        self.tw_timings = QTreeWidget()
+        self.tw_timings.setHeaderLabels(
+            ["Name", "Publishes", "Last", "Average", "Previous Average", "Max"]
+        )
+        self.tw_timings.setColumnWidth(0, 300)
+
+        self.bb_main = QDialogButtonBox()
+        self.b_refresh = self.bb_main.addButton("Refresh", QDialogButtonBox.ActionRole)
+        self.bb_main.addButton("Close", QDialogButtonBox.RejectRole)
+        self.b_refresh.clicked.connect(self.refresh)
+        self.bb_main.rejected.connect(self.reject)
+
+        self.lo_main.addWidget(self.l_info)
+        self.lo_main.addWidget(self.tw_timings)
+        self.lo_main.addWidget(self.bb_main)
+        self.resize(800, 600)
+
+    @err_catcher(name=__name__)
+    def refresh(self):
+        records = self.timings.getRecords()
+        rows = self.timings.aggregate(records)
+        self.tw_timings.clear()
+        if records:
+            self.l_info.setText(
+                "%s publishes since %s" % (len(records), records[0]["date"])
+            )
+        else:
+            self.l_info.setText("No publish timings recorded yet.")
+
+        def fmt(value):
+            return "" if value is None else "%.2fs" % value
+
+        groups = {}
+        for row in rows:
+            if row["group"] not in groups:
+                groupItem = QTreeWidgetItem([row["group"]])
+                self.tw_timings.addTopLevelItem(groupItem)
+                groups[row["group"]] = groupItem
+
+            values = [
+                row["name"],
+                str(row["count"]),
+                fmt(row["last"]),
+                fmt(row["mean"]),
+                fmt(row["previousMean"]),
+                fmt(row["max"]),
+            ]
+            if row["name"] == "total":
+                item = groups[row["group"]]
+                for idx, value in enumerate(values[1:]):
+                    item.setText(idx + 1, value)
+            else:
+                item = QTreeWidgetItem(values)
+                groups[row["group"]].addChild(item)
+
+            if row["regression"]:
+                item.setForeground(2, QColor(240, 50, 50))
+                item.setToolTip(2, "Slower than the average of the previous publishes")
+
+        self.tw_timings.expandAll()
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from qtpy.QtCore import *
+from qtpy.QtGui import *
+from qtpy.QtWidgets import *
+
+from PrismUtils.Decorators import err_catcher
+
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshScheduler(QObject):
+    jobFinished = Signal(object)
+
+    def __init__(self, core):
+        super(RefreshScheduler, self).__init__()
+        self.core = core
+        self.maxWorkers = 4
+        self.maxCacheEntries = 200
+        self.executor = None
+        self.jobs = {}
+        self.finishedJobs = []
+        self.cache = {}
+        self.applyTimer = None
+        self.enabled = os.getenv("PRISM_BACKGROUND_REFRESH", "1") != "0"
+        self.jobFinished.connect(self.onJobFinished)
+
+    @err_catcher(name=__name__)
+    def getExecutor(self):
+        if not self.executor:
+            self.executor = ThreadPoolExecutor(max_workers=self.maxWorkers)
+
+        return self.executor
+
+    @err_catcher(name=__name__)
+    def getCacheKey(self, *args):
+        return json.dumps(args, sort_keys=True, default=str)
+
+    @err_catcher(name=__name__)
+    def clearCache(self):
+        self.cache = {}
+
+    @err_catcher(name=__name__)
+    def submit(self, owner, channel, loader, callback, cacheKey=None):
+        self.cancel(owner, channel)
+        job = {
+            "owner": owner,
+            "channel": channel,
+            "loader": loader,
+            "callback": callback,
+            "cacheKey": cacheKey,
+            "cancelled": False,
+        }
+        if not self.enabled:
+            callback(loader())
+            return job
+
+        self.jobs[(owner, channel)] = job
+        if cacheKey is not None and (channel, cacheKey) in self.cache:
+            job["stale"] = self.cache[(channel, cacheKey)]
+            self.applyResult(job, job["stale"])
+
+        if self.jobs.get((owner, channel)) is job:
+            job["future"] = self.getExecutor().submit(self.runJob, job)
+
+        return job
+
+    def runJob(self, job):
+        if job["cancelled"]:
+            return
+
+        try:
+            job["result"] = job["loader"]()
+        except Exception as e:
+            logger.debug("background refresh failed, retrying in main thread: %s" % e)
+            job["error"] = True
+
+        if not job["cancelled"]:
+            self.jobFinished.emit(job)
+
+    @err_catcher(name=__name__)
+    def cancel(self, owner, channel=None):
+        for key in list(self.jobs):
+            if key[0] is not owner or (channel and key[1] != channel):
+                continue
+
+            job = self.jobs.pop(key)
+            job["cancelled"] = True
+            if job.get("future"):
+                job["future"].cancel()
+
+    @err_catcher(name=__name__)
+    def isPending(self, owner, channel=None):
+        for key in self.jobs:
+            if key[0] is owner and (not channel or key[1] == channel):
+                return True
+
+        return False
+
+    @err_catcher(name=__name__)
+    def onJobFinished(self, job):
+        # jobs finishing in the same event loop iteration get applied together
+        self.finishedJobs.append(job)
+        if not self.applyTimer:
+            self.applyTimer = QTimer()
+            self.applyTimer.setSingleShot(True)
+            self.applyTimer.timeout.connect(self.applyFinishedJobs)
+
+        if not self.applyTimer.isActive():
+            self.applyTimer.start(0)
+
+    @err_catcher(name=__name__)
+    def applyFinishedJobs(self):
+        jobs = self.finishedJobs
+        self.finishedJobs = []
+        for job in jobs:
+            self.finishJob(job)
+
+    @err_catcher(name=__name__)
+    def finishJob(self, job, wait=False):
+        key = (job["owner"], job["channel"])
+        if self.jobs.get(key) is not job:
+            return
+
+        if wait and job.get("future"):
+            try:
+                job["future"].result()
+            except Exception:
+                job["error"] = True
+
+        if self.jobs.get(key) is not job or job["cancelled"]:
+            return
+
+        del self.jobs[key]
+        if job.get("error") or "result" not in job:
+            result = job["loader"]()
+        else:
+            result = job["result"]
+
+        if job["cacheKey"] is not None:
+            self.cache.pop((job["channel"], job["cacheKey"]), None)
+            self.cache[(job["channel"], job["cacheKey"])] = result
+            while len(self.cache) > self.maxCacheEntries:
+                del self.cache[next(iter(self.cache))]
+
+        if "stale" in job and job["stale"] == result:
+            return
+
+        self.applyResult(job, result)
+
+    @err_catcher(name=__name__)
+    def applyResult(self, job, result):
+        try:
+            job["callback"](result)
+        except RuntimeError as e:
+            # the widget was deleted while the job was running
+            logger.debug("couldn't apply refresh result: %s" % e)
+            self.cancel(job["owner"])
+
+    @err_catcher(name=__name__)
+    def flush(self, owner):
+        # waits for all pending jobs of the owner. used when the caller
+        # needs the refreshed data immediately, e.g. when navigating
+        while True:
+            jobs = [job for key, job in self.jobs.items() if key[0] is owner]
+            if not jobs:
+                break
+
+            for job in jobs:
+                self.finishJob(job, wait=True)
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import time
+import logging
+
+from PrismUtils.Decorators import err_catcher
+
+
+logger = logging.getLogger(__name__)
+
+
+class RenderfarmBackend(object):
+    """
+    Base class for renderfarm plugins registered through
+    PluginManager.registerRenderfarmPlugin.
+
+    A job is a dict with the keys:
+        name: name of the job
+        command: list of arguments for a command line job. The tokens
+            <STARTFRAME> and <ENDFRAME> get replaced for every task.
+        code: python code for a python job. The script gets called with
+            the start and end frame of the task as arguments.
+        args: additional arguments for python jobs
+        frames: frame expression like "1001-1100" (default "1")
+        chunkSize: frames per task (default 1)
+        dependencies: ids of jobs, which have to complete first
+        environment: dict of additional environment variables
+        priority: 0-100, higher priorities start first (default 50)
+        timeout: task timeout in minutes (default None)
+        output: path of the output files
+
+    Job states are "queued", "active", "completed", "failed" and "canceled".
+    """
+
+    jobStates = ["queued", "active", "completed", "failed", "canceled"]
+
+    @err_catcher(name=__name__)
+    def submitJob(self, job):
+        # returns the id of the submitted job
+        logger.warning("%s doesn't support job submissions" % self.__class__.__name__)
+
+    @err_catcher(name=__name__)
+    def getJobStatus(self, jobId):
+        # returns one of the job states or None for unknown jobs
+        logger.debug("%s doesn't support job queries" % self.__class__.__name__)
+
+    @err_catcher(name=__name__)
+    def cancelJob(self, jobId):
+        logger.warning("%s doesn't support canceling jobs" % self.__class__.__name__)
+        return False
+
+    @err_catcher(name=__name__)
+    def getJobs(self):
+        return []
+
+    @err_catcher(name=__name__)
+    def isJobFinished(self, jobId):
+        return self.getJobStatus(jobId) in ["completed", "failed", "canceled", None]
+
+    @err_catcher(name=__name__)
+    def waitForJobs(self, jobIds, timeout=None, interval=1):
+        startTime = time.time()
+        while True:
+            pending = [jobId for jobId in jobIds if not self.isJobFinished(jobId)]
+            if not pending:
+                return True
+
+            if timeout is not None and time.time() - startTime > timeout:
+                logger.debug("timeout while waiting for jobs: %s" % pending)
+                return False
+
+            time.sleep(interval)
+
+    @err_catcher(name=__name__)
+    def getSubmitResult(self, jobId):
+        if not jobId:
+            return "Execute Canceled: Job submission failed"
+
+        return "Result=Success\nJobID=%s" % jobId
+
+    @err_catcher(name=__name__)
+    def getJobIdFromSubmitResult(self, result):
+        lines = str(result).split("\n")
+        for line in lines:
+            if line.startswith("JobID"):
+                return line.split("=")[1]
+
+    @err_catcher(name=__name__)
+    def registerSubmittedJob(self, state, submitResult, data=None):
+        jobId = self.getJobIdFromSubmitResult(submitResult)
+        if not jobId:
+            return
+
+        # uses the same lists as the Deadline plugin, so dependency states
+        # work with every renderfarm plugin
+        sm = state.stateManager
+        if not hasattr(sm, "submittedDlJobs"):
+            sm.submittedDlJobs = {}
+            sm.submittedDlJobData = {}
+
+        sm.submittedDlJobs.setdefault(state.uuid, []).append(jobId)
+        sm.submittedDlJobData[jobId] = data
+        return jobId
+
+    @err_catcher(name=__name__)
+    def getSubmittedJobIdsFromState(self, sm, stateId):
+        return getattr(sm, "submittedDlJobs", {}).get(stateId)
+
+    @err_catcher(name=__name__)
+    def getJobDependencies(self, dependencies):
+        jobIds = []
+        for dep in dependencies or []:
+            if dep.get("type") in ["job", "frame"]:
+                jobIds += dep["jobids"]
+
+        return jobIds
+
+    @err_catcher(name=__name__)
+    def sm_render_updateUI(self, origin):
+        pass
+
+    @err_catcher(name=__name__)
+    def sm_render_managerChanged(self, origin):
+        pass
+
+    @err_catcher(name=__name__)
+    def sm_render_preExecute(self, origin):
+        return []
+
+    @err_catcher(name=__name__)
+    def sm_houExport_activated(self, origin):
+        pass
+
+    @err_catcher(name=__name__)
+    def sm_houExport_preExecute(self, origin):
+        return []
+
+    @err_catcher(name=__name__)
+    def sm_houRender_updateUI(self, origin):
+        pass
+
+    @err_catcher(name=__name__)
+    def sm_houRender_managerChanged(self, origin):
+        pass
+
+    @err_catcher(name=__name__)
+    def sm_houRender_preExecute(self, origin):
+        return []
+
+    @err_catcher(name=__name__)
+    def sm_dep_updateUI(self, origin):
+        pass
+
+    @err_catcher(name=__name__)
+    def sm_dep_preExecute(self, origin):
+        return []
+
+    @err_catcher(name=__name__)
+    def sm_dep_execute(self, origin, parent):
+        pass
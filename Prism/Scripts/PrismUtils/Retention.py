@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+import time
+import shutil
+import fnmatch
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from PrismUtils.Decorators import err_catcher
+
+
+logger = logging.getLogger(__name__)
+
+
+class Retention(object):
+    def __init__(self, core):
+        self.core = core
+        self.trashFolderName = ".trash"
+        self.maxWorkers = 8
+
+    @err_catcher(name=__name__)
+    def getRules(self):
+        rules = self.core.getConfig("rules", config="retention", location="project") or []
+        return rules
+
+    @err_catcher(name=__name__)
+    def setRules(self, rules):
+        self.core.setConfig("rules", val=rules, config="retention", location="project")
+
+    @err_catcher(name=__name__)
+    def getRuleForVersionStack(self, stack):
+        for rule in self.getRules():
+            if rule.get("kind") and rule["kind"] != stack["kind"]:
+                continue
+
+            if rule.get("entityType") and rule["entityType"] != stack["context"].get("type"):
+                continue
+
+            filters = {
+                "product": stack["context"].get("product"),
+                "identifier": stack["context"].get("identifier"),
+                "department": stack.get("department"),
+            }
+            for key in filters:
+                pattern = rule.get(key)
+                if not pattern:
+                    continue
+
+                if not filters[key] or not fnmatch.fnmatch(filters[key], pattern):
+                    break
+            else:
+                return rule
+
+    @err_catcher(name=__name__)
+    def getEntities(self):
+        entities = self.core.entities.getAssets()
+        entities += self.core.entities.getShots(getSequences=False)
+        return entities
+
+    @err_catcher(name=__name__)
+    def getVersionStacks(self, entities=None):
+        if entities is None:
+            entities = self.getEntities()
+
+        stacks = []
+        for entity in entities:
+            for product in self.core.products.getProductsFromEntity(entity):
+                versions = self.core.products.getVersionsFromContext(product)
+                stacks.append({"kind": "product", "context": product, "versions": versions})
+
+            mediaTypes = self.core.mediaProducts.getIdentifiersByType(entity)
+            for mediaType in mediaTypes:
+                for identifier in mediaTypes[mediaType]:
+                    versions = self.core.mediaProducts.getVersionsFromIdentifier(identifier)
+                    stacks.append({"kind": "media", "context": identifier, "versions": versions})
+
+        for stack in stacks:
+            for version in stack["versions"]:
+                info = self.getVersionInfo(version["path"])
+                if info.get("department"):
+                    stack["department"] = info["department"]
+                    break
+
+        return stacks
+
+    @err_catcher(name=__name__)
+    def getVersionInfo(self, versionPath):
+        infoPath = self.core.getVersioninfoPath(versionPath)
+        if not os.path.exists(infoPath):
+            return {}
+
+        return self.core.getConfig(configPath=infoPath) or {}
+
+    @err_catcher(name=__name__)
+    def getReferencedPaths(self, stacks, entities=None, includeScenefiles=True):
+        depPaths = []
+        for stack in stacks:
+            for version in stack["versions"]:
+                info = self.getVersionInfo(version["path"])
+                depPaths += info.get("dependencies", []) + info.get("externalFiles", [])
+
+        if includeScenefiles:
+            if entities is None:
+                entities = self.getEntities()
+
+            for entity in entities:
+                for department in self.core.entities.getSteps(entity):
+                    for task in self.core.entities.getCategories(entity, step=department):
+                        scenefiles = self.core.entities.getScenefiles(
+                            entity=entity, step=department, category=task
+                        )
+                        for scenefile in scenefiles:
+                            info = self.getVersionInfo(scenefile)
+                            depPaths += info.get("dependencies", []) + info.get("externalFiles", [])
+
+        referenced = set()
+        for depPath in depPaths:
+            path = os.path.normpath(depPath)
+            while True:
+                parent = os.path.dirname(path)
+                if not parent or parent == path or parent in referenced:
+                    break
+
+                referenced.add(parent)
+                path = parent
+
+        return referenced
+
+    @err_catcher(name=__name__)
+    def getMasterSourcePaths(self, stack):
+        sources = set()
+        for version in stack["versions"]:
+            if version["version"] != "master":
+                continue
+
+            if stack["kind"] == "media":
+                info = self.core.paths.getRenderProductData(version["path"], isFilepath=False, addPathData=False)
+                for path in info.get("versionpaths", []):
+                    sources.add(os.path.normpath(path))
+
+                sourceVersion = self.core.mediaProducts.getMasterVersionNumber(version["path"])
+            else:
+                sourceVersion = self.core.products.getMasterVersionNumber(version["path"])
+
+            for sversion in stack["versions"]:
+                if sourceVersion and sversion["version"] == sourceVersion:
+                    for path in sversion.get("paths") or [sversion["path"]]:
+                        sources.add(os.path.normpath(path))
+
+        return sources
+
+    @err_catcher(name=__name__)
+    def getVersionAge(self, path):
+        infoPath = self.core.getVersioninfoPath(path)
+        for checkPath in [infoPath, path]:
+            try:
+                return (time.time() - os.stat(checkPath).st_mtime) / 86400.0
+            except OSError:
+                continue
+
+    @err_catcher(name=__name__)
+    def getReport(self, entities=None, includeScenefiles=True):
+        if entities is None:
+            entities = self.getEntities()
+
+        stacks = self.getVersionStacks(entities)
+        referenced = self.getReferencedPaths(
+            stacks, entities=entities, includeScenefiles=includeScenefiles
+        )
+
+        candidates = []
+        for stack in stacks:
+            rule = self.getRuleForVersionStack(stack)
+            if not rule:
+                continue
+
+            masterSources = self.getMasterSourcePaths(stack)
+            keepVersions = rule.get("keepVersions")
+            keepDays = rule.get("keepDays")
+            numbered = []
+            for version in stack["versions"]:
+                if version["version"] == "master":
+                    continue
+
+                intVersion = self.core.products.getIntVersionFromVersionName(version["version"])
+                if intVersion is None:
+                    continue
+
+                numbered.append((intVersion, version))
+
+            numbered = sorted(numbered, key=lambda x: x[0], reverse=True)
+            for idx, versionData in enumerate(numbered):
+                version = versionData[1]
+                if keepVersions is not None and idx < keepVersions:
+                    continue
+
+                for path in version.get("paths") or [version["path"]]:
+                    path = os.path.normpath(path)
+                    if path in masterSources or path in referenced:
+                        continue
+
+                    age = self.getVersionAge(path)
+                    if keepDays is not None and (age is None or age < keepDays):
+                        continue
+
+                    candidates.append({
+                        "path": path,
+                        "kind": stack["kind"],
+                        "version": version["version"],
+                        "context": stack["context"],
+                        "age": age,
+                    })
+
+        self.core.diskUsage.loadCache()
+        paths = [os.path.normpath(c["path"]) for c in candidates]
+        with ThreadPoolExecutor(max_workers=self.maxWorkers) as executor:
+            sizes = list(executor.map(self.core.diskUsage.computeSize, paths))
+
+        for candidate, size in zip(candidates, sizes):
+            candidate["size"] = size
+
+        report = {
+            "date": time.strftime("%d.%m.%y %X"),
+            "candidates": candidates,
+            "reclaimableSize": sum(sizes),
+        }
+        return report
+
+    @err_catcher(name=__name__)
+    def getTrashFolder(self):
+        return os.path.join(self.core.projects.getPipelineFolder(), "Retention")
+
+    @err_catcher(name=__name__)
+    def getTrashManifests(self):
+        folder = self.getTrashFolder()
+        if not os.path.exists(folder):
+            return []
+
+        ext = self.core.configs.getProjectExtension()
+        manifests = [
+            os.path.join(folder, f) for f in sorted(os.listdir(folder)) if f.endswith(ext)
+        ]
+        return manifests
+
+    @err_catcher(name=__name__)
+    def trashVersion(self, path):
+        trashBase = os.path.join(os.path.dirname(path), self.trashFolderName)
+        trashPath = os.path.join(trashBase, os.path.basename(path))
+        idx = 1
+        while os.path.exists(trashPath):
+            trashPath = os.path.join(trashBase, "%s_%s" % (os.path.basename(path), idx))
+            idx += 1
+
+        try:
+            if not os.path.exists(trashBase):
+                os.makedirs(trashBase)
+
+            os.rename(path, trashPath)
+        except Exception as e:
+            logger.warning("failed to move version to trash: %s - %s" % (path, e))
+            return
+
+        return trashPath
+
+    @err_catcher(name=__name__)
+    def trashVersions(self, report):
+        paths = [c["path"] for c in report["candidates"]]
+        with ThreadPoolExecutor(max_workers=self.maxWorkers) as executor:
+            trashPaths = list(executor.map(self.trashVersion, paths))
+
+        entries = []
+        for candidate, trashPath in zip(report["candidates"], trashPaths):
+            if not trashPath:
+                continue
+
+            entries.append({
+                "path": candidate["path"],
+                "trashPath": trashPath,
+                "size": candidate.get("size", 0),
+            })
+
+        manifestPath = os.path.join(
+            self.getTrashFolder(),
+            time.strftime("%Y%m%d_%H%M%S") + self.core.configs.getProjectExtension(),
+        )
+        data = {
+            "date": time.strftime("%d.%m.%y %X"),
+            "user": self.core.user,
+            "entries": entries,
+        }
+        self.core.setConfig(data=data, configPath=manifestPath)
+        logger.debug("moved %s versions to trash: %s" % (len(entries), manifestPath))
+        return manifestPath
+
+    @err_catcher(name=__name__)
+    def restoreTrash(self, manifestPath):
+        data = self.core.getConfig(configPath=manifestPath) or {}
+        failed = []
+        for entry in data.get("entries", []):
+            if not os.path.exists(entry["trashPath"]):
+                continue
+
+            if os.path.exists(entry["path"]):
+                failed.append(entry)
+                continue
+
+            try:
+                os.rename(entry["trashPath"], entry["path"])
+            except Exception as e:
+                logger.warning("failed to restore version: %s - %s" % (entry["path"], e))
+                failed.append(entry)
+
+        self.finalizeManifest(manifestPath, failed)
+        return not failed
+
+    @err_catcher(name=__name__)
+    def purgeTrash(self, manifestPath):
+        data = self.core.getConfig(configPath=manifestPath) or {}
+        entries = data.get("entries", [])
+
+        def purge(entry):
+            try:
+                if os.path.exists(entry["trashPath"]):
+                    shutil.rmtree(entry["trashPath"])
+            except Exception as e:
+                logger.warning("failed to purge version: %s - %s" % (entry["trashPath"], e))
+                return entry
+
+        with ThreadPoolExecutor(max_workers=self.maxWorkers) as executor:
+            failed = [entry for entry in executor.map(purge, entries) if entry]
+
+        self.finalizeManifest(manifestPath, failed)
+        return not failed
+
+    @err_catcher(name=__name__)
+    def finalizeManifest(self, manifestPath, remainingEntries):
+        if remainingEntries:
+            data = self.core.getConfig(configPath=manifestPath) or {}
+            data["entries"] = remainingEntries
+            self.core.setConfig(data=data, configPath=manifestPath)
+            return
+
+        try:
+            os.remove(manifestPath)
+        except Exception as e:
+            logger.warning("failed to remove manifest: %s - %s" % (manifestPath, e))
+
+        self.core.configs.clearCache(path=manifestPath)
+
+    @err_catcher(name=__name__)
+    def purgeExpiredTrash(self, days=7):
+        for manifestPath in self.getTrashManifests():
+            age = (time.time() - os.path.getmtime(manifestPath)) / 86400.0
+            if age >= days:
+                self.purgeTrash(manifestPath)
+
+    @err_catcher(name=__name__)
+    def formatReport(self, report):
+        lines = []
+        for candidate in sorted(report["candidates"], key=lambda x: x["path"]):
+            lines.append("%s  %s" % (self.core.diskUsage.formatSize(candidate.get("size", 0)).rjust(10), candidate["path"]))
+
+        lines.append(
+            "%s versions, %s reclaimable"
+            % (len(report["candidates"]), self.core.diskUsage.formatSize(report["reclaimableSize"]))
+        )
+        return "\n".join(lines)
@@ -33,7 +33,11 @@
 
 
 import os
+import time
 import logging
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 from qtpy.QtCore import *
 from qtpy.QtGui import *
@@ -48,6 +52,11 @@ logger = logging.getLogger(__name__)
 class SanityChecks(object):
     def __init__(self, core):
         self.core = core
+        self.maxWorkers = 4
+        self.executor = None
+        self.lock = threading.Lock()
+        self.results = {}
+        self.folderCache = {}
         self.checksToRun = {
             "onOpenProjectBrowser": [
                 {"name": "restartRequired", "function": self.checkRestartRequired}
@@ -56,23 +65,272 @@ class SanityChecks(object):
                 {"name": "restartRequired", "function": self.checkRestartRequired}
             ],
         }
+        self.registerCheck(
+            "onSceneOpen",
+            "importVersions",
+            self.getImportVersionUpdates,
+            inputs=self.getImportVersionInputs,
+            report=self.reportImportVersions,
+            threaded=True,
+        )
+        self.registerCheck(
+            "onSceneOpen",
+            "framerange",
+            self.getShotRange,
+            inputs=self.getFramerangeInputs,
+            report=self.reportFramerange,
+            threaded=True,
+        )
+        self.registerCheck(
+            "onSceneOpen",
+            "fps",
+            self.getProjectFps,
+            inputs=self.getFpsInputs,
+            report=self.reportFps,
+            threaded=True,
+        )
+        self.registerCheck(
+            "onSceneOpen",
+            "resolution",
+            self.getProjectResolution,
+            inputs=self.getResolutionInputs,
+            report=self.reportResolution,
+            threaded=True,
+        )
+
+    @err_catcher(name=__name__)
+    def registerCheck(
+        self, category, name, function, inputs=None, report=None, threaded=False
+    ):
+        """
+        Checks without inputs get called as function(quiet=quiet) every time
+        and return whether they passed.
+
+        Checks with inputs are split into an evaluation and a report:
+        inputs() runs in the main thread and returns None to skip the check or
+        a dict with "paths" (files and folders the result depends on), "values"
+        (scene state and settings) and "args" for the function. The result
+        of function(**args) is cached until one of the inputs changes.
+        Threaded functions must not access the DCC or any UI, they run in
+        worker threads next to other threaded checks. report(result, quiet)
+        runs in the main thread and returns whether the check passed.
+        """
+        check = {
+            "name": name,
+            "function": function,
+            "inputs": inputs,
+            "report": report,
+            "threaded": threaded,
+        }
+        checks = self.checksToRun.setdefault(category, [])
+        for idx, existing in enumerate(checks):
+            if existing["name"] == name:
+                checks[idx] = check
+                break
+        else:
+            checks.append(check)
+
+        self.invalidate(name)
+        return check
+
+    @err_catcher(name=__name__)
+    def unregisterCheck(self, category, name):
+        checks = self.checksToRun.get(category, [])
+        self.checksToRun[category] = [check for check in checks if check["name"] != name]
+        self.invalidate(name)
+
+    @err_catcher(name=__name__)
+    def invalidate(self, name=None):
+        with self.lock:
+            if name is None:
+                self.results = {}
+                self.folderCache = {}
+            elif name in self.results:
+                del self.results[name]
+
+    @err_catcher(name=__name__)
+    def isThreaded(self):
+        return os.getenv("PRISM_THREADED_SANITY_CHECKS", "1") != "0"
 
     @err_catcher(name=__name__)
-    def runChecks(self, category, quiet=False):
+    def getExecutor(self):
+        if not self.executor:
+            self.executor = ThreadPoolExecutor(max_workers=self.maxWorkers)
+
+        return self.executor
+
+    @err_catcher(name=__name__)
+    def runChecks(self, category, quiet=False, names=None):
         result = {"passed": True, "checks": []}
         if category not in self.checksToRun:
             return result
 
-        for check in self.checksToRun[category]:
-            checkResult = check["function"](quiet=quiet)
+        checks = [
+            check
+            for check in self.checksToRun[category]
+            if names is None or check["name"] in names
+        ]
+        evaluations = self.evaluateChecks(checks)
+        for check in checks:
+            if check.get("inputs"):
+                evaluation = evaluations[check["name"]]
+                if evaluation["skipped"]:
+                    checkResult = True
+                elif check.get("report"):
+                    checkResult = check["report"](evaluation["result"], quiet=quiet)
+                    checkResult = checkResult is not False
+                else:
+                    checkResult = bool(evaluation["result"])
+
+                cached = evaluation["cached"]
+            else:
+                checkResult = check["function"](quiet=quiet)
+                cached = False
+
             if not checkResult:
                 result["passed"] = False
 
-            checkData = {"name": check["name"], "passed": checkResult}
+            checkData = {"name": check["name"], "passed": checkResult, "cached": cached}
             result["checks"].append(checkData)
 
         return result
 
+    @err_catcher(name=__name__)
+    def evaluateChecks(self, checks):
+        # inputs get collected in the main thread, because they usually
+        # query the scene. Threaded checks which depend on the same paths
+        # run one after another in the same worker.
+        evaluations = {}
+        groups = []
+        for check in checks:
+            if not check.get("inputs"):
+                continue
+
+            inputs = check["inputs"]()
+            evaluation = {
+                "check": check,
+                "inputs": inputs,
+                "result": None,
+                "cached": False,
+                "skipped": inputs is None,
+            }
+            evaluations[check["name"]] = evaluation
+            if evaluation["skipped"]:
+                continue
+
+            if not check.get("threaded") or not self.isThreaded():
+                self.evaluateCheck(evaluation)
+                continue
+
+            paths = set(os.path.normpath(path) for path in inputs.get("paths", []))
+            for group in groups:
+                if group["paths"] & paths:
+                    group["paths"] |= paths
+                    group["evaluations"].append(evaluation)
+                    break
+            else:
+                groups.append({"paths": paths, "evaluations": [evaluation]})
+
+        futures = [
+            self.getExecutor().submit(self.evaluateGroup, group["evaluations"])
+            for group in groups
+        ]
+        for future in futures:
+            future.result()
+
+        return evaluations
+
+    def evaluateGroup(self, evaluations):
+        for evaluation in evaluations:
+            self.evaluateCheck(evaluation)
+
+    def evaluateCheck(self, evaluation):
+        # may run in a worker thread, where err_catcher would raise
+        check = evaluation["check"]
+        inputs = evaluation["inputs"]
+        fingerprint = self.getFingerprint(inputs)
+        with self.lock:
+            cache = self.results.get(check["name"])
+
+        if cache and cache["fingerprint"] == fingerprint:
+            evaluation["result"] = cache["result"]
+            evaluation["cached"] = True
+            return
+
+        try:
+            result = check["function"](**inputs.get("args", {}))
+        except Exception:
+            logger.warning(
+                "sanity check %s failed: %s" % (check["name"], traceback.format_exc())
+            )
+            evaluation["skipped"] = True
+            return
+
+        evaluation["result"] = result
+        with self.lock:
+            self.results[check["name"]] = {"fingerprint": fingerprint, "result": result}
+
+    def getFingerprint(self, inputs):
+        paths = []
+        for path in inputs.get("paths", []):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                paths.append((path, None))
+            else:
+                paths.append((path, stat.st_mtime, stat.st_size))
+
+        return (tuple(paths), repr(inputs.get("values", [])))
+
+    @err_catcher(name=__name__)
+    def getExistingPaths(self, paths):
+        # every folder gets listed once instead of checking all files on
+        # their own. A folder listing stays valid until the folder changes.
+        folders = {}
+        for path in paths:
+            path = os.path.normpath(path)
+            folders.setdefault(os.path.dirname(path), []).append(path)
+
+        if self.isThreaded() and len(folders) > 1:
+            results = self.getExecutor().map(
+                lambda x: self.getExistingPathsInFolder(*x), folders.items()
+            )
+        else:
+            results = [self.getExistingPathsInFolder(*x) for x in folders.items()]
+
+        existing = set()
+        for result in results:
+            existing.update(result)
+
+        return existing
+
+    def getExistingPathsInFolder(self, folder, paths):
+        try:
+            mtime = os.stat(folder).st_mtime
+        except OSError:
+            return []
+
+        with self.lock:
+            cache = self.folderCache.get(folder)
+
+        if cache and cache["mtime"] == mtime:
+            entries = cache["entries"]
+        else:
+            try:
+                entries = set(os.path.normcase(name) for name in os.listdir(folder))
+            except OSError:
+                return [path for path in paths if os.path.exists(path)]
+
+            # the mtime resolution of some filesystems is too coarse to notice
+            # changes right after the listing
+            if time.time() - mtime > 2:
+                with self.lock:
+                    self.folderCache[folder] = {"mtime": mtime, "entries": entries}
+
+        return [
+            path for path in paths if os.path.normcase(os.path.basename(path)) in entries
+        ]
+
     @err_catcher(name=__name__)
     def checkRestartRequired(self, quiet=False):
         if self.core.restartRequired and not quiet:
@@ -85,6 +343,10 @@ class SanityChecks(object):
 
     @err_catcher(name=__name__)
     def checkImportVersions(self):
+        return self.runChecks("onSceneOpen", names=["importVersions"])["passed"]
+
+    @err_catcher(name=__name__)
+    def getImportVersionInputs(self):
         checkImpVersions = self.core.getConfig("globals", "check_import_versions")
         if checkImpVersions is None:
             self.core.setConfig("globals", "check_import_versions", True)
@@ -113,8 +375,26 @@ class SanityChecks(object):
         if len(paths) == 0:
             return
 
-        msgString = "For the following imports there is a newer version available:\n\n"
-        updates = 0
+        # new versions get created as new folders in the product folder
+        inputPaths = [self.core.prismIni]
+        for pathData in paths:
+            versionFolder = os.path.dirname(
+                self.core.products.getVersionInfoPathFromProductFilepath(pathData[0])
+            )
+            productFolder = os.path.dirname(versionFolder)
+            if productFolder not in inputPaths:
+                inputPaths.append(productFolder)
+
+        useMaster = self.core.products.getUseMaster()
+        return {
+            "paths": inputPaths,
+            "values": [paths, useMaster],
+            "args": {"paths": paths, "includeMaster": useMaster},
+        }
+
+    @err_catcher(name=__name__)
+    def getImportVersionUpdates(self, paths, includeMaster=True):
+        updates = []
         for pathData in paths:
             path = pathData[0]
             if not os.path.exists(os.path.dirname(path)):
@@ -128,21 +408,34 @@ class SanityChecks(object):
             if not curVersion or "version" not in curVersion:
                 continue
 
-            latestVersion = self.core.products.getLatestVersionFromPath(path, includeMaster=self.core.products.getUseMaster())
+            latestVersion = self.core.products.getLatestVersionFromPath(path, includeMaster=includeMaster)
 
             if not latestVersion or curVersion["version"] == latestVersion["version"]:
                 continue
 
+            updates.append([pathData[1], curVersion["version"], latestVersion["version"]])
+
+        return updates
+
+    @err_catcher(name=__name__)
+    def reportImportVersions(self, updates, quiet=False):
+        if not updates:
+            return True
+
+        if quiet:
+            return False
+
+        msgString = "For the following imports there is a newer version available:\n\n"
+        for name, curVersion, latestVersion in updates:
             msgString += "%s\n    current: %s\n    latest: %s\n\n" % (
-                pathData[1],
-                curVersion["version"],
-                latestVersion["version"],
+                name,
+                curVersion,
+                latestVersion,
             )
-            updates += 1
 
         msgString += "Please update the imports in the State Manager."
 
-        if updates > 0:
+        if updates:
             msg = self.core.popupQuestion(
                 msgString,
                 title="New versions available",
@@ -155,6 +448,8 @@ class SanityChecks(object):
                 msg.buttonClicked.connect(self.onImportVersionsClicked)
                 msg.show()
 
+        return False
+
     @err_catcher(name=__name__)
     def onImportVersionsClicked(self, button):
         result = button.text()
@@ -168,6 +463,10 @@ class SanityChecks(object):
 
     @err_catcher(name=__name__)
     def checkFramerange(self):
+        return self.runChecks("onSceneOpen", names=["framerange"])["passed"]
+
+    @err_catcher(name=__name__)
+    def getFramerangeInputs(self):
         if not getattr(self.core.appPlugin, "hasFrameRange", True):
             return
 
@@ -197,14 +496,35 @@ class SanityChecks(object):
         if fnameData["shot"] == "_sequence":
             return
 
-        shotRange = self.core.entities.getShotRange(fnameData)
+        entity = {"sequence": fnameData["sequence"], "shot": fnameData["shot"]}
+        return {
+            "paths": [self.core.configs.getConfigPath("shotinfo")],
+            "values": [entity],
+            "args": {"entity": entity},
+        }
+
+    @err_catcher(name=__name__)
+    def getShotRange(self, entity):
+        shotRange = self.core.entities.getShotRange(entity)
         if not isinstance(shotRange, list) or len(shotRange) != 2 or shotRange[0] in [None, ""] or shotRange[1] in [None, ""]:
             return
 
+        return {"entity": entity, "range": shotRange}
+
+    @err_catcher(name=__name__)
+    def reportFramerange(self, result, quiet=False):
+        if not result:
+            return True
+
+        shotRange = result["range"]
         curRange = self.core.appPlugin.getFrameRange(self.core)
         if int(curRange[0]) == int(shotRange[0]) and int(curRange[1]) == int(shotRange[1]):
-            return
+            return True
 
+        if quiet:
+            return False
+
+        fnameData = result["entity"]
         shotName = self.core.entities.getShotName(fnameData)
         msgString = (
             "The framerange of the current scene doesn't match the framerange of the shot:\n\nFramerange of current scene:\n%s - %s\n\nFramerange of shot %s:\n%s - %s"
@@ -226,6 +546,8 @@ class SanityChecks(object):
                 msg.buttonClicked.connect(lambda x: self.onCheckFramerangeClicked(x, shotRange))
                 msg.show()
 
+        return False
+
     @err_catcher(name=__name__)
     def onCheckFramerangeClicked(self, button, shotRange):
         result = button.text()
@@ -234,10 +556,11 @@ class SanityChecks(object):
 
     @err_catcher(name=__name__)
     def checkFPS(self):
-        forceFPS = self.core.getConfig(
-            "globals", "forcefps", configPath=self.core.prismIni
-        )
-        if not forceFPS:
+        return self.runChecks("onSceneOpen", names=["fps"])["passed"]
+
+    @err_catcher(name=__name__)
+    def getFpsInputs(self):
+        if not getattr(self.core, "prismIni", None):
             return
 
         if not getattr(self.core.appPlugin, "hasFrameRange", True):
@@ -246,17 +569,35 @@ class SanityChecks(object):
         if not self.core.fileInPipeline():
             return
 
+        return {"paths": [self.core.prismIni]}
+
+    @err_catcher(name=__name__)
+    def getProjectFps(self):
+        forceFPS = self.core.getConfig(
+            "globals", "forcefps", configPath=self.core.prismIni
+        )
+        if not forceFPS:
+            return
+
         pFps = self.core.getConfig("globals", "fps", configPath=self.core.prismIni)
 
         if pFps is None:
             return
 
-        pFps = float(pFps)
+        return float(pFps)
+
+    @err_catcher(name=__name__)
+    def reportFps(self, pFps, quiet=False):
+        if pFps is None:
+            return True
 
         curFps = self.core.getFPS()
 
         if pFps == curFps or curFps is None:
-            return
+            return True
+
+        if quiet:
+            return False
 
         vInfo = [["FPS of current scene:", str(curFps)], ["FPS of project", str(pFps)]]
         lay_info = QGridLayout()
@@ -293,6 +634,8 @@ class SanityChecks(object):
             msg.buttonClicked.connect(lambda x: self.onCheckFpsClicked(x, pFps))
             msg.show()
 
+        return False
+
     @err_catcher(name=__name__)
     def onCheckFpsClicked(self, button, projectFps):
         result = button.text()
@@ -301,15 +644,26 @@ class SanityChecks(object):
 
     @err_catcher(name=__name__)
     def checkResolution(self):
+        return self.runChecks("onSceneOpen", names=["resolution"])["passed"]
+
+    @err_catcher(name=__name__)
+    def getResolutionInputs(self):
+        if not getattr(self.core, "prismIni", None):
+            return
+
+        if not self.core.fileInPipeline():
+            return
+
+        return {"paths": [self.core.prismIni]}
+
+    @err_catcher(name=__name__)
+    def getProjectResolution(self):
         forceRes = self.core.getConfig(
             "globals", "forceResolution", configPath=self.core.prismIni
         )
         if not forceRes:
             return
 
-        if not self.core.fileInPipeline():
-            return
-
         pRes = self.core.getConfig(
             "globals", "resolution", configPath=self.core.prismIni
         )
@@ -317,12 +671,22 @@ class SanityChecks(object):
         if not pRes:
             return
 
+        return list(pRes)
+
+    @err_catcher(name=__name__)
+    def reportResolution(self, pRes, quiet=False):
+        if not pRes:
+            return True
+
         curRes = self.core.getResolution()
         if not curRes:
-            return
+            return True
 
-        if list(pRes) == curRes:
-            return
+        if list(pRes) == list(curRes):
+            return True
+
+        if quiet:
+            return False
 
         vInfo = [
             ["Resolution of current scene:", "%s x %s" % (curRes[0], curRes[1])],
@@ -361,6 +725,8 @@ class SanityChecks(object):
             msg.buttonClicked.connect(lambda x: self.onCheckResolutionClicked(x, pRes))
             msg.show()
 
+        return False
+
     @err_catcher(name=__name__)
     def onCheckResolutionClicked(self, button, projectResolution):
         result = button.text()
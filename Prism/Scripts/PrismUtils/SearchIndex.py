@@ -0,0 +1,911 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import re
+import bisect
+import heapq
+import logging
+import threading
+import time
+
+from qtpy.QtCore import *
+from qtpy.QtGui import *
+from qtpy.QtWidgets import *
+
+from PrismUtils.Decorators import err_catcher
+
+
+logger = logging.getLogger(__name__)
+
+
+class SearchIndex(QObject):
+    """Full-text index of the entities, tasks, products, media and scenefiles
+    of the current project.
+
+    Documents are built from entity names and metadata, task names and the
+    versioninfo files of the project (names, comments, users and dates).
+    The index is cached per project and refreshed incrementally, versioninfo
+    files, task folders and project folders only get read again when their
+    modification time changed. In UI sessions the file system gets scanned
+    in the background and searches get answered from the current index
+    until refreshFinished is emitted.
+    """
+
+    facetKeys = ["type", "user", "department", "task", "mediaType", "date"]
+    refreshFinished = Signal()
+    refreshCollected = Signal(object)
+
+    def __init__(self, core):
+        super(SearchIndex, self).__init__()
+        self.core = core
+        self.docs = {}
+        self.infoModtimes = {}
+        self.taskModtimes = {}
+        self.folders = {}
+        self.postings = {}
+        self.sortedTokens = None
+        self.tokensByLength = None
+        self.cacheLoaded = None
+        self.stale = True
+        self.refreshing = False
+        self.dirty = False
+        self.refreshCollected.connect(self.applyRefresh)
+        self.core.registerCallback("onAssetCreated", self.onAssetCreated)
+        self.core.registerCallback("onShotCreated", self.onShotCreated)
+        self.core.registerCallback("onDepartmentCreated", self.onDepartmentCreated)
+        self.core.registerCallback("onTaskCreated", self.onTaskCreated)
+
+    @err_catcher(name=__name__)
+    def getCachePath(self):
+        if not getattr(self.core, "projectName", None):
+            return
+
+        return os.path.join(
+            self.core.getUserPrefDir(),
+            "Cache",
+            "searchIndex_%s.json" % self.core.projectName,
+        )
+
+    @err_catcher(name=__name__)
+    def loadCache(self):
+        cachePath = self.getCachePath()
+        if self.cacheLoaded == cachePath:
+            return
+
+        self.cacheLoaded = cachePath
+        self.docs = {}
+        self.infoModtimes = {}
+        self.taskModtimes = {}
+        self.folders = {}
+        self.postings = {}
+        self.sortedTokens = None
+        self.tokensByLength = None
+        self.stale = True
+        if not cachePath or not os.path.exists(cachePath):
+            return
+
+        data = self.core.configs.readJson(path=cachePath, ignoreErrors=True) or {}
+        self.infoModtimes = data.get("infoModtimes", {})
+        self.taskModtimes = data.get("taskModtimes", {})
+        self.folders = data.get("folders", {})
+        for doc in data.get("docs", []):
+            self.addDoc(doc)
+
+        self.dirty = False
+
+    @err_catcher(name=__name__)
+    def saveCache(self):
+        cachePath = self.cacheLoaded
+        if not cachePath or not self.dirty:
+            return
+
+        data = {
+            "docs": list(self.docs.values()),
+            "infoModtimes": self.infoModtimes,
+            "taskModtimes": self.taskModtimes,
+            "folders": self.folders,
+        }
+        self.core.configs.writeJson(data, path=cachePath, indent=None, quiet=True)
+        self.dirty = False
+
+    @err_catcher(name=__name__)
+    def invalidate(self):
+        self.stale = True
+
+    @err_catcher(name=__name__)
+    def tokenize(self, text):
+        if not text:
+            return []
+
+        text = re.sub(r"([a-z])([A-Z])", r"\1 \2", str(text))
+        tokens = [token for token in re.split(r"[^a-z0-9]+", text.lower()) if token]
+        return tokens
+
+    @err_catcher(name=__name__)
+    def getNameTokens(self, name):
+        # "charRig_v0001" is found as "charrig", "char" and "rig"
+        tokens = self.tokenize(name)
+        for part in re.split(r"[^a-zA-Z0-9]+", str(name or "")):
+            if part and part.lower() not in tokens:
+                tokens.append(part.lower())
+
+        return tokens
+
+    @err_catcher(name=__name__)
+    def addDoc(self, doc):
+        if doc["id"] in self.docs:
+            self.removeDoc(doc["id"])
+
+        self.docs[doc["id"]] = doc
+        weights = {}
+        for token in doc["names"]:
+            weights[token] = 3
+
+        for token in doc["terms"]:
+            weights.setdefault(token, 1)
+
+        for token, weight in weights.items():
+            self.postings.setdefault(token, {})[doc["id"]] = weight
+
+        self.sortedTokens = None
+        self.tokensByLength = None
+        self.dirty = True
+
+    @err_catcher(name=__name__)
+    def removeDoc(self, docId):
+        doc = self.docs.pop(docId, None)
+        if not doc:
+            return
+
+        for token in set(doc["names"] + doc["terms"]):
+            if token in self.postings:
+                self.postings[token].pop(docId, None)
+                if not self.postings[token]:
+                    del self.postings[token]
+
+        self.sortedTokens = None
+        self.tokensByLength = None
+        self.dirty = True
+
+    @err_catcher(name=__name__)
+    def createDoc(self, docId, docType, title, names, terms=None, facets=None, data=None, path=""):
+        nameTokens = []
+        for name in names:
+            for token in self.getNameTokens(name):
+                if token not in nameTokens:
+                    nameTokens.append(token)
+
+        termTokens = []
+        for term in terms or []:
+            for token in self.tokenize(term):
+                if token not in termTokens and token not in nameTokens:
+                    termTokens.append(token)
+
+        docFacets = {"type": docType}
+        for key, value in (facets or {}).items():
+            if value:
+                docFacets[key] = str(value)
+
+        return {
+            "id": docId,
+            "type": docType,
+            "title": title,
+            "path": path,
+            "names": nameTokens,
+            "terms": termTokens,
+            "facets": docFacets,
+            "data": data or {},
+        }
+
+    @err_catcher(name=__name__)
+    def getEntityId(self, entity):
+        if entity.get("type") == "asset":
+            return "asset:%s" % entity.get("asset_path", "").replace("\\", "/")
+        elif entity.get("type") == "shot":
+            return "shot:%s/%s" % (entity.get("sequence", ""), entity.get("shot", ""))
+        elif entity.get("type") == "sequence":
+            return "sequence:%s" % entity.get("sequence", "")
+
+    @err_catcher(name=__name__)
+    def getEntityLabel(self, entity):
+        if entity.get("type") == "asset":
+            return entity.get("asset_path", "").replace("\\", "/")
+        elif entity.get("type") == "shot":
+            return "%s-%s" % (entity.get("sequence", ""), entity.get("shot", ""))
+        else:
+            return entity.get("sequence", "")
+
+    @err_catcher(name=__name__)
+    def getEntityContext(self, data):
+        context = {"type": data.get("type")}
+        for key in ["asset_path", "sequence", "shot"]:
+            if data.get(key):
+                context[key] = data[key]
+
+        return context
+
+    @err_catcher(name=__name__)
+    def createEntityDoc(self, entity):
+        context = self.getEntityContext(entity)
+        label = self.getEntityLabel(context)
+        names = [label]
+        if context["type"] == "asset":
+            names.append(os.path.basename(label))
+
+        terms = []
+        for key, value in self.core.entities.getMetaData(context).items():
+            terms.append(key)
+            if isinstance(value, dict):
+                value = value.get("value", "")
+
+            terms.append(str(value))
+
+        return self.createDoc(
+            "entity:" + self.getEntityId(context),
+            context["type"],
+            label,
+            names,
+            terms=terms,
+            data=context,
+            path=entity.get("path", ""),
+        )
+
+    @err_catcher(name=__name__)
+    def createTaskDoc(self, entity, department, task):
+        context = self.getEntityContext(entity)
+        label = self.getEntityLabel(context)
+        context["department"] = department
+        context["task"] = task
+        return self.createDoc(
+            "task:%s/%s/%s" % (self.getEntityId(context), department, task),
+            "task",
+            "%s - %s - %s" % (label, department, task),
+            [task],
+            terms=[department, label],
+            facets={"department": department, "task": task},
+            data=context,
+        )
+
+    @err_catcher(name=__name__)
+    def getEntities(self):
+        entities = list(self.core.entities.getAssets())
+        sequences, shots = self.core.entities.getShots()
+        entities += shots
+        entities += [{"type": "sequence", "sequence": seq} for seq in sequences]
+        return entities
+
+    @err_catcher(name=__name__)
+    def updateEntity(self, entity, tasks=True):
+        self.loadCache()
+        doc = self.createEntityDoc(entity)
+        self.addDoc(doc)
+        if not tasks or entity.get("type") == "sequence":
+            return
+
+        tasks = self.collectTasks(entity)
+        for taskDoc in tasks["docs"]:
+            self.addDoc(taskDoc)
+
+        self.taskModtimes[doc["id"]] = tasks["stamps"]
+
+    @err_catcher(name=__name__)
+    def getTaskFolders(self, entity, departments):
+        # new departments change the modification time of their parent
+        # folder, new tasks the one of their department folder
+        folders = [self.core.getEntityPath(entity=entity, reqEntity="step")]
+        for department in departments:
+            folders.append(self.core.getEntityPath(entity=entity, step=department))
+
+        if self.core.useLocalFiles:
+            folders += [self.core.convertPath(folder, target="local") for folder in folders]
+
+        return folders
+
+    @err_catcher(name=__name__)
+    def getFolderStamps(self, folders):
+        stamps = {}
+        for folder in folders:
+            try:
+                stamps[folder] = os.stat(folder).st_mtime
+            except OSError:
+                stamps[folder] = None
+
+        return stamps
+
+    @err_catcher(name=__name__)
+    def collectTasks(self, entity):
+        departments = self.core.entities.getSteps(entity)
+        docs = []
+        for department in departments:
+            for task in self.core.entities.getCategories(entity, department):
+                docs.append(self.createTaskDoc(entity, department, task))
+
+        stamps = self.getFolderStamps(self.getTaskFolders(entity, departments))
+        return {"stamps": stamps, "docs": docs}
+
+    @err_catcher(name=__name__)
+    def isVersionInfo(self, path):
+        base, ext = os.path.splitext(os.path.basename(path))
+        return base.endswith("versioninfo") and ext in [".json", ".yml", ".ini"]
+
+    @err_catcher(name=__name__)
+    def formatDate(self, date):
+        # versioninfo dates are stored as "%d.%m.%y %X"
+        try:
+            return time.strftime("%Y-%m", time.strptime(date.split(" ")[0], "%d.%m.%y"))
+        except Exception:
+            return ""
+
+    @err_catcher(name=__name__)
+    def createVersionInfoDoc(self, infoPath, data):
+        context = self.getEntityContext(data)
+        entityLabel = self.getEntityLabel(context)
+        user = data.get("username") or data.get("user") or ""
+        facets = {
+            "user": user,
+            "department": data.get("department"),
+            "task": data.get("task"),
+            "date": self.formatDate(data.get("date", "")),
+        }
+        terms = [
+            entityLabel,
+            data.get("comment", ""),
+            data.get("description", ""),
+            data.get("user", ""),
+            data.get("username", ""),
+            data.get("department", ""),
+            data.get("task", ""),
+            data.get("date", ""),
+        ]
+        version = data.get("version", "")
+        base = os.path.splitext(os.path.basename(infoPath))[0][: -len("versioninfo")]
+        if base:
+            docType = "scenefile"
+            filename = base.rstrip("._")
+            title = "%s - %s" % (entityLabel, filename)
+            names = [filename]
+            context.update({"department": data.get("department"), "task": data.get("task")})
+            path = os.path.dirname(infoPath)
+        elif data.get("product"):
+            docType = "product"
+            title = "%s - %s - %s" % (entityLabel, data["product"], version)
+            names = [data["product"], version]
+            context["product"] = data["product"]
+            context["version"] = version
+            path = os.path.dirname(infoPath)
+        elif data.get("identifier"):
+            docType = "media"
+            title = "%s - %s - %s" % (entityLabel, data["identifier"], version)
+            names = [data["identifier"], version]
+            context["identifier"] = data["identifier"]
+            context["version"] = version
+            facets["mediaType"] = data.get("mediaType")
+            path = os.path.dirname(infoPath)
+        else:
+            return
+
+        context = {key: val for key, val in context.items() if val}
+        return self.createDoc(
+            "info:" + infoPath,
+            docType,
+            title,
+            names,
+            terms=terms,
+            facets=facets,
+            data=context,
+            path=path,
+        )
+
+    @err_catcher(name=__name__)
+    def updateVersionInfo(self, infoPath, modtime=None):
+        self.loadCache()
+        infoPath = os.path.normpath(infoPath)
+        if modtime is None:
+            try:
+                modtime = os.stat(infoPath).st_mtime
+            except OSError:
+                self.removeVersionInfo(infoPath)
+                return
+
+        data = self.readVersionInfo(infoPath) or {}
+        self.infoModtimes[infoPath] = modtime
+        doc = self.createVersionInfoDoc(infoPath, data)
+        if doc:
+            self.addDoc(doc)
+        else:
+            self.removeDoc("info:" + infoPath)
+
+        self.dirty = True
+
+    @err_catcher(name=__name__)
+    def readVersionInfo(self, infoPath):
+        # the versioninfos are read without the config cache of the core,
+        # which would keep all of them in memory
+        ext = os.path.splitext(infoPath)[1]
+        if ext == ".json":
+            return self.core.configs.readJson(path=infoPath, ignoreErrors=True)
+        elif ext == ".yml":
+            return self.core.configs.readYaml(path=infoPath)
+        else:
+            return self.core.getConfig(configPath=infoPath)
+
+    @err_catcher(name=__name__)
+    def removeVersionInfo(self, infoPath):
+        self.infoModtimes.pop(infoPath, None)
+        self.removeDoc("info:" + infoPath)
+
+    @err_catcher(name=__name__)
+    def refresh(self, force=False):
+        self.loadCache()
+        if not self.stale and not force:
+            return
+
+        self.applyRefresh(self.collectRefresh(self.getRefreshState(force), emit=False))
+
+    @err_catcher(name=__name__)
+    def requestRefresh(self, force=False):
+        self.loadCache()
+        if (not self.stale and not force) or self.refreshing:
+            return
+
+        if not self.core.uiAvailable:
+            self.refresh(force=force)
+            return
+
+        self.refreshing = True
+        thread = threading.Thread(target=self.collectRefresh, args=(self.getRefreshState(force),))
+        thread.daemon = True
+        thread.start()
+
+    @err_catcher(name=__name__)
+    def getRefreshState(self, force=False):
+        # the entities get queried from the core on the main thread, the
+        # worker only reads files and folders
+        entities = {}
+        for entity in self.getEntities():
+            doc = self.createEntityDoc(entity)
+            entities[doc["id"]] = {"entity": entity, "doc": doc}
+
+        projectPath = getattr(self.core, "projectPath", None)
+        if not projectPath or not os.path.exists(projectPath):
+            projectPath = None
+        else:
+            projectPath = os.path.normpath(projectPath)
+
+        pipelineFolder = os.path.normpath(self.core.projects.getPipelineFolder() or "")
+        state = {
+            "cachePath": self.cacheLoaded,
+            "projectPath": projectPath,
+            "pipelineFolder": pipelineFolder,
+            "entities": entities,
+            "force": force,
+        }
+        if force:
+            state.update({"infoModtimes": {}, "taskModtimes": {}, "folders": {}})
+        else:
+            state.update({
+                "infoModtimes": dict(self.infoModtimes),
+                "taskModtimes": dict(self.taskModtimes),
+                "folders": dict(self.folders),
+            })
+
+        return state
+
+    def collectRefresh(self, state, emit=True):
+        # runs in a worker thread when called from requestRefresh. Only reads
+        # from disk, the index gets updated on the main thread in applyRefresh
+        result = dict(state)
+        result.update({
+            "start": time.time(),
+            "tasks": [],
+            "found": set(),
+            "changed": {},
+            "folders": {},
+        })
+        try:
+            for entityId, entityData in state["entities"].items():
+                if entityData["entity"].get("type") == "sequence":
+                    continue
+
+                stamps = state["taskModtimes"].get(entityId)
+                if not stamps or self.getFolderStamps(list(stamps)) != stamps:
+                    result["tasks"].append(entityId)
+
+            if state["projectPath"]:
+                self.collectVersionInfos(state, result)
+        except Exception as e:
+            logger.warning("failed to refresh the search index: %s" % e)
+            result["failed"] = True
+
+        if emit:
+            self.refreshCollected.emit(result)
+
+        return result
+
+    def collectVersionInfos(self, state, result):
+        # folders are only listed again when their modification time changed.
+        # Folders of product and media versions don't contain other
+        # versioninfos, so their subfolders with files and frames are skipped.
+        stack = [state["projectPath"]]
+        while stack:
+            folder = stack.pop()
+            if folder == state["pipelineFolder"]:
+                continue
+
+            try:
+                modtime = os.stat(folder).st_mtime
+            except OSError:
+                continue
+
+            folderData = state["folders"].get(folder)
+            if not folderData or folderData["modtime"] != modtime:
+                folderData = self.listFolder(folder, modtime)
+                if not folderData:
+                    continue
+
+            result["folders"][folder] = folderData
+            for name in folderData["infos"]:
+                infoPath = os.path.join(folder, name)
+                try:
+                    infoModtime = os.stat(infoPath).st_mtime
+                except OSError:
+                    continue
+
+                result["found"].add(infoPath)
+                if state["infoModtimes"].get(infoPath) == infoModtime:
+                    continue
+
+                # yml and ini files are read on the main thread
+                doc = None
+                data = None
+                if infoPath.endswith(".json"):
+                    data = self.core.configs.readJson(path=infoPath, ignoreErrors=True) or {}
+                    doc = self.createVersionInfoDoc(infoPath, data)
+
+                result["changed"][infoPath] = {"modtime": infoModtime, "doc": doc, "read": data is not None}
+
+            stack += [os.path.join(folder, name) for name in folderData["dirs"]]
+
+    def listFolder(self, folder, modtime):
+        dirs = []
+        infos = []
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            return
+
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name != ".trash":
+                        dirs.append(entry.name)
+                elif self.isVersionInfo(entry.name):
+                    infos.append(entry.name)
+            except OSError:
+                continue
+
+        if any(os.path.splitext(name)[0] == "versioninfo" for name in infos):
+            dirs = []
+
+        return {"modtime": modtime, "dirs": dirs, "infos": infos}
+
+    @err_catcher(name=__name__)
+    def applyRefresh(self, result):
+        self.refreshing = False
+        if result["cachePath"] != self.cacheLoaded or result.get("failed"):
+            return
+
+        if result["force"]:
+            self.docs = {}
+            self.postings = {}
+            self.infoModtimes = {}
+            self.taskModtimes = {}
+            self.sortedTokens = None
+            self.tokensByLength = None
+
+        for entityData in result["entities"].values():
+            self.addDoc(entityData["doc"])
+
+        taskDocs = {}
+        for docId, doc in list(self.docs.items()):
+            if doc["type"] == "task":
+                entityId = "entity:" + self.getEntityId(doc["data"])
+                taskDocs.setdefault(entityId, []).append(docId)
+            elif doc["type"] in ["asset", "shot", "sequence"]:
+                entityId = docId
+            else:
+                continue
+
+            if entityId not in result["entities"]:
+                self.removeDoc(docId)
+                self.taskModtimes.pop(entityId, None)
+
+        for entityId in result["tasks"]:
+            tasks = self.collectTasks(result["entities"][entityId]["entity"])
+            newIds = [doc["id"] for doc in tasks["docs"]]
+            for docId in taskDocs.get(entityId, []):
+                if docId not in newIds:
+                    self.removeDoc(docId)
+
+            for doc in tasks["docs"]:
+                self.addDoc(doc)
+
+            self.taskModtimes[entityId] = tasks["stamps"]
+
+        # versioninfos, which got updated while the refresh was running, are
+        # already up to date
+        prevModtimes = result["infoModtimes"]
+        for infoPath, info in result["changed"].items():
+            if self.infoModtimes.get(infoPath) != prevModtimes.get(infoPath):
+                continue
+
+            doc = info["doc"]
+            if not info["read"]:
+                doc = self.createVersionInfoDoc(infoPath, self.readVersionInfo(infoPath) or {})
+
+            self.infoModtimes[infoPath] = info["modtime"]
+            if doc:
+                self.addDoc(doc)
+            else:
+                self.removeDoc("info:" + infoPath)
+
+        for infoPath in list(self.infoModtimes):
+            if infoPath in result["found"] or infoPath not in prevModtimes:
+                continue
+
+            if self.infoModtimes[infoPath] == prevModtimes[infoPath]:
+                self.removeVersionInfo(infoPath)
+
+        self.folders = result["folders"]
+        self.stale = False
+        self.dirty = True
+        self.saveCache()
+        logger.debug(
+            "refreshed search index: %s documents in %.2fs"
+            % (len(self.docs), time.time() - result["start"])
+        )
+        self.refreshFinished.emit()
+
+    @err_catcher(name=__name__)
+    def getTokenIndex(self):
+        if self.sortedTokens is None:
+            self.sortedTokens = sorted(self.postings)
+            self.tokensByLength = {}
+            for token in self.sortedTokens:
+                self.tokensByLength.setdefault(len(token), []).append(token)
+
+        return self.sortedTokens
+
+    @err_catcher(name=__name__)
+    def getPrefixTokens(self, prefix):
+        tokens = self.getTokenIndex()
+        idx = bisect.bisect_left(tokens, prefix)
+        matches = []
+        while idx < len(tokens) and tokens[idx].startswith(prefix):
+            matches.append(tokens[idx])
+            idx += 1
+
+        return matches
+
+    @err_catcher(name=__name__)
+    def getFuzzyTokens(self, term):
+        self.getTokenIndex()
+        maxDist = 1 if len(term) <= 5 else 2
+        termChars = set(term)
+        isDigit = term.isdigit()
+        matches = []
+        for length in range(len(term) - maxDist, len(term) + maxDist + 1):
+            for token in self.tokensByLength.get(length, []):
+                # cheap checks first, every edit changes at most two characters
+                if token.isdigit() != isDigit:
+                    continue
+
+                if len(termChars.symmetric_difference(token)) > maxDist * 2:
+                    continue
+
+                if self.getEditDistance(term, token, maxDist) <= maxDist:
+                    matches.append(token)
+
+        return matches
+
+    def getEditDistance(self, a, b, maxDist):
+        # levenshtein distance which counts swapped characters as one edit,
+        # stops early once it exceeds maxDist
+        prevPrev = None
+        prev = list(range(len(b) + 1))
+        for i in range(1, len(a) + 1):
+            cur = [i]
+            for j in range(1, len(b) + 1):
+                cost = a[i - 1] != b[j - 1]
+                dist = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+                if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                    dist = min(dist, prevPrev[j - 2] + 1)
+
+                cur.append(dist)
+
+            if min(cur) > maxDist:
+                return maxDist + 1
+
+            prevPrev = prev
+            prev = cur
+
+        return prev[-1]
+
+    @err_catcher(name=__name__)
+    def parseQuery(self, text):
+        terms = []
+        facets = {}
+        for part in text.split():
+            if ":" in part:
+                key, value = part.split(":", 1)
+                for facetKey in self.facetKeys:
+                    if facetKey.lower() == key.lower() and value:
+                        facets[facetKey] = value.lower()
+                        break
+                else:
+                    terms += self.tokenize(part)
+            else:
+                terms += self.tokenize(part)
+
+        return terms, facets
+
+    @err_catcher(name=__name__)
+    def matchTerm(self, term, fuzzy=True):
+        # returns {docId: score}. exact matches rank above prefix matches,
+        # fuzzy matches are only used if nothing else matched
+        scores = {}
+        for docId, weight in self.postings.get(term, {}).items():
+            scores[docId] = weight * 2
+
+        for token in self.getPrefixTokens(term):
+            if token == term:
+                continue
+
+            for docId, weight in self.postings[token].items():
+                scores[docId] = max(scores.get(docId, 0), weight)
+
+        if not scores and fuzzy and len(term) > 2:
+            for token in self.getFuzzyTokens(term):
+                for docId, weight in self.postings[token].items():
+                    scores[docId] = max(scores.get(docId, 0), weight * 0.5)
+
+        return scores
+
+    @err_catcher(name=__name__)
+    def matchFacets(self, doc, facets):
+        for key, value in facets.items():
+            docValue = doc["facets"].get(key, "").lower()
+            if not docValue.startswith(value):
+                return False
+
+        return True
+
+    @err_catcher(name=__name__)
+    def search(self, text, facets=None, types=None, limit=50, fuzzy=True):
+        """Returns the documents matching all words of the query.
+
+        Words of the form "key:value" filter by facet, for example
+        "user:jo type:product date:2023-05". Every other word matches
+        as prefix and falls back to fuzzy matching.
+        """
+        self.requestRefresh()
+        terms, queryFacets = self.parseQuery(text or "")
+        queryFacets.update({key: str(val).lower() for key, val in (facets or {}).items()})
+        if not terms and not queryFacets:
+            return []
+
+        if terms:
+            scores = None
+            for term in terms:
+                termScores = self.matchTerm(term, fuzzy=fuzzy)
+                if scores is None:
+                    scores = termScores
+                else:
+                    scores = {
+                        docId: score + termScores[docId]
+                        for docId, score in scores.items()
+                        if docId in termScores
+                    }
+
+                if not scores:
+                    return []
+        else:
+            scores = dict.fromkeys(self.docs, 0)
+
+        results = []
+        for docId, score in scores.items():
+            doc = self.docs[docId]
+            if types and doc["type"] not in types:
+                continue
+
+            if queryFacets and not self.matchFacets(doc, queryFacets):
+                continue
+
+            results.append((score, doc))
+
+        results = heapq.nsmallest(limit, results, key=lambda x: (-x[0], x[1]["title"]))
+        return [doc for score, doc in results]
+
+    @err_catcher(name=__name__)
+    def getFacetValues(self, key):
+        self.requestRefresh()
+        values = {}
+        for doc in self.docs.values():
+            value = doc["facets"].get(key)
+            if value:
+                values[value] = values.get(value, 0) + 1
+
+        return values
+
+    @err_catcher(name=__name__)
+    def onAssetCreated(self, origin, entity, dialog=None):
+        if self.cacheLoaded:
+            self.updateEntity(entity)
+
+    @err_catcher(name=__name__)
+    def onShotCreated(self, origin, entity):
+        if self.cacheLoaded:
+            self.updateEntity(entity)
+            sequence = {"type": "sequence", "sequence": entity.get("sequence")}
+            self.addDoc(self.createEntityDoc(sequence))
+
+    @err_catcher(name=__name__)
+    def onDepartmentCreated(self, origin, entity, department, stepPath, settings):
+        if self.cacheLoaded:
+            for task in self.core.entities.getCategories(entity, department):
+                self.addDoc(self.createTaskDoc(entity, department, task))
+
+    @err_catcher(name=__name__)
+    def onTaskCreated(self, origin, category, catPath):
+        if not self.cacheLoaded:
+            return
+
+        # the callback only passes the task path, so the entity gets looked
+        # up from the indexed entities
+        stepPath = os.path.normpath(os.path.dirname(catPath))
+        department = os.path.basename(stepPath)
+        for doc in list(self.docs.values()):
+            if doc["type"] not in ["asset", "shot"]:
+                continue
+
+            entity = doc["data"]
+            name = entity.get("shot") or os.path.basename(entity.get("asset_path", ""))
+            if not name or name not in catPath:
+                continue
+
+            entityStepPath = self.core.getEntityPath(entity=entity, step=department)
+            if os.path.normpath(entityStepPath) == stepPath:
+                self.addDoc(self.createTaskDoc(entity, department, category))
+                break
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+import time
+import logging
+from contextlib import contextmanager
+
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfiler(object):
+    def __init__(self, core):
+        self.core = core
+        self.setting = os.getenv("PRISM_PROFILE_STARTUP", "")
+        self.active = True
+        self.startTime = time.time()
+        self.phases = []
+        self.plugins = {}
+        self.configReads = {}
+
+    @contextmanager
+    def phase(self, name):
+        if not self.active:
+            yield
+            return
+
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.phases.append({"name": name, "duration": time.time() - start})
+
+    def addPluginTiming(self, pluginName, step, duration):
+        if not self.active:
+            return
+
+        data = self.plugins.setdefault(pluginName, {})
+        data[step] = data.get(step, 0) + duration
+
+    def addConfigRead(self, path, duration):
+        if not self.active:
+            return
+
+        data = self.configReads.setdefault(path, {"count": 0, "duration": 0})
+        data["count"] += 1
+        data["duration"] += duration
+
+    def getReport(self):
+        total = 0
+        for data in self.configReads.values():
+            total += data["duration"]
+
+        report = {
+            "duration": time.time() - self.startTime,
+            "phases": self.phases,
+            "plugins": self.plugins,
+            "configReads": {
+                "count": sum(data["count"] for data in self.configReads.values()),
+                "duration": total,
+                "files": self.configReads,
+            },
+        }
+        return report
+
+    def finish(self):
+        if not self.active:
+            return
+
+        self.active = False
+        report = self.getReport()
+        if self.setting and self.setting not in ["1", "true", "True"]:
+            self.core.configs.writeJson(report, path=self.setting, quiet=True)
+
+        if self.setting:
+            logger.info(self.formatReport(report))
+        else:
+            logger.debug("startup duration: %.3fs" % report["duration"])
+
+        return report
+
+    def formatReport(self, report):
+        lines = ["startup duration: %.3fs" % report["duration"]]
+        for phase in report["phases"]:
+            lines.append("    %-24s %.3fs" % (phase["name"], phase["duration"]))
+
+        plugins = sorted(
+            report["plugins"].items(),
+            key=lambda x: sum(x[1].values()),
+            reverse=True,
+        )
+        if plugins:
+            lines.append("plugins:")
+
+        for pluginName, steps in plugins:
+            timings = ", ".join("%s %.3fs" % (step, steps[step]) for step in sorted(steps))
+            lines.append("    %-24s %s" % (pluginName, timings))
+
+        lines.append(
+            "config reads: %s (%.3fs)"
+            % (report["configReads"]["count"], report["configReads"]["duration"])
+        )
+        return "\n".join(lines)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+import time
+import json
+import logging
+import threading
+from contextlib import contextmanager
+
+
+logger = logging.getLogger(__name__)
+
+
+class Tracer(object):
+    def __init__(self):
+        self.enabled = False
+        self.outputPath = None
+        self.maxEvents = 500000
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.clear()
+
+    def clear(self):
+        self.stats = {}
+        self.events = []
+        self.droppedEvents = 0
+        self.startTime = time.time()
+
+    def start(self, outputPath=None):
+        if not self.enabled:
+            self.clear()
+
+        self.enabled = True
+        if outputPath:
+            self.outputPath = outputPath
+
+        logger.debug("tracing enabled")
+
+    def stop(self):
+        self.enabled = False
+        logger.debug("tracing disabled")
+
+    def getStack(self):
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+
+        return stack
+
+    def trace(self, name, func, args, kwargs):
+        with self.span(name):
+            return func(*args, **kwargs)
+
+    @contextmanager
+    def span(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        stack = self.getStack()
+        # the second value collects the time spent in nested spans
+        frame = [name, 0.0]
+        stack.append(frame)
+        start = time.time()
+        try:
+            yield
+        finally:
+            duration = time.time() - start
+            stack.pop()
+            if stack:
+                stack[-1][1] += duration
+
+            self.record(name, start, duration, duration - frame[1])
+
+    def record(self, name, start, duration, selfTime):
+        with self.lock:
+            stats = self.stats.get(name)
+            if not stats:
+                stats = self.stats[name] = {
+                    "name": name,
+                    "count": 0,
+                    "total": 0.0,
+                    "self": 0.0,
+                    "max": 0.0,
+                }
+
+            stats["count"] += 1
+            stats["total"] += duration
+            stats["self"] += selfTime
+            stats["max"] = max(stats["max"], duration)
+
+            if len(self.events) >= self.maxEvents:
+                self.droppedEvents += 1
+                return
+
+            self.events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": int((start - self.startTime) * 1000000),
+                    "dur": int(duration * 1000000),
+                    "pid": os.getpid(),
+                    "tid": threading.current_thread().ident,
+                }
+            )
+
+    def getSummary(self, sortKey="self"):
+        with self.lock:
+            stats = [dict(data) for data in self.stats.values()]
+
+        return sorted(stats, key=lambda x: x[sortKey], reverse=True)
+
+    def formatSummary(self, limit=30, sortKey="self"):
+        lines = ["%-70s %8s %10s %10s %10s" % ("function", "calls", "total", "self", "max")]
+        for data in self.getSummary(sortKey=sortKey)[:limit]:
+            lines.append(
+                "%-70s %8s %9.3fs %9.3fs %9.3fs"
+                % (data["name"][-70:], data["count"], data["total"], data["self"], data["max"])
+            )
+
+        if self.droppedEvents:
+            lines.append("(%s trace events dropped)" % self.droppedEvents)
+
+        return "\n".join(lines)
+
+    def exportChromeTrace(self, path=None):
+        path = path or self.outputPath
+        if not path:
+            return
+
+        with self.lock:
+            data = {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+        logger.info("exported trace: %s" % path)
+        return path
+
+
+tracer = Tracer()
+if os.getenv("PRISM_TRACE"):
+    tracer.start(
+        outputPath=None if os.getenv("PRISM_TRACE") in ["1", "true", "True"] else os.getenv("PRISM_TRACE")
+    )
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2023 Richard Frangenberg
+# Copyright (C) 2023 Prism Software GmbH
+#
+# Licensed under GNU LGPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+import time
+import logging
+import threading
+
+from PrismUtils.Decorators import err_catcher
+
+
+logger = logging.getLogger(__name__)
+
+
+def getAuthKey(prefDir):
+    keyPath = os.path.join(prefDir, "PrismTray.key")
+    if os.path.exists(keyPath):
+        with open(keyPath, "rb") as f:
+            key = f.read()
+
+        if key:
+            return key
+
+    if not os.path.exists(prefDir):
+        os.makedirs(prefDir)
+
+    key = os.urandom(32)
+    fd = os.open(keyPath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+
+    os.chmod(keyPath, 0o600)
+    return key
+
+
+class QueryService(object):
+    def __init__(self, core):
+        self.core = core
+        self.maxAge = float(os.getenv("PRISM_TRAY_CACHE_AGE", "30"))
+        self.cache = {}
+        self.lock = threading.Lock()
+        self.uncached = ["getLatestProductVersion"]
+        self.methods = {
+            "getShots": self.getShots,
+            "getAssetPaths": self.getAssetPaths,
+            "getProductVersions": self.getProductVersions,
+            "getLatestProductVersion": self.getLatestProductVersion,
+            "getMediaVersions": self.getMediaVersions,
+            "getConfig": self.getConfig,
+        }
+
+    def handle(self, request):
+        method = request.get("query")
+        if method not in self.methods:
+            return {"error": "unknown query: %s" % method}
+
+        prjPath = getattr(self.core, "projectPath", None)
+        if not prjPath or os.path.normpath(request.get("project") or "") != os.path.normpath(prjPath):
+            return {"error": "project not loaded"}
+
+        kwargs = request.get("kwargs") or {}
+        key = (prjPath, method, repr(sorted(kwargs.items())))
+        useCache = method not in self.uncached
+        if useCache:
+            with self.lock:
+                cacheData = self.cache.get(key)
+
+            if cacheData and self.isValid(cacheData):
+                return {"result": cacheData["result"], "cached": True}
+
+        # requests are handled in one thread per connection, the core is
+        # only used from the main thread
+        try:
+            result, paths = self.core.runInMainThread(self.methods[method], **kwargs)
+        except Exception as e:
+            logger.warning("failed to answer query %s: %s" % (method, e))
+            return {"error": str(e)}
+
+        if useCache:
+            cacheData = {"result": result, "time": time.time(), "stamps": self.getStamps(paths)}
+            with self.lock:
+                self.cache[key] = cacheData
+
+        return {"result": result, "cached": False}
+
+    def clear(self):
+        with self.lock:
+            self.cache = {}
+
+    def getStamps(self, paths):
+        stamps = {}
+        for path in set(paths):
+            try:
+                stamps[path] = os.stat(path).st_mtime
+            except OSError:
+                stamps[path] = None
+
+        return stamps
+
+    def isValid(self, cacheData):
+        if (time.time() - cacheData["time"]) > self.maxAge:
+            return False
+
+        for path, modtime in cacheData["stamps"].items():
+            try:
+                if os.stat(path).st_mtime != modtime:
+                    return False
+            except OSError:
+                if modtime is not None:
+                    return False
+
+        return True
+
+    def getShots(self, **kwargs):
+        result = self.core.entities.getShots(**kwargs)
+        shots = result[1] if isinstance(result, tuple) else result
+        paths = []
+        for shot in shots:
+            for data in shot.get("paths", []):
+                paths.append(os.path.dirname(data["path"]))
+                paths.append(os.path.dirname(os.path.dirname(data["path"])))
+
+        return result, paths
+
+    def getAssetPaths(self, **kwargs):
+        result = self.core.entities.getAssetPaths(**kwargs)
+        paths = [self.core.assetPath] + [os.path.dirname(path) for path in result]
+        return result, paths
+
+    def getVersionFolders(self, key, context, basePaths):
+        folders = []
+        for basePath in basePaths:
+            ctx = context.copy()
+            ctx["project_path"] = basePath
+            template = self.core.projects.getResolvedProjectStructurePath(key, context=ctx)
+            path = os.path.dirname(template)
+            while path and not os.path.exists(path) and os.path.dirname(path) != path:
+                folders.append(path)
+                path = os.path.dirname(path)
+
+            folders.append(path)
+
+        return folders
+
+    def getProductVersions(self, context, locations=None):
+        result = self.core.products.getVersionsFromContext(context, locations=locations)
+        basePaths = self.core.paths.getExportProductBasePaths()
+        basePaths = [
+            basePaths[loc] for loc in basePaths
+            if not locations or loc in locations or "all" in locations
+        ]
+        paths = self.getVersionFolders("productVersions", context, basePaths)
+        paths += [os.path.dirname(version["path"]) for version in result if version.get("path")]
+        return result, paths
+
+    def getLatestProductVersion(self, product, entity=None, includeMaster=True, wedge=None):
+        result = self.core.products.getLatestVersionpathFromProduct(
+            product, entity=entity, includeMaster=includeMaster, wedge=wedge
+        )
+        paths = [os.path.dirname(result)] if result else []
+        return result, paths
+
+    def getMediaVersions(self, context, keys=None):
+        result = self.core.mediaProducts.getVersionsFromContext(context, keys=keys)
+        if context.get("mediaType") == "playblasts":
+            key = "playblastVersions"
+        else:
+            key = "renderVersions"
+
+        basePaths = [context.get("project_path") or self.core.projectPath]
+        paths = self.getVersionFolders(key, context, basePaths)
+        paths += [os.path.dirname(version["path"]) for version in result if version.get("path")]
+        return result, paths
+
+    def getConfig(self, configPath, cat=None, param=None):
+        configPath = os.path.normpath(configPath)
+        prjPath = os.path.normpath(self.core.projectPath)
+        if not configPath.startswith(prjPath + os.sep):
+            raise Exception("only project configs can be queried")
+
+        self.core.configs.clearCache(path=configPath)
+        result = self.core.getConfig(cat, param, configPath=configPath)
+        return result, [configPath]
+
+
+class QueryClient(object):
+    def __init__(self, core):
+        self.core = core
+        self.port = 7571
+        self.timeout = 5
+        self.retryInterval = 30
+        self.conn = None
+        self.lastFailure = 0
+        self.lock = threading.Lock()
+
+    @err_catcher(name=__name__)
+    def isEnabled(self):
+        if os.getenv("PRISM_TRAY_QUERIES") is not None:
+            return os.getenv("PRISM_TRAY_QUERIES") == "1"
+
+        appPlugin = getattr(self.core, "appPlugin", None)
+        if not appPlugin or appPlugin.pluginName == "Standalone":
+            return False
+
+        if not getattr(self.core, "projectPath", None):
+            return False
+
+        return self.core.getConfig("globals", "tray_queries", dft=True)
+
+    def connect(self):
+        from multiprocessing.connection import Client
+
+        if self.conn:
+            return self.conn
+
+        if (time.time() - self.lastFailure) < self.retryInterval:
+            return
+
+        try:
+            authkey = getAuthKey(self.core.getUserPrefDir())
+            self.conn = Client(("localhost", self.port), authkey=authkey)
+        except Exception:
+            self.lastFailure = time.time()
+            self.conn = None
+
+        return self.conn
+
+    def disconnect(self):
+        if self.conn:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+
+        self.conn = None
+        self.lastFailure = time.time()
+
+    def query(self, method, **kwargs):
+        if not self.isEnabled():
+            return
+
+        request = {"query": method, "project": self.core.projectPath, "kwargs": kwargs}
+        with self.lock:
+            conn = self.connect()
+            if not conn:
+                return
+
+            try:
+                conn.send(request)
+                if not conn.poll(self.timeout):
+                    logger.debug("tray query timed out: %s" % method)
+                    self.disconnect()
+                    return
+
+                response = conn.recv()
+            except Exception as e:
+                logger.debug("tray query failed: %s" % e)
+                self.disconnect()
+                return
+
+        if not isinstance(response, dict) or "error" in response:
+            logger.debug("tray couldn't answer query %s: %s" % (method, response))
+            if isinstance(response, dict) and response["error"] == "project not loaded":
+                with self.lock:
+                    self.disconnect()
+
+            return
+
+        return response["result"]
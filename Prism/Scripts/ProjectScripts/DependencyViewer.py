@@ -70,11 +70,16 @@ class DependencyViewer(QDialog, DependencyViewer_ui.Ui_dlg_DependencyViewer):
         self.tw_dependencies.setHeaderLabels(["Name", "", "Type", "Date", "Path"])
         self.tw_dependencies.header().setSectionResizeMode(1, QHeaderView.Fixed)
 
-        self.dependencies = {}
+        self.chb_reverse = QCheckBox("Show Dependents")
+        self.chb_reverse.setToolTip(
+            "Show the versions which use this version instead of the versions it depends on."
+        )
+        self.horizontalLayout.insertWidget(0, self.chb_reverse)
+
         self.depRoot = depRoot
 
         self.connectEvents()
-        self.updateDependencies("0", depRoot)
+        self.refreshDependencies()
 
         self.tw_dependencies.setColumnWidth(0, 400)
         self.tw_dependencies.setColumnWidth(1, 10)
@@ -87,6 +92,9 @@ class DependencyViewer(QDialog, DependencyViewer_ui.Ui_dlg_DependencyViewer):
     @err_catcher(name=__name__)
     def connectEvents(self):
         self.e_search.textChanged.connect(self.filterDeps)
+        self.chb_reverse.toggled.connect(self.refreshDependencies)
+        self.core.dependencyIndex.scanFinished.connect(self.onIndexScanned)
+        self.tw_dependencies.itemExpanded.connect(self.onItemExpanded)
         self.tw_dependencies.mouseClickEvent = self.tw_dependencies.mouseReleaseEvent
         self.tw_dependencies.mouseReleaseEvent = lambda x: self.mouseClickEvent(
             x, "deps"
@@ -95,6 +103,13 @@ class DependencyViewer(QDialog, DependencyViewer_ui.Ui_dlg_DependencyViewer):
             lambda x: self.rclList("deps", x)
         )
 
+    @err_catcher(name=__name__)
+    def onIndexScanned(self):
+        # dependents are shown from the current index until the project scan
+        # finished in the background
+        if self.chb_reverse.isChecked():
+            self.refreshDependencies()
+
     @err_catcher(name=__name__)
     def mouseClickEvent(self, event, uielement):
         if QEvent != None:
@@ -137,144 +152,124 @@ class DependencyViewer(QDialog, DependencyViewer_ui.Ui_dlg_DependencyViewer):
         rcmenu.exec_(QCursor.pos())
 
     @err_catcher(name=__name__)
-    def updateDependencies(self, depID, versionInfo, ignore=None):
-        ignore = ignore or []
-        source = self.core.getConfig("source scene", configPath=versionInfo)
-        if not source:
-            source = self.core.getConfig("sourceScene", configPath=versionInfo)
-
-        deps = (
-            self.core.getConfig("dependencies", configPath=versionInfo)
-            or []
+    def refreshDependencies(self):
+        self.tw_dependencies.clear()
+        self.addDependencyItems(
+            self.tw_dependencies.invisibleRootItem(),
+            self.depRoot,
+            ancestors=[os.path.normpath(self.depRoot)],
         )
-        extFiles = (
-            self.core.getConfig("externalFiles", configPath=versionInfo)
-            or []
-        )
-
-        if source is not None:
-            deps.append(source)
+        filterStr = self.e_search.text()
+        if filterStr:
+            self.filterDeps(filterStr)
 
-        if depID == "0":
-            depItem = self.tw_dependencies.invisibleRootItem()
+    @err_catcher(name=__name__)
+    def addDependencyItems(self, parentItem, versionInfo, ancestors):
+        if self.chb_reverse.isChecked():
+            entries = self.core.dependencyIndex.getDependents(versionInfo)
         else:
-            depItem = self.dependencies[depID][1]
+            entries = self.core.dependencyIndex.getDependencies(versionInfo)
 
-        for i in deps:
-            if sys.version[0] == "2":
-                existText = unicode("█", "utf-8")
-            else:
-                existText = "█"
+        for entry in entries:
+            item = self.createDependencyItem(entry)
+            parentItem.addChild(item)
+            childInfo = entry["versionInfo"]
+            if not childInfo:
+                continue
 
-            depPath = i
-            if depPath in ignore:
+            if childInfo in ancestors:
+                item.setToolTip(0, "Circular dependency")
                 continue
 
-            ignore.append(depPath)
-
-            if not os.path.exists(i):
-                depDir = os.path.dirname(i)
-                if os.path.exists(depDir) and len(os.listdir(depDir)) > 0:
-                    depPath = depDir
-
-            if os.path.exists(depPath):
-                cdate = datetime.datetime.fromtimestamp(os.path.getmtime(depPath))
-                cdate = cdate.replace(microsecond=0)
-                date = cdate.strftime("%d.%m.%y,  %X")
-                existColor = QColor(0, 255, 0)
-            else:
-                date = ""
-                existColor = QColor(255, 0, 0)
-
-            if i == source:
-                dType = "Source Scene"
-            else:
-                dType = "Export"
-
-            item = QTreeWidgetItem(
-                [os.path.basename(i), existText, dType, date, i.replace("\\", "/")]
+            item.setData(
+                0, Qt.UserRole, {"versionInfo": childInfo, "ancestors": ancestors + [childInfo]}
             )
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
 
-            item.setForeground(1, existColor)
-
-            depItem.addChild(item)
-            curID = str(len(self.dependencies) + 1)
-
-            self.dependencies[curID] = [i, item, depID]
+    @err_catcher(name=__name__)
+    def createDependencyItem(self, entry):
+        if sys.version[0] == "2":
+            existText = unicode("█", "utf-8")
+        else:
+            existText = "█"
+
+        path = entry["path"]
+        datePath = path
+        if not os.path.exists(path):
+            depDir = os.path.dirname(path)
+            if os.path.exists(depDir) and len(os.listdir(depDir)) > 0:
+                datePath = depDir
+
+        if os.path.exists(datePath):
+            cdate = datetime.datetime.fromtimestamp(os.path.getmtime(datePath))
+            cdate = cdate.replace(microsecond=0)
+            date = cdate.strftime("%d.%m.%y,  %X")
+            existColor = QColor(0, 255, 0)
+        else:
+            date = ""
+            existColor = QColor(255, 0, 0)
 
+        item = QTreeWidgetItem(
+            [os.path.basename(path), existText, entry["type"], date, path.replace("\\", "/")]
+        )
+        item.setForeground(1, existColor)
+        if entry["type"] != "File":
             iFont = item.font(0)
             iFont.setBold(True)
             item.setFont(0, iFont)
-            depInfo = os.path.join(
-                os.path.dirname(i), "versioninfo" + self.core.configs.getProjectExtension()
-            )
-            self.core.configs.findDeprecatedConfig(depInfo)
-            if not os.path.exists(depInfo):
-                depInfo = os.path.join(
-                    os.path.dirname(os.path.dirname(i)),
-                    "versioninfo" + self.core.configs.getProjectExtension(),
-                )
-                self.core.configs.findDeprecatedConfig(depInfo)
-
-            if os.path.exists(depInfo):
-                self.updateDependencies(curID, depInfo, ignore=ignore)
-
-        for i in extFiles:
-            if i in deps:
-                continue
 
-            if sys.version[0] == "2":
-                existText = unicode("█", "utf-8")
-            else:
-                existText = "█"
-
-            if os.path.exists(i):
-                cdate = datetime.datetime.fromtimestamp(os.path.getmtime(i))
-                cdate = cdate.replace(microsecond=0)
-                date = cdate.strftime("%d.%m.%y,  %X")
-                existColor = QColor(0, 255, 0)
-            else:
-                date = ""
-                existColor = QColor(255, 0, 0)
-
-            item = QTreeWidgetItem(
-                [os.path.basename(i), existText, "File", date, i.replace("\\", "/")]
-            )
+        return item
 
-            item.setForeground(1, existColor)
+    @err_catcher(name=__name__)
+    def onItemExpanded(self, item):
+        self.loadChildItems(item)
 
-            depItem.addChild(item)
+    @err_catcher(name=__name__)
+    def loadChildItems(self, item):
+        data = item.data(0, Qt.UserRole)
+        if not data or data.get("loaded"):
+            return
 
-            curID = str(len(self.dependencies) + 1)
-            self.dependencies[curID] = [i, item, depID]
+        data["loaded"] = True
+        item.setData(0, Qt.UserRole, data)
+        self.addDependencyItems(item, data["versionInfo"], data["ancestors"])
+        if not item.childCount():
+            item.setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicator)
 
     @err_catcher(name=__name__)
-    def filterDeps(self, filterStr):
-        self.clearItem(self.tw_dependencies.invisibleRootItem())
+    def loadAllItems(self, item, visited=None):
+        visited = set() if visited is None else visited
+        for idx in range(item.childCount()):
+            child = item.child(idx)
+            data = child.data(0, Qt.UserRole)
+            if data:
+                if data["versionInfo"] in visited:
+                    continue
 
-        if filterStr == "":
-            self.dependencies = {}
-            self.updateDependencies("0", self.depRoot)
-        else:
-            for i in self.dependencies:
-                if filterStr.lower() in self.dependencies[i][0].lower():
-                    depID = i
-                    while depID != "0":
-                        parID = self.dependencies[depID][2]
-                        if parID == "0":
-                            self.tw_dependencies.invisibleRootItem().addChild(
-                                self.dependencies[depID][1]
-                            )
-                        else:
-                            self.dependencies[parID][1].addChild(
-                                self.dependencies[depID][1]
-                            )
-                        depID = parID
+                visited.add(data["versionInfo"])
+                self.loadChildItems(child)
+
+            self.loadAllItems(child, visited=visited)
+
+    @err_catcher(name=__name__)
+    def filterDeps(self, filterStr):
+        root = self.tw_dependencies.invisibleRootItem()
+        if filterStr:
+            self.loadAllItems(root)
 
-            self.tw_dependencies.expandAll()
+        self.filterItem(root, filterStr.lower())
 
     @err_catcher(name=__name__)
-    def clearItem(self, item):
-        for i in range(item.childCount()):
-            self.clearItem(item.child(0))
-            item.takeChild(0)
+    def filterItem(self, item, filterStr):
+        visible = False
+        for idx in range(item.childCount()):
+            child = item.child(idx)
+            childVisible = self.filterItem(child, filterStr)
+            childVisible = childVisible or filterStr in child.text(4).lower()
+            child.setHidden(not childVisible)
+            visible = visible or childVisible
+
+        if filterStr and visible and item != self.tw_dependencies.invisibleRootItem():
+            item.setExpanded(True)
+
+        return visible
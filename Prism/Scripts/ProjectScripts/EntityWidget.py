@@ -295,6 +295,337 @@ class EntityPage(QWidget):
         if self.getCurrentData() != prevData:
             self.onItemChanged()
 
+        self.refreshEntitySizes()
+
+    @err_catcher(name=__name__)
+    def refreshEntitySizes(self, parent=None):
+        # only items which are visible in the tree request their size. The
+        # children of an item get requested when it gets expanded.
+        showSizes = self.core.getConfig("globals", "showFileSizes", config="user")
+        self.tw_tree.setColumnCount(2 if showSizes else 1)
+        if parent is None:
+            self.sizeItems = {}
+            items = [self.tw_tree.topLevelItem(idx) for idx in range(self.tw_tree.topLevelItemCount())]
+        else:
+            items = [parent.child(idx) for idx in range(parent.childCount())]
+
+        if not showSizes:
+            return
+
+        while items:
+            item = items.pop()
+            if item.isExpanded():
+                items += [item.child(idx) for idx in range(item.childCount())]
+
+            data = item.data(0, Qt.UserRole)
+            if not data or data.get("shot") == "_sequence":
+                continue
+
+            for path in self.core.diskUsage.getEntityPaths(data):
+                self.sizeItems.setdefault(path, []).append(item)
+                self.core.diskUsage.requestFolderSize(path)
+
+            self.setEntitySizeText(item)
+
+    @err_catcher(name=__name__)
+    def onFolderSizeUpdated(self, data):
+        for item in getattr(self, "sizeItems", {}).get(data["path"], []):
+            try:
+                self.setEntitySizeText(item)
+            except RuntimeError:
+                continue
+
+    @err_catcher(name=__name__)
+    def setEntitySizeText(self, item):
+        size = self.core.diskUsage.getCachedEntitySize(item.data(0, Qt.UserRole))
+        if size is not None:
+            item.setText(1, self.core.diskUsage.formatSize(size))
+            item.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
+
+        parent = item.parent()
+        if parent and parent.data(0, Qt.UserRole).get("shot") == "_sequence":
+            total = 0
+            for idx in range(parent.childCount()):
+                childSize = self.core.diskUsage.getCachedEntitySize(parent.child(idx).data(0, Qt.UserRole))
+                if childSize is None:
+                    return
+
+                total += childSize
+
+            parent.setText(1, self.core.diskUsage.formatSize(total))
+            parent.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
+
+    @err_catcher(name=__name__)
+    def setupUi(self):
+        pageNames = ["Assets", "Shots"]
+
+        self.sw_tabs = QStackedWidget()
+        self.w_header = QWidget()
+        self.tb_entities = QTabBar()
+        self.lo_headerV = QVBoxLayout()
+        self.lo_header = QHBoxLayout()
+        self.w_header.setLayout(self.lo_headerV)
+
+        sizePolicy = QSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(1)
+        self.w_header.setSizePolicy(sizePolicy)
+        sizePolicy = QSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(100)
+        self.sw_tabs.setSizePolicy(sizePolicy)
+        self.lo_headerV.addStretch()
+        self.lo_headerV.addLayout(self.lo_header)
+        self.lo_header.addStretch()
+        self.lo_header.addWidget(self.tb_entities)
+        self.lo_header.addStretch()
+        self.lo_header.setContentsMargins(0, 0, 0, 0)
+        self.lo_headerV.setContentsMargins(0, 0, 0, 0)
+
+        self.b_search = QToolButton()
+        self.b_search.setCheckable(True)
+        self.b_search.setAutoRaise(True)
+        path = os.path.join(
+            self.core.prismRoot, "Scripts", "UserInterfacesPrism", "search.png"
+        )
+        icon = self.core.media.getColoredIcon(path)
+        self.b_search.setIcon(icon)
+        if self.core.appPlugin.pluginName != "Standalone":
+            ssheet = """
+                QWidget{padding: 0; border-width: 0px; border-radius: 4px; background-color: transparent}
+                QWidget:hover{border-width: 0px; background-color: rgba(150, 210, 240, 50) }
+                QWidget:checked{border-width: 0px; background-color: rgba(150, 210, 240, 100) }
+            """
+            self.b_search.setStyleSheet(ssheet)
+
+        self.w_search = QWidget()
+        self.lo_search = QHBoxLayout()
+        self.w_search.setLayout(self.lo_search)
+        self.lo_search.addStretch()
+        self.lo_search.addWidget(self.b_search)
+        self.b_search.setParent(self.w_header)
+        self.b_search.setGeometry(100, 0, 25, 25)
+        self.b_search.move(
+            self.w_header.geometry().width() - self.b_search.geometry().width(), 0
+        )
+
+        for pageName in pageNames:
+            page = EntityPage(self, pageName, refresh=self.refresh)
+            self.tb_entities.addTab(page.objectName())
+            self.sw_tabs.addWidget(page)
+            self.pages.append(page)
+
+        self.prevTab = self.getCurrentPage()
+        self.lo_main = QVBoxLayout()
+        self.lo_main.setContentsMargins(0, 0, 0, 0)
+        self.lo_main.setSpacing(0)
+        self.lo_main.addWidget(self.w_header)
+        self.lo_main.addWidget(self.sw_tabs)
+        self.setLayout(self.lo_main)
+
+    @err_catcher(name=__name__)
+    def resizeEvent(self, event):
+        self.b_search.move(
+            self.w_header.geometry().width() - self.b_search.geometry().width(), 0
+        )
+
+    @err_catcher(name=__name__)
+    def connectEvents(self):
+        self.tb_entities.currentChanged.connect(self.ontabChanged)
+        self.b_search.toggled.connect(self.searchClicked)
+
+    @err_catcher(name=__name__)
+    def refreshEntities(self, pages=None, restoreSelection=False, defaultSelection=True):
+        for page in self.pages:
+            if pages and page.objectName() not in pages:
+                continue
+
+            page.refreshEntities(restoreSelection=restoreSelection, defaultSelection=defaultSelection)
+
+    @err_catcher(name=__name__)
+    def getPage(self, pageName):
+        for page in self.pages:
+            if page.objectName() == pageName:
+                return page
+
+    @err_catcher(name=__name__)
+    def getCurrentPage(self):
+        return self.sw_tabs.currentWidget()
+
+    @err_catcher(name=__name__)
+    def getCurrentPageName(self):
+        return self.sw_tabs.currentWidget().objectName()
+
+    @err_catcher(name=__name__)
+    def searchClicked(self, state):
+        self.sw_tabs.currentWidget().searchClicked(state)
+
+    @err_catcher(name=__name__)
+    def ontabChanged(self, state):
+        self.sw_tabs.setCurrentIndex(state)
+        state = self.b_search.isChecked()
+        widget = self.sw_tabs.currentWidget()
+        if widget.e_search.isVisible() != state:
+            widget.searchClicked(state)
+
+        if self.prevTab:
+            location = self.prevTab.getCurrentLocation()
+            idx = self.getCurrentPage().cb_location.findText(location)
+            if idx != -1:
+                self.getCurrentPage().cb_location.setCurrentIndex(idx)
+
+        self.tabChanged.emit()
+        self.prevTab = self.getCurrentPage()
+
+    @err_catcher(name=__name__)
+    def getCurrentData(self, returnOne=True):
+        return self.getCurrentPage().getCurrentData(returnOne=returnOne)
+
+    @err_catcher(name=__name__)
+    def getLocations(self):
+        return self.getCurrentPage().getLocations()
+
+    @err_catcher(name=__name__)
+    def navigate(self, data, clear=False):
+        if not data:
+            if clear:
+                self.getCurrentPage().tw_tree.selectionModel().clearSelection()
+
+            return
+
+        if isinstance(data, list):
+            fdata = data[0]
+        else:
+            fdata = data
+
+        if fdata.get("type") in ["asset", "assetFolder"]:
+            page = self.getPage("Assets")
+        elif fdata.get("type") in ["shot", "sequence"]:
+            page = self.getPage("Shots")
+        else:
+            if clear:
+                self.getCurrentPage().tw_tree.selectionModel().clearSelection()
+
+            return False
+
+        self.sw_tabs.setCurrentWidget(page)
+        self.tb_entities.setCurrentIndex(self.sw_tabs.currentIndex())
+        page.navigate(data)
+
+    @err_catcher(name=__name__)
+    def syncFromWidget(self, widget):
+        data = widget.getCurrentData()
+        if data:
+            self.navigate(data)
+        else:
+            self.tb_entities.setCurrentIndex(widget.tb_entities.currentIndex())
+
+        self.b_search.setChecked(widget.b_search.isChecked())
+        location = widget.getCurrentPage().getCurrentLocation()
+        idx = self.getCurrentPage().cb_location.findText(location)
+        if idx != -1:
+            self.getCurrentPage().cb_location.setCurrentIndex(idx)
+
+    @err_catcher(name=__name__)
+    def getCurrentLocation(self):
+        return self.getCurrentPage().getCurrentLocation()
+
+
+class EntityPage(QWidget):
+    itemChanged = Signal(object)
+    entityCreated = Signal(object)
+
+    shotSaved = Signal()
+    nextClicked = Signal()
+
+    def __init__(self, widget, pageName, refresh=True):
+        QWidget.__init__(self)
+        self.entityWidget = widget
+        self.core = widget.core
+        self.pageName = pageName
+        self.expandedItems = []
+        self.dclick = None
+        self.entityPreviewWidth = 107
+        self.entityPreviewHeight = 60
+        self.itemWidgets = []
+        self.setObjectName(self.pageName)
+        if pageName == "Assets":
+            self.entityType = "asset"
+        elif pageName == "Shots":
+            self.entityType = "shot"
+
+        self.setupUi()
+        self.connectEvents()
+
+        if refresh:
+            self.refreshEntities()
+
+    @err_catcher(name=__name__)
+    def refreshEntities(self, restoreSelection=False, defaultSelection=True):
+        prevData = self.getCurrentData()
+        self.itemWidgets = []
+
+        self.tw_tree.blockSignals(True)
+        if self.entityType == "asset":
+            self.refreshAssetHierarchy(defaultSelection=defaultSelection)
+        elif self.entityType == "shot":
+            self.refreshShots(defaultSelection=defaultSelection)
+
+        if restoreSelection:
+            self.navigate(prevData)
+
+        self.tw_tree.blockSignals(False)
+        if self.getCurrentData() != prevData:
+            self.onItemChanged()
+
+        self.refreshEntitySizes()
+
+    @err_catcher(name=__name__)
+    def refreshEntitySizes(self):
+        self.sizeItems = {}
+        if not self.core.getConfig("globals", "showFileSizes", config="user"):
+            return
+
+        iterator = QTreeWidgetItemIterator(self.tw_tree)
+        while iterator.value():
+            item = iterator.value()
+            iterator += 1
+            data = item.data(0, Qt.UserRole)
+            if not data or data.get("shot") == "_sequence":
+                continue
+
+            for path in self.core.diskUsage.getEntityPaths(data):
+                self.sizeItems.setdefault(path, []).append(item)
+                self.core.diskUsage.requestFolderSize(path)
+
+            self.setEntitySizeTooltip(item)
+
+    @err_catcher(name=__name__)
+    def onFolderSizeUpdated(self, data):
+        for item in getattr(self, "sizeItems", {}).get(data["path"], []):
+            try:
+                self.setEntitySizeTooltip(item)
+            except RuntimeError:
+                continue
+
+    @err_catcher(name=__name__)
+    def setEntitySizeTooltip(self, item):
+        size = self.core.diskUsage.getCachedEntitySize(item.data(0, Qt.UserRole))
+        if size is not None:
+            item.setToolTip(0, "Disk usage: %s" % self.core.diskUsage.formatSize(size))
+
+        parent = item.parent()
+        if parent and parent.data(0, Qt.UserRole).get("shot") == "_sequence":
+            total = 0
+            for idx in range(parent.childCount()):
+                childSize = self.core.diskUsage.getCachedEntitySize(parent.child(idx).data(0, Qt.UserRole))
+                if childSize is None:
+                    return
+
+                total += childSize
+
+            parent.setToolTip(0, "Disk usage: %s" % self.core.diskUsage.formatSize(total))
+
     @err_catcher(name=__name__)
     def setupUi(self):
         self.e_search = QLineEdit()
@@ -355,6 +686,7 @@ class EntityPage(QWidget):
         self.e_search.keyPressEvent = lambda x: self.keyPressed(x, "search")
 
         self.tw_tree.itemSelectionChanged.connect(self.onItemChanged)
+        self.core.diskUsage.sizeUpdated.connect(self.onFolderSizeUpdated)
         self.tw_tree.itemExpanded.connect(self.itemExpanded)
         self.tw_tree.itemCollapsed.connect(self.itemCollapsed)
         self.tw_tree.customContextMenuRequested.connect(self.contextMenuTree)
@@ -516,7 +848,7 @@ class EntityPage(QWidget):
             item.setData(0, Qt.UserRole, data)
             refreshItem = False
         else:
-            item = QTreeWidgetItem([name, name])
+            item = QTreeWidgetItem([name])
             entity = {"asset_path": relPath, "asset": os.path.basename(relPath), "paths": [path], "type": itemType}
             item.setData(
                 0,
@@ -604,6 +936,8 @@ class EntityPage(QWidget):
             for childnum in range(item.childCount()):
                 self.refreshAssetItem(item.child(childnum))
 
+        self.refreshEntitySizes(parent=item)
+
     @err_catcher(name=__name__)
     def itemCollapsed(self, item):
         if self.entityType == "asset":
@@ -201,6 +201,8 @@ class MediaBrowser(QWidget, MediaBrowser_ui.Ui_w_mediaBrowser):
         self.lw_version.customContextMenuRequested.connect(
             lambda x: self.rclList(x, self.lw_version)
         )
+        self.core.watcher.folderChanged.connect(self.onWatchedFolderChanged)
+        self.core.diskUsage.sizeUpdated.connect(self.onFolderSizeUpdated)
 
     @err_catcher(name=__name__)
     def saveSettings(self, data):
@@ -218,7 +220,7 @@ class MediaBrowser(QWidget, MediaBrowser_ui.Ui_w_mediaBrowser):
 
     @err_catcher(name=__name__)
     def entityChanged(self, item=None):
-        self.updateTasks(restoreSelection=True)
+        self.updateTasks(restoreSelection=True, background=True)
 
     @err_catcher(name=__name__)
     def refreshUI(self):
@@ -331,7 +333,42 @@ class MediaBrowser(QWidget, MediaBrowser_ui.Ui_w_mediaBrowser):
         return mediaTasks
 
     @err_catcher(name=__name__)
-    def updateTasks(self, restoreSelection=False):
+    def getTaskContext(self):
+        entity = self.getCurrentEntities()
+        if isinstance(entity, list) and len(entity) == 1:
+            entity = entity[0]
+
+        context = {"entity": entity, "location": self.w_entities.getCurrentLocation()}
+        return context
+
+    @err_catcher(name=__name__)
+    def loadMediaTasks(self, context):
+        # only reads from disk, so it can run in a background thread
+        entity = context["entity"]
+        if not entity or not isinstance(entity, dict) or entity["type"] not in ["asset", "shot"]:
+            return {"3d": [], "2d": [], "playblast": [], "external": []}
+
+        return self.core.mediaProducts.getIdentifiersByType(
+            entity=entity, locations=[context["location"]]
+        )
+
+    @err_catcher(name=__name__)
+    def updateTasks(self, restoreSelection=False, background=False, mediaTasks=None):
+        if mediaTasks is None:
+            if background:
+                context = self.getTaskContext()
+                self.core.refreshScheduler.submit(
+                    self,
+                    "tasks",
+                    lambda: self.loadMediaTasks(context),
+                    lambda data: self.updateTasks(restoreSelection=True, background=True, mediaTasks=data),
+                    cacheKey=self.core.refreshScheduler.getCacheKey(context),
+                )
+                return
+
+            self.core.refreshScheduler.cancel(self, "tasks")
+            mediaTasks = self.getMediaTasks()
+
         if restoreSelection:
             curTask = None
             identifier = self.getCurrentIdentifier()
@@ -344,7 +381,6 @@ class MediaBrowser(QWidget, MediaBrowser_ui.Ui_w_mediaBrowser):
 
         self.lw_task.clear()
 
-        mediaTasks = self.getMediaTasks()
         if mediaTasks:
             addedItems = []
             for pType in ["3d", "2d", "playblast", "external"]:
@@ -374,7 +410,7 @@ class MediaBrowser(QWidget, MediaBrowser_ui.Ui_w_mediaBrowser):
 
         if not wasBlocked:
             self.lw_task.blockSignals(False)
-            self.updateVersions(restoreSelection=True)
+            self.updateVersions(restoreSelection=True, background=background)
 
     @err_catcher(name=__name__)
     def sortVersions(self, key):
@@ -385,7 +421,70 @@ class MediaBrowser(QWidget, MediaBrowser_ui.Ui_w_mediaBrowser):
         return val
 
     @err_catcher(name=__name__)
-    def updateVersions(self, restoreSelection=False):
+    def getVersionContext(self):
+        identifier = None
+        if len(self.lw_task.selectedItems()) == 1:
+            identifier = self.getCurrentIdentifier()
+
+        context = {"identifier": identifier, "location": self.w_entities.getCurrentLocation()}
+        return context
+
+    @err_catcher(name=__name__)
+    def loadVersionData(self, context):
+        # only reads from disk, so it can run in a background thread
+        versionData = []
+        if not context["identifier"]:
+            return versionData
+
+        versions = self.core.mediaProducts.getVersionsFromIdentifier(
+            identifier=context["identifier"], locations=[context["location"]], cached=True
+        )
+        locs = self.core.paths.getRenderProductBasePaths()
+        for version in sorted(versions, key=self.sortVersions, reverse=True):
+            if version["version"] == "master":
+                versionName = self.core.mediaProducts.getMasterVersionLabel(version["path"])
+            else:
+                versionName = version["version"]
+
+            vdata = self.core.paths.getRenderProductData(version["path"], isFilepath=False, addPathData=False, mediaType="3drenders", validateModTime=False)
+            if "project_path" in vdata:
+                del vdata["project_path"]
+
+            comment = vdata.get("comment")
+            if comment:
+                versionName += " - " + comment
+
+            data = version.copy()
+            if data["version"] == "master":
+                vdata["version"] = "master"
+
+            data.update(vdata)
+            if len(locs) > 1:
+                locStr = ", ".join([loc for loc in data.get("locations", []) if loc != "global"])
+                if locStr:
+                    versionName += " (%s)" % locStr
+
+            versionData.append({"name": versionName, "data": data})
+
+        return versionData
+
+    @err_catcher(name=__name__)
+    def updateVersions(self, restoreSelection=False, background=False, versionData=None):
+        if versionData is None:
+            if background:
+                context = self.getVersionContext()
+                self.core.refreshScheduler.submit(
+                    self,
+                    "versions",
+                    lambda: self.loadVersionData(context),
+                    lambda data: self.updateVersions(restoreSelection=True, versionData=data),
+                    cacheKey=self.core.refreshScheduler.getCacheKey(context),
+                )
+                return
+
+            self.core.refreshScheduler.cancel(self, "versions")
+            versionData = self.loadVersionData(self.getVersionContext())
+
         if restoreSelection:
             curVersion = None
             version = self.getCurrentVersion()
@@ -395,58 +494,88 @@ class MediaBrowser(QWidget, MediaBrowser_ui.Ui_w_mediaBrowser):
         wasBlocked = self.lw_version.signalsBlocked()
         if not wasBlocked:
             self.lw_version.blockSignals(True)
-        
+
         self.lw_version.clear()
         selectFirst = True
-        if len(self.lw_task.selectedItems()) == 1:
-            identifier = self.getCurrentIdentifier()
-            location = self.w_entities.getCurrentLocation()
-            versions = self.core.mediaProducts.getVersionsFromIdentifier(
-                identifier=identifier, locations=[location]
-            )
-            locs = self.core.paths.getRenderProductBasePaths()
-            for version in sorted(versions, key=self.sortVersions, reverse=True):
-                if version["version"] == "master":
-                    versionName = self.core.mediaProducts.getMasterVersionLabel(version["path"])
-                else:
-                    versionName = version["version"]
+        multipleLocations = len(self.core.paths.getRenderProductBasePaths()) > 1
+        showSizes = self.core.getConfig("globals", "showFileSizes", config="user")
+        for version in versionData:
+            item = QListWidgetItem(version["name"])
+            item.setData(Qt.UserRole, version["data"])
+            if multipleLocations:
+                item.setToolTip(", ".join(version["data"].get("locations", [])))
+
+            if showSizes:
+                self.setVersionSizeTooltip(item)
+                self.core.diskUsage.requestFolderSize(version["data"]["path"])
+
+            self.lw_version.addItem(item)
+
+            if restoreSelection and curVersion:
+                if curVersion == version["data"]["version"]:
+                    self.lw_version.setCurrentItem(item)
+                    selectFirst = False
 
-                vdata = self.core.paths.getRenderProductData(version["path"], isFilepath=False, addPathData=False, mediaType="3drenders", validateModTime=False)
-                if "project_path" in vdata:
-                    del vdata["project_path"]
+        if self.lw_version.count() > 0 and selectFirst:
+            self.lw_version.setCurrentRow(0)
 
-                comment = vdata.get("comment")
-                if comment:
-                    versionName += " - " + comment
+        if not wasBlocked:
+            self.lw_version.blockSignals(False)
+            self.versionClicked()
 
-                versionData = version.copy()
-                if versionData["version"] == "master":
-                    vdata["version"] = "master"
+        self.refreshWatchedFolders()
 
-                versionData.update(vdata)
-                if len(locs) > 1:
-                    locStr = ", ".join([loc for loc in versionData.get("locations", []) if loc != "global"])
-                    if locStr:
-                        versionName += " (%s)" % locStr
+    @err_catcher(name=__name__)
+    def setVersionSizeTooltip(self, item, size=None):
+        versionData = item.data(Qt.UserRole)
+        if size is None:
+            size = self.core.diskUsage.getCachedSize(versionData["path"])
 
-                item = QListWidgetItem(versionName)
-                item.setData(Qt.UserRole, versionData)
-                if len(locs) > 1:
-                    item.setToolTip(", ".join(versionData.get("locations", [])))
+        lines = []
+        if len(self.core.paths.getRenderProductBasePaths()) > 1:
+            lines.append(", ".join(versionData.get("locations", [])))
 
-                self.lw_version.addItem(item)
+        if size is not None:
+            lines.append("Size: %s" % self.core.diskUsage.formatSize(size))
 
-                if restoreSelection and curVersion:
-                    if curVersion == version["version"]:
-                        self.lw_version.setCurrentItem(item)
-                        selectFirst = False
+        item.setToolTip("\n".join(lines))
 
-        if self.lw_version.count() > 0 and selectFirst:
-            self.lw_version.setCurrentRow(0)
+    @err_catcher(name=__name__)
+    def onFolderSizeUpdated(self, data):
+        for idx in range(self.lw_version.count()):
+            item = self.lw_version.item(idx)
+            versionData = item.data(Qt.UserRole)
+            if versionData and os.path.normpath(versionData.get("path", "")) == data["path"]:
+                self.setVersionSizeTooltip(item, data["size"])
 
-        if not wasBlocked:
-            self.lw_version.blockSignals(False)
-            self.versionClicked()
+    @err_catcher(name=__name__)
+    def refreshWatchedFolders(self):
+        folders = []
+        entity = self.getCurrentEntity()
+        if entity and entity.get("type") in ["asset", "shot"]:
+            path = self.core.mediaProducts.getIdentifierPathFromEntity(entity)
+            folders.append({"path": path, "type": "entity", "context": entity})
+
+        if len(self.lw_task.selectedItems()) == 1:
+            identifier = self.getCurrentIdentifier()
+            if identifier and identifier.get("path"):
+                folders.append({"path": identifier["path"], "type": "identifier", "context": identifier})
+
+        self.core.watcher.setWatchedFolders(self, folders)
+
+    @err_catcher(name=__name__)
+    def onWatchedFolderChanged(self, event):
+        if not self.core.watcher.isWatchedBy(self, event["path"]):
+            return
+
+        if not self.isVisible():
+            self.refreshStatus = "invalid"
+            return
+
+        if event["type"] == "identifier":
+            self.updateVersions(restoreSelection=True, background=True)
+        elif event["type"] == "entity" and event["added"] + event["removed"]:
+            self.updateTasks(restoreSelection=True, background=True)
 
     @err_catcher(name=__name__)
     def getSelectedContexts(self):
@@ -473,7 +602,7 @@ class MediaBrowser(QWidget, MediaBrowser_ui.Ui_w_mediaBrowser):
 
     @err_catcher(name=__name__)
     def taskClicked(self):
-        self.updateVersions()
+        self.updateVersions(background=True)
 
     @err_catcher(name=__name__)
     def versionClicked(self):
@@ -684,6 +813,7 @@ class MediaBrowser(QWidget, MediaBrowser_ui.Ui_w_mediaBrowser):
         if entity:
             self.navigateToEntity(entity)
 
+        self.core.refreshScheduler.flush(self)
         if not identifier:
             self.lw_task.blockSignals(False)
             if prevIdf != self.getCurrentIdentifier() or not self.initialized:
@@ -708,6 +838,7 @@ class MediaBrowser(QWidget, MediaBrowser_ui.Ui_w_mediaBrowser):
         if prevIdf != self.getCurrentIdentifier():
             self.taskClicked()
 
+        self.core.refreshScheduler.flush(self)
         if not version:
             self.lw_version.blockSignals(False)
             if prevVersion != self.getCurrentVersion() or not self.initialized:
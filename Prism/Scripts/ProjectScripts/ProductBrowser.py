@@ -110,6 +110,7 @@ class ProductBrowser(QDialog, ProductBrowser_ui.Ui_dlg_ProductBrowser):
 
     @err_catcher(name=__name__)
     def closeEvent(self, event=None):
+        self.core.watcher.unwatchFolders(self)
         self.closing.emit()
 
     @err_catcher(name=__name__)
@@ -315,6 +316,8 @@ class ProductBrowser(QDialog, ProductBrowser_ui.Ui_dlg_ProductBrowser):
             lambda pos: self.rclicked(pos, "versions")
         )
         self.tw_versions.mouseMoveEvent = self.mouseDrag
+        self.core.watcher.folderChanged.connect(self.onWatchedFolderChanged)
+        self.core.diskUsage.sizeUpdated.connect(self.onFolderSizeUpdated)
 
     @err_catcher(name=__name__)
     def mouseClickEvent(self, event, widget):
@@ -979,26 +982,62 @@ class ProductBrowser(QDialog, ProductBrowser_ui.Ui_dlg_ProductBrowser):
         if entityType and entityType != self.w_entities.getCurrentPage().entityType:
             return
 
-        self.updateIdentifiers(restoreSelection=True)
+        self.updateIdentifiers(restoreSelection=True, background=True)
 
     @err_catcher(name=__name__)
     def identifierClicked(self):
-        self.updateVersions()
+        self.updateVersions(background=True)
         if hasattr(self, "dlg_editTags") and self.dlg_editTags.isVisible():
             self.dlg_editTags.setProductData(self.getCurrentProduct())
 
     @err_catcher(name=__name__)
     def getIdentifiers(self):
+        return self.loadIdentifierData(self.getIdentifierContext())["identifiers"]
+
+    @err_catcher(name=__name__)
+    def getIdentifierContext(self):
         curEntities = self.getCurrentEntities()
+        context = {
+            "entities": curEntities,
+            "location": self.w_entities.getCurrentLocation(),
+        }
+        return context
+
+    @err_catcher(name=__name__)
+    def loadIdentifierData(self, context):
+        # only reads from disk, so it can run in a background thread
+        curEntities = context["entities"]
         if len(curEntities) != 1 or curEntities[0]["type"] not in ["asset", "shot"]:
-            return {}
+            return {"identifiers": {}, "groups": {}}
 
-        location = self.w_entities.getCurrentLocation()
-        identifiers = self.core.products.getProductNamesFromEntity(curEntities[0], locations=[location])
-        return identifiers
+        identifiers = self.core.products.getProductNamesFromEntity(
+            curEntities[0], locations=[context["location"]]
+        )
+        groups = {}
+        for identifierName in identifiers:
+            group = self.core.products.getGroupFromProduct(identifiers[identifierName])
+            if group:
+                groups[identifierName] = group
+
+        return {"identifiers": identifiers, "groups": groups}
 
     @err_catcher(name=__name__)
-    def updateIdentifiers(self, item=None, restoreSelection=False):
+    def updateIdentifiers(self, item=None, restoreSelection=False, background=False, data=None):
+        if data is None:
+            if background:
+                context = self.getIdentifierContext()
+                self.core.refreshScheduler.submit(
+                    self,
+                    "identifiers",
+                    lambda: self.loadIdentifierData(context),
+                    lambda data: self.updateIdentifiers(restoreSelection=True, background=True, data=data),
+                    cacheKey=self.core.refreshScheduler.getCacheKey(context),
+                )
+                return
+
+            self.core.refreshScheduler.cancel(self, "identifiers")
+            data = self.loadIdentifierData(self.getIdentifierContext())
+
         if restoreSelection:
             curId = self.getCurrentProductName() or ""
 
@@ -1008,9 +1047,9 @@ class ProductBrowser(QDialog, ProductBrowser_ui.Ui_dlg_ProductBrowser):
 
         self.tw_identifier.clear()
 
-        identifiers = self.getIdentifiers()
+        identifiers = data["identifiers"]
         identifierNames = sorted(identifiers.keys(), key=lambda s: s.lower())
-        groups, groupItems = self.createGroupItems(identifiers)
+        groups, groupItems = self.createGroupItems(identifiers, groups=data["groups"])
         for tn in identifierNames:
             item = QTreeWidgetItem([tn.replace("_ShotCam", "ShotCam")])
             item.setData(0, Qt.UserRole, identifiers[tn])
@@ -1034,15 +1073,16 @@ class ProductBrowser(QDialog, ProductBrowser_ui.Ui_dlg_ProductBrowser):
 
         if not wasBlocked:
             self.tw_identifier.blockSignals(False)
-            self.updateVersions(restoreSelection=True)
+            self.updateVersions(restoreSelection=True, background=background)
 
     @err_catcher(name=__name__)
-    def createGroupItems(self, identifiers):
-        groups = {}
-        for identifierName in identifiers:
-            group = self.core.products.getGroupFromProduct(identifiers[identifierName])
-            if group:
-                groups[identifierName] = group
+    def createGroupItems(self, identifiers, groups=None):
+        if groups is None:
+            groups = {}
+            for identifierName in identifiers:
+                group = self.core.products.getGroupFromProduct(identifiers[identifierName])
+                if group:
+                    groups[identifierName] = group
 
         groupNames = sorted(list(set(groups.values())))
         groupItems = {}
@@ -1081,7 +1121,106 @@ class ProductBrowser(QDialog, ProductBrowser_ui.Ui_dlg_ProductBrowser):
         return groups, groupItems
 
     @err_catcher(name=__name__)
-    def updateVersions(self, restoreSelection=False):
+    def getVersionContext(self):
+        context = {
+            "product": self.getCurrentProduct(),
+            "location": self.w_entities.getCurrentLocation(),
+            "multipleLocations": len(self.w_entities.getLocations()) > 1 or bool(
+                self.projectBrowser and len(self.projectBrowser.locations) > 1
+            ),
+        }
+        return context
+
+    @err_catcher(name=__name__)
+    def loadVersionData(self, context):
+        # only reads from disk, so it can run in a background thread
+        versionData = []
+        identifierData = context["product"]
+        if not identifierData:
+            return versionData
+
+        versions = self.core.products.getVersionsFromContext(
+            identifierData, locations=[context["location"]], cached=True
+        )
+        for version in versions:
+            if version["version"] == "master":
+                if context["multipleLocations"]:
+                    location = [self.core.products.getLocationFromFilepath(path) for path in version["paths"]]
+                else:
+                    location = None
+
+                if location:
+                    filepath = self.core.products.getPreferredFileFromVersion(
+                        version, location=location[0]
+                    )
+                else:
+                    filepath = self.core.products.getPreferredFileFromVersion(
+                        version
+                    )
+
+                if not filepath:
+                    continue
+
+                cfgData = self.core.paths.getCachePathData(filepath, addPathData=False)
+                cfgData.update(version)
+                comment = cfgData.get("comment", "")
+                user = cfgData.get("user", "")
+                versionName = self.core.products.getMasterVersionLabel(filepath)
+                versionData.append({
+                    "filepath": filepath,
+                    "versionName": versionName,
+                    "comment": comment,
+                    "user": user,
+                    "location": location,
+                    "data": cfgData,
+                })
+            else:
+                filepath = self.core.products.getPreferredFileFromVersion(version)
+                versionNameData = self.core.products.getDataFromVersionContext(
+                    version
+                )
+                versionName = versionNameData.get("version")
+                if not versionName:
+                    versionName = version.get("version")
+
+                if versionNameData.get("wedge"):
+                    versionName += " (%s)" % versionNameData["wedge"]
+
+                comment = versionNameData.get("comment")
+                user = versionNameData.get("user")
+                if context["multipleLocations"]:
+                    location = [self.core.products.getLocationFromFilepath(path) for path in version["paths"]]
+                else:
+                    location = None
+
+                versionData.append({
+                    "filepath": filepath,
+                    "versionName": versionName,
+                    "comment": comment,
+                    "user": user,
+                    "location": location,
+                    "data": versionNameData,
+                })
+
+        return versionData
+
+    @err_catcher(name=__name__)
+    def updateVersions(self, restoreSelection=False, background=False, data=None):
+        if data is None:
+            if background:
+                context = self.getVersionContext()
+                self.core.refreshScheduler.submit(
+                    self,
+                    "versions",
+                    lambda: self.loadVersionData(context),
+                    lambda data: self.updateVersions(restoreSelection=True, data=data),
+                    cacheKey=self.core.refreshScheduler.getCacheKey(context),
+                )
+                return
+
+            self.core.refreshScheduler.cancel(self, "versions")
+            data = self.loadVersionData(self.getVersionContext())
+
         curVersion = None
         indexes = self.tw_versions.selectionModel().selectedIndexes()
         if indexes:
@@ -1099,61 +1238,18 @@ class ProductBrowser(QDialog, ProductBrowser_ui.Ui_dlg_ProductBrowser):
             self.tw_versions.horizontalHeader().sortIndicatorOrder(),
         ]
         self.tw_versions.setSortingEnabled(False)
-        identifierData = self.getCurrentProduct()
-
-        if identifierData:
-            location = self.w_entities.getCurrentLocation()
-            versions = self.core.products.getVersionsFromContext(identifierData, locations=[location])
-            for version in versions:
-                if version["version"] == "master":
-                    if len(self.w_entities.getLocations()) > 1 or (self.projectBrowser and len(self.projectBrowser.locations) > 1):
-                        location = [self.core.products.getLocationFromFilepath(path) for path in version["paths"]]
-                    else:
-                        location = None
-
-                    if location:
-                        filepath = self.core.products.getPreferredFileFromVersion(
-                            version, location=location[0]
-                        )
-                    else:
-                        filepath = self.core.products.getPreferredFileFromVersion(
-                            version
-                        )
-
-                    if not filepath:
-                        continue
-                    
-                    cfgData = self.core.paths.getCachePathData(filepath, addPathData=False)
-                    cfgData.update(version)
-                    comment = cfgData.get("comment", "")
-                    user = cfgData.get("user", "")
-                    versionName = self.core.products.getMasterVersionLabel(filepath)
-                    self.addVersionToTable(
-                        filepath, versionName, comment, user, location=location, data=cfgData
-                    )
-                else:
-                    filepath = self.core.products.getPreferredFileFromVersion(version)
-                    versionNameData = self.core.products.getDataFromVersionContext(
-                        version
-                    )
-                    versionName = versionNameData.get("version")
-                    if not versionName:
-                        versionName = version.get("version")
-
-                    if versionNameData.get("wedge"):
-                        versionName += " (%s)" % versionNameData["wedge"]
-
-                    comment = versionNameData.get("comment")
-                    user = versionNameData.get("user")
-                    if len(self.w_entities.getLocations()) > 1 or (self.projectBrowser and len(self.projectBrowser.locations) > 1):
-                        location = [self.core.products.getLocationFromFilepath(path) for path in version["paths"]]
-                    else:
-                        location = None
-
-                    self.addVersionToTable(
-                        filepath, versionName, comment, user, location=location, data=versionNameData
-                    )
+        self.tw_versions.setUpdatesEnabled(False)
+        for version in data:
+            self.addVersionToTable(
+                version["filepath"],
+                version["versionName"],
+                version["comment"],
+                version["user"],
+                location=version["location"],
+                data=version["data"],
+            )
 
+        self.tw_versions.setUpdatesEnabled(True)
         self.tw_versions.resizeColumnsToContents()
         self.tw_versions.sortByColumn(twSorting[0], twSorting[1])
         self.tw_versions.setSortingEnabled(True)
@@ -1179,6 +1275,37 @@ class ProductBrowser(QDialog, ProductBrowser_ui.Ui_dlg_ProductBrowser):
             if curVersion != newVersion:
                 self.versionsUpdated.emit()
 
+        self.refreshWatchedFolders()
+
+    @err_catcher(name=__name__)
+    def refreshWatchedFolders(self):
+        folders = []
+        curEntities = self.getCurrentEntities()
+        if len(curEntities) == 1 and curEntities[0]["type"] in ["asset", "shot"]:
+            productPath = self.core.products.getProductPathFromEntity(curEntities[0])
+            folders.append({"path": productPath, "type": "entity", "context": curEntities[0]})
+
+        identifierData = self.getCurrentProduct()
+        if identifierData:
+            for path in identifierData.get("locations", [identifierData.get("path")]):
+                folders.append({"path": path, "type": "identifier", "context": identifierData})
+
+        self.core.watcher.setWatchedFolders(self, folders)
+
+    @err_catcher(name=__name__)
+    def onWatchedFolderChanged(self, event):
+        if not self.core.watcher.isWatchedBy(self, event["path"]):
+            return
+
+        if not self.isVisible():
+            self.refreshStatus = "invalid"
+            return
+
+        if event["type"] == "identifier":
+            self.updateVersions(restoreSelection=True, background=True)
+        elif event["type"] == "entity" and event["added"] + event["removed"]:
+            self.updateIdentifiers(restoreSelection=True, background=True)
+
     @err_catcher(name=__name__)
     def addVersionToTable(self, filepath, versionName, comment, user, location=None, data=None):
         dateStamp = data.get("date", "") if data else ""
@@ -1269,17 +1396,21 @@ class ProductBrowser(QDialog, ProductBrowser_ui.Ui_dlg_ProductBrowser):
         self.tw_versions.setItem(row, self.versionLabels.index("User"), item)
 
         if self.core.getConfig("globals", "showFileSizes", config="user"):
-            if "size" in data:
-                size = data["size"]
-            elif filepath and os.path.exists(filepath):
-                size = float(os.stat(filepath).st_size / 1024.0 / 1024.0)
+            item = QTableWidgetItem()
+            item.setTextAlignment(Qt.Alignment(Qt.AlignCenter))
+            if data and "size" in data:
+                item.setText("%.2f mb" % data["size"])
             else:
-                size = 0
+                versionPath = (data or {}).get("path", "")
+                if not versionPath or os.path.splitext(versionPath)[1]:
+                    versionPath = os.path.dirname(filepath) if filepath else ""
 
-            sizeStr = "%.2f mb" % size
+                if versionPath:
+                    versionPath = os.path.normpath(versionPath)
+                    item.setData(Qt.UserRole, versionPath)
+                    self.setSizeItemText(item, self.core.diskUsage.getCachedSize(versionPath))
+                    self.core.diskUsage.requestFolderSize(versionPath)
 
-            item = QTableWidgetItem(sizeStr)
-            item.setTextAlignment(Qt.Alignment(Qt.AlignCenter))
             self.tw_versions.setItem(row, self.versionLabels.index("Size"), item)
 
         item = QTableWidgetItem()
@@ -1294,6 +1425,24 @@ class ProductBrowser(QDialog, ProductBrowser_ui.Ui_dlg_ProductBrowser):
 
         self.core.callback(name="productVersionAdded", args=[self, row, filepath, versionName, comment, user, location])
 
+    @err_catcher(name=__name__)
+    def setSizeItemText(self, item, size):
+        if size is None:
+            item.setText("...")
+        else:
+            item.setText("%.2f mb" % (size / 1024.0 / 1024.0))
+
+    @err_catcher(name=__name__)
+    def onFolderSizeUpdated(self, data):
+        if "Size" not in self.versionLabels:
+            return
+
+        column = self.versionLabels.index("Size")
+        for row in range(self.tw_versions.rowCount()):
+            item = self.tw_versions.item(row, column)
+            if item and item.data(Qt.UserRole) == data["path"]:
+                self.setSizeItemText(item, data["size"])
+
     @err_catcher(name=__name__)
     def getCurSelection(self):
         curPath = self.core.projectPath
@@ -1375,6 +1524,7 @@ class ProductBrowser(QDialog, ProductBrowser_ui.Ui_dlg_ProductBrowser):
         if entity:
             self.navigateToEntity(entity)
 
+        self.core.refreshScheduler.flush(self)
         if product == "_ShotCam":
             product = "ShotCam"
 
@@ -1407,6 +1557,7 @@ class ProductBrowser(QDialog, ProductBrowser_ui.Ui_dlg_ProductBrowser):
 
                 return False
 
+        self.core.refreshScheduler.flush(self)
         result = False
         if version is not None:
             for versionNum in range(self.tw_versions.model().rowCount()):
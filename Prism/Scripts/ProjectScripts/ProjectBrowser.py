@@ -257,7 +257,25 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
                 "QWidget{padding: 0; border-width: 0px;background-color: transparent} QWidget:hover{background-color: rgba(250, 250, 250, 40); }"
             )
 
+        self.e_search = QLineEdit()
+        self.e_search.setPlaceholderText("Search project...")
+        self.e_search.setClearButtonEnabled(True)
+        self.e_search.setMinimumWidth(220)
+        self.e_search.setToolTip(
+            "Search entities, tasks, products, media and comments of the project.\n"
+            "Filter with type:, user:, department:, task:, mediaType: or date:"
+        )
+        self.searchModel = QStandardItemModel(self)
+        self.searchCompleter = QCompleter(self.searchModel, self)
+        self.searchCompleter.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.searchCompleter.setMaxVisibleItems(15)
+        self.e_search.setCompleter(self.searchCompleter)
+        self.e_search.textEdited.connect(self.onSearchTextEdited)
+        self.searchCompleter.activated[QModelIndex].connect(self.onSearchResultActivated)
+        self.core.searchIndex.refreshFinished.connect(self.onSearchIndexRefreshed)
+
         self.b_refreshTabs = QToolButton()
+        self.lo_corner.addWidget(self.e_search)
         self.lo_corner.addWidget(self.b_user)
         self.lo_corner.addWidget(self.b_projects)
         self.lo_corner.addWidget(self.b_refreshTabs)
@@ -459,6 +477,8 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
             if hasattr(tab, "saveSettings"):
                 tab.saveSettings(cData)
 
+            self.core.watcher.unwatchFolders(tab)
+
         self.core.setConfig(data=cData, updateNestedData={"exclude": ["selectedContext"]})
 
         if hasattr(self, "mediaBrowser"):
@@ -519,6 +539,58 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
         newPos = QPoint(x, y)
         self.w_projects.move(newPos)
 
+    @err_catcher(name=__name__)
+    def onSearchTextEdited(self, text):
+        # results come from the current index. A stale index gets refreshed
+        # in the background and the results get updated afterwards.
+        self.searchModel.clear()
+        if len(text.strip()) < 2:
+            return
+
+        for doc in self.core.searchIndex.search(text, limit=30):
+            item = QStandardItem("%s  [%s]" % (doc["title"], doc["type"]))
+            item.setData(doc, Qt.UserRole)
+            item.setToolTip(doc["path"])
+            self.searchModel.appendRow(item)
+
+    @err_catcher(name=__name__)
+    def onSearchIndexRefreshed(self):
+        if not self.e_search.hasFocus():
+            return
+
+        self.onSearchTextEdited(self.e_search.text())
+        if self.searchModel.rowCount():
+            self.searchCompleter.complete()
+
+    @err_catcher(name=__name__)
+    def onSearchResultActivated(self, index):
+        doc = index.data(Qt.UserRole)
+        if not doc:
+            return
+
+        self.navigateToSearchResult(doc)
+
+    @err_catcher(name=__name__)
+    def navigateToSearchResult(self, doc):
+        data = dict(doc["data"])
+        if doc["type"] == "product":
+            if self.showTab("Products") is False:
+                return
+
+            self.productBrowser.navigateToProduct(data["product"], entity=data)
+        elif doc["type"] == "media":
+            if self.showTab("Media") is False:
+                return
+
+            self.mediaBrowser.showRender(
+                entity=data, identifier=data["identifier"], version=data.get("version")
+            )
+        else:
+            if self.showTab("Scenefiles") is False:
+                return
+
+            self.sceneBrowser.navigate(data)
+
     @err_catcher(name=__name__)
     def tabChanged(self, tab, navData=None):
         if self.previousTab is not None:
@@ -581,6 +653,9 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
         for idx in range(self.tbw_project.count()):
             self.tbw_project.widget(idx).refreshStatus = "invalid"
 
+        if self.core.isManagerLoaded("searchIndex"):
+            self.core.searchIndex.invalidate()
+
         if self.isVisible() and not self.isMinimized():
             cw = self.tbw_project.currentWidget()
             cw.refreshUI()
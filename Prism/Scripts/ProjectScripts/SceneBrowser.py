@@ -39,6 +39,9 @@ import shutil
 import logging
 import traceback
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 if sys.version[0] == "3":
     pVersion = 3
@@ -82,7 +85,6 @@ class SceneBrowser(QWidget, SceneBrowser_ui.Ui_w_sceneBrowser):
 
         self.filteredAssets = []
         self.scenefileData = []
-        self.sceneItemWidgets = []
         self.depIcons = {}
         self.initialized = False
 
@@ -148,13 +150,13 @@ class SceneBrowser(QWidget, SceneBrowser_ui.Ui_w_sceneBrowser):
 
         self.tw_scenefiles.setShowGrid(False)
 
-        self.w_scenefileItems = QWidget()
-        self.w_scenefileItems.setObjectName("itemview")
-        self.lo_scenefileItems = QVBoxLayout()
-        self.w_scenefileItems.setLayout(self.lo_scenefileItems)
-        self.sa_scenefileItems.setWidget(self.w_scenefileItems)
-        self.sa_scenefileItems.setWidgetResizable(True)
-        # self.sa_scenefileItems.setStyleSheet("QScrollArea { border: 0px}")
+        self.previewLoader = ScenePreviewLoader(self.core)
+        self.scenefileModel = ScenefileModel(self)
+        self.previewLoader.previewReady.connect(self.scenefileModel.onPreviewReady)
+        self.lv_scenefileItems.setObjectName("itemview")
+        self.lv_scenefileItems.setModel(self.scenefileModel)
+        self.lv_scenefileItems.setItemDelegate(ScenefileDelegate(self))
+        self.lv_scenefileItems.setMouseTracking(True)
 
         cData = self.core.getConfig()
         brsData = cData.get("browser", {})
@@ -197,11 +199,11 @@ class SceneBrowser(QWidget, SceneBrowser_ui.Ui_w_sceneBrowser):
         self.tw_scenefiles.dragLeaveEvent = self.sceneDragLeaveEvent
         self.tw_scenefiles.dropEvent = self.sceneDropEvent
 
-        self.w_scenefileItems.setAcceptDrops(True)
-        self.w_scenefileItems.dragEnterEvent = self.sceneDragEnterEvent
-        self.w_scenefileItems.dragMoveEvent = self.sceneDragMoveEvent
-        self.w_scenefileItems.dragLeaveEvent = self.sceneDragLeaveEvent
-        self.w_scenefileItems.dropEvent = self.sceneDropEvent
+        self.lv_scenefileItems.setAcceptDrops(True)
+        self.lv_scenefileItems.dragEnterEvent = self.sceneDragEnterEvent
+        self.lv_scenefileItems.dragMoveEvent = self.sceneDragMoveEvent
+        self.lv_scenefileItems.dragLeaveEvent = self.sceneDragLeaveEvent
+        self.lv_scenefileItems.dropEvent = self.sceneDropEvent
 
         self.setStyleSheet(
             'QSplitter::handle{background-image: "";background-color: transparent}'
@@ -226,12 +228,6 @@ class SceneBrowser(QWidget, SceneBrowser_ui.Ui_w_sceneBrowser):
         icon = self.core.media.getColoredIcon(iconPath)
         self.b_sceneLayoutItems.setIcon(icon)
 
-        if hasattr(QApplication.instance(), "styleSheet"):
-            ssheet = QApplication.instance().styleSheet()
-            ssheet = ssheet.replace("QScrollArea", "Qdisabled")
-            ssheet = ssheet.replace("QListView", "QScrollArea")
-            self.sa_scenefileItems.setStyleSheet(ssheet)
-
     @err_catcher(name=__name__)
     def refreshAppFilters(self, browserData=None):
         if browserData is None:
@@ -331,11 +327,13 @@ class SceneBrowser(QWidget, SceneBrowser_ui.Ui_w_sceneBrowser):
         self.b_sceneLayoutList.toggled.connect(self.sceneLayoutListToggled)
         self.b_scenefilter.clicked.connect(self.showSceneFilterMenu)
 
-        self.sa_scenefileItems.mouseClickEvent = (
-            self.sa_scenefileItems.mouseReleaseEvent
+        self.lv_scenefileItems.mouseClickEvent = (
+            self.lv_scenefileItems.mousePressEvent
         )
-        self.sa_scenefileItems.mouseReleaseEvent = self.mouseClickItemViewEvent
-        self.sa_scenefileItems.customContextMenuRequested.connect(self.rclItemView)
+        self.lv_scenefileItems.mousePressEvent = self.mouseClickItemViewEvent
+        self.lv_scenefileItems.doubleClicked.connect(self.itemDoubleClicked)
+        self.lv_scenefileItems.customContextMenuRequested.connect(self.rclItemView)
+        self.core.watcher.folderChanged.connect(self.onWatchedFolderChanged)
 
     @err_catcher(name=__name__)
     def saveSettings(self, data):
@@ -441,6 +439,7 @@ class SceneBrowser(QWidget, SceneBrowser_ui.Ui_w_sceneBrowser):
 
         if os.path.isabs(data.get("filename", "")):
             curFname = data["filename"]
+            self.core.refreshScheduler.flush(self)
             self.selectScenefile(curFname)
 
         return True
@@ -449,12 +448,10 @@ class SceneBrowser(QWidget, SceneBrowser_ui.Ui_w_sceneBrowser):
     def selectScenefile(self, curFname):
         globalCurFname = self.core.convertPath(curFname, "global")
         if self.b_sceneLayoutItems.isChecked():
-            for widget in self.sceneItemWidgets:
-                cmpFname = os.path.normpath(widget.data["filename"])
-                if cmpFname in [curFname, globalCurFname]:
-                    widget.select()
-                    self.sa_scenefileItems.ensureWidgetVisible(widget)
-                    break
+            index = self.scenefileModel.getIndexFromPath([curFname, globalCurFname])
+            if index.isValid():
+                self.lv_scenefileItems.setCurrentIndex(index)
+                self.lv_scenefileItems.scrollTo(index)
         else:
             for idx in range(self.tw_scenefiles.model().rowCount()):
                 cmpFname = (
@@ -527,10 +524,18 @@ class SceneBrowser(QWidget, SceneBrowser_ui.Ui_w_sceneBrowser):
 
     @err_catcher(name=__name__)
     def mouseClickItemViewEvent(self, event):
-        if event.type() == QEvent.MouseButtonRelease:
-            if event.button() == Qt.LeftButton:
+        if event.button() == Qt.LeftButton:
+            if not self.lv_scenefileItems.indexAt(event.pos()).isValid():
                 self.deselectItems()
 
+        self.lv_scenefileItems.mouseClickEvent(event)
+
+    @err_catcher(name=__name__)
+    def itemDoubleClicked(self, index):
+        data = index.data(Qt.UserRole)
+        if data:
+            self.exeFile(data["filename"])
+
     @err_catcher(name=__name__)
     def tableMoveEvent(self, event):
         self.showDetailWin(event)
@@ -895,8 +900,19 @@ class SceneBrowser(QWidget, SceneBrowser_ui.Ui_w_sceneBrowser):
 
     @err_catcher(name=__name__)
     def rclItemView(self, pos):
-        self.deselectItems()
-        self.openScenefileContextMenu()
+        index = self.lv_scenefileItems.indexAt(pos)
+        if not index.isValid():
+            self.deselectItems()
+            self.openScenefileContextMenu()
+            return
+
+        self.lv_scenefileItems.setCurrentIndex(index)
+        data = index.data(Qt.UserRole)
+        itemRect = self.lv_scenefileItems.visualRect(index)
+        if self.lv_scenefileItems.itemDelegate().getPreviewRect(itemRect).contains(pos):
+            self.openScenePreviewContextMenu(data)
+        else:
+            self.openScenefileContextMenu(data["filename"])
 
     @err_catcher(name=__name__)
     def openScenefileContextMenu(self, filepath=None):
@@ -1401,7 +1417,7 @@ class SceneBrowser(QWidget, SceneBrowser_ui.Ui_w_sceneBrowser):
 
         if not wasBlocked:
             self.lw_tasks.blockSignals(False)
-            self.refreshScenefiles(restoreSelection=True)
+            self.refreshScenefiles(restoreSelection=True, background=True)
 
     @err_catcher(name=__name__)
     def getCurrentEntity(self):
@@ -1427,61 +1443,100 @@ class SceneBrowser(QWidget, SceneBrowser_ui.Ui_w_sceneBrowser):
 
         return item.text()
 
+    @err_catcher(name=__name__)
+    def getScenefileContext(self):
+        appfilter = []
+        for pluginName in self.appFilters:
+            if self.appFilters[pluginName]["show"]:
+                appfilter += self.appFilters[pluginName]["formats"]
+
+        context = {
+            "entity": self.getCurrentEntity(),
+            "department": self.getCurrentDepartment(),
+            "task": self.getCurrentTask(),
+            "extensions": appfilter,
+            "multipleLocations": len(self.projectBrowser.locations) > 1,
+        }
+        return context
+
     @err_catcher(name=__name__)
     def getScenefileData(self):
-        sceneData = []
-        curEntity = self.getCurrentEntity()
-        curDep = self.getCurrentDepartment()
-        curTask = self.getCurrentTask()
-        if curEntity and curDep and curTask:
-            appfilter = []
+        sceneData = self.loadScenefileData(self.getScenefileContext())
+        return self.addScenefileIcons(sceneData)
 
-            for pluginName in self.appFilters:
-                if self.appFilters[pluginName]["show"]:
-                    appfilter += self.appFilters[pluginName]["formats"]
+    @err_catcher(name=__name__)
+    def loadScenefileData(self, context):
+        # only reads from disk, so it can run in a background thread
+        sceneData = []
+        if not context["entity"] or not context["department"] or not context["task"]:
+            return sceneData
+
+        records = self.core.entities.getScenefileRecords(
+            entity=context["entity"],
+            step=context["department"],
+            category=context["task"],
+            extensions=context["extensions"],
+        )
 
-            scenefiles = self.core.entities.getScenefiles(
-                entity=curEntity, step=curDep, category=curTask, extensions=appfilter
+        for data in records:
+            publicFile = (
+                context["multipleLocations"]
+                and self.core.paths.getLocationFromPath(os.path.normpath(data["filename"])) == "global"
             )
 
-            for scenefile in scenefiles:
-                data = self.core.getScenefileData(scenefile, preview=True)
-                publicFile = (
-                    len(self.projectBrowser.locations) > 1
-                    and self.core.paths.getLocationFromPath(os.path.normpath(scenefile)) == "global"
-                )
-                icon = self.core.getIconForFileType(data["extension"])
-                if icon:
-                    data["icon"] = icon
-                else:
-                    colorVals = [128, 128, 128]
-                    if data["extension"] in self.core.appPlugin.sceneFormats:
-                        colorVals = self.core.appPlugin.appColor
-                    else:
-                        for k in self.core.unloadedAppPlugins.values():
-                            if data["extension"] in k.sceneFormats:
-                                colorVals = k.appColor
+            if not data.get("comment") or data["comment"] == "nocomment":
+                data["comment"] = ""
+
+            if "date" not in data or type(data["date"]) != int:
+                data["date"] = data["modtime"]
 
-                    data["color"] = QColor(colorVals[0], colorVals[1], colorVals[2])
+            data["public"] = publicFile
+            sceneData.append(data)
+
+        return sceneData
 
-                if not data.get("comment") or data["comment"] == "nocomment":
-                    data["comment"] = ""
+    @err_catcher(name=__name__)
+    def addScenefileIcons(self, sceneData):
+        result = []
+        for data in sceneData:
+            data = dict(data)
+            icon = self.core.getIconForFileType(data["extension"])
+            if icon:
+                data["icon"] = icon
+            else:
+                colorVals = [128, 128, 128]
+                if data["extension"] in self.core.appPlugin.sceneFormats:
+                    colorVals = self.core.appPlugin.appColor
+                else:
+                    for k in self.core.unloadedAppPlugins.values():
+                        if data["extension"] in k.sceneFormats:
+                            colorVals = k.appColor
 
-                if "date" not in data or type(data["date"]) != int:
-                    cdate = self.core.getFileModificationDate(scenefile, asString=False)
-                    data["date"] = cdate
+                data["color"] = QColor(colorVals[0], colorVals[1], colorVals[2])
 
-                data["public"] = publicFile
-                sceneData.append(data)
+            result.append(data)
 
-        return sceneData
+        return result
 
     @err_catcher(name=__name__)
-    def refreshScenefiles(self, reloadFiles=True, restoreSelection=False):
+    def refreshScenefiles(self, reloadFiles=True, restoreSelection=False, background=False):
+        if reloadFiles and background:
+            context = self.getScenefileContext()
+            self.core.refreshScheduler.submit(
+                self,
+                "scenefiles",
+                lambda: self.loadScenefileData(context),
+                self.onScenefileDataLoaded,
+                cacheKey=self.core.refreshScheduler.getCacheKey(context),
+            )
+            self.refreshWatchedFolders()
+            return
+
         if restoreSelection:
             file = self.getSelectedScenefile()
 
         if reloadFiles:
+            self.core.refreshScheduler.cancel(self, "scenefiles")
             self.scenefileData = self.getScenefileData()
 
         if self.b_sceneLayoutItems.isChecked():
@@ -1492,75 +1547,70 @@ class SceneBrowser(QWidget, SceneBrowser_ui.Ui_w_sceneBrowser):
         if restoreSelection:
             self.selectScenefile(file)
 
-    @err_catcher(name=__name__)
-    def refreshScenefileItems(self, sceneData):
-        self.clearScenefileItems()
-        # if sceneData:
-        for data in sorted(sceneData, key=lambda x: x.get("version", ""), reverse=True):
-            self.addScenefileItem(data)
-        # else:
-        #     self.w_emptyScenes = QWidget()
-        #     self.lo_emptyScenes = QHBoxLayout()
-        #     self.w_emptyScenes.setLayout(self.lo_emptyScenes)
-        #     self.l_emptyScenes = QLabel("< no scenefiles to show >")
-        #     self.lo_emptyScenes.addStretch()
-        #     self.lo_emptyScenes.addWidget(self.l_emptyScenes)
-        #     self.lo_emptyScenes.addStretch()
-        #     self.lo_scenefileItems.addWidget(self.w_emptyScenes)
-
-        self.w_sceneItemsStretch = QWidget()
-        self.lo_sceneItemsStretch = QVBoxLayout()
-        self.lo_sceneItemsStretch.setContentsMargins(0, 0, 0, 0)
-        self.w_sceneItemsStretch.setLayout(self.lo_sceneItemsStretch)
-        self.lo_sceneItemsStretch.addStretch()
-        self.lo_scenefileItems.addWidget(self.w_sceneItemsStretch)
-        policy = QSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
-        policy.setVerticalStretch(10)
-        self.w_sceneItemsStretch.setSizePolicy(policy)
+        if reloadFiles:
+            self.refreshWatchedFolders()
 
     @err_catcher(name=__name__)
-    def clearScenefileItems(self):
-        self.sceneItemWidgets = []
-        for idx in reversed(range(self.lo_scenefileItems.count())):
-            item = self.lo_scenefileItems.takeAt(idx)
-            w = item.widget()
-            if w:
-                w.setVisible(False)
-                w.setParent(None)
-                w.deleteLater()
+    def onScenefileDataLoaded(self, sceneData):
+        self.scenefileData = self.addScenefileIcons(sceneData)
+        self.refreshScenefiles(reloadFiles=False, restoreSelection=True)
 
     @err_catcher(name=__name__)
-    def addScenefileItem(self, data):
-        item = ScenefileItem(self, data)
-        item.signalSelect.connect(self.itemSelected)
-        item.signalReleased.connect(self.itemReleased)
-        self.sceneItemWidgets.append(item)
-        self.lo_scenefileItems.addWidget(item)
+    def refreshWatchedFolders(self):
+        folders = []
+        curEntity = self.getCurrentEntity()
+        curDep = self.getCurrentDepartment()
+        curTask = self.getCurrentTask()
+        if curEntity and curEntity.get("type") in ["asset", "shot"] and curDep:
+            context = curEntity.copy()
+            context["department"] = curDep
+            depPath = self.core.getEntityPath(entity=curEntity, step=curDep)
+            folders.append({"path": depPath, "type": "entity", "context": context})
+            if curTask:
+                context = context.copy()
+                context["task"] = curTask
+                taskPath = self.core.getEntityPath(entity=curEntity, step=curDep, category=curTask)
+                folders.append({"path": taskPath, "type": "task", "context": context})
+
+        self.core.watcher.setWatchedFolders(self, folders)
+
+    @err_catcher(name=__name__)
+    def onWatchedFolderChanged(self, event):
+        if not self.core.watcher.isWatchedBy(self, event["path"]):
+            return
 
-    @err_catcher(name=__name__)
-    def itemSelected(self, item):
-        if not item.isSelected():
-            self.deselectItems(ignore=[item])
+        if not self.isVisible():
+            self.refreshStatus = "invalid"
+            return
+
+        if event["type"] == "task":
+            self.refreshScenefiles(restoreSelection=True, background=True)
+        elif event["type"] == "entity" and event["added"] + event["removed"]:
+            self.refreshTasks(restoreSelection=True)
 
     @err_catcher(name=__name__)
-    def itemReleased(self, item):
-        self.deselectItems(ignore=[item])
+    def refreshScenefileItems(self, sceneData):
+        self.previewLoader.clearRequests()
+        sceneData = sorted(sceneData, key=lambda x: x.get("version", ""), reverse=True)
+        self.scenefileModel.setScenefiles(sceneData)
 
     @err_catcher(name=__name__)
-    def deselectItems(self, ignore=None):
-        for item in self.sceneItemWidgets:
-            if ignore and item in ignore:
-                continue
+    def clearScenefileItems(self):
+        self.previewLoader.clearRequests()
+        self.scenefileModel.setScenefiles([])
 
-            item.deselect()
+    @err_catcher(name=__name__)
+    def deselectItems(self):
+        self.lv_scenefileItems.clearSelection()
+        self.lv_scenefileItems.setCurrentIndex(QModelIndex())
 
     @err_catcher(name=__name__)
     def getSelectedScenefile(self):
         filepath = ""
         if self.b_sceneLayoutItems.isChecked():
-            for item in self.sceneItemWidgets:
-                if item.isSelected():
-                    filepath = item.data["filename"]
+            indexes = self.lv_scenefileItems.selectionModel().selectedIndexes()
+            if indexes:
+                filepath = indexes[0].data(Qt.UserRole)["filename"]
 
         elif self.b_sceneLayoutList.isChecked():
             idxs = self.tw_scenefiles.selectedIndexes()
@@ -1659,7 +1709,7 @@ class SceneBrowser(QWidget, SceneBrowser_ui.Ui_w_sceneBrowser):
 
     @err_catcher(name=__name__)
     def taskChanged(self, current=None, prev=None):
-        self.refreshScenefiles(restoreSelection=True)
+        self.refreshScenefiles(restoreSelection=True, background=True)
 
     @err_catcher(name=__name__)
     def refreshEntityInfo(self):
@@ -1935,6 +1985,114 @@ class SceneBrowser(QWidget, SceneBrowser_ui.Ui_w_sceneBrowser):
         if self.core.getConfig("browser", "showEntityPreviews", config="user"):
             self.refreshUI()
 
+    @err_catcher(name=__name__)
+    def openScenePreviewContextMenu(self, data):
+        rcmenu = QMenu(self)
+
+        copAct = QAction("Capture preview", self)
+        copAct.triggered.connect(lambda: self.captureScenePreview(data))
+
+        exp = QAction("Browse preview...", self)
+        exp.triggered.connect(lambda: self.browseScenePreview(data))
+        rcmenu.addAction(exp)
+
+        rcmenu.addAction(copAct)
+        clipAct = QAction("Paste preview from clipboard", self)
+        clipAct.triggered.connect(
+            lambda: self.pasteScenePreviewFromClipboard(data)
+        )
+        rcmenu.addAction(clipAct)
+
+        prvAct = QAction("Set as %spreview" % data.get("type", ""), self)
+        prvAct.triggered.connect(lambda: self.setEntityPreviewFromScenefile(data))
+        rcmenu.addAction(prvAct)
+        rcmenu.exec_(QCursor.pos())
+
+    @err_catcher(name=__name__)
+    def getScenePreviewImage(self, data):
+        if data.get("preview", ""):
+            pixmap = self.core.media.getPixmapFromPath(data.get("preview", ""))
+        else:
+            pixmap = QPixmap(300, 169)
+            pixmap.fill(Qt.black)
+
+        return pixmap
+
+    @err_catcher(name=__name__)
+    def setEntityPreviewFromScenefile(self, data):
+        pm = self.getScenePreviewImage(data)
+        self.core.entities.setEntityPreview(data, pm)
+        self.refreshEntityInfo()
+
+    @err_catcher(name=__name__)
+    def browseScenePreview(self, data):
+        formats = "Image File (*.jpg *.png *.exr)"
+
+        imgPath = QFileDialog.getOpenFileName(
+            self, "Select preview-image", self.core.projectPath, formats
+        )[0]
+
+        if not imgPath:
+            return
+
+        previewSize = [self.core.scenePreviewWidth, self.core.scenePreviewHeight]
+        if os.path.splitext(imgPath)[1] == ".exr":
+            pmsmall = self.core.media.getPixmapFromExrPath(
+                imgPath, width=previewSize[0], height=previewSize[1]
+            )
+        else:
+            pm = self.core.media.getPixmapFromPath(imgPath)
+            if pm.width() == 0:
+                warnStr = "Cannot read image: %s" % imgPath
+                self.core.popup(warnStr)
+                return
+
+            pmsmall = self.core.media.scalePixmap(
+                pm, previewSize[0], previewSize[1], fitIntoBounds=False, crop=True
+            )
+
+        self.core.entities.setScenePreview(data["filename"], pmsmall)
+        self.refreshScenefilePreview(data)
+
+    @err_catcher(name=__name__)
+    def captureScenePreview(self, data):
+        from PrismUtils import ScreenShot
+        self.window().setWindowOpacity(0)
+        previewImg = ScreenShot.grabScreenArea(self.core)
+        self.window().setWindowOpacity(1)
+        if previewImg:
+            previewImg = self.core.media.scalePixmap(
+                previewImg,
+                self.core.scenePreviewWidth,
+                self.core.scenePreviewHeight,
+                fitIntoBounds=False, crop=True
+            )
+            self.core.entities.setScenePreview(data["filename"], previewImg)
+            self.refreshScenefilePreview(data)
+
+    @err_catcher(name=__name__)
+    def pasteScenePreviewFromClipboard(self, data):
+        pmap = self.core.media.getPixmapFromClipboard()
+        if not pmap:
+            self.core.popup("No image in clipboard.")
+            return
+
+        pmap = self.core.media.scalePixmap(
+            pmap, self.core.scenePreviewWidth, self.core.scenePreviewHeight, fitIntoBounds=False, crop=True
+        )
+        self.core.entities.setScenePreview(data["filename"], pmap)
+        self.refreshScenefilePreview(data)
+
+    @err_catcher(name=__name__)
+    def refreshScenefilePreview(self, data):
+        data.update(self.core.entities.getScenefileData(
+            data["filename"], preview=True
+        ))
+        if data.get("preview"):
+            data["previewModtime"] = os.path.getmtime(data["preview"])
+
+        self.scenefileModel.updateScenefile(data)
+
     @err_catcher(name=__name__)
     def editEntity(self):
         entity = self.getCurrentEntity()
@@ -2297,9 +2455,9 @@ class SceneBrowser(QWidget, SceneBrowser_ui.Ui_w_sceneBrowser):
                         "QTableView { border-style: dashed; border-color: rgb(100, 200, 100);  border-width: 2px; }"
                     )
             elif self.b_sceneLayoutItems.isChecked():
-                if not self.w_scenefileItems.styleSheet():
-                    self.w_scenefileItems.setStyleSheet(
-                        "QWidget#itemview { border-style: dashed; border-color: rgb(100, 200, 100);  border-width: 2px; }"
+                if not self.lv_scenefileItems.styleSheet():
+                    self.lv_scenefileItems.setStyleSheet(
+                        "QListView#itemview { border-style: dashed; border-color: rgb(100, 200, 100);  border-width: 2px; }"
                     )
 
         else:
@@ -2310,7 +2468,7 @@ class SceneBrowser(QWidget, SceneBrowser_ui.Ui_w_sceneBrowser):
         if self.b_sceneLayoutList.isChecked():
             self.tw_scenefiles.setStyleSheet("")
         elif self.b_sceneLayoutItems.isChecked():
-            self.w_scenefileItems.setStyleSheet("")
+            self.lv_scenefileItems.setStyleSheet("")
 
     @err_catcher(name=__name__)
     def sceneDropEvent(self, e):
@@ -2318,7 +2476,7 @@ class SceneBrowser(QWidget, SceneBrowser_ui.Ui_w_sceneBrowser):
             if self.b_sceneLayoutList.isChecked():
                 self.tw_scenefiles.setStyleSheet("")
             elif self.b_sceneLayoutItems.isChecked():
-                self.w_scenefileItems.setStyleSheet("")
+                self.lv_scenefileItems.setStyleSheet("")
 
             e.setDropAction(Qt.LinkAction)
             e.accept()
@@ -2452,452 +2610,333 @@ class IngestSettings(QDialog):
             self.close()
 
 
-class ScenefileItem(QWidget):
+class ScenePreviewLoader(QObject):
+    imageLoaded = Signal(object)
+    previewReady = Signal(object)
 
-    signalSelect = Signal(object)
-    signalReleased = Signal(object)
+    def __init__(self, core, width=120, height=69, maxEntries=300):
+        super(ScenePreviewLoader, self).__init__()
+        self.core = core
+        self.width = width
+        self.height = height
+        self.maxEntries = maxEntries
+        self.maxWorkers = 2
+        self.executor = None
+        self.cache = OrderedDict()
+        self.queue = []
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.imageLoaded.connect(self.onImageLoaded)
 
-    def __init__(self, browser, data):
-        super(ScenefileItem, self).__init__()
-        self.core = browser.core
-        self.browser = browser
-        self.data = data
-        self.state = "deselected"
-        self.previewSize = [self.core.scenePreviewWidth, self.core.scenePreviewHeight]
-        self.itemPreviewWidth = 120
-        self.itemPreviewHeight = 69
-        self.setupUi()
-        self.refreshUi()
+    @err_catcher(name=__name__)
+    def getExecutor(self):
+        if not self.executor:
+            self.executor = ThreadPoolExecutor(max_workers=self.maxWorkers)
 
-    def mouseReleaseEvent(self, event):
-        super(ScenefileItem, self).mouseReleaseEvent(event)
-        self.signalReleased.emit(self)
-        event.accept()
+        return self.executor
 
     @err_catcher(name=__name__)
-    def setupUi(self):
-        self.setObjectName("texture")
-        self.applyStyle(self.state)
-        self.setAttribute(Qt.WA_StyledBackground, True)
-        self.lo_main = QHBoxLayout()
-        self.setLayout(self.lo_main)
-        self.lo_main.setSpacing(15)
-        self.lo_main.setContentsMargins(0, 0, 0, 0)
-
-        self.l_preview = QLabel()
-        self.l_preview.setMinimumWidth(self.itemPreviewWidth)
-        self.l_preview.setMinimumHeight(self.itemPreviewHeight)
-        self.l_preview.setMaximumWidth(self.itemPreviewWidth)
-        self.l_preview.setMaximumHeight(self.itemPreviewHeight)
-        self.spacer1 = QSpacerItem(0, 10, QSizePolicy.Fixed, QSizePolicy.Fixed)
-
-        self.l_version = QLabel()
-        # self.l_version.setWordWrap(True)
-        font = self.l_version.font()
-        font.setBold(True)
-        self.l_version.setStyleSheet("font-size: 8pt;")
-        self.l_version.setFont(font)
+    def getPreview(self, path, modtime=None):
+        key = (path, modtime)
+        if key in self.cache:
+            pixmap = self.cache.pop(key)
+            self.cache[key] = pixmap
+            return pixmap
 
-        self.spacer2 = QSpacerItem(0, 10, QSizePolicy.Fixed, QSizePolicy.Fixed)
-        self.lo_info = QVBoxLayout()
-        self.lo_info.setSpacing(0)
-        self.l_icon = QLabel()
+        self.requestPreview(key)
 
-        self.lo_description = QVBoxLayout()
-        self.l_comment = QLabel()
-        self.l_description = QLabel()
+    @err_catcher(name=__name__)
+    def requestPreview(self, key):
+        with self.lock:
+            if key in self.pending:
+                return
 
-        self.lo_user = QVBoxLayout()
-        path = os.path.join(self.core.prismRoot, "Scripts", "UserInterfacesPrism", "user.png")
-        icon = self.core.media.getColoredIcon(path)
-        self.w_user = QWidget()
-        self.lo_userIcon = QHBoxLayout(self.w_user)
-        self.lo_userIcon.setContentsMargins(0, 0, 0, 0)
-        self.l_userIcon = QLabel()
-        self.l_userIcon.setPixmap(icon.pixmap(15, 15))
-        self.l_user = QLabel()
-        self.l_user.setAlignment(Qt.AlignRight)
-        self.lo_userIcon.addStretch()
-        self.lo_userIcon.addWidget(self.l_userIcon)
-        self.lo_userIcon.addWidget(self.l_user)
+            self.pending.add(key)
+            self.queue.append(key)
 
-        path = os.path.join(self.core.prismRoot, "Scripts", "UserInterfacesPrism", "date.png")
-        icon = self.core.media.getColoredIcon(path)
-        self.w_date = QWidget()
-        self.lo_dateIcon = QHBoxLayout(self.w_date)
-        self.lo_dateIcon.setContentsMargins(0, 0, 0, 0)
-        self.l_dateIcon = QLabel()
-        self.l_dateIcon.setPixmap(icon.pixmap(15, 15))
-        self.l_date = QLabel()
-        self.l_date.setAlignment(Qt.AlignRight)
-        self.lo_dateIcon.addStretch()
-        self.lo_dateIcon.addWidget(self.l_dateIcon)
-        self.lo_dateIcon.addWidget(self.l_date)
-
-        self.spacer3 = QSpacerItem(0, 10, QSizePolicy.Fixed, QSizePolicy.Fixed)
-        self.spacer4 = QSpacerItem(15, 0, QSizePolicy.Fixed, QSizePolicy.Fixed)
-        self.spacer5 = QSpacerItem(0, 10, QSizePolicy.Fixed, QSizePolicy.Fixed)
-        self.spacer6 = QSpacerItem(0, 10, QSizePolicy.Fixed, QSizePolicy.Fixed)
-        self.spacer7 = QSpacerItem(20, 10, QSizePolicy.Fixed, QSizePolicy.Fixed)
-
-        self.lo_info.addItem(self.spacer1)
-        self.lo_info.addWidget(self.l_version)
-        self.lo_info.addItem(self.spacer2)
-        self.lo_info.addWidget(self.l_icon)
-        self.lo_info.addStretch()
-
-        self.lo_description.addItem(self.spacer3)
-        self.lo_description.addWidget(self.l_comment)
-        self.lo_description.addWidget(self.l_description)
-        self.lo_description.addStretch()
-
-        self.lo_user.addItem(self.spacer5)
-        self.lo_user.addWidget(self.w_user)
-        self.lo_user.addStretch()
-        self.lo_user.addWidget(self.w_date)
-        self.lo_user.addItem(self.spacer6)
-
-        self.lo_main.addWidget(self.l_preview)
-        self.lo_main.addLayout(self.lo_info)
-        self.lo_main.addItem(self.spacer7)
-        self.lo_main.addLayout(self.lo_description)
-        self.lo_main.addStretch()
-        self.locationLabels = {}
-        if len(self.browser.projectBrowser.locations) > 1:
-            self.spacer7 = QSpacerItem(0, 10, QSizePolicy.Fixed, QSizePolicy.Fixed)
-            self.spacer8 = QSpacerItem(0, 10, QSizePolicy.Fixed, QSizePolicy.Fixed)
-            self.lo_location = QVBoxLayout()
-            self.lo_location.addItem(self.spacer7)
-
-            for location in self.browser.projectBrowser.locations:
-                l_loc = QLabel()
-                l_loc.setToolTip("Version exists in %s" % location["name"])
-                self.locationLabels[location["name"]] = l_loc
-                if "icon" not in location:
-                    location["icon"] = self.browser.projectBrowser.getLocationIcon(location["name"])
+        self.getExecutor().submit(self.loadNextPreview)
 
-                if location["icon"]:
-                    l_loc.setPixmap(location["icon"].pixmap(18, 18))
-                else:
-                    l_loc.setText(location["name"])
-                
-                self.lo_location.addWidget(l_loc)
-
-            self.lo_location.addItem(self.spacer8)
-            self.lo_main.addLayout(self.lo_location)
-
-        self.lo_main.addLayout(self.lo_user)
-        self.lo_main.addItem(self.spacer4)
-
-        self.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.customContextMenuRequested.connect(self.rightClicked)
-        self.l_preview.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.l_preview.customContextMenuRequested.connect(self.previewRightClicked)
-
-    @err_catcher(name=__name__)
-    def refreshUi(self):
-        version = self.getVersion()
-        descr = self.getDescription()
-        comment = self.getComment()
-        date = self.getDate()
-        user = self.getUser()
-        icon = self.getIcon()
-
-        self.refreshPreview()
-        self.l_version.setText(version)
-        self.setIcon(icon)
-        self.l_comment.setText(comment)
-        self.l_description.setText(descr)
-        self.l_date.setText(date)
-        self.l_user.setText(user)
+    @err_catcher(name=__name__)
+    def clearRequests(self):
+        with self.lock:
+            for key in self.queue:
+                self.pending.discard(key)
 
-        if len(self.browser.projectBrowser.locations) > 1:
-            for loc in self.locationLabels:
-                self.locationLabels[loc].setHidden(True)
+            self.queue = []
 
-            for loc in self.browser.projectBrowser.locations:
-                if loc.get("name") == "global" and self.data.get("public"):
-                    self.locationLabels["global"].setHidden(False)
+    def loadNextPreview(self):
+        # the newest request is loaded first, so previews of the rows which
+        # are currently visible don't wait for rows which were scrolled past
+        with self.lock:
+            if not self.queue:
+                return
 
-                elif loc.get("name") == "local" and self.core.useLocalFiles:
-                    localPath = self.core.convertPath(self.data["filename"], "local")
-                    if os.path.exists(localPath):
-                        self.locationLabels["local"].setHidden(False)
+            key = self.queue.pop()
 
-                elif loc.get("name") in self.data.get("locations", []):
-                    self.locationLabels[loc["name"]].setHidden(False)
+        image = QImage(key[0])
+        if not image.isNull():
+            image = image.scaled(
+                self.width,
+                self.height,
+                Qt.KeepAspectRatioByExpanding,
+                Qt.SmoothTransformation,
+            )
+            image = image.copy(
+                int((image.width() - self.width) / 2),
+                int((image.height() - self.height) / 2),
+                self.width,
+                self.height,
+            )
 
-    @err_catcher(name=__name__)
-    def setIcon(self, icon):
-        self.l_icon.setToolTip(os.path.basename(self.data["filename"]))
-        if isinstance(icon, QIcon):
-            self.l_icon.setPixmap(icon.pixmap(24, 24))
-        else:
-            pmap = QPixmap(20, 20)
-            pmap.fill(Qt.transparent)
-            painter = QPainter(pmap)
-            painter.setPen(Qt.NoPen)
-            painter.setBrush(icon)
-            painter.drawEllipse(0, 0, 10, 10)
-            painter.setRenderHint(QPainter.Antialiasing, True)
-            painter.end()
-            self.l_icon.setPixmap(pmap)
+        self.imageLoaded.emit({"key": key, "image": image})
 
     @err_catcher(name=__name__)
-    def refreshPreview(self):
-        ppixmap = self.getPreviewImage()
-        ppixmap = self.core.media.scalePixmap(
-            ppixmap, self.itemPreviewWidth, self.itemPreviewHeight, fitIntoBounds=False, crop=True
-        )
-        self.l_preview.setPixmap(ppixmap)
+    def onImageLoaded(self, data):
+        key = data["key"]
+        with self.lock:
+            self.pending.discard(key)
 
-    @err_catcher(name=__name__)
-    def getPreviewImage(self):
-        if self.data.get("preview", ""):
-            pixmap = self.core.media.getPixmapFromPath(self.data.get("preview", ""))
-        else:
-            pixmap = QPixmap(300, 169)
-            pixmap.fill(Qt.black)
+        pixmap = None
+        if not data["image"].isNull():
+            pixmap = QPixmap.fromImage(data["image"])
 
-        return pixmap
+        self.cache[key] = pixmap
+        while len(self.cache) > self.maxEntries:
+            self.cache.popitem(last=False)
 
-    @err_catcher(name=__name__)
-    def getVersion(self):
-        version = self.data.get("version", "")
-        return version
+        self.previewReady.emit(key[0])
 
-    @err_catcher(name=__name__)
-    def getComment(self):
-        comment = self.data.get("comment", "")
-        return comment
 
-    @err_catcher(name=__name__)
-    def getDescription(self):
-        description = self.data.get("description", "")
-        return description
+class ScenefileModel(QAbstractListModel):
+    def __init__(self, browser):
+        super(ScenefileModel, self).__init__()
+        self.browser = browser
+        self.core = browser.core
+        self.scenefiles = []
+        self.rowInfo = {}
 
-    @err_catcher(name=__name__)
-    def getDate(self):
-        date = self.data.get("date")
-        dateStr = self.core.getFormattedDate(date) if date else ""
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
 
-        if self.browser.projectBrowser.act_filesizes.isChecked():
-            if "size" in self.data:
-                size = self.data["size"]
-            elif os.path.exists(self.data["filename"]):
-                size = float(os.stat(self.data["filename"]).st_size / 1024.0 / 1024.0)
-            else:
-                size = 0
+        return len(self.scenefiles)
 
-            dateStr += " - %.2f mb" % size
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.scenefiles):
+            return
 
-        return dateStr
+        data = self.scenefiles[index.row()]
+        if role == Qt.DisplayRole:
+            return data.get("version", "")
+        elif role == Qt.ToolTipRole:
+            return os.path.basename(data["filename"])
+        elif role == Qt.UserRole:
+            return data
 
     @err_catcher(name=__name__)
-    def getUser(self):
-        user = self.data.get("username", "")
-        if user:
-            return user
-
-        user = self.data.get("user", "")
-        return user
+    def setScenefiles(self, scenefiles):
+        self.beginResetModel()
+        self.scenefiles = scenefiles
+        self.rowInfo = {}
+        self.endResetModel()
 
     @err_catcher(name=__name__)
-    def getIcon(self):
-        if self.data.get("icon", ""):
-            return self.data["icon"]
-        else:
-            return self.data["color"]
+    def getIndexFromPath(self, paths):
+        paths = [os.path.normpath(path) for path in paths]
+        for row, data in enumerate(self.scenefiles):
+            if os.path.normpath(data["filename"]) in paths:
+                return self.index(row, 0)
 
-    @err_catcher(name=__name__)
-    def applyStyle(self, styleType):
-        borderColor = (
-            "rgb(70, 90, 120)" if self.state == "selected" else "rgb(70, 90, 120)"
-        )
-        ssheet = (
-            """
-            QWidget#texture {
-                border: 1px solid %s;
-                border-radius: 10px;
-            }
-        """
-            % borderColor
-        )
-        if styleType == "deselected":
-            pass
-        elif styleType == "selected":
-            ssheet = """
-                QWidget#texture {
-                    border: 1px solid rgb(70, 90, 120);
-                    background-color: rgba(255, 255, 255, 30);
-                    border-radius: 10px;
-                }
-                QWidget {
-                    background-color: rgba(255, 255, 255, 0);
-                }
-
-            """
-        elif styleType == "hoverSelected":
-            ssheet = """
-                QWidget#texture {
-                    border: 1px solid rgb(70, 90, 120);
-                    background-color: rgba(255, 255, 255, 35);
-                    border-radius: 10px;
-                }
-                QWidget {
-                    background-color: rgba(255, 255, 255, 0);
-                }
-
-            """
-        elif styleType == "hover":
-            ssheet += """
-                QWidget {
-                    background-color: rgba(255, 255, 255, 0);
-                }
-                QWidget#texture {
-                    background-color: rgba(255, 255, 255, 20);
-                }
-            """
-
-        self.setStyleSheet(ssheet)
-
-    @err_catcher(name=__name__)
-    def mousePressEvent(self, event):
-        self.select()
-
-    @err_catcher(name=__name__)
-    def enterEvent(self, event):
-        if self.isSelected():
-            self.applyStyle("hoverSelected")
-        else:
-            self.applyStyle("hover")
+        return QModelIndex()
 
     @err_catcher(name=__name__)
-    def leaveEvent(self, event):
-        self.applyStyle(self.state)
+    def updateScenefile(self, data):
+        for row, rowData in enumerate(self.scenefiles):
+            if rowData is data:
+                self.rowInfo.pop(row, None)
+                idx = self.index(row, 0)
+                self.dataChanged.emit(idx, idx)
 
     @err_catcher(name=__name__)
-    def mouseDoubleClickEvent(self, event):
-        self.browser.exeFile(self.data["filename"])
+    def onPreviewReady(self, path):
+        for row, data in enumerate(self.scenefiles):
+            if data.get("preview") == path:
+                idx = self.index(row, 0)
+                self.dataChanged.emit(idx, idx)
 
     @err_catcher(name=__name__)
-    def select(self):
-        wasSelected = self.isSelected()
-        self.signalSelect.emit(self)
-        if not wasSelected:
-            self.state = "selected"
-            self.applyStyle(self.state)
-            self.setFocus()
+    def getRowInfo(self, row):
+        # values which need disk access are only computed for painted rows
+        if row in self.rowInfo:
+            return self.rowInfo[row]
 
-    @err_catcher(name=__name__)
-    def deselect(self):
-        if self.state != "deselected":
-            self.state = "deselected"
-            self.applyStyle(self.state)
+        data = self.scenefiles[row]
+        date = data.get("date")
+        dateStr = self.core.getFormattedDate(date) if date else ""
+        if self.browser.projectBrowser.act_filesizes.isChecked():
+            if "size" in data:
+                size = data["size"]
+            elif os.path.exists(data["filename"]):
+                size = float(os.stat(data["filename"]).st_size / 1024.0 / 1024.0)
+            else:
+                size = 0
 
-    @err_catcher(name=__name__)
-    def isSelected(self):
-        return self.state == "selected"
+            dateStr += " - %.2f mb" % size
 
-    @err_catcher(name=__name__)
-    def rightClicked(self, pos):
-        self.browser.openScenefileContextMenu(self.data["filename"])
+        locations = []
+        if len(self.browser.projectBrowser.locations) > 1:
+            for loc in self.browser.projectBrowser.locations:
+                if loc.get("name") == "global" and data.get("public"):
+                    locations.append(loc)
 
-    @err_catcher(name=__name__)
-    def previewRightClicked(self, pos):
-        rcmenu = QMenu(self.browser)
+                elif loc.get("name") == "local" and self.core.useLocalFiles:
+                    localPath = self.core.convertPath(data["filename"], "local")
+                    if os.path.exists(localPath):
+                        locations.append(loc)
 
-        copAct = QAction("Capture preview", self.browser)
-        copAct.triggered.connect(lambda: self.captureScenePreview(self.data))
+                elif loc.get("name") in data.get("locations", []):
+                    locations.append(loc)
 
-        exp = QAction("Browse preview...", self.browser)
-        exp.triggered.connect(self.browseScenePreview)
-        rcmenu.addAction(exp)
+        self.rowInfo[row] = {
+            "date": dateStr,
+            "user": data.get("username", "") or data.get("user", ""),
+            "locations": locations,
+        }
+        return self.rowInfo[row]
 
-        rcmenu.addAction(copAct)
-        clipAct = QAction("Paste preview from clipboard", self.browser)
-        clipAct.triggered.connect(
-            lambda: self.pasteScenePreviewFromClipboard(self.data)
-        )
-        rcmenu.addAction(clipAct)
 
-        prvAct = QAction("Set as %spreview" % self.data.get("type", ""), self)
-        prvAct.triggered.connect(self.setPreview)
-        rcmenu.addAction(prvAct)
-        rcmenu.exec_(QCursor.pos())
+class ScenefileDelegate(QStyledItemDelegate):
+    def __init__(self, browser):
+        super(ScenefileDelegate, self).__init__()
+        self.browser = browser
+        self.core = browser.core
+        self.itemHeight = 77
+        self.previewWidth = 120
+        self.previewHeight = 69
+        self.infoWidth = 90
+        self.userWidth = 160
 
-    @err_catcher(name=__name__)
-    def setPreview(self):
-        pm = self.getPreviewImage()
-        self.core.entities.setEntityPreview(self.data, pm)
-        self.browser.refreshEntityInfo()
+        path = os.path.join(self.core.prismRoot, "Scripts", "UserInterfacesPrism", "user.png")
+        self.userPixmap = self.core.media.getColoredIcon(path).pixmap(15, 15)
+        path = os.path.join(self.core.prismRoot, "Scripts", "UserInterfacesPrism", "date.png")
+        self.datePixmap = self.core.media.getColoredIcon(path).pixmap(15, 15)
+        self.emptyPreview = QPixmap(self.previewWidth, self.previewHeight)
+        self.emptyPreview.fill(Qt.black)
 
-    @err_catcher(name=__name__)
-    def browseScenePreview(self):
-        formats = "Image File (*.jpg *.png *.exr)"
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.itemHeight)
 
-        imgPath = QFileDialog.getOpenFileName(
-            self, "Select preview-image", self.core.projectPath, formats
-        )[0]
+    def getItemRect(self, rect):
+        return rect.adjusted(2, 2, -2, -2)
 
-        if not imgPath:
+    def getPreviewRect(self, rect):
+        rect = self.getItemRect(rect)
+        top = rect.y() + int((rect.height() - self.previewHeight) / 2)
+        return QRect(rect.x() + 1, top, self.previewWidth, self.previewHeight)
+
+    def paint(self, painter, option, index):
+        data = index.data(Qt.UserRole)
+        if not data:
             return
 
-        if os.path.splitext(imgPath)[1] == ".exr":
-            pmsmall = self.core.media.getPixmapFromExrPath(
-                imgPath, width=self.previewSize[0], height=self.previewSize[1]
-            )
+        rowInfo = index.model().getRowInfo(index.row())
+        selected = bool(option.state & QStyle.State_Selected)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        rect = self.getItemRect(option.rect)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        if selected:
+            background = QColor(255, 255, 255, 35 if hovered else 30)
+        elif hovered:
+            background = QColor(255, 255, 255, 20)
         else:
-            pm = self.core.media.getPixmapFromPath(imgPath)
-            if pm.width() == 0:
-                warnStr = "Cannot read image: %s" % imgPath
-                self.core.popup(warnStr)
-                return
+            background = QColor(0, 0, 0, 0)
 
-            pmsmall = self.core.media.scalePixmap(
-                pm, self.previewSize[0], self.previewSize[1], fitIntoBounds=False, crop=True
+        painter.setPen(QColor(70, 90, 120))
+        painter.setBrush(background)
+        painter.drawRoundedRect(rect, 10, 10)
+
+        previewRect = self.getPreviewRect(option.rect)
+        pixmap = None
+        if data.get("preview"):
+            pixmap = self.browser.previewLoader.getPreview(
+                data["preview"], data.get("previewModtime")
             )
 
-        self.core.entities.setScenePreview(self.data["filename"], pmsmall)
-        self.data.update(self.core.entities.getScenefileData(
-            self.data["filename"], preview=True
-        ))
-        self.refreshPreview()
+        painter.drawPixmap(previewRect, pixmap or self.emptyPreview)
 
-    @err_catcher(name=__name__)
-    def captureScenePreview(self, entity):
-        from PrismUtils import ScreenShot
-        self.window().setWindowOpacity(0)
-        previewImg = ScreenShot.grabScreenArea(self.core)
-        self.window().setWindowOpacity(1)
-        if previewImg:
-            previewImg = self.core.media.scalePixmap(
-                previewImg,
-                self.previewSize[0],
-                self.previewSize[1],
-                fitIntoBounds=False, crop=True
+        textColor = option.palette.color(QPalette.Text)
+        painter.setPen(textColor)
+        font = QFont(option.font)
+        font.setBold(True)
+        font.setPointSize(8)
+        infoX = previewRect.right() + 15
+        versionRect = QRect(infoX, rect.y() + 10, self.infoWidth, 20)
+        painter.setFont(font)
+        painter.drawText(
+            versionRect,
+            Qt.AlignLeft | Qt.AlignVCenter,
+            QFontMetrics(font).elidedText(data.get("version", ""), Qt.ElideRight, self.infoWidth),
+        )
+
+        iconRect = QRect(infoX, versionRect.bottom() + 10, 24, 24)
+        if data.get("icon"):
+            data["icon"].paint(painter, iconRect)
+        elif data.get("color"):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(data["color"])
+            painter.drawEllipse(QRect(iconRect.x(), iconRect.y(), 10, 10))
+            painter.setPen(textColor)
+
+        painter.setFont(option.font)
+        metrics = QFontMetrics(option.font)
+        userX = rect.right() - self.userWidth - 15
+        locations = rowInfo["locations"]
+        if locations:
+            userX -= 30
+
+        descrX = infoX + self.infoWidth + 20
+        descrWidth = max(0, userX - descrX - 10)
+        lineHeight = metrics.height()
+        for idx, text in enumerate([data.get("comment", ""), data.get("description", "")]):
+            lineRect = QRect(descrX, rect.y() + 10 + idx * lineHeight, descrWidth, lineHeight)
+            painter.drawText(
+                lineRect,
+                Qt.AlignLeft | Qt.AlignVCenter,
+                metrics.elidedText(text, Qt.ElideRight, descrWidth),
             )
-            self.core.entities.setScenePreview(self.data["filename"], previewImg)
-            self.data.update(self.core.entities.getScenefileData(
-                self.data["filename"], preview=True
-            ))
-            self.refreshPreview()
 
-    @err_catcher(name=__name__)
-    def pasteScenePreviewFromClipboard(self, pos):
-        pmap = self.core.media.getPixmapFromClipboard()
-        if not pmap:
-            self.core.popup("No image in clipboard.")
-            return
+        if locations:
+            locY = rect.y() + 10
+            for location in locations:
+                if "icon" not in location:
+                    location["icon"] = self.browser.projectBrowser.getLocationIcon(location["name"])
 
-        pmap = self.core.media.scalePixmap(
-            pmap, self.previewSize[0], self.previewSize[1], fitIntoBounds=False, crop=True
+                if location["icon"]:
+                    location["icon"].paint(painter, QRect(userX + self.userWidth + 5, locY, 18, 18))
+                else:
+                    painter.drawText(QPoint(userX + self.userWidth + 5, locY + 14), location["name"])
+
+                locY += 20
+
+        userWidth = self.userWidth - 20
+        userRect = QRect(userX, rect.y() + 10, userWidth, 15)
+        painter.drawText(
+            userRect,
+            Qt.AlignRight | Qt.AlignVCenter,
+            metrics.elidedText(rowInfo["user"], Qt.ElideLeft, userWidth),
         )
-        self.core.entities.setScenePreview(self.data["filename"], pmap)
-        self.data.update(self.core.entities.getScenefileData(
-            self.data["filename"], preview=True
-        ))
-        self.refreshPreview()
+        painter.drawPixmap(userRect.right() + 5, userRect.y(), self.userPixmap)
+
+        dateRect = QRect(userX, rect.bottom() - 25, userWidth, 15)
+        painter.drawText(
+            dateRect,
+            Qt.AlignRight | Qt.AlignVCenter,
+            metrics.elidedText(rowInfo["date"], Qt.ElideLeft, userWidth),
+        )
+        painter.drawPixmap(dateRect.right() + 5, dateRect.y(), self.datePixmap)
+        painter.restore()
 
 
 class DateDelegate(QStyledItemDelegate):
@@ -34,6 +34,7 @@
 
 import os
 import sys
+import json
 import traceback
 import time
 import logging
@@ -61,6 +62,7 @@ if eval(os.getenv("PRISM_DEBUG", "False")):
 
 from PrismUtils import PrismWidgets
 from PrismUtils.Decorators import err_catcher
+from PrismUtils.PublishScheduler import PublishScheduler
 from UserInterfaces import StateManager_ui
 
 
@@ -126,9 +128,18 @@ class StateManager(QMainWindow, StateManager_ui.Ui_mw_StateManager):
         foldercont = ["", "", ""]
 
         self.saveEnabled = True
+        self.saveDelay = int(os.getenv("PRISM_SM_SAVE_DELAY", "300"))
+        self.saveTimer = QTimer(self)
+        self.saveTimer.setSingleShot(True)
+        self.saveTimer.timeout.connect(self.flushStateSave)
+        self.statePropsCache = {}
+        self.stateProps = {}
+        self.savedStateStr = None
         self.loading = False
         self.shotcamFileType = ".abc"
         self.publishPaused = False
+        self.publishScheduler = None
+        self.publishReport = None
         self.entityDlg = EntityDlg
         self.applyChangesToSelection = True
 
@@ -347,6 +358,10 @@ class %s(QWidget, %s.%s, %s.%sClass):
         self.gb_import.setObjectName("list")
         self.gb_export.setObjectName("list")
 
+        self.actionPublishTimings = QAction("Publish timings...", self)
+        self.actionPublishTimings.triggered.connect(self.showPublishTimings)
+        self.menuAbout.addAction(self.actionPublishTimings)
+
         if "Render Settings" in self.stateTypes:
             self.actionRenderSettings = QAction("Rendersettings presets...", self)
             self.actionRenderSettings.triggered.connect(self.showRenderPresets)
@@ -635,7 +650,7 @@ class %s(QWidget, %s.%s, %s.%sClass):
         self.tw_export.itemClicked.connect(
             lambda x, y: self.updateForeground(x, y, self.tw_export)
         )
-        self.tw_export.itemChanged.connect(lambda x, y: self.saveStatesToScene())
+        self.tw_export.itemChanged.connect(lambda x, y: self.saveStatesToScene(x))
         self.tw_export.itemDoubleClicked.connect(self.focusRename)
         self.tw_export.focusOutEvent = self.checkFocusOut
         self.tw_export.keyPressEvent = self.checkKeyPressed
@@ -675,6 +690,7 @@ class %s(QWidget, %s.%s, %s.%sClass):
 
     @err_catcher(name=__name__)
     def closeEvent(self, event):
+        self.flushPendingStateSave()
         self.core.callback(name="onStateManagerClose", args=[self])
         event.accept()
 
@@ -1431,7 +1447,48 @@ QGroupBox::indicator:checked {
         return stateProps
 
     @err_catcher(name=__name__)
-    def saveStatesToScene(self, param=None):
+    def saveStatesToScene(self, param=None, immediate=False, state=None):
+        self.markStateDirty(state or self.getChangedState(param))
+        if not self.saveEnabled:
+            return False
+
+        if self.standalone:
+            return False
+
+        # most UI edits call this, so the saves get coalesced
+        if immediate or self.saveDelay <= 0:
+            return self.flushStateSave()
+
+        self.saveTimer.start(self.saveDelay)
+
+    @err_catcher(name=__name__)
+    def getChangedState(self, param=None):
+        # edits arrive through signals of the state widgets or the state items
+        stateUis = [state.ui for state in self.states]
+        for obj in [param, self.sender()]:
+            if isinstance(obj, QTreeWidgetItem):
+                obj = getattr(obj, "ui", None)
+
+            while isinstance(obj, QObject):
+                if obj in stateUis:
+                    return obj
+
+                obj = obj.parent()
+
+    @err_catcher(name=__name__)
+    def markStateDirty(self, state=None):
+        # the props of clean states are reused when the states get saved.
+        # Without a state all states get dirty.
+        if state is None:
+            self.stateProps = {}
+            self.statePropsCache = {}
+        else:
+            self.stateProps.pop(getattr(state, "uuid", None), None)
+            self.statePropsCache.pop(getattr(state, "uuid", None), None)
+
+    @err_catcher(name=__name__)
+    def flushStateSave(self):
+        self.saveTimer.stop()
         if not self.saveEnabled:
             return False
 
@@ -1440,7 +1497,23 @@ QGroupBox::indicator:checked {
 
         getattr(self.core.appPlugin, "sm_preSaveToScene", lambda x: None)(self)
         stateStr = self.getStateSettings()
+        if stateStr == self.savedStateStr:
+            return
+
         getattr(self.core.appPlugin, "sm_saveStates", lambda x, y: None)(self, stateStr)
+        self.savedStateStr = stateStr
+
+    @err_catcher(name=__name__)
+    def saveAllStatesToScene(self):
+        # states can change without saving themselves, for example when a
+        # node gets renamed in the DCC. All props get read again.
+        self.markStateDirty()
+        return self.flushStateSave()
+
+    @err_catcher(name=__name__)
+    def flushPendingStateSave(self):
+        if self.saveTimer.isActive():
+            return self.flushStateSave()
 
     @err_catcher(name=__name__)
     def getStateSettings(self):
@@ -1478,6 +1551,7 @@ QGroupBox::indicator:checked {
                     continue
 
                 selState.ui.loadData(changes)
+                self.markStateDirty(selState.ui)
 
             self.saveEnabled = True
 
@@ -1489,14 +1563,40 @@ QGroupBox::indicator:checked {
             stateProps["stateparent"] = str(i[1])
             stateProps["stateclass"] = i[0].ui.className
             stateProps["uuid"] = i[0].ui.uuid
-            stateProps.update(i[0].ui.getStateProps())
+            if i[0].ui.uuid not in self.stateProps:
+                self.stateProps[i[0].ui.uuid] = i[0].ui.getStateProps()
+
+            stateProps.update(self.stateProps[i[0].ui.uuid])
             if "statename" not in stateProps and "stateName" not in stateProps:
                 continue
 
             stateData["states"].append(stateProps)
 
         self.prevStateData = stateData
-        stateStr = self.core.configs.writeJson(stateData)
+        stateStr = self.serializeStateData(stateData)
+        return stateStr
+
+    @err_catcher(name=__name__)
+    def serializeStateData(self, stateData):
+        # only dirty states or states with changed props get serialized again.
+        # The result is identical to writeJson(stateData) with an indent of 4.
+        cache = {}
+        fragments = []
+        for props in stateData["states"]:
+            key = props.get("uuid", props.get("statename"))
+            cached = self.statePropsCache.get(key)
+            if cached and cached[0] == props:
+                fragment = cached[1]
+            else:
+                fragment = json.dumps(props, indent=4).replace("\n", "\n        ")
+
+            cache[key] = (props, fragment)
+            fragments.append(fragment)
+
+        self.statePropsCache = cache
+        stateStr = '{\n    "states": [\n        %s\n    ]\n}' % ",\n        ".join(
+            fragments
+        )
         return stateStr
 
     @err_catcher(name=__name__)
@@ -1858,8 +1958,11 @@ QGroupBox::indicator:checked {
                 if result == "Cancel":
                     return
 
+            scheduler = PublishScheduler(self.core)
             if sanityChecks:
-                sanityResult = self.runSantityChecks(executeState)
+                with scheduler.phase("sanityChecks"):
+                    sanityResult = self.runSantityChecks(executeState)
+
                 if not sanityResult:
                     return
 
@@ -1871,20 +1974,21 @@ QGroupBox::indicator:checked {
                 }
 
             if saveScene is None or saveScene is True:
-                if executeState:
-                    increment = False if incrementScene is None else incrementScene
-                    sceneSaved = self.core.saveScene(
-                        versionUp=increment, details=details, preview=self.previewImg
-                    )
-                else:
-                    increment = self.actionVersionUp.isChecked() if incrementScene is None else incrementScene
-                    sceneSaved = self.core.saveScene(
-                        comment=self.e_comment.text(),
-                        publish=True,
-                        versionUp=increment,
-                        details=details,
-                        preview=self.previewImg,
-                    )
+                with scheduler.phase("saveScene"):
+                    if executeState:
+                        increment = False if incrementScene is None else incrementScene
+                        sceneSaved = self.core.saveScene(
+                            versionUp=increment, details=details, preview=self.previewImg
+                        )
+                    else:
+                        increment = self.actionVersionUp.isChecked() if incrementScene is None else incrementScene
+                        sceneSaved = self.core.saveScene(
+                            comment=self.e_comment.text(),
+                            publish=True,
+                            versionUp=increment,
+                            details=details,
+                            preview=self.previewImg,
+                        )
 
                 if not sceneSaved:
                     logger.debug(actionString + " canceled")
@@ -1895,7 +1999,7 @@ QGroupBox::indicator:checked {
             self.previewImg = None
             self.b_description.setStyleSheet(self.styleMissing)
             self.b_preview.setStyleSheet(self.styleMissing)
-            self.saveStatesToScene()
+            self.saveStatesToScene(immediate=True)
 
             self.publishResult = []
             self.dependencies = []
@@ -1904,10 +2008,14 @@ QGroupBox::indicator:checked {
             self.core.sceneOpenChecksEnabled = False
             self.publishComment = self.e_comment.text()
 
-            getattr(self.core.appPlugin, "sm_preExecute", lambda x: None)(self)
+            self.publishScheduler = scheduler
+            with scheduler.phase("preExecute"):
+                getattr(self.core.appPlugin, "sm_preExecute", lambda x: None)(self)
+
             result = self.core.callback(name="prePublish", args=[self])
             for res in result:
                 if isinstance(res, dict) and res.get("cancel", False):
+                    self.publishScheduler = None
                     return
 
         if executeState:
@@ -1918,12 +2026,7 @@ QGroupBox::indicator:checked {
                     self.pubMsg = self.core.waitPopup(self.core, text)
                     with self.pubMsg:
                         self.curExecutedState = curUi
-                        if getattr(curUi, "canSetVersion", False):
-                            result = curUi.executeState(
-                                parent=self, useVersion=useVersion
-                            )
-                        else:
-                            result = curUi.executeState(parent=self)
+                        result = self.executePublishState(curUi, useVersion=useVersion)
 
                         self.curExecutedState = None
                         if curUi.className == "Folder":
@@ -1951,7 +2054,7 @@ QGroupBox::indicator:checked {
                     self.pubMsg = self.core.waitPopup(self.core, text)
                     with self.pubMsg:
                         self.curExecutedState = curUi
-                        exResult = curUi.executeState(parent=self)
+                        exResult = self.executePublishState(curUi)
                         self.curExecutedState = None
                         if curUi.className == "Folder":
                             self.publishResult += exResult
@@ -1969,7 +2072,13 @@ QGroupBox::indicator:checked {
                                 self.publishPaused = True
                                 return
 
-        getattr(self.core.appPlugin, "sm_postExecute", lambda x: None)(self)
+        self.finishPublishTasks()
+        if self.publishScheduler:
+            with self.publishScheduler.phase("postExecute"):
+                getattr(self.core.appPlugin, "sm_postExecute", lambda x: None)(self)
+        else:
+            getattr(self.core.appPlugin, "sm_postExecute", lambda x: None)(self)
+
         pubType = "stateExecution" if executeState else "publish"
         self.core.callback(
             name="postPublish", args=[self, pubType], **{"result": self.publishResult}
@@ -1984,6 +2093,7 @@ QGroupBox::indicator:checked {
             if "error" in i["result"][0]:
                 success = False
 
+        self.savePublishTimings(pubType, success)
         try:
             self.core.pb.refreshUI()
         except:
@@ -2018,6 +2128,94 @@ QGroupBox::indicator:checked {
 
         return result
 
+    @err_catcher(name=__name__)
+    def executePublishState(self, stateUi, parent=None, useVersion=None):
+        kwargs = {"parent": parent or self}
+        if useVersion is not None and getattr(stateUi, "canSetVersion", False):
+            kwargs["useVersion"] = useVersion
+
+        if not self.publishScheduler:
+            return stateUi.executeState(**kwargs)
+
+        return self.publishScheduler.executeState(stateUi, stateUi.executeState, **kwargs)
+
+    @err_catcher(name=__name__)
+    def runPublishTask(
+        self, func, args=None, kwargs=None, name=None, state=None, inputs=None, outputs=None
+    ):
+        if not self.publishScheduler:
+            return func(*(args or []), **(kwargs or {}))
+
+        return self.publishScheduler.submit(
+            func,
+            args=args,
+            kwargs=kwargs,
+            name=name,
+            state=state,
+            inputs=inputs,
+            outputs=outputs,
+        )
+
+    @err_catcher(name=__name__)
+    def getMasterTaskKey(self, path, media=False, mediaType=None):
+        # master updates of the same product or identifier must not overlap
+        if media:
+            infoPath = self.core.mediaProducts.getMediaVersionInfoPathFromFilepath(
+                path, mediaType=mediaType
+            )
+            folder = os.path.dirname(os.path.dirname(infoPath))
+        else:
+            versionFolder = self.core.products.getVersionInfoPathFromProductFilepath(path)
+            folder = os.path.dirname(versionFolder)
+
+        return "master:" + folder
+
+    @err_catcher(name=__name__)
+    def finishPublishTasks(self):
+        scheduler = self.publishScheduler
+        if not scheduler:
+            return
+
+        if scheduler.hasPendingTasks():
+            text = "Finishing background publish tasks - please wait.."
+            with self.core.waitPopup(self.core, text), scheduler.phase("waitForTasks"):
+                failedTasks = scheduler.finish()
+        else:
+            failedTasks = scheduler.finish()
+
+        for task in failedTasks:
+            for stateResult in self.publishResult:
+                if stateResult["state"] is not task["state"] or not stateResult["result"]:
+                    continue
+
+                if "error" not in stateResult["result"][0]:
+                    stateResult["result"][0] = "%s - error - %s failed: %s" % (
+                        task["state"].state.text(0),
+                        task["name"],
+                        task["error"],
+                    )
+
+    @err_catcher(name=__name__)
+    def savePublishTimings(self, pubType, success):
+        scheduler = self.publishScheduler
+        if not scheduler:
+            return
+
+        self.publishScheduler = None
+        scheduler.finish()
+        self.publishReport = scheduler.getReport()
+        logger.info(scheduler.formatReport(self.publishReport))
+        self.core.publishTimings.addRecord(
+            self.publishReport,
+            pubType=pubType,
+            scenefile=self.core.getCurrentFileName(),
+            success=success,
+        )
+
+    @err_catcher(name=__name__)
+    def showPublishTimings(self):
+        self.core.publishTimings.showDialog(parent=self)
+
     @err_catcher(name=__name__)
     def runSantityChecks(self, executeState):
         result = []
@@ -2030,20 +2228,21 @@ QGroupBox::indicator:checked {
 
         invalidFiles = []
         nonExistend = []
-        for idx, i in enumerate(extFiles):
-            i = self.core.fixPath(i)
-
+        fixedFiles = [self.core.fixPath(i) for i in extFiles]
+        existingFiles = self.core.sanities.getExistingPaths(fixedFiles)
+        for idx, i in enumerate(fixedFiles):
+            exists = os.path.normpath(i) in existingFiles
             if not (
                 i.startswith(self.core.projectPath)
                 or (
                     self.core.useLocalFiles and i.startswith(self.core.localProjectPath)
                 )
             ):
-                if os.path.exists(i) and not i in invalidFiles:
+                if exists and not i in invalidFiles:
                     invalidFiles.append(i)
 
             if (
-                not os.path.exists(i)
+                not exists
                 and not i in nonExistend
                 and i != self.core.getCurrentFileName()
             ):
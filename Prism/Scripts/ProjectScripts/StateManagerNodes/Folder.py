@@ -114,12 +114,9 @@ class FolderClass(object):
             if (self.stateManager.publishType == "execute" or curState.checkState(0) == Qt.Checked) and (curState.ui.className == "Folder" or curState in set(
                 self.stateManager.execStates
             )):
-                if getattr(curState.ui, "canSetVersion", False):
-                    exResult = curState.ui.executeState(
-                        parent=self, useVersion=useVersion
-                    )
-                else:
-                    exResult = curState.ui.executeState(parent=self)
+                exResult = self.stateManager.executePublishState(
+                    curState.ui, parent=self, useVersion=useVersion
+                )
 
                 if curState.ui.className == "Folder":
                     result += exResult
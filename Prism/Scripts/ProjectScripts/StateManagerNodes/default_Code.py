@@ -49,6 +49,7 @@ logger = logging.getLogger(__name__)
 
 class CodeClass(object):
     className = "Code"
+    publishBarrier = True
     listType = "Export"
 
     def setup(self, state, core, stateManager, stateData=None):
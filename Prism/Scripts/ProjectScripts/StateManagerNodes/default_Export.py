@@ -330,17 +330,17 @@ class ExportClass(object):
     def setCustomContext(self, context):
         self.customContext = context
         self.refreshContext()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def onContextTypeChanged(self, state):
         self.refreshContext()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def rangeTypeChanged(self, state):
         self.updateRange()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def wholeSceneChanged(self, state):
@@ -351,7 +351,7 @@ class ExportClass(object):
 
         self.gb_objects.setEnabled(enabled)
         self.updateUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def nameChanged(self, text):
@@ -479,7 +479,7 @@ class ExportClass(object):
 
         if result == 1:
             self.setTaskname(self.nameWin.e_item.text())
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def preDelete(self, item):
@@ -512,7 +512,7 @@ class ExportClass(object):
     def addObjects(self, objects=None):
         self.core.appPlugin.sm_export_addObjects(self, objects)
         self.updateObjectList()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def removeItem(self, item):
@@ -524,7 +524,7 @@ class ExportClass(object):
             self.lw_objects.takeItem(rowNum)
 
         self.updateObjectList()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def clearItems(self):
@@ -534,7 +534,7 @@ class ExportClass(object):
             getattr(self.core.appPlugin, "sm_export_clearSet", lambda x: None)(self)
 
         self.updateObjectList()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def refreshShotCameras(self):
@@ -551,7 +551,7 @@ class ExportClass(object):
             self.cb_sCamShot.setCurrentIndex(idx)
         else:
             self.cb_sCamShot.setCurrentIndex(0)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def updateUi(self):
@@ -570,7 +570,7 @@ class ExportClass(object):
                 self.curCam = self.camlist[0]
             else:
                 self.curCam = None
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
         if not self.core.products.getUseMaster():
             self.w_master.setVisible(False)
@@ -749,40 +749,40 @@ class ExportClass(object):
         self.gb_objects.setVisible(not isSCam)
 
         self.updateUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def setCam(self, index):
         self.curCam = self.camlist[index]
         self.updateUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def startChanged(self):
         if self.sp_rangeStart.value() > self.sp_rangeEnd.value():
             self.sp_rangeEnd.setValue(self.sp_rangeStart.value())
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def endChanged(self):
         if self.sp_rangeEnd.value() < self.sp_rangeStart.value():
             self.sp_rangeStart.setValue(self.sp_rangeEnd.value())
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def rjToggled(self, checked):
         self.refreshSubmitUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def managerChanged(self, text=None):
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def setLastPath(self, path):
         self.l_pathLast.setText(path)
         self.l_pathLast.setToolTip(path)
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def getContextStrFromEntity(self, entity):
@@ -885,7 +885,14 @@ class ExportClass(object):
         if not self.isUsingMasterVersion():
             return
 
-        self.core.products.updateMasterVersion(outputName)
+        self.stateManager.runPublishTask(
+            self.core.products.updateMasterVersion,
+            args=[outputName],
+            name="updateMasterVersion",
+            state=self,
+            inputs=[outputName],
+            outputs=[self.stateManager.getMasterTaskKey(outputName)],
+        )
 
     @err_catcher(name=__name__)
     def executeState(self, parent, useVersion="next"):
@@ -1006,7 +1013,7 @@ class ExportClass(object):
                 if res and "validateOutput" in res:
                     validateOutput = res["validateOutput"]
 
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
             if not validateOutput or os.path.exists(outputName):
                 return [self.state.text(0) + " - success"]
@@ -1108,7 +1115,7 @@ class ExportClass(object):
 
                 logger.debug("exported to: %s" % outputName)
                 self.setLastPath(outputName)
-                self.stateManager.saveStatesToScene()
+                self.stateManager.saveStatesToScene(state=self)
 
             except Exception as e:
                 exc_type, exc_obj, exc_tb = sys.exc_info()
@@ -185,7 +185,7 @@ class ImageRenderClass(object):
             idx = self.cb_renderPreset.findText(data["currentrenderpreset"])
             if idx != -1:
                 self.cb_renderPreset.setCurrentIndex(idx)
-                self.stateManager.saveStatesToScene()
+                self.stateManager.saveStatesToScene(state=self)
         if "rangeType" in data:
             idx = self.cb_rangeType.findText(data["rangeType"])
             if idx != -1:
@@ -205,7 +205,7 @@ class ImageRenderClass(object):
             if idx != -1:
                 self.curCam = self.camlist[idx]
                 self.cb_cam.setCurrentIndex(idx)
-                self.stateManager.saveStatesToScene()
+                self.stateManager.saveStatesToScene(state=self)
         if "resoverride" in data:
             res = eval(data["resoverride"])
             self.chb_resOverride.setChecked(res[0])
@@ -223,7 +223,7 @@ class ImageRenderClass(object):
             idx = self.cb_renderLayer.findText(data["renderlayer"])
             if idx != -1:
                 self.cb_renderLayer.setCurrentIndex(idx)
-                self.stateManager.saveStatesToScene()
+                self.stateManager.saveStatesToScene(state=self)
         if "outputFormat" in data:
             idx = self.cb_format.findText(data["outputFormat"])
             if idx != -1:
@@ -380,38 +380,40 @@ class ImageRenderClass(object):
     def setCustomContext(self, context):
         self.customContext = context
         self.refreshContext()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def onContextTypeChanged(self, state):
         self.refreshContext()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def rangeTypeChanged(self, state):
         self.updateUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def startChanged(self):
         if self.sp_rangeStart.value() > self.sp_rangeEnd.value():
             self.sp_rangeEnd.setValue(self.sp_rangeStart.value())
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def endChanged(self):
         if self.sp_rangeEnd.value() < self.sp_rangeStart.value():
             self.sp_rangeStart.setValue(self.sp_rangeEnd.value())
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def frameExpressionChanged(self, text=None):
         if not hasattr(self, "expressionWinLabel"):
             return
 
-        frames = self.core.resolveFrameExpression(self.le_frameExpression.text())
+        frames = self.core.resolveFrameExpression(
+            self.le_frameExpression.text(), limit=1001
+        )
         if len(frames) > 1000:
             frames = frames[:1000]
             frames.append("...")
@@ -448,7 +450,9 @@ class ImageRenderClass(object):
             winwidth = 10
             winheight = 10
             VBox = QVBoxLayout()
-            frames = self.core.resolveFrameExpression(self.le_frameExpression.text())
+            frames = self.core.resolveFrameExpression(
+                self.le_frameExpression.text(), limit=1001
+            )
             if len(frames) > 1000:
                 frames = frames[:1000]
                 frames.append("...")
@@ -484,7 +488,7 @@ class ImageRenderClass(object):
     @err_catcher(name=__name__)
     def setCam(self, index):
         self.curCam = self.camlist[index]
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def nameChanged(self, text):
@@ -528,7 +532,7 @@ class ImageRenderClass(object):
         idx = self.cb_format.findText(fmt)
         if idx != -1:
             self.cb_format.setCurrentIndex(idx)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
             return True
 
         return False
@@ -582,12 +586,12 @@ class ImageRenderClass(object):
         if result == 1:
             self.setTaskname(self.nameWin.e_item.text())
             self.nameChanged(self.e_name.text())
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def presetOverrideChanged(self, checked):
         self.cb_renderPreset.setEnabled(checked)
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def resOverrideChanged(self, checked):
@@ -595,7 +599,7 @@ class ImageRenderClass(object):
         self.sp_resHeight.setEnabled(checked)
         self.b_resPresets.setEnabled(checked)
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def showResPresets(self):
@@ -615,7 +619,7 @@ class ImageRenderClass(object):
             pAct.triggered.connect(
                 lambda x=None, v=pheight: self.sp_resHeight.setValue(v)
             )
-            pAct.triggered.connect(lambda: self.stateManager.saveStatesToScene())
+            pAct.triggered.connect(lambda: self.stateManager.saveStatesToScene(state=self))
             pmenu.addAction(pAct)
 
         pmenu.exec_(QCursor.pos())
@@ -666,7 +670,7 @@ class ImageRenderClass(object):
         idx = self.cb_master.findText(master)
         if idx != -1:
             self.cb_master.setCurrentIndex(idx)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
             return True
 
         return False
@@ -680,7 +684,7 @@ class ImageRenderClass(object):
         idx = self.cb_outPath.findText(location)
         if idx != -1:
             self.cb_outPath.setCurrentIndex(idx)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
             return True
 
         return False
@@ -709,7 +713,7 @@ class ImageRenderClass(object):
             else:
                 self.curCam = None
 
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
         self.updateRange()
 
@@ -730,7 +734,7 @@ class ImageRenderClass(object):
             self.cb_renderLayer.setCurrentIndex(layerList.index(curLayer))
         else:
             self.cb_renderLayer.setCurrentIndex(0)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
         self.refreshSubmitUi()
         getattr(self.core.appPlugin, "sm_render_refreshPasses", lambda x: None)(self)
@@ -877,17 +881,17 @@ class ImageRenderClass(object):
                     selSlaves = selSlaves[:-2]
 
             self.e_osSlaves.setText(selSlaves)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def gpuPtChanged(self):
         self.w_dlGPUdevices.setEnabled(self.sp_dlGPUpt.value() == 0)
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def gpuDevicesChanged(self):
         self.w_dlGPUpt.setEnabled(self.le_dlGPUdevices.text() == "")
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def showPasses(self):
@@ -933,7 +937,7 @@ class ImageRenderClass(object):
                 )
 
         self.updateUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def rclickPasses(self, pos):
@@ -960,7 +964,7 @@ class ImageRenderClass(object):
     @err_catcher(name=__name__)
     def rjToggled(self, checked):
         self.refreshSubmitUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def managerChanged(self, text=None):
@@ -968,7 +972,7 @@ class ImageRenderClass(object):
         if plugin:
             plugin.sm_render_managerChanged(self)
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def getContextStrFromEntity(self, entity):
@@ -1124,7 +1128,7 @@ class ImageRenderClass(object):
 
             self.l_pathLast.setText(outputName)
             self.l_pathLast.setToolTip(outputName)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
             rSettings = {
                 "outputName": outputName,
@@ -1251,9 +1255,23 @@ class ImageRenderClass(object):
 
         masterAction = self.cb_master.currentText()
         if masterAction == "Set as master":
-            self.core.mediaProducts.updateMasterVersion(outputName)
+            self.stateManager.runPublishTask(
+                self.core.mediaProducts.updateMasterVersion,
+                args=[outputName],
+                name="updateMasterVersion",
+                state=self,
+                inputs=[outputName],
+                outputs=[self.stateManager.getMasterTaskKey(outputName, media=True)],
+            )
         elif masterAction == "Add to master":
-            self.core.mediaProducts.addToMasterVersion(outputName)
+            self.stateManager.runPublishTask(
+                self.core.mediaProducts.addToMasterVersion,
+                args=[outputName],
+                name="addToMasterVersion",
+                state=self,
+                inputs=[outputName],
+                outputs=[self.stateManager.getMasterTaskKey(outputName, media=True)],
+            )
 
     @err_catcher(name=__name__)
     def setTaskWarn(self, warn):
@@ -272,7 +272,7 @@ class ImportFileClass(object):
         self.w_currentVersion.setToolTip(path)
         self.stateManager.saveImports()
         self.updateUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def isShotCam(self, path=None):
@@ -291,14 +291,14 @@ class ImportFileClass(object):
                 if curVersion.get("version") and latestVersion.get("version") and curVersion["version"] != latestVersion["version"]:
                     self.importLatest()
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def autoNameSpaceChanged(self, checked):
         self.b_nameSpaces.setEnabled(not checked)
         if not self.stateManager.standalone:
             self.core.appPlugin.sm_import_removeNameSpaces(self)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def runSanityChecks(self, cachePath):
@@ -436,7 +436,7 @@ class ImportFileClass(object):
         self.setImportPath(impFileName)
         self.stateManager.saveImports()
         self.updateUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
         return result
 
@@ -603,7 +603,7 @@ class ImportFileClass(object):
             )(self)
 
         self.updateUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def preDelete(
@@ -151,7 +151,7 @@ class PlayblastClass(object):
             if idx > 0:
                 self.curCam = self.camlist[idx - 1]
                 self.cb_cams.setCurrentIndex(idx)
-                self.stateManager.saveStatesToScene()
+                self.stateManager.saveStatesToScene(state=self)
         if "resoverride" in data:
             res = eval(data["resoverride"])
             self.chb_resOverride.setChecked(res[0])
@@ -270,21 +270,21 @@ class PlayblastClass(object):
     @err_catcher(name=__name__)
     def rangeTypeChanged(self, state):
         self.updateRange()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def startChanged(self):
         if self.sp_rangeStart.value() > self.sp_rangeEnd.value():
             self.sp_rangeEnd.setValue(self.sp_rangeStart.value())
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def endChanged(self):
         if self.sp_rangeEnd.value() < self.sp_rangeStart.value():
             self.sp_rangeStart.setValue(self.sp_rangeEnd.value())
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def setCam(self, index):
@@ -293,7 +293,7 @@ class PlayblastClass(object):
         else:
             self.curCam = self.camlist[index - 1]
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def nameChanged(self, text):
@@ -362,7 +362,7 @@ class PlayblastClass(object):
         if result == 1:
             self.setTaskname(self.nameWin.e_item.text())
             self.nameChanged(self.e_name.text())
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def resOverrideChanged(self, checked):
@@ -370,7 +370,7 @@ class PlayblastClass(object):
         self.sp_resHeight.setEnabled(checked)
         self.b_resPresets.setEnabled(checked)
 
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def showResPresets(self):
@@ -390,7 +390,7 @@ class PlayblastClass(object):
             pAct.triggered.connect(
                 lambda x=None, v=pheight: self.sp_resHeight.setValue(v)
             )
-            pAct.triggered.connect(lambda: self.stateManager.saveStatesToScene())
+            pAct.triggered.connect(lambda: self.stateManager.saveStatesToScene(state=self))
             pmenu.addAction(pAct)
 
         pmenu.exec_(QCursor.pos())
@@ -427,7 +427,7 @@ class PlayblastClass(object):
         idx = self.cb_master.findText(master)
         if idx != -1:
             self.cb_master.setCurrentIndex(idx)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
             return True
 
         return False
@@ -441,7 +441,7 @@ class PlayblastClass(object):
         idx = self.cb_location.findText(location)
         if idx != -1:
             self.cb_location.setCurrentIndex(idx)
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
             return True
 
         return False
@@ -571,11 +571,11 @@ class PlayblastClass(object):
     @err_catcher(name=__name__)
     def rjToggled(self, checked):
         self.refreshSubmitUi()
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def managerChanged(self, text=None):
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def updateLastPath(self, path):
@@ -725,7 +725,7 @@ class PlayblastClass(object):
         self.core.saveVersionInfo(filepath=outputPath, details=details)
 
         self.updateLastPath(outputName)
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
         self.core.saveScene(versionUp=False, prismReq=False)
 
@@ -850,9 +850,33 @@ class PlayblastClass(object):
 
         masterAction = self.cb_master.currentText()
         if masterAction == "Set as master":
-            self.core.mediaProducts.updateMasterVersion(outputName, mediaType="playblasts")
+            self.stateManager.runPublishTask(
+                self.core.mediaProducts.updateMasterVersion,
+                args=[outputName],
+                kwargs={"mediaType": "playblasts"},
+                name="updateMasterVersion",
+                state=self,
+                inputs=[outputName],
+                outputs=[
+                    self.stateManager.getMasterTaskKey(
+                        outputName, media=True, mediaType="playblasts"
+                    )
+                ],
+            )
         elif masterAction == "Add to master":
-            self.core.mediaProducts.addToMasterVersion(outputName, mediaType="playblasts")
+            self.stateManager.runPublishTask(
+                self.core.mediaProducts.addToMasterVersion,
+                args=[outputName],
+                kwargs={"mediaType": "playblasts"},
+                name="addToMasterVersion",
+                state=self,
+                inputs=[outputName],
+                outputs=[
+                    self.stateManager.getMasterTaskKey(
+                        outputName, media=True, mediaType="playblasts"
+                    )
+                ],
+            )
 
     @err_catcher(name=__name__)
     def setTaskWarn(self, warn):
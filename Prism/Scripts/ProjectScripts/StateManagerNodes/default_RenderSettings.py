@@ -170,7 +170,7 @@ class RenderSettingsClass(object):
         self.w_addSetting.setVisible(state)
         self.gb_settings.setVisible(state)
         self.te_settings.setPlainText("")
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def updateUi(self):
@@ -183,7 +183,7 @@ class RenderSettingsClass(object):
         if idx != -1:
             self.cb_presetOption.setCurrentIndex(idx)
         else:
-            self.stateManager.saveStatesToScene()
+            self.stateManager.saveStatesToScene(state=self)
         if self.state:
             self.nameChanged(self.e_name.text())
 
@@ -200,7 +200,7 @@ class RenderSettingsClass(object):
 
     @err_catcher(name=__name__)
     def focusOut(self, event):
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
         self.te_settings.origFocusOutEvent(event)
 
     @err_catcher(name=__name__)
@@ -209,7 +209,7 @@ class RenderSettingsClass(object):
             self.core.appPlugin, "sm_renderSettings_getCurrentSettings", lambda x: {}
         )(self)
         self.te_settings.setPlainText(settings)
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def resetSettings(self):
@@ -254,7 +254,7 @@ class RenderSettingsClass(object):
 
         settings = self.core.writeYaml(data=preset["renderSettings"])
         self.te_settings.setPlainText(settings)
-        self.stateManager.saveStatesToScene()
+        self.stateManager.saveStatesToScene(state=self)
 
     @err_catcher(name=__name__)
     def savePreset(self):
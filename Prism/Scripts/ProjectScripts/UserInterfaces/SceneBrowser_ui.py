@@ -219,15 +219,13 @@ class Ui_w_sceneBrowser(object):
         self.verticalLayout = QtWidgets.QVBoxLayout(self.w_scenePage2)
         self.verticalLayout.setContentsMargins(0, 0, 0, 0)
         self.verticalLayout.setObjectName("verticalLayout")
-        self.sa_scenefileItems = QtWidgets.QScrollArea(self.w_scenePage2)
-        self.sa_scenefileItems.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.sa_scenefileItems.setWidgetResizable(True)
-        self.sa_scenefileItems.setObjectName("sa_scenefileItems")
-        self.scrollAreaWidgetContents = QtWidgets.QWidget()
-        self.scrollAreaWidgetContents.setGeometry(QtCore.QRect(0, 0, 554, 451))
-        self.scrollAreaWidgetContents.setObjectName("scrollAreaWidgetContents")
-        self.sa_scenefileItems.setWidget(self.scrollAreaWidgetContents)
-        self.verticalLayout.addWidget(self.sa_scenefileItems)
+        self.lv_scenefileItems = QtWidgets.QListView(self.w_scenePage2)
+        self.lv_scenefileItems.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+        self.lv_scenefileItems.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.lv_scenefileItems.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        self.lv_scenefileItems.setUniformItemSizes(True)
+        self.lv_scenefileItems.setObjectName("lv_scenefileItems")
+        self.verticalLayout.addWidget(self.lv_scenefileItems)
         self.sw_scenefiles.addWidget(self.w_scenePage2)
         self.verticalLayout_4.addWidget(self.sw_scenefiles)
         self.horizontalLayout.addWidget(self.splitter_5)